@@ -13,4 +13,8 @@ $CMD_MC mb polar/$BUCKET_NAME --with-versioning --ignore-existing
 $CMD_MC mb polar/$PUBLIC_BUCKET_NAME --with-versioning --ignore-existing
 $CMD_MC anonymous set download polar/$PUBLIC_BUCKET_NAME
 
+if [ -n "$PAYOUTS_BUCKET_NAME" ]; then
+    $CMD_MC mb polar/$PAYOUTS_BUCKET_NAME --with-versioning --ignore-existing
+fi
+
 $CMD_MC mb polar/$BUCKET_TESTING_NAME --with-versioning --ignore-existing
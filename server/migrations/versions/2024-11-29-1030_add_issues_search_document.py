@@ -0,0 +1,81 @@
+"""Add issues search document and title trigram index
+
+Revision ID: 5d1c3e8f2a47
+Revises: 8a0ba0d5b5f3
+Create Date: 2024-11-29 10:30:12.418305
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy_utils.types.ts_vector import TSVectorType
+
+# Polar Custom Imports
+
+# revision identifiers, used by Alembic.
+revision = "5d1c3e8f2a47"
+down_revision = "8a0ba0d5b5f3"
+branch_labels: tuple[str] | None = None
+depends_on: tuple[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "issues",
+        sa.Column(
+            "search_tsv",
+            TSVectorType(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+                "setweight(jsonb_to_tsvector('simple', "
+                "coalesce(jsonb_path_query_array(labels, '$[*].name'), '[]'::jsonb), "
+                "'[\"string\"]'), 'B') || "
+                "setweight(to_tsvector('simple', left(coalesce(body, ''), 100000)), 'C')",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "idx_issues_search_tsv",
+        "issues",
+        ["search_tsv"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "idx_issues_title_trgm",
+        "issues",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+    op.drop_index("idx_issues_title_tsv", table_name="issues")
+    op.drop_column("issues", "title_tsv")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "issues",
+        sa.Column(
+            "title_tsv",
+            TSVectorType(),
+            sa.Computed("to_tsvector('simple', \"title\")", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "idx_issues_title_tsv",
+        "issues",
+        ["title_tsv"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    op.drop_index("idx_issues_title_trgm", table_name="issues")
+    op.drop_index("idx_issues_search_tsv", table_name="issues")
+    op.drop_column("issues", "search_tsv")
@@ -0,0 +1,36 @@
+"""Add partial index on granted benefit grants
+
+Revision ID: 7c4e2b9d1f63
+Revises: 5d1c3e8f2a47
+Create Date: 2024-11-30 09:00:41.207518
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Polar Custom Imports
+
+# revision identifiers, used by Alembic.
+revision = "7c4e2b9d1f63"
+down_revision = "5d1c3e8f2a47"
+branch_labels: tuple[str] | None = None
+depends_on: tuple[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_benefit_grants_benefit_id_id_granted",
+        "benefit_grants",
+        ["benefit_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("granted_at IS NOT NULL AND deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_benefit_grants_benefit_id_id_granted",
+        table_name="benefit_grants",
+        postgresql_where=sa.text("granted_at IS NOT NULL AND deleted_at IS NULL"),
+    )
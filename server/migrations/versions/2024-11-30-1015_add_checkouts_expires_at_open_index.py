@@ -0,0 +1,36 @@
+"""Add partial index on open checkouts expiration
+
+Revision ID: 3b8f6a1d9e24
+Revises: 7c4e2b9d1f63
+Create Date: 2024-11-30 10:15:27.903164
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Polar Custom Imports
+
+# revision identifiers, used by Alembic.
+revision = "3b8f6a1d9e24"
+down_revision = "7c4e2b9d1f63"
+branch_labels: tuple[str] | None = None
+depends_on: tuple[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_checkouts_expires_at_open",
+        "checkouts",
+        ["expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'open' AND deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_checkouts_expires_at_open",
+        table_name="checkouts",
+        postgresql_where=sa.text("status = 'open' AND deleted_at IS NULL"),
+    )
@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.benefit.schemas import BenefitID
 from polar.benefit.service.benefit import benefit as benefit_service
@@ -12,6 +12,7 @@ from polar.models import AdvertisementCampaign as AdvertisementCampaignModel
 from polar.models.benefit import BenefitAds
 from polar.openapi import APITag
 from polar.postgres import AsyncSession, get_db_session
+from polar.redis import Redis, get_redis
 from polar.routing import APIRouter
 
 from .schemas import AdvertisementCampaign, AdvertisementCampaignListResource
@@ -21,7 +22,7 @@ from .service import advertisement_campaign as advertisement_campaign_service
 router = APIRouter(prefix="/advertisements", tags=["advertisements", APITag.documented])
 
 AdvertisementCampaignID = Annotated[
-    UUID4, Path(description="The advertisement campaign ID.")
+    UUID, Path(description="The advertisement campaign ID.")
 ]
 AdvertisementCampaignNotFound = {
     "description": "Advertisement campaign not found.",
@@ -116,6 +117,7 @@ async def get(
 async def track_view(
     id: AdvertisementCampaignID,
     session: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> None:
     """Track a view on an advertisement campaign."""
     advertisement_campaign = await advertisement_campaign_service.get_by_id(session, id)
@@ -123,6 +125,6 @@ async def track_view(
     if advertisement_campaign is None:
         raise ResourceNotFound()
 
-    await advertisement_campaign_service.track_view(session, advertisement_campaign)
+    await advertisement_campaign_service.track_view(redis, advertisement_campaign)
 
     return None
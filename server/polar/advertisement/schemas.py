@@ -1,13 +1,14 @@
 from typing import Annotated
+from uuid import UUID
 
-from pydantic import UUID4, Field, HttpUrl
+from pydantic import Field, HttpUrl
 
 from polar.kit.pagination import ListResource
 from polar.kit.schemas import MergeJSONSchema, TimestampedSchema
 
 
 class AdvertisementCampaign(TimestampedSchema):
-    id: UUID4
+    id: UUID
     image_url: HttpUrl
     image_url_dark: HttpUrl | None
     text: str
@@ -3,14 +3,16 @@ from collections.abc import Sequence
 from enum import StrEnum
 from typing import Any
 
-from sqlalchemy import UUID, Select, UnaryExpression, asc, desc, select, update
+from sqlalchemy import UUID, Select, UnaryExpression, asc, desc, select
 
+from polar.counter.service import BufferedCounter
 from polar.kit.db.postgres import AsyncSession
 from polar.kit.pagination import PaginationParams, paginate
 from polar.kit.services import ResourceServiceReader
 from polar.kit.sorting import Sorting
 from polar.models import AdvertisementCampaign, BenefitGrant
 from polar.models.benefit import BenefitAds
+from polar.redis import Redis
 
 
 class AdvertisementSortProperty(StrEnum):
@@ -20,6 +22,11 @@ class AdvertisementSortProperty(StrEnum):
     clicks = "clicks"
 
 
+advertisement_campaign_views = BufferedCounter(
+    "advertisement_campaign_views", AdvertisementCampaign, "views"
+)
+
+
 class AdvertisementCampaignService(ResourceServiceReader[AdvertisementCampaign]):
     async def list(
         self,
@@ -66,19 +73,11 @@ class AdvertisementCampaignService(ResourceServiceReader[AdvertisementCampaign])
 
     async def track_view(
         self,
-        session: AsyncSession,
+        redis: Redis,
         advertisement_campaign: AdvertisementCampaign,
     ) -> AdvertisementCampaign:
-        statement = (
-            update(AdvertisementCampaign)
-            .where(AdvertisementCampaign.id == advertisement_campaign.id)
-            .values({"views": AdvertisementCampaign.views + 1})
-            .returning(AdvertisementCampaign)
-        )
-
-        result = await session.execute(statement)
-
-        return result.scalar_one()
+        await advertisement_campaign_views.increment(redis, advertisement_campaign)
+        return advertisement_campaign
 
     def _get_readable_advertisement_statement(
         self,
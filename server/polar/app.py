@@ -12,14 +12,11 @@ from polar.checkout import ip_geolocation
 from polar.config import settings
 from polar.exception_handlers import add_exception_handlers
 from polar.health.endpoints import router as health_router
-from polar.kit.cors import CORSConfig, CORSMatcherMiddleware, Scope
+from polar.kit.cors import CORSConfig, CORSMatcherMiddleware, origins_matcher
 from polar.kit.db.postgres import (
     AsyncEngine,
     AsyncSessionMaker,
-    Engine,
-    SyncSessionMaker,
     create_async_sessionmaker,
-    create_sync_sessionmaker,
 )
 from polar.logfire import (
     configure_logfire,
@@ -33,14 +30,20 @@ from polar.middlewares import (
     FlushEnqueuedWorkerJobsMiddleware,
     LogCorrelationIdMiddleware,
     PathRewriteMiddleware,
+    QueryStatsMiddleware,
     SandboxResponseHeaderMiddleware,
 )
 from polar.oauth2.endpoints.well_known import router as well_known_router
 from polar.oauth2.exception_handlers import OAuth2Error, oauth2_error_exception_handler
 from polar.openapi import OPENAPI_PARAMETERS, APITag, set_openapi_generator
-from polar.postgres import create_async_engine, create_sync_engine
+from polar.postgres import create_async_engine, create_async_read_engine
 from polar.posthog import configure_posthog
-from polar.redis import Redis, create_redis
+from polar.redis import (
+    Redis,
+    RedisConnectionManager,
+    RedisRole,
+    create_redis_connections,
+)
 from polar.sentry import configure_sentry
 from polar.webhook.webhooks import document_webhooks
 from polar.worker import ArqRedis
@@ -54,12 +57,8 @@ def configure_cors(app: FastAPI) -> None:
 
     # Polar frontend CORS configuration
     if settings.CORS_ORIGINS:
-
-        def polar_frontend_matcher(origin: str, scope: Scope) -> bool:
-            return origin in settings.CORS_ORIGINS
-
         polar_frontend_config = CORSConfig(
-            polar_frontend_matcher,
+            origins_matcher(settings.CORS_ORIGINS),
             allow_origins=[str(origin) for origin in settings.CORS_ORIGINS],
             allow_credentials=True,  # Cookies are allowed, but only there!
             allow_methods=["*"],
@@ -88,9 +87,10 @@ def generate_unique_openapi_id(route: APIRoute) -> str:
 class State(TypedDict):
     async_engine: AsyncEngine
     async_sessionmaker: AsyncSessionMaker
-    sync_engine: Engine
-    sync_sessionmaker: SyncSessionMaker
+    async_read_engine: AsyncEngine | None
+    async_read_sessionmaker: AsyncSessionMaker | None
     arq_pool: ArqRedis
+    redis_connections: RedisConnectionManager
     redis: Redis
     ip_geolocation_client: ip_geolocation.IPGeolocationClient | None
 
@@ -99,15 +99,18 @@ class State(TypedDict):
 async def lifespan(app: FastAPI) -> AsyncIterator[State]:
     log.info("Starting Polar API")
 
-    async with worker_lifespan() as arq_pool:
-        async with create_redis() as redis:
+    async with create_redis_connections() as redis_connections:
+        async with worker_lifespan(redis_connections) as arq_pool:
+            redis = redis_connections.get_client(RedisRole.cache)
             async_engine = create_async_engine("app")
             async_sessionmaker = create_async_sessionmaker(async_engine)
             instrument_sqlalchemy(async_engine.sync_engine)
 
-            sync_engine = create_sync_engine("app")
-            sync_sessionmaker = create_sync_sessionmaker(sync_engine)
-            instrument_sqlalchemy(sync_engine)
+            async_read_engine = create_async_read_engine("app")
+            async_read_sessionmaker: AsyncSessionMaker | None = None
+            if async_read_engine is not None:
+                async_read_sessionmaker = create_async_sessionmaker(async_read_engine)
+                instrument_sqlalchemy(async_read_engine.sync_engine)
 
             try:
                 ip_geolocation_client = ip_geolocation.get_client()
@@ -123,15 +126,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[State]:
             yield {
                 "async_engine": async_engine,
                 "async_sessionmaker": async_sessionmaker,
-                "sync_engine": sync_engine,
-                "sync_sessionmaker": sync_sessionmaker,
+                "async_read_engine": async_read_engine,
+                "async_read_sessionmaker": async_read_sessionmaker,
                 "arq_pool": arq_pool,
+                "redis_connections": redis_connections,
                 "redis": redis,
                 "ip_geolocation_client": ip_geolocation_client,
             }
 
             await async_engine.dispose()
-            sync_engine.dispose()
+            if async_read_engine is not None:
+                await async_read_engine.dispose()
             if ip_geolocation_client is not None:
                 ip_geolocation_client.close()
 
@@ -148,6 +153,7 @@ def create_app() -> FastAPI:
 
     app.add_middleware(PathRewriteMiddleware, pattern=r"^/api/v1", replacement="/v1")
     app.add_middleware(FlushEnqueuedWorkerJobsMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
     app.add_middleware(LogCorrelationIdMiddleware)
     if settings.is_sandbox():
         app.add_middleware(SandboxResponseHeaderMiddleware)
@@ -162,7 +168,8 @@ def create_app() -> FastAPI:
     app.include_router(health_router)
 
     app.include_router(router)
-    document_webhooks(app)
+    if not settings.LAZY_STARTUP:
+        document_webhooks(app)
 
     return app
 
@@ -173,6 +180,6 @@ configure_logging(logfire=True)
 configure_posthog()
 
 app = create_app()
-set_openapi_generator(app)
+set_openapi_generator(app, prepare=document_webhooks if settings.LAZY_STARTUP else None)
 instrument_fastapi(app)
 instrument_httpx()
@@ -3,7 +3,6 @@ from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends, Query
 from fastapi.responses import FileResponse
-from pydantic import UUID4
 
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted, ResourceNotFound
@@ -87,7 +86,7 @@ async def list(
 async def export(
     auth_subject: auth.ArticlesWrite,
     background_tasks: BackgroundTasks,
-    organization_id: UUID4 = Query(),
+    organization_id: UUID = Query(),
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
 ) -> FileResponse:
@@ -2,8 +2,9 @@ import base64
 import datetime
 import re
 from typing import Annotated, Self
+from uuid import UUID
 
-from pydantic import UUID4, Field, FutureDatetime, HttpUrl, model_validator
+from pydantic import Field, FutureDatetime, HttpUrl, model_validator
 
 from polar.kit.schemas import EmailStrDNS, MergeJSONSchema, Schema, SelectorWidget
 from polar.models import Article as ArticleModel
@@ -13,7 +14,7 @@ from polar.organization.schemas import Organization, OrganizationID
 paywall_regex = r"<Paywall>((.|\n)*?)<\/Paywall>"
 
 ArticleID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The article ID."}),
     SelectorWidget("/v1/articles", "Article", "title"),
 ]
@@ -25,15 +26,15 @@ class BylineProfile(Schema):
 
 
 class Article(Schema):
-    id: UUID4
+    id: UUID
     slug: str
     title: str
     body: str
     byline: BylineProfile
     visibility: ArticleVisibility
 
-    user_id: UUID4 | None
-    organization_id: UUID4
+    user_id: UUID | None
+    organization_id: UUID
 
     organization: Organization
 
@@ -1,5 +1,6 @@
+from uuid import UUID
+
 from fastapi import Depends, Query
-from pydantic import UUID4
 
 from polar.authz.service import Authz
 from polar.exceptions import BadRequest, NotPermitted, ResourceNotFound
@@ -100,7 +101,7 @@ async def grants(
             "If `false`, only revoked benefits will be returned. "
         ),
     ),
-    user_id: UUID4 | None = Query(
+    user_id: UUID | None = Query(
         None,
         description=("Filter by user ID."),
     ),
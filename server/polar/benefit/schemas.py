@@ -1,10 +1,10 @@
 from collections.abc import Sequence
 from datetime import datetime
 from typing import Annotated, Any, Literal
+from uuid import UUID
 
 from annotated_types import Len
 from pydantic import (
-    UUID4,
     Discriminator,
     Field,
     TypeAdapter,
@@ -35,7 +35,7 @@ BENEFIT_DESCRIPTION_MIN_LENGTH = 3
 BENEFIT_DESCRIPTION_MAX_LENGTH = 42
 
 BenefitID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The benefit ID."}),
     SelectorWidget("/v1/benefits", "Benefit", "description"),
 ]
@@ -197,7 +197,7 @@ class BenefitGitHubRepositoryCreateProperties(Schema):
 
     # For benefits created before 2014-13-15 repository_id will be set
     # no new benefits of this type are allowed to be created
-    repository_id: UUID4 | None = None
+    repository_id: UUID | None = None
     # For benefits created after 2014-13-15 both repository_owner and repository_name will be set
     repository_owner: str | None = Field(
         None, description="The owner of the repository.", examples=["polarsource"]
@@ -214,7 +214,7 @@ class BenefitGitHubRepositoryProperties(Schema):
     """
 
     # Is set to None for all benefits created after 2024-03-15
-    repository_id: UUID4 | None
+    repository_id: UUID | None
     repository_owner: RepositoryOwner
     repository_name: RepositoryName
     permission: Permission
@@ -233,16 +233,16 @@ class BenefitGitHubRepositorySubscriberProperties(Schema):
 
 
 class BenefitDownloadablesCreateProperties(Schema):
-    archived: dict[UUID4, bool] = {}
-    files: Annotated[list[UUID4], Len(min_length=1)]
+    archived: dict[UUID, bool] = {}
+    files: Annotated[list[UUID], Len(min_length=1)]
 
 
 class BenefitDownloadablesProperties(Schema):
-    archived: dict[UUID4, bool]
-    files: list[UUID4]
+    archived: dict[UUID, bool]
+    files: list[UUID]
 
 
-def get_active_file_ids(properties: BenefitDownloadablesProperties) -> list[UUID4]:
+def get_active_file_ids(properties: BenefitDownloadablesProperties) -> list[UUID]:
     active = []
     archived_files = properties.archived
     for file_id in properties.files:
@@ -254,7 +254,7 @@ def get_active_file_ids(properties: BenefitDownloadablesProperties) -> list[UUID
 
 
 class BenefitDownloadablesSubscriberProperties(Schema):
-    active_files: list[UUID4]
+    active_files: list[UUID]
 
     @model_validator(mode="before")
     @classmethod
@@ -439,14 +439,14 @@ BenefitUpdate = (
 
 
 class BenefitBase(IDSchema, TimestampedSchema):
-    id: UUID4 = Field(..., description="The ID of the benefit.")
+    id: UUID = Field(..., description="The ID of the benefit.")
     type: BenefitType = Field(..., description="The type of the benefit.")
     description: str = Field(..., description="The description of the benefit.")
     selectable: bool = Field(
         ..., description="Whether the benefit is selectable when creating a product."
     )
     deletable: bool = Field(..., description="Whether the benefit is deletable.")
-    organization_id: UUID4 = Field(
+    organization_id: UUID = Field(
         ..., description="The ID of the organization owning the benefit."
     )
 
@@ -546,7 +546,7 @@ class BenefitGrantBase(IDSchema, TimestampedSchema):
     A grant of a benefit to a user.
     """
 
-    id: UUID4 = Field(description="The ID of the grant.")
+    id: UUID = Field(description="The ID of the grant.")
     granted_at: datetime | None = Field(
         None,
         description=(
@@ -563,14 +563,14 @@ class BenefitGrantBase(IDSchema, TimestampedSchema):
         ),
     )
     is_revoked: bool = Field(description="Whether the benefit is revoked.")
-    subscription_id: UUID4 | None = Field(
+    subscription_id: UUID | None = Field(
         description="The ID of the subscription that granted this benefit.",
     )
-    order_id: UUID4 | None = Field(
+    order_id: UUID | None = Field(
         description="The ID of the order that granted this benefit."
     )
-    user_id: UUID4 = Field(description="The ID of the user concerned by this grant.")
-    benefit_id: UUID4 = Field(
+    user_id: UUID = Field(description="The ID of the user concerned by this grant.")
+    benefit_id: UUID = Field(
         description="The ID of the benefit concerned by this grant."
     )
 
@@ -606,7 +606,7 @@ class BenefitArticlesSubscriber(BenefitSubscriberBase):
 
 
 class BenefitGrantAdsSubscriberProperties(Schema):
-    advertisement_campaign_id: UUID4 | None = Field(
+    advertisement_campaign_id: UUID | None = Field(
         None,
         description="The ID of the enabled advertisement campaign for this benefit grant.",
     )
@@ -1,13 +1,20 @@
-from collections.abc import Sequence
-from typing import Any, Literal, TypeVar, Unpack, overload
+import asyncio
+import contextlib
+from collections.abc import Callable, Sequence
+from typing import Any, Literal, TypeAlias, TypeVar, Unpack, overload
 from uuid import UUID
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import joinedload
 
-from polar.benefit.benefits import BenefitPreconditionError, get_benefit_service
+from polar.benefit.benefits import (
+    BenefitPreconditionError,
+    BenefitRetriableError,
+    get_benefit_service,
+)
 from polar.benefit.schemas import BenefitGrantWebhook
+from polar.config import settings
 from polar.eventstream.service import publish as eventstream_publish
 from polar.exceptions import PolarError
 from polar.kit.pagination import PaginationParams, paginate
@@ -41,12 +48,26 @@ from polar.webhook.webhooks import (
 )
 from polar.worker import enqueue_job
 
+from . import benefit_grant_updates
 from .benefit_grant_scope import resolve_scope, scope_to_args
 
 log: Logger = structlog.get_logger()
 
 BG = TypeVar("BG", bound=BenefitGrant)
 
+SessionFactory: TypeAlias = Callable[
+    [], contextlib.AbstractAsyncContextManager[AsyncSession]
+]
+BenefitGrantAction: TypeAlias = Literal["grant", "revoke"]
+
+
+def _get_update_grants_job_id(run_id: UUID, cursor: UUID | None) -> str:
+    """
+    Identify the job updating the chunk after `cursor`, so a given chunk of a run
+    is enqueued at most once.
+    """
+    return f"benefit.update_grants:{run_id}:{cursor if cursor is not None else 'start'}"
+
 
 class BenefitGrantError(PolarError): ...
 
@@ -160,7 +181,21 @@ class BenefitGrantService(ResourceServiceReader[BenefitGrant]):
         log.info("Granting benefit", benefit_id=str(benefit.id), user_id=str(user.id))
 
         grant = await self.get_by_benefit_and_scope(session, user, benefit, **scope)
+        return await self._grant_benefit(
+            session, redis, user, benefit, grant, attempt=attempt, **scope
+        )
 
+    async def _grant_benefit(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        user: User,
+        benefit: Benefit,
+        grant: BenefitGrant | None,
+        *,
+        attempt: int = 1,
+        **scope: Unpack[BenefitGrantScope],
+    ) -> BenefitGrant:
         if grant is None:
             grant = BenefitGrant(user=user, benefit=benefit, properties={}, **scope)
             session.add(grant)
@@ -221,7 +256,21 @@ class BenefitGrantService(ResourceServiceReader[BenefitGrant]):
         log.info("Revoking benefit", benefit_id=str(benefit.id), user_id=str(user.id))
 
         grant = await self.get_by_benefit_and_scope(session, user, benefit, **scope)
+        return await self._revoke_benefit(
+            session, redis, user, benefit, grant, attempt=attempt, **scope
+        )
 
+    async def _revoke_benefit(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        user: User,
+        benefit: Benefit,
+        grant: BenefitGrant | None,
+        *,
+        attempt: int = 1,
+        **scope: Unpack[BenefitGrantScope],
+    ) -> BenefitGrant:
         if grant is None:
             grant = BenefitGrant(user=user, benefit=benefit, properties={}, **scope)
             session.add(grant)
@@ -274,33 +323,121 @@ class BenefitGrantService(ResourceServiceReader[BenefitGrant]):
         )
         return grant
 
-    async def enqueue_benefits_grants(
+    async def process_benefits_grants(
         self,
         session: AsyncSession,
-        task: Literal["grant", "revoke"],
+        sessionmaker: SessionFactory,
+        redis: Redis,
+        task: BenefitGrantAction,
         user: User,
         product: Product,
+        *,
+        attempt: int = 1,
+        max_concurrency: int | None = None,
         **scope: Unpack[BenefitGrantScope],
     ) -> None:
-        # Get granted benefits that are not part of this product.
-        # It happens if the subscription has been upgraded/downgraded.
-        outdated_grants = await self._get_outdated_grants(session, product, **scope)
-
-        for benefit in product.benefits:
-            enqueue_job(
-                f"benefit.{task}",
-                user_id=user.id,
-                benefit_id=benefit.id,
-                **scope_to_args(scope),
+        """
+        Grant or revoke all the benefits of a product to a user.
+
+        Granted benefits that are not part of the product anymore are revoked.
+        It happens if the subscription has been upgraded/downgraded.
+
+        Each benefit is processed concurrently, in its own session from
+        `sessionmaker`. When one fails, only this benefit is retried,
+        through its own `benefit.grant` or `benefit.revoke` job.
+
+        The transaction of `session` is committed before: its connection isn't
+        held while the benefits call slow external APIs.
+        """
+        steps = await self._get_benefits_grants_steps(
+            session, task, user, product, **scope
+        )
+        await session.commit()
+
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.BENEFIT_GRANTS_CONCURRENCY
+        )
+
+        async def _process_step(
+            action: BenefitGrantAction, benefit: Benefit, grant: BenefitGrant | None
+        ) -> None:
+            async with semaphore:
+                try:
+                    async with sessionmaker() as benefit_session:
+                        await self._process_benefit_grant(
+                            benefit_session,
+                            redis,
+                            action,
+                            user,
+                            benefit,
+                            grant,
+                            attempt=attempt,
+                            **scope,
+                        )
+                except BenefitRetriableError as e:
+                    log.warning(
+                        "Retriable error encountered while processing benefit",
+                        action=action,
+                        error=str(e),
+                        defer_seconds=e.defer_seconds,
+                        benefit_id=str(benefit.id),
+                        user_id=str(user.id),
+                    )
+                    enqueue_job(
+                        f"benefit.{action}",
+                        user_id=user.id,
+                        benefit_id=benefit.id,
+                        _defer_by=e.defer_seconds,
+                        **scope_to_args(scope),
+                    )
+                except Exception:
+                    log.exception(
+                        "Error encountered while processing benefit",
+                        action=action,
+                        benefit_id=str(benefit.id),
+                        user_id=str(user.id),
+                    )
+                    enqueue_job(
+                        f"benefit.{action}",
+                        user_id=user.id,
+                        benefit_id=benefit.id,
+                        **scope_to_args(scope),
+                    )
+
+        await asyncio.gather(*(_process_step(*step) for step in steps))
+
+    async def _process_benefit_grant(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        action: BenefitGrantAction,
+        user: User,
+        benefit: Benefit,
+        grant: BenefitGrant | None,
+        *,
+        attempt: int = 1,
+        **scope: Unpack[BenefitGrantScope],
+    ) -> BenefitGrant:
+        # Objects were loaded by the orchestrator session: attach them to this one
+        user = await session.merge(user, load=False)
+        benefit = await session.merge(benefit, load=False)
+        if grant is not None:
+            grant = await session.merge(grant, load=False)
+        session_scope: BenefitGrantScope = {}
+        if subscription := scope.get("subscription"):
+            session_scope["subscription"] = await session.merge(
+                subscription, load=False
             )
+        if order := scope.get("order"):
+            session_scope["order"] = await session.merge(order, load=False)
 
-        for outdated_grant in outdated_grants:
-            enqueue_job(
-                "benefit.revoke",
-                user_id=user.id,
-                benefit_id=outdated_grant.benefit_id,
-                **scope_to_args(scope),
+        if action == "grant":
+            return await self._grant_benefit(
+                session, redis, user, benefit, grant, attempt=attempt, **session_scope
             )
+        return await self._revoke_benefit(
+            session, redis, user, benefit, grant, attempt=attempt, **session_scope
+        )
 
     async def enqueue_benefit_grant_updates(
         self,
@@ -309,13 +446,191 @@ class BenefitGrantService(ResourceServiceReader[BenefitGrant]):
         benefit: Benefit,
         previous_properties: BenefitProperties,
     ) -> None:
+        """
+        Start the update of all the granted grants of a benefit.
+
+        Grants are updated in chunks by a chain of `benefit.update_grants` jobs,
+        whose progress is tracked in Redis. Starting a new run stops the
+        previous one, if any.
+        """
         benefit_service = get_benefit_service(benefit.type, session, redis)
         if not await benefit_service.requires_update(benefit, previous_properties):
             return
 
-        grants = await self._get_granted_by_benefit(session, benefit)
-        for grant in grants:
-            enqueue_job("benefit.update", benefit_grant_id=grant.id)
+        count_statement = select(func.count(BenefitGrant.id)).where(
+            BenefitGrant.benefit_id == benefit.id,
+            BenefitGrant.is_granted.is_(True),
+            BenefitGrant.deleted_at.is_(None),
+        )
+        total = (await session.execute(count_statement)).scalar_one()
+        if total == 0:
+            return
+
+        progress = await benefit_grant_updates.start_progress(redis, benefit.id, total)
+        enqueue_job(
+            "benefit.update_grants",
+            benefit_id=benefit.id,
+            run_id=progress.run_id,
+            _job_id=_get_update_grants_job_id(progress.run_id, progress.cursor),
+        )
+
+    async def update_benefit_grants_chunk(
+        self,
+        session: AsyncSession,
+        sessionmaker: SessionFactory,
+        redis: Redis,
+        benefit: Benefit,
+        run_id: UUID,
+        *,
+        max_concurrency: int | None = None,
+    ) -> None:
+        """
+        Update the next chunk of granted grants of a benefit.
+
+        Grants are walked by ID from the cursor saved in the progress, and
+        updated concurrently, each in its own session from `sessionmaker`.
+        A grant that fails is handed to its own `benefit.update` job.
+        The next chunk is then enqueued, unless the run has been paused
+        or superseded by a newer one.
+        """
+        progress = await benefit_grant_updates.get_progress(redis, benefit.id)
+        if (
+            progress is None
+            or progress.run_id != run_id
+            or progress.status
+            != benefit_grant_updates.BenefitGrantUpdatesStatus.running
+        ):
+            log.info(
+                "Benefit grants update run is not active, skipping",
+                benefit_id=str(benefit.id),
+                run_id=str(run_id),
+            )
+            return
+
+        statement = (
+            select(BenefitGrant)
+            .where(
+                BenefitGrant.benefit_id == benefit.id,
+                BenefitGrant.is_granted.is_(True),
+                BenefitGrant.deleted_at.is_(None),
+            )
+            .order_by(BenefitGrant.id.asc())
+            .limit(benefit_grant_updates.CHUNK_SIZE)
+            .options(joinedload(BenefitGrant.benefit).joinedload(Benefit.organization))
+        )
+        if progress.cursor is not None:
+            statement = statement.where(BenefitGrant.id > progress.cursor)
+        grants = (await session.execute(statement)).scalars().all()
+
+        limits = benefit_grant_updates.get_limits(benefit.type)
+        semaphore = asyncio.Semaphore(max_concurrency or limits.concurrency)
+
+        async def _update_grant(grant: BenefitGrant) -> bool:
+            async with semaphore:
+                try:
+                    async with sessionmaker() as grant_session:
+                        await self.update_benefit_grant(
+                            grant_session,
+                            redis,
+                            await grant_session.merge(grant, load=False),
+                        )
+                except BenefitRetriableError as e:
+                    log.warning(
+                        "Retriable error encountered while updating benefit",
+                        error=str(e),
+                        defer_seconds=e.defer_seconds,
+                        benefit_grant_id=str(grant.id),
+                    )
+                    enqueue_job(
+                        "benefit.update",
+                        benefit_grant_id=grant.id,
+                        _defer_by=e.defer_seconds,
+                    )
+                    return False
+                except Exception:
+                    log.exception(
+                        "Error encountered while updating benefit",
+                        benefit_grant_id=str(grant.id),
+                    )
+                    enqueue_job("benefit.update", benefit_grant_id=grant.id)
+                    return False
+                return True
+
+        results = await asyncio.gather(*(_update_grant(grant) for grant in grants))
+
+        if grants:
+            await benefit_grant_updates.record_chunk(
+                redis,
+                benefit.id,
+                cursor=grants[-1].id,
+                processed=len(grants),
+                retried=results.count(False),
+            )
+
+        if len(grants) < benefit_grant_updates.CHUNK_SIZE:
+            # Don't complete a run that has been paused or superseded meanwhile
+            progress = await benefit_grant_updates.get_progress(redis, benefit.id)
+            if (
+                progress is not None
+                and progress.run_id == run_id
+                and progress.status
+                == benefit_grant_updates.BenefitGrantUpdatesStatus.running
+            ):
+                await benefit_grant_updates.set_status(
+                    redis,
+                    benefit.id,
+                    benefit_grant_updates.BenefitGrantUpdatesStatus.completed,
+                )
+            return
+
+        enqueue_job(
+            "benefit.update_grants",
+            benefit_id=benefit.id,
+            run_id=run_id,
+            _job_id=_get_update_grants_job_id(run_id, grants[-1].id),
+            _defer_by=limits.chunk_delay,
+        )
+
+    async def pause_benefit_grant_updates(
+        self, redis: Redis, benefit_id: UUID
+    ) -> benefit_grant_updates.BenefitGrantUpdatesProgress | None:
+        """Pause the running update of a benefit grants, after the current chunk."""
+        progress = await benefit_grant_updates.get_progress(redis, benefit_id)
+        if (
+            progress is None
+            or progress.status
+            != benefit_grant_updates.BenefitGrantUpdatesStatus.running
+        ):
+            return progress
+
+        await benefit_grant_updates.set_status(
+            redis, benefit_id, benefit_grant_updates.BenefitGrantUpdatesStatus.paused
+        )
+        return await benefit_grant_updates.get_progress(redis, benefit_id)
+
+    async def resume_benefit_grant_updates(
+        self, redis: Redis, benefit_id: UUID
+    ) -> benefit_grant_updates.BenefitGrantUpdatesProgress | None:
+        """Resume a paused update of a benefit grants, from its saved cursor."""
+        progress = await benefit_grant_updates.get_progress(redis, benefit_id)
+        if (
+            progress is None
+            or progress.status != benefit_grant_updates.BenefitGrantUpdatesStatus.paused
+        ):
+            return progress
+
+        await benefit_grant_updates.set_status(
+            redis, benefit_id, benefit_grant_updates.BenefitGrantUpdatesStatus.running
+        )
+        # Same job ID as the chunk job the pause may have left pending,
+        # so the same chunk isn't processed twice
+        enqueue_job(
+            "benefit.update_grants",
+            benefit_id=benefit_id,
+            run_id=progress.run_id,
+            _job_id=_get_update_grants_job_id(progress.run_id, progress.cursor),
+        )
+        return await benefit_grant_updates.get_progress(redis, benefit_id)
 
     async def update_benefit_grant(
         self,
@@ -548,27 +863,54 @@ class BenefitGrantService(ResourceServiceReader[BenefitGrant]):
         result = await session.execute(statement)
         return result.scalars().all()
 
-    async def _get_outdated_grants(
+    async def _get_benefits_grants_steps(
         self,
         session: AsyncSession,
+        task: BenefitGrantAction,
+        user: User,
         product: Product,
         **scope: Unpack[BenefitGrantScope],
-    ) -> Sequence[BenefitGrant]:
-        product_benefits_statement = (
-            select(Benefit.id)
-            .join(ProductBenefit)
-            .where(ProductBenefit.product_id == product.id)
+    ) -> Sequence[tuple[BenefitGrantAction, Benefit, BenefitGrant | None]]:
+        """
+        Load the benefits to grant or revoke along with their existing grant,
+        in a single query.
+        """
+        product_benefits_statement = select(ProductBenefit.benefit_id).where(
+            ProductBenefit.product_id == product.id
         )
-
-        statement = select(BenefitGrant).where(
+        granted_benefits_statement = select(BenefitGrant.benefit_id).where(
+            BenefitGrant.user_id == user.id,
             BenefitGrant.scope == scope,
-            BenefitGrant.benefit_id.not_in(product_benefits_statement),
             BenefitGrant.is_granted.is_(True),
             BenefitGrant.deleted_at.is_(None),
         )
 
+        is_product_benefit = Benefit.id.in_(product_benefits_statement)
+        statement = (
+            select(Benefit, BenefitGrant, is_product_benefit)
+            .join(
+                BenefitGrant,
+                onclause=and_(
+                    BenefitGrant.benefit_id == Benefit.id,
+                    BenefitGrant.user_id == user.id,
+                    BenefitGrant.scope == scope,
+                    BenefitGrant.deleted_at.is_(None),
+                ),
+                isouter=True,
+            )
+            .where(
+                Benefit.deleted_at.is_(None),
+                or_(is_product_benefit, Benefit.id.in_(granted_benefits_statement)),
+            )
+            .order_by(Benefit.created_at)
+            .options(joinedload(Benefit.organization))
+        )
+
         result = await session.execute(statement)
-        return result.scalars().all()
+        return [
+            (task if in_product else "revoke", benefit, grant)
+            for benefit, grant, in_product in result.unique().tuples().all()
+        ]
 
     async def _send_webhook(
         self,
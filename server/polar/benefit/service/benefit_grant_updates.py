@@ -0,0 +1,147 @@
+"""
+Progress of the bulk updates of a benefit grants, stored in Redis.
+
+When the properties of a benefit change, all its granted grants are updated
+by a chain of `benefit.update_grants` jobs, one chunk of grants at a time.
+Each benefit has at most one update run: a new change of the benefit starts
+a new run, making the previous one stop at its next chunk.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from polar.kit.utils import utc_now
+from polar.models.benefit import BenefitType
+from polar.redis import Redis
+
+PROGRESS_TTL = timedelta(days=7)
+
+CHUNK_SIZE = 100
+
+
+@dataclass(frozen=True)
+class BenefitGrantUpdatesLimits:
+    concurrency: int
+    "Number of grants updated at the same time."
+    chunk_delay: timedelta
+    "Delay between two chunks, to stay under the integration rate limits."
+
+
+_DEFAULT_LIMITS = BenefitGrantUpdatesLimits(concurrency=5, chunk_delay=timedelta())
+_LIMITS: dict[BenefitType, BenefitGrantUpdatesLimits] = {
+    BenefitType.discord: BenefitGrantUpdatesLimits(
+        concurrency=2, chunk_delay=timedelta(seconds=5)
+    ),
+    BenefitType.github_repository: BenefitGrantUpdatesLimits(
+        concurrency=2, chunk_delay=timedelta(seconds=5)
+    ),
+    BenefitType.license_keys: BenefitGrantUpdatesLimits(
+        concurrency=10, chunk_delay=timedelta()
+    ),
+    BenefitType.downloadables: BenefitGrantUpdatesLimits(
+        concurrency=10, chunk_delay=timedelta()
+    ),
+}
+
+
+def get_limits(benefit_type: BenefitType) -> BenefitGrantUpdatesLimits:
+    return _LIMITS.get(benefit_type, _DEFAULT_LIMITS)
+
+
+class BenefitGrantUpdatesStatus(StrEnum):
+    running = "running"
+    paused = "paused"
+    completed = "completed"
+
+
+class BenefitGrantUpdatesProgress(BaseModel):
+    run_id: uuid.UUID
+    benefit_id: uuid.UUID
+    status: BenefitGrantUpdatesStatus
+    total: int
+    processed: int = 0
+    retried: int = 0
+    "Grants that failed and were handed to their own `benefit.update` job."
+    cursor: uuid.UUID | None = None
+    "ID of the last processed grant."
+    started_at: datetime
+    updated_at: datetime
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _get_key(benefit_id: uuid.UUID) -> str:
+    return f"benefit_grant_updates:{benefit_id}"
+
+
+async def start_progress(
+    redis: Redis, benefit_id: uuid.UUID, total: int
+) -> BenefitGrantUpdatesProgress:
+    now = utc_now()
+    progress = BenefitGrantUpdatesProgress(
+        run_id=uuid.uuid4(),
+        benefit_id=benefit_id,
+        status=BenefitGrantUpdatesStatus.running,
+        total=total,
+        started_at=now,
+        updated_at=now,
+    )
+    key = _get_key(benefit_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.hset(
+            key,
+            mapping={
+                k: str(v)
+                for k, v in progress.model_dump(mode="json").items()
+                if v is not None
+            },
+        )
+        pipe.expire(key, PROGRESS_TTL)
+        await pipe.execute()
+    return progress
+
+
+async def get_progress(
+    redis: Redis, benefit_id: uuid.UUID
+) -> BenefitGrantUpdatesProgress | None:
+    values = await redis.hgetall(_get_key(benefit_id))
+    if not values:
+        return None
+    return BenefitGrantUpdatesProgress.model_validate(
+        {_decode(field): _decode(value) for field, value in values.items()}
+    )
+
+
+async def record_chunk(
+    redis: Redis,
+    benefit_id: uuid.UUID,
+    *,
+    cursor: uuid.UUID,
+    processed: int,
+    retried: int,
+) -> None:
+    key = _get_key(benefit_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(
+            key, mapping={"cursor": str(cursor), "updated_at": utc_now().isoformat()}
+        )
+        pipe.hincrby(key, "processed", processed)
+        pipe.hincrby(key, "retried", retried)
+        pipe.expire(key, PROGRESS_TTL)
+        await pipe.execute()
+
+
+async def set_status(
+    redis: Redis, benefit_id: uuid.UUID, status: BenefitGrantUpdatesStatus
+) -> None:
+    await redis.hset(
+        _get_key(benefit_id),
+        mapping={"status": status.value, "updated_at": utc_now().isoformat()},
+    )
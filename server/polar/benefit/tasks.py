@@ -1,3 +1,4 @@
+import functools
 import uuid
 from typing import Literal, Unpack
 
@@ -84,8 +85,15 @@ async def enqueue_benefits_grants(
 
         resolved_scope = await resolve_scope(session, scope)
 
-        await benefit_grant_service.enqueue_benefits_grants(
-            session, task, user, product, **resolved_scope
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            functools.partial(AsyncSessionMaker, ctx),
+            get_worker_redis(ctx),
+            task,
+            user,
+            product,
+            attempt=ctx["job_try"],
+            **resolved_scope,
         )
 
 
@@ -194,6 +202,29 @@ async def benefit_update(
             raise Retry(e.defer_seconds) from e
 
 
+# Don't keep the result: a paused run is resumed with the job ID of the chunk
+# job that was pending, which must be reusable once that job has been skipped
+@task("benefit.update_grants", keep_result=0)
+async def benefit_update_grants(
+    ctx: JobContext,
+    benefit_id: uuid.UUID,
+    run_id: uuid.UUID,
+    polar_context: PolarWorkerContext,
+) -> None:
+    async with AsyncSessionMaker(ctx) as session:
+        benefit = await benefit_service.get(session, benefit_id, loaded=True)
+        if benefit is None:
+            raise BenefitDoesNotExist(benefit_id)
+
+        await benefit_grant_service.update_benefit_grants_chunk(
+            session,
+            functools.partial(AsyncSessionMaker, ctx),
+            get_worker_redis(ctx),
+            benefit,
+            run_id,
+        )
+
+
 @task("benefit.delete")
 async def benefit_delete(
     ctx: JobContext,
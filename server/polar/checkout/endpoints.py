@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query, Request
-from pydantic import UUID4
 from sse_starlette.sse import EventSourceResponse
 
 from polar.eventstream.endpoints import subscribe
@@ -15,7 +15,7 @@ from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
 from polar.postgres import AsyncSession, get_db_session
 from polar.product.schemas import ProductID
-from polar.redis import Redis, get_redis
+from polar.redis import Redis, get_redis_pubsub
 from polar.routing import APIRouter
 
 from . import auth, ip_geolocation, sorting
@@ -36,7 +36,7 @@ router = APIRouter(
 )
 
 
-CheckoutID = Annotated[UUID4, Path(description="The checkout session ID.")]
+CheckoutID = Annotated[UUID, Path(description="The checkout session ID.")]
 CheckoutClientSecret = Annotated[
     str, Path(description="The checkout session client secret.")
 ]
@@ -243,7 +243,7 @@ async def client_stream(
     request: Request,
     client_secret: CheckoutClientSecret,
     session: AsyncSession = Depends(get_db_session),
-    redis: Redis = Depends(get_redis),
+    redis: Redis = Depends(get_redis_pubsub),
 ) -> EventSourceResponse:
     checkout = await checkout_service.get_by_client_secret(session, client_secret)
 
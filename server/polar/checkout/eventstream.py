@@ -1,7 +1,8 @@
+from collections.abc import Sequence
 from enum import StrEnum
 from typing import Literal, TypedDict, overload
 
-from polar.eventstream.service import publish
+from polar.eventstream.service import Receivers, publish, publish_many
 from polar.models.checkout import CheckoutStatus
 
 
@@ -60,3 +61,16 @@ async def publish_checkout_event(
     return await publish(
         event, {**payload} if payload else {}, checkout_client_secret=client_secret
     )
+
+
+async def publish_checkouts_updated_event(
+    checkouts: Sequence[tuple[str, CheckoutStatus]],
+) -> None:
+    """Publish `checkout.updated` to many checkouts, given their client secret."""
+    await publish_many(
+        CheckoutEvent.updated,
+        [
+            (Receivers(checkout_client_secret=client_secret), {"status": status})
+            for client_secret, status in checkouts
+        ],
+    )
@@ -1,4 +1,6 @@
-from pydantic import UUID4, AnyHttpUrl, ConfigDict, Field
+from uuid import UUID
+
+from pydantic import AnyHttpUrl, ConfigDict, Field
 
 from polar.checkout.schemas import CheckoutProduct
 from polar.kit.schemas import EmailStrDNS, Schema
@@ -6,7 +8,7 @@ from polar.product.schemas import ProductPrice
 
 
 class CheckoutLegacyCreate(Schema):
-    product_price_id: UUID4 = Field(
+    product_price_id: UUID = Field(
         ...,
         description="ID of the product price to subscribe to.",
     )
@@ -25,7 +27,7 @@ class CheckoutLegacyCreate(Schema):
             "It'll be pre-filled on the checkout page."
         ),
     )
-    subscription_id: UUID4 | None = Field(
+    subscription_id: UUID | None = Field(
         default=None,
         description=(
             "ID of the subscription to update. "
@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import Annotated, Any, Literal
+from uuid import UUID
 
 from pydantic import (
-    UUID4,
     AliasChoices,
     Discriminator,
     Field,
@@ -114,7 +114,7 @@ class CheckoutCreateBase(CustomFieldDataInputMixin, MetadataInputMixin, Schema):
     payment_processor: Literal[PaymentProcessor.stripe] = Field(
         description="Payment processor to use. Currently only Stripe is supported."
     )
-    discount_id: UUID4 | None = Field(
+    discount_id: UUID | None = Field(
         default=None, description="ID of the discount to apply to the checkout."
     )
     allow_discount_codes: bool = Field(
@@ -126,7 +126,7 @@ class CheckoutCreateBase(CustomFieldDataInputMixin, MetadataInputMixin, Schema):
     customer_ip_address: CustomerIPAddress | None = None
     customer_billing_address: CustomerBillingAddress | None = None
     customer_tax_id: Annotated[str | None, EmptyStrToNoneValidator] = None
-    subscription_id: UUID4 | None = Field(
+    subscription_id: UUID | None = Field(
         default=None,
         description=(
             "ID of a subscription to upgrade. It must be on a free pricing. "
@@ -146,7 +146,7 @@ class CheckoutPriceCreate(CheckoutCreateBase):
     to the resulting order and/or subscription.
     """
 
-    product_price_id: UUID4 = Field(description="ID of the product price to checkout.")
+    product_price_id: UUID = Field(description="ID of the product price to checkout.")
 
 
 class CheckoutProductCreate(CheckoutCreateBase):
@@ -157,7 +157,7 @@ class CheckoutProductCreate(CheckoutCreateBase):
     to the resulting order and/or subscription.
     """
 
-    product_id: UUID4 = Field(
+    product_id: UUID = Field(
         description="ID of the product to checkout. First available price will be selected."
     )
 
@@ -171,10 +171,10 @@ CheckoutCreate = Annotated[
 class CheckoutCreatePublic(Schema):
     """Create a new checkout session from a client."""
 
-    product_price_id: UUID4 = Field(description="ID of the product price to checkout.")
+    product_price_id: UUID = Field(description="ID of the product price to checkout.")
     customer_email: CustomerEmail | None = None
     from_legacy_checkout_link: bool = False
-    subscription_id: UUID4 | None = Field(
+    subscription_id: UUID | None = Field(
         default=None,
         description=(
             "ID of a subscription to upgrade. It must be on a free pricing. "
@@ -185,7 +185,7 @@ class CheckoutCreatePublic(Schema):
 
 
 class CheckoutUpdateBase(OptionalCustomFieldDataInputMixin, Schema):
-    product_price_id: UUID4 | None = Field(
+    product_price_id: UUID | None = Field(
         default=None,
         description=(
             "ID of the product price to checkout. "
@@ -202,7 +202,7 @@ class CheckoutUpdateBase(OptionalCustomFieldDataInputMixin, Schema):
 class CheckoutUpdate(OptionalMetadataInputMixin, CheckoutUpdateBase):
     """Update an existing checkout session using an access token."""
 
-    discount_id: UUID4 | None = Field(
+    discount_id: UUID | None = Field(
         default=None, description="ID of the discount to apply to the checkout."
     )
     allow_discount_codes: bool | None = Field(
@@ -273,9 +273,9 @@ class CheckoutBase(CustomFieldDataOutputMixin, IDSchema, TimestampedSchema):
     total_amount: int | None = Field(
         description="Total amount to pay in cents, including discounts and after tax."
     )
-    product_id: UUID4 = Field(description="ID of the product to checkout.")
-    product_price_id: UUID4 = Field(description="ID of the product price to checkout.")
-    discount_id: UUID4 | None = Field(
+    product_id: UUID = Field(description="ID of the product to checkout.")
+    product_price_id: UUID = Field(description="ID of the product price to checkout.")
+    discount_id: UUID | None = Field(
         description="ID of the discount applied to the checkout."
     )
     allow_discount_codes: bool = Field(description=_allow_discount_codes_description)
@@ -307,7 +307,7 @@ class CheckoutBase(CustomFieldDataOutputMixin, IDSchema, TimestampedSchema):
         )
     )
 
-    customer_id: UUID4 | None
+    customer_id: UUID | None
     customer_name: CustomerName | None
     customer_email: CustomerEmail | None
     customer_ip_address: CustomerIPAddress | None
@@ -392,7 +392,7 @@ class Checkout(MetadataOutputMixin, CheckoutBase):
     product: CheckoutProduct
     product_price: ProductPrice
     discount: CheckoutDiscount | None
-    subscription_id: UUID4 | None
+    subscription_id: UUID | None
     attached_custom_fields: list[AttachedCustomField]
 
 
@@ -1,10 +1,11 @@
 import uuid
 from collections.abc import Sequence
+from datetime import UTC, datetime
 from typing import Any
 
 import stripe as stripe_lib
 import structlog
-from sqlalchemy import Select, UnaryExpression, asc, desc, select, update
+from sqlalchemy import Select, UnaryExpression, asc, desc, literal, select, update
 from sqlalchemy.orm import contains_eager, joinedload, selectinload
 
 from polar.auth.models import (
@@ -68,7 +69,11 @@ from polar.webhook.service import webhook as webhook_service
 from polar.worker import enqueue_job
 
 from . import ip_geolocation
-from .eventstream import CheckoutEvent, publish_checkout_event
+from .eventstream import (
+    CheckoutEvent,
+    publish_checkout_event,
+    publish_checkouts_updated_event,
+)
 from .sorting import CheckoutSortProperty
 from .tax import TaxCalculationError, calculate_tax
 
@@ -593,7 +598,7 @@ class CheckoutService(ResourceServiceReader[Checkout]):
         except TaxCalculationError:
             pass
 
-        await self._after_checkout_updated(session, checkout)
+        await self._after_checkout_updated(session, checkout, debounce=True)
         return checkout
 
     async def confirm(
@@ -1019,17 +1024,43 @@ class CheckoutService(ResourceServiceReader[Checkout]):
         result = await session.execute(statement)
         return result.unique().scalar_one_or_none()
 
-    async def expire_open_checkouts(self, session: AsyncSession) -> None:
-        statement = (
-            update(Checkout)
+    async def expire_open_checkouts(
+        self, session: AsyncSession, *, batch_size: int | None = None
+    ) -> int:
+        """
+        Expire a batch of open checkouts past their expiration date.
+
+        Checkouts are picked through the partial index on open checkouts, and
+        locked with `SKIP LOCKED`: one being updated concurrently is left to
+        the next batch. Returns the number of expired checkouts, so the caller
+        can commit and run another batch until it's lower than `batch_size`.
+        """
+        batch_size = batch_size or settings.CHECKOUT_EXPIRY_BATCH_SIZE
+        expired_ids = (
+            select(Checkout.id)
             .where(
+                # Inlined, so the planner can match the partial index predicate
+                Checkout.status == literal(CheckoutStatus.open, literal_execute=True),
                 Checkout.deleted_at.is_(None),
                 Checkout.expires_at <= utc_now(),
-                Checkout.status == CheckoutStatus.open,
             )
+            .order_by(Checkout.expires_at.asc())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(Checkout)
+            .where(Checkout.id.in_(expired_ids.scalar_subquery()))
             .values(status=CheckoutStatus.expired)
+            .returning(Checkout.client_secret, Checkout.status)
+            .execution_options(synchronize_session="fetch")
         )
-        await session.execute(statement)
+        result = await session.execute(statement)
+        expired = result.tuples().all()
+
+        await publish_checkouts_updated_event(expired)
+
+        return len(expired)
 
     async def _get_validated_price(
         self,
@@ -1558,12 +1589,44 @@ class CheckoutService(ResourceServiceReader[Checkout]):
             session, organization, (WebhookEventType.checkout_created, checkout)
         )
 
+    async def send_updated_webhook(
+        self, session: AsyncSession, checkout_id: uuid.UUID
+    ) -> None:
+        checkout = await self._get_eager_loaded_checkout(session, checkout_id)
+        if checkout is None:
+            return
+        await self._send_updated_webhook(session, checkout)
+
     async def _after_checkout_updated(
-        self, session: AsyncSession, checkout: Checkout
+        self, session: AsyncSession, checkout: Checkout, *, debounce: bool = False
     ) -> None:
+        """
+        Notify the checkout page and the webhooks of a checkout update.
+
+        With `debounce`, the webhook is deferred to the end of a short window,
+        so rapid edits, like a customer filling the form, collapse into a single
+        `checkout.updated` webhook carrying the latest state.
+        """
         await publish_checkout_event(
             checkout.client_secret, CheckoutEvent.updated, {"status": checkout.status}
         )
+
+        if not debounce:
+            await self._send_updated_webhook(session, checkout)
+            return
+
+        window = settings.CHECKOUT_UPDATED_WEBHOOK_DEBOUNCE_SECONDS
+        window_end = (int(utc_now().timestamp()) // window + 1) * window
+        enqueue_job(
+            "checkout.send_updated_webhook",
+            checkout_id=checkout.id,
+            _job_id=f"checkout.send_updated_webhook:{checkout.id}:{window_end}",
+            _defer_until=datetime.fromtimestamp(window_end, UTC),
+        )
+
+    async def _send_updated_webhook(
+        self, session: AsyncSession, checkout: Checkout
+    ) -> None:
         organization = await organization_service.get(
             session, checkout.product.organization_id
         )
@@ -1,5 +1,6 @@
 import uuid
 
+from polar.config import settings
 from polar.exceptions import PolarTaskError
 from polar.worker import (
     AsyncSessionMaker,
@@ -23,10 +24,27 @@ async def handle_free_success(
         await checkout_service.handle_free_success(session, checkout_id)
 
 
+@task("checkout.send_updated_webhook", keep_result=0)
+async def send_updated_webhook(
+    ctx: JobContext, checkout_id: uuid.UUID, polar_context: PolarWorkerContext
+) -> None:
+    async with AsyncSessionMaker(ctx) as session:
+        await checkout_service.send_updated_webhook(session, checkout_id)
+
+
 @task(
     "checkout.expire_open_checkouts",
-    cron_trigger=CronTrigger.from_crontab("0,15,30,45 * * * *"),
+    cron_trigger=CronTrigger(
+        minute=f"*/{settings.CHECKOUT_EXPIRY_SWEEP_INTERVAL_MINUTES}"
+    ),
 )
 async def expire_open_checkouts(ctx: JobContext) -> None:
-    async with AsyncSessionMaker(ctx) as session:
-        await checkout_service.expire_open_checkouts(session)
+    # Commit each batch, so its locks are released before the next one
+    batch_size = settings.CHECKOUT_EXPIRY_BATCH_SIZE
+    while True:
+        async with AsyncSessionMaker(ctx) as session:
+            expired = await checkout_service.expire_open_checkouts(
+                session, batch_size=batch_size
+            )
+        if expired < batch_size:
+            break
@@ -1,9 +1,9 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query, Request
 from fastapi.datastructures import URL
 from fastapi.responses import RedirectResponse
-from pydantic import UUID4
 
 from polar.checkout import ip_geolocation
 from polar.checkout.service import checkout as checkout_service
@@ -25,7 +25,7 @@ from .service import checkout_link as checkout_link_service
 router = APIRouter(prefix="/checkout-links", tags=["checkout-links", APITag.documented])
 
 
-CheckoutLinkID = Annotated[UUID4, Path(description="The checkout link ID.")]
+CheckoutLinkID = Annotated[UUID, Path(description="The checkout link ID.")]
 CheckoutLinkClientSecret = Annotated[
     str, Path(description="The checkout link client secret.")
 ]
@@ -1,6 +1,7 @@
 from typing import Annotated, Literal
+from uuid import UUID
 
-from pydantic import UUID4, Field, HttpUrl, computed_field
+from pydantic import Field, HttpUrl, computed_field
 
 from polar.config import settings
 from polar.discount.schemas import DiscountMinimal
@@ -58,18 +59,16 @@ class CheckoutLinkCreateBase(MetadataInputMixin, Schema):
     allow_discount_codes: bool = Field(
         default=True, description=_allow_discount_codes_description
     )
-    discount_id: UUID4 | None = Field(
-        default=None, description=_discount_id_description
-    )
+    discount_id: UUID | None = Field(default=None, description=_discount_id_description)
     success_url: SuccessURL = None
 
 
 class CheckoutLinkPriceCreate(CheckoutLinkCreateBase):
-    product_price_id: UUID4 = Field(description="ID of the product price to checkout.")
+    product_price_id: UUID = Field(description="ID of the product price to checkout.")
 
 
 class CheckoutLinkProductCreate(CheckoutLinkCreateBase):
-    product_id: UUID4 = Field(
+    product_id: UUID = Field(
         description="ID of the product to checkout. First available price will be selected."
     )
 
@@ -87,10 +86,8 @@ class CheckoutLinkUpdate(OptionalMetadataInputMixin):
     allow_discount_codes: bool | None = Field(
         default=None, description=_allow_discount_codes_description
     )
-    product_price_id: UUID4 | None = None
-    discount_id: UUID4 | None = Field(
-        default=None, description=_discount_id_description
-    )
+    product_price_id: UUID | None = None
+    discount_id: UUID | None = Field(default=None, description=_discount_id_description)
     success_url: SuccessURL = None
 
 
@@ -108,11 +105,11 @@ class CheckoutLinkBase(MetadataOutputMixin, IDSchema, TimestampedSchema):
         description="Optional label to distinguish links internally"
     )
     allow_discount_codes: bool = Field(description=_allow_discount_codes_description)
-    product_id: UUID4 = Field(description="ID of the product to checkout.")
-    product_price_id: UUID4 | None = Field(
+    product_id: UUID = Field(description="ID of the product to checkout.")
+    product_price_id: UUID | None = Field(
         description="ID of the product price to checkout. First available price will be selected unless an explicit price ID is set."
     )
-    discount_id: UUID4 | None = Field(description=_discount_id_description)
+    discount_id: UUID | None = Field(description=_discount_id_description)
 
     @computed_field  # type: ignore[prop-decorator]
     @property
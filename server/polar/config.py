@@ -33,6 +33,13 @@ class Settings(BaseSettings):
     TESTING: bool = False
 
     WORKER_HEALTH_CHECK_INTERVAL: timedelta = timedelta(seconds=30)
+    # Serve the worker metrics on this port, plus the index of the worker process
+    WORKER_METRICS_PORT: int | None = None
+    WORKER_METRICS_HOST: str = "127.0.0.1"
+
+    # Defer the schemas only needed by some requests, like the OpenAPI schema,
+    # until their first use, to speed up the cold start of the API.
+    LAZY_STARTUP: bool = False
 
     SECRET: str = "super secret jwt secret"
     JWKS: JWKSFile = Field(default="./.jwks.json")
@@ -67,6 +74,11 @@ class Settings(BaseSettings):
 
     # Checkout
     CHECKOUT_TTL_SECONDS: int = 60 * 60  # 1 hour
+    CHECKOUT_UPDATED_WEBHOOK_DEBOUNCE_SECONDS: int = 5
+    # Expiry sweeper: how often it runs, i.e. the max delay before an open
+    # checkout is marked as expired, and how many checkouts it expires per batch
+    CHECKOUT_EXPIRY_SWEEP_INTERVAL_MINUTES: int = Field(default=15, ge=1, le=59)
+    CHECKOUT_EXPIRY_BATCH_SIZE: int = 500
     IP_GEOLOCATION_DATABASE_DIRECTORY_PATH: DirectoryPath = Path(__file__).parent.parent
     IP_GEOLOCATION_DATABASE_NAME: str = "ip-geolocation.mmdb"
     USE_TEST_CLOCK: bool = False
@@ -78,13 +90,36 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
     POSTGRES_DATABASE: str = "polar_development"
     DATABASE_POOL_SIZE: int = 5
-    DATABASE_SYNC_POOL_SIZE: int = 1  # Specific pool size for sync connection: since we only use it in OAuth2 router, don't waste resources.
     DATABASE_POOL_RECYCLE_SECONDS: int = 600  # 10 minutes
+    # Warn when an identical statement is repeated this many times
+    # within a request or a job, a likely N+1 pattern.
+    DATABASE_REPEATED_STATEMENTS_THRESHOLD: int = 10
+
+    # Read replica, used by the read-only endpoints when the host is set.
+    # Unset credentials and database fall back to the primary ones.
+    POSTGRES_READ_HOST: str | None = None
+    POSTGRES_READ_PORT: int | None = None
+    POSTGRES_READ_USER: str | None = None
+    POSTGRES_READ_PWD: str | None = None
+    POSTGRES_READ_DATABASE: str | None = None
+    DATABASE_READ_POOL_SIZE: int = 5
+    # Route to the primary when the replica is lagging more than this
+    DATABASE_READ_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_READ_LAG_CHECK_INTERVAL_SECONDS: float = 1.0
 
     # Redis
     REDIS_HOST: str = "127.0.0.1"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    # Connection pools are split by role, so a burst on one of them,
+    # like many SSE subscribers, can't starve the others.
+    REDIS_MAX_CONNECTIONS_CACHE: int = 20
+    REDIS_MAX_CONNECTIONS_LOCKS: int = 10
+    REDIS_MAX_CONNECTIONS_QUEUE: int = 10
+    # How long to wait for a free connection when a pool is exhausted
+    REDIS_POOL_TIMEOUT_SECONDS: int = 5
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    REDIS_SOCKET_KEEPALIVE: bool = True
 
     # Emails
     EMAIL_SENDER: EmailSender = EmailSender.logger
@@ -100,6 +135,9 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_ID: str = ""
     GITHUB_CLIENT_SECRET: str = ""
     GITHUB_POLAR_USER_ACCESS_TOKEN: str | None = None
+    # Number of calls per installation and rate limit window that the crawler
+    # leaves untouched, for webhooks and user-facing calls
+    GITHUB_CRAWL_RATE_LIMIT_RESERVE: int = 500
 
     # GitHub App for repository benefits
     GITHUB_REPOSITORY_BENEFITS_APP_NAMESPACE: str = ""
@@ -155,6 +193,8 @@ class Settings(BaseSettings):
     # Downloadable files
     S3_FILES_BUCKET_NAME: str = "polar-s3"
     S3_FILES_PUBLIC_BUCKET_NAME: str = "polar-s3-public"
+    # Private bucket for financial exports, like precomputed payout CSVs
+    S3_PAYOUTS_BUCKET_NAME: str = "polar-s3-payouts"
     S3_FILES_PRESIGN_TTL: int = 600  # 10 minutes
     S3_FILES_DOWNLOAD_SECRET: str = "supersecret"
     S3_FILES_DOWNLOAD_SALT: str = "saltysalty"
@@ -167,11 +207,15 @@ class Settings(BaseSettings):
     # Application behaviours
     API_PAGINATION_MAX_LIMIT: int = 100
 
+    # Number of benefits of a product granted or revoked at the same time
+    BENEFIT_GRANTS_CONCURRENCY: int = 3
+
     GITHUB_BADGE_EMBED: bool = False
     GITHUB_BADGE_EMBED_DEFAULT_LABEL: str = "Fund"
 
     ACCOUNT_PAYOUT_REVIEW_THRESHOLDS: list[int] = [0, 10000]
     ACCOUNT_PAYOUT_DELAY: timedelta = timedelta(days=1)
+    ACCOUNT_PAYOUT_CSV_PRECOMPUTE: bool = False
 
     PLATFORM_FEE_BASIS_POINTS: int = 400
     PLATFORM_FEE_FIXED: int = 40
@@ -235,6 +279,22 @@ class Settings(BaseSettings):
             )
         )
 
+    def get_postgres_read_dsn(
+        self, driver: Literal["asyncpg", "psycopg2"]
+    ) -> str | None:
+        if self.POSTGRES_READ_HOST is None:
+            return None
+        return str(
+            PostgresDsn.build(
+                scheme=f"postgresql+{driver}",
+                username=self.POSTGRES_READ_USER or self.POSTGRES_USER,
+                password=self.POSTGRES_READ_PWD or self.POSTGRES_PWD,
+                host=self.POSTGRES_READ_HOST,
+                port=self.POSTGRES_READ_PORT or self.POSTGRES_PORT,
+                path=self.POSTGRES_READ_DATABASE or self.POSTGRES_DATABASE,
+            )
+        )
+
     def is_environment(self, environments: set[Environment]) -> bool:
         return self.ENV in environments
 
@@ -0,0 +1,214 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Generic, TypeVar
+from uuid import UUID
+
+import structlog
+from redis.exceptions import ResponseError
+from sqlalchemy import TIMESTAMP, Integer, Uuid, column, update, values
+from sqlalchemy.orm.attributes import set_committed_value
+
+from polar.kit.db.models import RecordModel
+from polar.kit.utils import utc_now
+from polar.logging import Logger
+from polar.postgres import AsyncSession
+from polar.redis import Redis
+
+log: Logger = structlog.get_logger()
+
+ModelType = TypeVar("ModelType", bound=RecordModel)
+
+_TIMESTAMP_SUFFIX = ":at"
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class BufferedCounter(Generic[ModelType]):
+    """
+    Write-behind counter for hot integer columns.
+
+    Increments are accumulated in a Redis hash, keyed by row ID, using `HINCRBY`.
+    A cron task periodically calls `flush` to apply the buffered deltas to the
+    database in a single `UPDATE ... FROM (VALUES ...)` statement.
+
+    The persisted value is thus eventually consistent: use `get_value` or
+    `merge_pending` to read the persisted count plus the buffered delta.
+
+    Args:
+        name: Unique name of the counter, used to build the Redis key.
+        model: The model holding the counter column.
+        column: Name of the integer column to increment.
+        timestamp_column: Optional name of a timestamp column to set
+        to the time of the latest increment when flushing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: type[ModelType],
+        column: str,
+        *,
+        timestamp_column: str | None = None,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.column = column
+        self.timestamp_column = timestamp_column
+
+    @property
+    def key(self) -> str:
+        return f"polar:counter:{self.name}"
+
+    @property
+    def flushing_key(self) -> str:
+        return f"{self.key}:flushing"
+
+    async def increment(
+        self, redis: Redis, instance: ModelType, amount: int = 1
+    ) -> int:
+        """
+        Buffer an increment for the given instance.
+
+        The in-memory instance, as loaded from the database, is updated with the
+        merged value without marking it as dirty, so the caller can read
+        its own write.
+
+        Returns:
+            The merged value: persisted count plus buffered delta.
+        """
+        field = str(instance.id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(self.key, field, amount)
+            pipe.hget(self.flushing_key, field)
+            if self.timestamp_column is not None:
+                pipe.hset(
+                    self.key,
+                    f"{field}{_TIMESTAMP_SUFFIX}",
+                    str(utc_now().timestamp()),
+                )
+            results = await pipe.execute()
+
+        pending = int(results[0]) + int(results[1] or 0)
+        self._set_merged_value(instance, pending)
+        if self.timestamp_column is not None:
+            set_committed_value(instance, self.timestamp_column, utc_now())
+
+        return getattr(instance, self.column)
+
+    async def get_pending(self, redis: Redis, id: UUID) -> int:
+        """Return the buffered delta for the given ID, not flushed yet."""
+        pending = await self.get_pending_many(redis, [id])
+        return pending[id]
+
+    async def get_pending_many(
+        self, redis: Redis, ids: Sequence[UUID]
+    ) -> dict[UUID, int]:
+        """
+        Return the buffered deltas for the given IDs, not flushed yet.
+
+        Deltas currently being flushed are included, so readers don't see
+        the value going backwards during a flush.
+        """
+        if not ids:
+            return {}
+
+        fields = [str(id) for id in ids]
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(self.key, fields)
+            pipe.hmget(self.flushing_key, fields)
+            buffered, flushing = await pipe.execute()
+
+        return {
+            id: int(buffered[i] or 0) + int(flushing[i] or 0)
+            for i, id in enumerate(ids)
+        }
+
+    async def get_value(self, redis: Redis, instance: ModelType) -> int:
+        """Return the persisted count plus the buffered delta."""
+        pending = await self.get_pending(redis, instance.id)
+        return getattr(instance, self.column) + pending
+
+    async def merge_pending(self, redis: Redis, instances: Sequence[ModelType]) -> None:
+        """
+        Add the buffered deltas to the counter value of the given instances.
+
+        The instances are not marked as dirty, so the merged value
+        won't be written back to the database.
+        """
+        pending = await self.get_pending_many(
+            redis, [instance.id for instance in instances]
+        )
+        for instance in instances:
+            self._set_merged_value(instance, pending[instance.id])
+
+    async def flush(self, session: AsyncSession, redis: Redis) -> int:
+        """
+        Apply the buffered deltas to the database and commit.
+
+        The buffer is atomically renamed before being read, so increments
+        happening during the flush are kept for the next one. If a previous flush
+        crashed before clearing its buffer, it's retried first.
+
+        Returns:
+            The number of updated rows.
+        """
+        if not await redis.exists(self.flushing_key):
+            try:
+                await redis.rename(self.key, self.flushing_key)
+            except ResponseError:
+                # Nothing buffered since the last flush
+                return 0
+
+        buffer = {
+            _decode(field): _decode(value)
+            for field, value in (await redis.hgetall(self.flushing_key)).items()
+        }
+
+        rows: list[tuple[UUID, int, datetime | None]] = []
+        for field, value in buffer.items():
+            if field.endswith(_TIMESTAMP_SUFFIX):
+                continue
+            timestamp = buffer.get(f"{field}{_TIMESTAMP_SUFFIX}")
+            rows.append(
+                (
+                    UUID(field),
+                    int(value),
+                    datetime.fromtimestamp(float(timestamp), UTC)
+                    if timestamp is not None
+                    else None,
+                )
+            )
+
+        if rows:
+            deltas = values(
+                column("id", Uuid),
+                column("delta", Integer),
+                column("at", TIMESTAMP(timezone=True)),
+                name="deltas",
+            ).data(rows)
+            counter_column = getattr(self.model, self.column)
+            update_values = {self.column: counter_column + deltas.c.delta}
+            if self.timestamp_column is not None:
+                update_values[self.timestamp_column] = deltas.c.at
+            statement = (
+                update(self.model)
+                .where(self.model.id == deltas.c.id)
+                .values(update_values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.execute(statement)
+            await session.commit()
+
+        # Only clear the buffer once the deltas are committed.
+        # If we crash in-between, they'll be applied again on the next flush:
+        # we prefer over-counting to losing increments.
+        await redis.delete(self.flushing_key)
+
+        log.info("counter.flushed", name=self.name, rows=len(rows))
+        return len(rows)
+
+    def _set_merged_value(self, instance: ModelType, pending: int) -> None:
+        persisted = instance.__dict__.get(self.column) or 0
+        set_committed_value(instance, self.column, persisted + pending)
@@ -0,0 +1,26 @@
+from typing import Any
+
+from polar.advertisement.service import advertisement_campaign_views
+from polar.user.service.downloadables import downloadable_downloads
+from polar.worker import (
+    AsyncSessionMaker,
+    CronTrigger,
+    JobContext,
+    get_worker_redis,
+    task,
+)
+
+from .service import BufferedCounter
+
+COUNTERS: tuple[BufferedCounter[Any], ...] = (
+    advertisement_campaign_views,
+    downloadable_downloads,
+)
+
+
+@task("counter.flush", cron_trigger=CronTrigger(second=0))
+async def counter_flush(ctx: JobContext) -> None:
+    redis = get_worker_redis(ctx)
+    for counter in COUNTERS:
+        async with AsyncSessionMaker(ctx) as session:
+            await counter.flush(session, redis)
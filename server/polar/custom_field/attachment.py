@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, Annotated, Any
 from uuid import UUID
 
-from pydantic import UUID4, Field
+from pydantic import Field
 from sqlalchemy import Boolean, ForeignKey, Integer, Uuid, event
 from sqlalchemy.orm import (
     Mapped,
@@ -49,7 +49,7 @@ def track_attached_custom_field_mixin(_mapper: Mapper[Any], class_: type) -> Non
 class AttachedCustomField(Schema):
     """Schema of a custom field attached to a resource."""
 
-    custom_field_id: UUID4 = Field(description="ID of the custom field.")
+    custom_field_id: UUID = Field(description="ID of the custom field.")
     custom_field: CustomFieldSchema
     order: int = Field(description="Order of the custom field in the resource.")
     required: bool = Field(
@@ -60,7 +60,7 @@ class AttachedCustomField(Schema):
 class AttachedCustomFieldCreate(Schema):
     """Schema to attach a custom field to a resource."""
 
-    custom_field_id: UUID4 = Field(description="ID of the custom field to attach.")
+    custom_field_id: UUID = Field(description="ID of the custom field to attach.")
     required: bool = Field(
         description="Whether the value is required for this custom field."
     )
@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.authz.service import Authz
 from polar.exceptions import ResourceNotFound
@@ -22,7 +22,7 @@ from .service import custom_field as custom_field_service
 router = APIRouter(prefix="/custom-fields", tags=["custom-fields", APITag.documented])
 
 
-CustomFieldID = Annotated[UUID4, Path(description="The custom field ID.")]
+CustomFieldID = Annotated[UUID, Path(description="The custom field ID.")]
 CustomFieldNotFound = {
     "description": "Custom field not found.",
     "model": ResourceNotFound.schema(),
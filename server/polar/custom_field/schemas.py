@@ -14,6 +14,7 @@ from polar.kit.schemas import (
     Schema,
     SetSchemaReference,
     TimestampedSchema,
+    get_type_adapter_config,
 )
 from polar.models.custom_field import (
     CustomFieldCheckboxProperties,
@@ -216,4 +217,6 @@ CustomField = Annotated[
     ClassName("CustomField"),
 ]
 
-CustomFieldAdapter: TypeAdapter[CustomField] = TypeAdapter(CustomField)
+CustomFieldAdapter: TypeAdapter[CustomField] = TypeAdapter(
+    CustomField, config=get_type_adapter_config()
+)
@@ -1,5 +1,4 @@
 from collections.abc import Sequence
-from uuid import UUID
 
 from fastapi import Depends, HTTPException, Query
 
@@ -7,35 +6,23 @@ from polar.auth.dependencies import WebUser
 from polar.auth.models import AuthSubject
 from polar.authz.service import AccessType, Authz
 from polar.dashboard.schemas import (
-    Entry,
     IssueListResponse,
     IssueSortBy,
     PaginationResponse,
 )
+from polar.dashboard.service import dashboard_service
 from polar.exceptions import ResourceNotFound, Unauthorized
-from polar.external_organization.service import (
-    external_organization as external_organization_service,
-)
 from polar.funding.schemas import PledgesTypeSummaries
-from polar.issue.schemas import Issue as IssueSchema
 from polar.issue.service import issue
 from polar.models.organization import Organization
-from polar.models.pledge import PledgeState
 from polar.models.repository import Repository
 from polar.models.user import User
-from polar.models.user_organization import UserOrganization
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
 from polar.organization.service import organization as organization_service
-from polar.pledge.endpoints import to_schema as pledge_to_schema
-from polar.pledge.schemas import Pledge as PledgeSchema
-from polar.pledge.service import pledge as pledge_service
 from polar.postgres import AsyncSession, get_db_session
 from polar.repository.dependencies import OptionalRepositoryNameQuery
 from polar.repository.service import repository
-from polar.reward.endpoints import to_resource
-from polar.reward.schemas import Reward
-from polar.reward.service import reward_service
 from polar.routing import APIRouter
 from polar.user_organization.service import (
     user_organization as user_organization_service,
@@ -57,12 +44,10 @@ async def get_personal_dashboard(
     show_closed: bool = Query(default=False),
     page: int = Query(default=1),
     session: AsyncSession = Depends(get_db_session),
-    authz: Authz = Depends(Authz.authz),
 ) -> IssueListResponse:
     return await dashboard(
         session=session,
         auth_subject=auth_subject,
-        authz=authz,
         q=q,
         sort=sort,
         in_repos=[],
@@ -140,7 +125,6 @@ async def get_dashboard(
     return await dashboard(
         session=session,
         auth_subject=auth_subject,
-        authz=authz,
         in_repos=repositories,
         q=q,
         sort=sort,
@@ -155,7 +139,6 @@ async def get_dashboard(
 async def dashboard(
     session: AsyncSession,
     auth_subject: AuthSubject[User],
-    authz: Authz,
     in_repos: Sequence[Repository] = [],
     q: str | None = None,
     sort: IssueSortBy | None = None,
@@ -196,87 +179,12 @@ async def dashboard(
         offset=offset,
     )
 
-    pledge_statuses = list(
-        set(PledgeState.active_states()) | set([PledgeState.disputed])
-    )
-
-    # load user memberships
-    user_memberships: Sequence[UserOrganization] = []
-    user_memberships = await user_organization_service.list_by_user_id(session, user.id)
-
-    # add pledges to included
-    issue_pledges: dict[UUID, list[PledgeSchema]] = {}
-    for i in issues:
-        for pled in i.pledges:
-            # Filter out invalid pledges
-            if pled.state not in pledge_statuses:
-                continue
-
-            pledge_schema = await pledge_to_schema(session, user, pled)
-
-            # Add user-specific metadata
-            pledge_schema.authed_can_admin_sender = (
-                pledge_service.user_can_admin_sender_pledge(
-                    user, pled, user_memberships
-                )
-            )
-
-            external_organization = await external_organization_service.get_linked(
-                session, i.organization_id
-            )
-            pledge_schema.authed_can_admin_received = (
-                external_organization is not None
-                and any(
-                    m.organization_id == external_organization.organization_id
-                    for m in user_memberships
-                )
-            )
-
-            irefs = issue_pledges.get(i.id, [])
-            irefs.append(pledge_schema)
-            issue_pledges[i.id] = irefs
-
-    # get pledge summary (public data, vs pledges who are dependent on who you are)
-    pledge_summaries = await pledge_service.issues_pledge_type_summary(
-        session,
-        issues=issues,
+    data = await dashboard_service.get_issue_entries(
+        session, user, issues, include_rewards=for_org is not None
     )
-    issue_pledge_summaries: dict[UUID, PledgesTypeSummaries] = {}
-    for issue_id, summary in pledge_summaries.items():
-        issue_pledge_summaries[issue_id] = summary
-
-    # get rewards
-    issue_rewards: dict[UUID, list[Reward]] = {}
-    if for_org:
-        rewards = await reward_service.list(session, issue_ids=[i.id for i in issues])
-        for pledge, reward, transaction in rewards:
-            reward_resource = to_resource(
-                pledge,
-                reward,
-                transaction,
-                include_receiver_admin_fields=await authz.can(
-                    user, AccessType.write, pledge
-                ),
-            )
-
-            ir2 = issue_rewards.get(pledge.issue_id, [])
-            ir2.append(reward_resource)
-            issue_rewards[pledge.issue_id] = ir2
 
     next_page = page + 1 if total_issue_count > page * limit else None
 
-    data: list[Entry] = [
-        Entry(
-            id=i.id,
-            type="issue",
-            attributes=IssueSchema.model_validate(i),
-            rewards=issue_rewards.get(i.id, None),
-            pledges_summary=issue_pledge_summaries.get(i.id, None),
-            pledges=issue_pledges.get(i.id, None),
-        )
-        for i in issues
-    ]
-
     return IssueListResponse(
         data=data,
         pagination=PaginationResponse(
@@ -0,0 +1,141 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from polar.external_organization.service import (
+    external_organization as external_organization_service,
+)
+from polar.funding.schemas import PledgesTypeSummaries
+from polar.issue.schemas import Issue as IssueSchema
+from polar.models import Issue, Pledge, User
+from polar.models.pledge import PledgeState
+from polar.pledge.schemas import Pledge as PledgeSchema
+from polar.pledge.service import pledge as pledge_service
+from polar.postgres import AsyncSession
+from polar.reward.endpoints import to_resource
+from polar.reward.schemas import Reward
+from polar.reward.service import reward_service
+from polar.user_organization.service import (
+    user_organization as user_organization_service,
+)
+
+from .schemas import Entry
+
+
+class DashboardService:
+    async def get_issue_entries(
+        self,
+        session: AsyncSession,
+        user: User,
+        issues: Sequence[Issue],
+        *,
+        include_rewards: bool = False,
+    ) -> list[Entry]:
+        """
+        Build the dashboard entries for a list of issues, loaded with their pledges.
+
+        Everything that depends on the authenticated user is computed from data
+        loaded upfront by ID sets, so the number of queries doesn't depend on
+        the number of issues, pledges or rewards.
+        """
+        pledge_statuses = set(PledgeState.active_states()) | {PledgeState.disputed}
+
+        user_memberships = await user_organization_service.list_by_user_id(
+            session, user.id
+        )
+        member_organization_ids = {m.organization_id for m in user_memberships}
+
+        rewards = (
+            await reward_service.list(session, issue_ids=[i.id for i in issues])
+            if include_rewards and issues
+            else []
+        )
+
+        external_organization_ids = {i.organization_id for i in issues} | {
+            pledge.organization_id for pledge, _, _ in rewards
+        }
+        linked_organization_ids: dict[UUID, UUID] = {
+            external_organization.id: external_organization.organization_id
+            for external_organization in await external_organization_service.list_linked(
+                session, list(external_organization_ids)
+            )
+            if external_organization.organization_id is not None
+        }
+
+        def _is_member(organization_id: UUID | None) -> bool:
+            return (
+                organization_id is not None
+                and organization_id in member_organization_ids
+            )
+
+        def _is_sender(pledge: Pledge) -> bool:
+            return (
+                pledge.by_user_id == user.id
+                or _is_member(pledge.by_organization_id)
+                or _is_member(pledge.on_behalf_of_organization_id)
+            )
+
+        def _can_write_pledge(pledge: Pledge) -> bool:
+            if user.blocked_at is not None:
+                return False
+            return (
+                pledge.by_user_id == user.id
+                or _is_member(pledge.by_organization_id)
+                or _is_member(linked_organization_ids.get(pledge.organization_id))
+            )
+
+        issue_pledges: dict[UUID, list[PledgeSchema]] = {}
+        for i in issues:
+            for pledge in i.pledges:
+                # Filter out invalid pledges
+                if pledge.state not in pledge_statuses:
+                    continue
+
+                is_sender = _is_sender(pledge)
+                pledge_schema = PledgeSchema.from_db(
+                    pledge,
+                    include_receiver_admin_fields=_is_member(pledge.organization_id),
+                    include_sender_admin_fields=is_sender,
+                    include_sender_fields=is_sender,
+                )
+
+                # Add user-specific metadata
+                pledge_schema.authed_can_admin_sender = (
+                    pledge_service.user_can_admin_sender_pledge(
+                        user, pledge, user_memberships
+                    )
+                )
+                pledge_schema.authed_can_admin_received = _is_member(
+                    linked_organization_ids.get(i.organization_id)
+                )
+
+                issue_pledges.setdefault(i.id, []).append(pledge_schema)
+
+        # get pledge summary (public data, vs pledges who are dependent on who you are)
+        issue_pledge_summaries: dict[
+            UUID, PledgesTypeSummaries
+        ] = await pledge_service.issues_pledge_type_summary(session, issues=issues)
+
+        issue_rewards: dict[UUID, list[Reward]] = {}
+        for pledge, reward, transaction in rewards:
+            reward_resource = to_resource(
+                pledge,
+                reward,
+                transaction,
+                include_receiver_admin_fields=_can_write_pledge(pledge),
+            )
+            issue_rewards.setdefault(pledge.issue_id, []).append(reward_resource)
+
+        return [
+            Entry(
+                id=i.id,
+                type="issue",
+                attributes=IssueSchema.model_validate(i),
+                rewards=issue_rewards.get(i.id, None),
+                pledges_summary=issue_pledge_summaries.get(i.id, None),
+                pledges=issue_pledges.get(i.id, None),
+            )
+            for i in issues
+        ]
+
+
+dashboard_service = DashboardService()
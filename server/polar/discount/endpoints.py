@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Body, Depends, Path, Query
-from pydantic import UUID4
 
 from polar.authz.service import Authz
 from polar.exceptions import ResourceNotFound
@@ -27,7 +27,7 @@ router = APIRouter(
 )
 
 
-DiscountID = Annotated[UUID4, Path(description="The discount ID.")]
+DiscountID = Annotated[UUID, Path(description="The discount ID.")]
 DiscountNotFound = {
     "description": "Discount not found.",
     "model": ResourceNotFound.schema(),
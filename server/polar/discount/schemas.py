@@ -1,10 +1,10 @@
 import inspect
 from datetime import datetime
 from typing import Annotated, Any, Literal, Self
+from uuid import UUID
 
 from annotated_types import Ge
 from pydantic import (
-    UUID4,
     AfterValidator,
     Discriminator,
     Field,
@@ -26,6 +26,7 @@ from polar.kit.schemas import (
     Schema,
     SetSchemaReference,
     TimestampedSchema,
+    get_type_adapter_config,
 )
 from polar.models.discount import DiscountDuration, DiscountType
 from polar.organization.schemas import OrganizationID
@@ -161,7 +162,7 @@ BasisPoints = Annotated[
     ),
 ]
 ProductsList = Annotated[
-    list[UUID4],
+    list[UUID],
     Field(description="List of product IDs the discount can be applied to."),
 ]
 
@@ -436,4 +437,6 @@ Discount = Annotated[
     MergeJSONSchema({"title": "Discount"}),
     ClassName("Discount"),
 ]
-DiscountAdapter: TypeAdapter[Discount] = TypeAdapter(Discount)
+DiscountAdapter: TypeAdapter[Discount] = TypeAdapter(
+    Discount, config=get_type_adapter_config()
+)
@@ -1,5 +1,6 @@
+from uuid import UUID
+
 from fastapi import Depends, Request
-from pydantic import UUID4
 
 from polar.exceptions import ResourceNotFound, ResourceNotModified
 from polar.openapi import APITag
@@ -19,7 +20,7 @@ async def get_product(
     request: Request,
     auth_subject: auth.EmbedsRead,
     id: ProductID,
-    price_id: UUID4 | None = None,
+    price_id: UUID | None = None,
     session: AsyncSession = Depends(get_db_session),
 ) -> ProductEmbed:
     """Get product card."""
@@ -1,4 +1,4 @@
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.file.schemas import ProductMediaFileRead
 from polar.kit.schemas import Schema
@@ -6,11 +6,11 @@ from polar.product.schemas import BenefitList, ProductPrice
 
 
 class ProductEmbed(Schema):
-    id: UUID4
+    id: UUID
     name: str
     description: str | None
     is_recurring: bool
-    organization_id: UUID4
+    organization_id: UUID
     price: ProductPrice
     cover: ProductMediaFileRead | None
     benefits: BenefitList
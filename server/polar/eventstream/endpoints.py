@@ -4,7 +4,7 @@ from typing import Any
 
 import structlog
 from fastapi import Depends, Request
-from redis.exceptions import ConnectionError
+from redis.exceptions import ConnectionError, TimeoutError
 from sse_starlette.sse import EventSourceResponse
 from uvicorn import Server
 
@@ -13,7 +13,7 @@ from polar.exceptions import ResourceNotFound, Unauthorized
 from polar.organization.schemas import OrganizationID
 from polar.organization.service import organization as organization_service
 from polar.postgres import AsyncSession, get_db_session
-from polar.redis import Redis, get_redis
+from polar.redis import Redis, get_redis_pubsub
 from polar.routing import APIRouter
 from polar.user_organization.service import (
     user_organization as user_organization_service,
@@ -56,7 +56,12 @@ async def subscribe(
     request: Request,
 ) -> AsyncGenerator[Any, Any]:
     async with redis.pubsub() as pubsub:
-        await pubsub.subscribe(*channels)
+        try:
+            await pubsub.subscribe(*channels)
+        except (ConnectionError, TimeoutError) as e:
+            # End the stream: the client reconnects with its usual retry
+            log.warning("redis.pubsub.subscribe_failed", error=str(e))
+            return
 
         while not _uvicorn_should_exit():
             if await request.is_disconnected():
@@ -85,7 +90,7 @@ async def subscribe(
 async def user_stream(
     request: Request,
     auth_subject: WebUser,
-    redis: Redis = Depends(get_redis),
+    redis: Redis = Depends(get_redis_pubsub),
 ) -> EventSourceResponse:
     receivers = Receivers(user_id=auth_subject.subject.id)
     return EventSourceResponse(subscribe(redis, receivers.get_channels(), request))
@@ -96,7 +101,7 @@ async def org_stream(
     id: OrganizationID,
     request: Request,
     auth_subject: WebUser,
-    redis: Redis = Depends(get_redis),
+    redis: Redis = Depends(get_redis_pubsub),
     session: AsyncSession = Depends(get_db_session),
 ) -> EventSourceResponse:
     if not auth_subject.subject:
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Any
 from uuid import UUID
 
@@ -47,11 +48,17 @@ class Event(BaseModel):
 
 
 async def send_event(redis: Redis, event_json: str, channels: list[str]) -> None:
-    for channel in channels:
-        await redis.publish(channel, event_json)
-    log.debug(
-        "Published event to eventstream", event_json=event_json, channels=channels
-    )
+    await send_events(redis, [(event_json, channels)])
+
+
+async def send_events(redis: Redis, events: Sequence[tuple[str, list[str]]]) -> None:
+    # One round-trip for all the events and their channels
+    async with redis.pipeline(transaction=False) as pipe:
+        for event_json, channels in events:
+            for channel in channels:
+                pipe.publish(channel, event_json)
+        await pipe.execute()
+    log.debug("Published events to eventstream", count=len(events))
 
 
 async def publish(
@@ -84,6 +91,37 @@ async def publish(
         await send_event(redis, event, channels)
 
 
+async def publish_many(
+    key: str,
+    events: Sequence[tuple[Receivers, dict[str, Any]]],
+    *,
+    run_in_worker: bool = True,
+    redis: Redis | None = None,
+) -> None:
+    """
+    Publish the same kind of event to many receivers, each with its own payload.
+
+    In the worker, they are all sent by a single job.
+    """
+    if not events:
+        return
+
+    serialized_events = [
+        (
+            Event(id=generate_uuid(), key=key, payload=payload).model_dump_json(),
+            receivers.get_channels(),
+        )
+        for receivers, payload in events
+    ]
+
+    if run_in_worker:
+        enqueue_job("eventstream.publish_many", serialized_events)
+    else:
+        if redis is None:
+            raise RuntimeError("Redis instance is required when run_in_worker is False")
+        await send_events(redis, serialized_events)
+
+
 async def publish_members(
     session: AsyncSession,
     key: str,
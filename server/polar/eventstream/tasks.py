@@ -3,7 +3,7 @@ import structlog
 from polar.logging import Logger
 from polar.worker import JobContext, PolarWorkerContext, get_worker_redis, task
 
-from .service import send_event
+from .service import send_event, send_events
 
 log: Logger = structlog.get_logger()
 
@@ -16,3 +16,12 @@ async def eventstream_publish(
     polar_context: PolarWorkerContext,
 ) -> None:
     await send_event(get_worker_redis(ctx), event, channels)
+
+
+@task("eventstream.publish_many")
+async def eventstream_publish_many(
+    ctx: JobContext,
+    events: list[tuple[str, list[str]]],
+    polar_context: PolarWorkerContext,
+) -> None:
+    await send_events(get_worker_redis(ctx), events)
@@ -2,15 +2,13 @@ from datetime import datetime
 from typing import Annotated, Self
 from uuid import UUID
 
-from pydantic import UUID4
-
 from polar.enums import Platforms
 from polar.integrations.github import types
 from polar.kit.schemas import MergeJSONSchema, Schema, SelectorWidget
 from polar.organization.schemas import OrganizationID
 
 ExternalOrganizationID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The external organization ID."}),
     SelectorWidget("/v1/external-organizations", "External Organization", "name"),
 ]
@@ -83,6 +83,26 @@ class ExternalOrganizationService(ResourceServiceReader[ExternalOrganization]):
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def list_linked(
+        self, session: AsyncSession, ids: Sequence[uuid.UUID]
+    ) -> Sequence[ExternalOrganization]:
+        """List ExternalOrganizations by IDs that are linked to an Organization."""
+        if not ids:
+            return []
+
+        statement = (
+            select(ExternalOrganization)
+            .where(
+                ExternalOrganization.id.in_(ids),
+                ExternalOrganization.deleted_at.is_(None),
+                ExternalOrganization.organization_id.isnot(None),
+            )
+            .options(joinedload(ExternalOrganization.organization))
+        )
+
+        result = await session.execute(statement)
+        return result.scalars().all()
+
     def _get_readable_external_organization_statement(
         self, auth_subject: AuthSubject[Anonymous | User | Organization]
     ) -> Select[tuple[ExternalOrganization]]:
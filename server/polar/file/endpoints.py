@@ -1,7 +1,7 @@
 from typing import Annotated, TypeAlias
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted
@@ -28,7 +28,7 @@ from .service import file as file_service
 
 router = APIRouter(prefix="/files", tags=["files", APITag.documented])
 
-FileID = Annotated[UUID4, Path(description="The file ID.")]
+FileID = Annotated[UUID, Path(description="The file ID.")]
 FileNotFoundResponse = {
     "description": "File not found.",
     "model": FileNotFound.schema(),
@@ -37,9 +37,9 @@ FileNotFoundResponse = {
 
 # We want to name our endpoint `list` to offer a nice SDK
 # via our OpenAPI generator. However, mypy then asssumes we
-# refer to our endpoint if we use `list[UUID4]` for `ids`.
+# refer to our endpoint if we use `list[UUID]` for `ids`.
 # So we define a TypeAlias to circumvent that.
-ListOfFileIDs: TypeAlias = list[UUID4]
+ListOfFileIDs: TypeAlias = list[UUID]
 
 
 @router.get("/", summary="List Files", response_model=ListResource[FileRead])
@@ -180,7 +180,7 @@ async def update(
 )
 async def delete(
     auth_subject: auth.CreatorFilesWrite,
-    id: UUID4,
+    id: UUID,
     authz: Authz = Depends(Authz.authz),
     session: AsyncSession = Depends(get_db_session),
 ) -> None:
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import Annotated, Any, Literal, Self
+from uuid import UUID
 
-from pydantic import UUID4, Discriminator, Field, TypeAdapter, computed_field
+from pydantic import Discriminator, Field, TypeAdapter, computed_field
 
 from polar.integrations.aws.s3.schemas import (
     S3DownloadURL,
@@ -160,7 +161,7 @@ class FileDownload(S3FileDownload):
 
 
 class FileUpdate(Schema):
-    id: UUID4
+    id: UUID
     version: str | None
     checksum_etag: str
     last_modified_at: datetime
@@ -9,7 +9,8 @@ from polar.models import Repository
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
 from polar.organization.service import organization as organization_service
-from polar.postgres import AsyncSession, get_db_session
+from polar.postgres import AsyncSession, get_db_read_session, get_db_session
+from polar.redis import Redis, get_redis
 from polar.repository.dependencies import OptionalRepositoryNameQuery
 from polar.repository.service import repository as repository_service
 from polar.routing import APIRouter
@@ -32,7 +33,8 @@ async def search(
     badged: bool | None = Query(None),
     closed: bool | None = Query(None),
     sorting: ListFundingSorting = [ListFundingSortBy.newest],
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_read_session),
+    redis: Redis = Depends(get_redis),
 ) -> ListResource[IssueFunding]:
     organization = await organization_service.get(session, organization_id)
     if organization is None:
@@ -56,6 +58,7 @@ async def search(
         closed=closed,
         sorting=sorting,
         pagination=pagination,
+        redis=redis,
     )
 
     return ListResource.from_paginated_results(
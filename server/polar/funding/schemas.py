@@ -1,18 +1,11 @@
-from datetime import datetime
-from decimal import Decimal
 from typing import Self
 
 from polar.currency.schemas import CurrencyAmount
 from polar.issue.schemas import Issue
 from polar.kit.schemas import Schema
 from polar.models import Issue as IssueModel
-from polar.models.pledge import PledgeType
 from polar.pledge.schemas import Pledger
 
-FundingResultType = tuple[
-    IssueModel, Decimal, datetime | None, Decimal, Decimal, Decimal
-]
-
 
 # Public API
 class PledgesSummary(Schema):
@@ -26,6 +19,9 @@ class PledgesTypeSummaries(Schema):
     pay_directly: PledgesSummary
 
 
+FundingResultType = tuple[IssueModel, PledgesTypeSummaries]
+
+
 class IssueFunding(Schema):
     issue: Issue
     funding_goal: CurrencyAmount | None
@@ -34,34 +30,12 @@ class IssueFunding(Schema):
 
     @classmethod
     def from_list_by_result(cls, result: FundingResultType) -> Self:
-        (
-            issue,
-            total,
-            last_pledged_at,
-            pay_upfront_total,
-            pay_on_completion_total,
-            pay_directly_total,
-        ) = result
+        issue, pledges_summaries = result
 
-        pledgers: dict[PledgeType, list[Pledger]] = {
-            pledge_type: [] for pledge_type in PledgeType
-        }
-        for pledge in issue.pledges:
-            pledger = Pledger.from_pledge(pledge)
-            if pledger:
-                pledgers[pledge.type].append(pledger)
-
-        pay_upfront_summary = PledgesSummary(
-            total=CurrencyAmount(currency="USD", amount=int(pay_upfront_total)),
-            pledgers=pledgers[PledgeType.pay_upfront],
-        )
-        pay_on_completion_summary = PledgesSummary(
-            total=CurrencyAmount(currency="USD", amount=int(pay_on_completion_total)),
-            pledgers=pledgers[PledgeType.pay_on_completion],
-        )
-        pay_directly_summary = PledgesSummary(
-            total=CurrencyAmount(currency="USD", amount=int(pay_directly_total)),
-            pledgers=pledgers[PledgeType.pay_directly],
+        total = (
+            pledges_summaries.pay_upfront.total.amount
+            + pledges_summaries.pay_on_completion.total.amount
+            + pledges_summaries.pay_directly.total.amount
         )
 
         return cls(
@@ -69,10 +43,6 @@ class IssueFunding(Schema):
             funding_goal=CurrencyAmount(currency="USD", amount=issue.funding_goal)
             if issue.funding_goal
             else None,
-            total=CurrencyAmount(currency="USD", amount=int(total)),
-            pledges_summaries=PledgesTypeSummaries(
-                pay_upfront=pay_upfront_summary,
-                pay_on_completion=pay_on_completion_summary,
-                pay_directly=pay_directly_summary,
-            ),
+            total=CurrencyAmount(currency="USD", amount=total),
+            pledges_summaries=pledges_summaries,
         )
@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 from enum import StrEnum
-from typing import Any, TypeVar, cast
+from typing import Any, TypeVar
 from uuid import UUID
 
 from sqlalchemy import (
@@ -13,23 +13,28 @@ from sqlalchemy import (
     or_,
     select,
 )
-from sqlalchemy.orm import contains_eager, load_only
+from sqlalchemy.orm import contains_eager
 
 from polar.auth.models import Anonymous, Subject
 from polar.funding.schemas import FundingResultType
-from polar.issue.search import search_query
+from polar.issue.search import (
+    get_cached_search,
+    get_search_cache_key,
+    get_search_clause,
+    get_search_rank,
+    set_cached_search,
+)
 from polar.kit.pagination import PaginationParams
 from polar.models import (
     ExternalOrganization,
     Issue,
     Organization,
-    Pledge,
     Repository,
     UserOrganization,
 )
-from polar.models.pledge import PledgeState, PledgeType
-from polar.models.user import OAuthAccount, OAuthPlatform, User
+from polar.pledge.service import pledge as pledge_service
 from polar.postgres import AsyncSession
+from polar.redis import Redis
 
 
 class ListFundingSortBy(StrEnum):
@@ -57,54 +62,62 @@ class FundingService:
         sorting: list[ListFundingSortBy] = [ListFundingSortBy.oldest],
         issue_ids: list[UUID] | None = None,
         pagination: PaginationParams,
+        redis: Redis | None = None,
     ) -> tuple[Sequence[FundingResultType], int]:
-        # Construct a inner statement that returns a list of Issue.id's
-        # We're applying pagination and sorting to this inner statement
-        inner_statement = self._get_readable_issue_ids_statement(auth_subject)
-        count_statement = self._get_readable_issues_statement(
-            auth_subject
-        ).with_only_columns(func.count(Issue.id))
+        page, limit = pagination
 
-        order_by_clauses: list[UnaryExpression[Any]] = []
+        # Text searches are the expensive ones: cache the page of matching IDs
+        cache_key: str | None = None
+        if query is not None and redis is not None:
+            cache_key = get_search_cache_key(
+                "funding",
+                query,
+                subject=None
+                if isinstance(auth_subject, Anonymous)
+                else auth_subject.id,
+                organization=organization.id if organization is not None else None,
+                repository=repository.id if repository is not None else None,
+                badged=badged,
+                closed=closed,
+                sorting=sorting,
+                issue_ids=sorted(issue_ids) if issue_ids is not None else None,
+                page=page,
+                limit=limit,
+            )
+            cached = await get_cached_search(redis, cache_key)
+            if cached is not None:
+                cached_ids, cached_count = cached
+                return (
+                    await self._get_funding_results(session, auth_subject, cached_ids),
+                    cached_count,
+                )
 
-        if query is not None:
-            search = search_query(query)
+        # Select the page of Issue.id's along with the total count in one go
+        statement = self._get_readable_issue_ids_statement(auth_subject).add_columns(
+            func.count().over()
+        )
 
-            inner_statement = inner_statement.where(
-                Issue.title_tsv.bool_op("@@")(func.to_tsquery(search))
-            )
-            count_statement = count_statement.where(
-                Issue.title_tsv.bool_op("@@")(func.to_tsquery(search))
-            )
+        order_by_clauses: list[UnaryExpression[Any]] = []
 
+        if query is not None:
+            statement = statement.where(get_search_clause(query))
             # No matter the sorting option, always add a relevance sort first
-            order_by_clauses.append(
-                desc(func.ts_rank_cd(Issue.title_tsv, func.to_tsquery(search)))
-            )
+            order_by_clauses.append(desc(get_search_rank(query)))
 
         if organization is not None:
-            inner_statement = inner_statement.where(Organization.id == organization.id)
-            count_statement = count_statement.where(Organization.id == organization.id)
+            statement = statement.where(Organization.id == organization.id)
 
         if repository is not None:
-            inner_statement = inner_statement.where(Repository.id == repository.id)
-            count_statement = count_statement.where(Repository.id == repository.id)
+            statement = statement.where(Repository.id == repository.id)
 
         if issue_ids is not None:
-            inner_statement = inner_statement.where(Issue.id.in_(issue_ids))
-            count_statement = count_statement.where(Issue.id.in_(issue_ids))
+            statement = statement.where(Issue.id.in_(issue_ids))
 
         if badged is not None:
-            inner_statement = inner_statement.where(
-                Issue.pledge_badge_currently_embedded == badged
-            )
-            count_statement = count_statement.where(
-                Issue.pledge_badge_currently_embedded == badged
-            )
+            statement = statement.where(Issue.pledge_badge_currently_embedded == badged)
 
         if closed is not None:
-            inner_statement = inner_statement.where(Issue.closed == closed)
-            count_statement = count_statement.where(Issue.closed == closed)
+            statement = statement.where(Issue.closed == closed)
 
         for criterion in sorting:
             if criterion == ListFundingSortBy.oldest:
@@ -117,60 +130,79 @@ class FundingService:
                 order_by_clauses.append(nulls_last(desc(Issue.last_pledged_at)))
             elif criterion == ListFundingSortBy.most_engagement:
                 order_by_clauses.append(Issue.total_engagement_count.desc())
-        inner_statement = inner_statement.order_by(*order_by_clauses)
 
-        # paginate on inner query (issue listing)
-        page, limit = pagination
-        offset = limit * (page - 1)
-        inner_statement = inner_statement.offset(offset).limit(limit)
-
-        # Given a list of issues, join in the pledges
-        outer_statement = self._apply_pledges_summary_statement(
-            self._get_readable_issues_statement(auth_subject).where(
-                Issue.id.in_(inner_statement)
-            )
+        statement = (
+            statement.order_by(*order_by_clauses)
+            .offset(limit * (page - 1))
+            .limit(limit)
         )
 
-        outer_statement = outer_statement.order_by(*order_by_clauses)
-        outer_statement = outer_statement.add_columns(count_statement.scalar_subquery())
-
-        result = await session.execute(outer_statement)
+        result = await session.execute(statement)
 
-        results: list[Any] = []
+        ids: list[UUID] = []
         count: int = 0
-        for row in result.unique().all():
-            (*queried_data, c) = row._tuple()
+        for id, c in result.tuples().all():
+            ids.append(id)
             count = int(c)
-            if len(queried_data) == 1:
-                results.append(queried_data[0])
-            else:
-                results.append(queried_data)
 
-        return results, count
+        if cache_key is not None and redis is not None:
+            await set_cached_search(redis, cache_key, ids, count)
+
+        return await self._get_funding_results(session, auth_subject, ids), count
 
     async def get_by_issue_id(
         self, session: AsyncSession, auth_subject: Subject, *, issue_id: UUID
     ) -> FundingResultType | None:
-        statement = self._apply_pledges_summary_statement(
-            self._get_readable_issues_statement(auth_subject)
+        statement = self._get_readable_issues_statement(auth_subject).where(
+            Issue.id == issue_id
+        )
+        result = await session.execute(statement)
+
+        issue = result.unique().scalar_one_or_none()
+        if issue is None:
+            return None
+
+        (funding_result,) = await self._get_pledges_summaries(session, [issue])
+        return funding_result
+
+    async def _get_funding_results(
+        self, session: AsyncSession, auth_subject: Subject, ids: Sequence[UUID]
+    ) -> list[FundingResultType]:
+        if not ids:
+            return []
+
+        statement = self._get_readable_issues_statement(auth_subject).where(
+            Issue.id.in_(ids)
         )
-        statement = statement.where(Issue.id == issue_id)
         result = await session.execute(statement)
+        issues = {issue.id: issue for issue in result.unique().scalars().all()}
+        return await self._get_pledges_summaries(
+            session, [issues[id] for id in ids if id in issues]
+        )
 
-        row = result.unique().one_or_none()
-        if row is not None:
-            return row._tuple() if row is not None else None
-        return row
+    async def _get_pledges_summaries(
+        self, session: AsyncSession, issues: Sequence[Issue]
+    ) -> list[FundingResultType]:
+        pledges_summaries = await pledge_service.issues_pledge_type_summary(
+            session, issues
+        )
+        return [(issue, pledges_summaries[issue.id]) for issue in issues]
 
     def _get_readable_issue_ids_statement(
         self, auth_subject: Subject
-    ) -> Select[tuple[int]]:
+    ) -> Select[tuple[UUID]]:
         return self._apply_readable_issues_statement(select(Issue.id), auth_subject)
 
     def _get_readable_issues_statement(
         self, auth_subject: Subject
     ) -> Select[tuple[Issue]]:
-        return self._apply_readable_issues_statement(select(Issue), auth_subject)
+        return self._apply_readable_issues_statement(
+            select(Issue), auth_subject
+        ).options(
+            contains_eager(Issue.repository)
+            .contains_eager(Repository.organization)
+            .contains_eager(ExternalOrganization.organization)
+        )
 
     def _apply_readable_issues_statement(
         self, selector: Select[T], auth_subject: Subject
@@ -191,11 +223,6 @@ class FundingService:
                 Repository.deleted_at.is_(None),
                 ExternalOrganization.deleted_at.is_(None),
             )
-            .options(
-                contains_eager(Issue.repository)
-                .contains_eager(Repository.organization)
-                .contains_eager(ExternalOrganization.organization)
-            )
         )
 
         if isinstance(auth_subject, Anonymous):
@@ -215,80 +242,5 @@ class FundingService:
             ),
         )
 
-    def _apply_pledges_summary_statement(
-        self, statement: Select[tuple[Issue]]
-    ) -> Select[FundingResultType]:
-        issue_pledges_eager_loading_clause = contains_eager(Issue.pledges)
-        total_column = func.coalesce(
-            func.sum(Pledge.amount).over(partition_by=Issue.id),
-            0,
-        ).label("total")
-        last_pledged_at_column = func.coalesce(
-            func.max(Pledge.created_at).over(partition_by=Issue.id)
-        ).label("last_pledged_at")
-        statement = (
-            statement.join(
-                Pledge,
-                onclause=and_(
-                    Pledge.issue_id == Issue.id,
-                    Pledge.state.in_(PledgeState.active_states()),
-                ),
-                isouter=True,
-            )
-            .join(
-                Pledge.user,
-                isouter=True,
-            )
-            .join(
-                OAuthAccount,
-                onclause=and_(
-                    # Only load github oauth accounts:
-                    # This prevents us from returning multiple rows per identity,
-                    # which would lead to over-counting the pledges.
-                    #
-                    # If we want to support showing other identities in the funding API, we'd need to solve this in another way.
-                    OAuthAccount.user_id == User.id,
-                    OAuthAccount.platform == OAuthPlatform.github,
-                ),
-                isouter=True,
-            )
-            .options(
-                contains_eager(Issue.repository).contains_eager(Repository.organization)
-            )
-            .options(
-                issue_pledges_eager_loading_clause.contains_eager(Pledge.user).options(
-                    load_only(
-                        User.id,
-                        User.avatar_url,
-                        User.email,
-                    ),
-                    contains_eager(User.oauth_accounts),
-                )
-            )
-            .options(
-                issue_pledges_eager_loading_clause.joinedload(Pledge.by_organization)
-            )
-            .options(
-                issue_pledges_eager_loading_clause.joinedload(
-                    Pledge.on_behalf_of_organization
-                )
-            )
-            .add_columns(total_column, last_pledged_at_column)
-        )
-
-        for pledge_type in PledgeType:
-            statement = statement.add_columns(
-                func.coalesce(
-                    func.sum(Pledge.amount)
-                    .filter(
-                        Pledge.type == pledge_type,
-                    )
-                    .over(partition_by=Issue.id),
-                    0,
-                ).label(f"{pledge_type}_total"),
-            )
-
-        return cast(Select[FundingResultType], statement)
-
 
 funding = FundingService()
@@ -0,0 +1,118 @@
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import stripe as stripe_lib
+import structlog
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from polar.kit.services import ResourceServiceReader
+from polar.kit.utils import utc_now
+from polar.logging import Logger
+from polar.models import InboundWebhook
+from polar.models.inbound_webhook import InboundWebhookProvider
+from polar.postgres import AsyncSession
+
+log: Logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class InboundWebhookReference:
+    """
+    Lightweight reference to a stored webhook,
+    passed to tasks in place of the webhook payload.
+    """
+
+    id: UUID
+
+
+class InboundWebhookService(ResourceServiceReader[InboundWebhook]):
+    async def receive(
+        self,
+        session: AsyncSession,
+        *,
+        provider: InboundWebhookProvider,
+        delivery_id: str,
+        event_type: str,
+        body: bytes,
+    ) -> InboundWebhook | None:
+        """
+        Store a received webhook.
+
+        Returns:
+            The stored webhook, or `None` if this delivery was already processed,
+            i.e. it's a replay that should be ignored. A delivery received but not
+            processed yet is returned, so it can be enqueued again.
+        """
+        statement = (
+            insert(InboundWebhook)
+            .values(
+                id=InboundWebhook.generate_id(),
+                created_at=utc_now(),
+                provider=provider,
+                delivery_id=delivery_id,
+                event_type=event_type,
+                body=zlib.compress(body),
+            )
+            .on_conflict_do_nothing(index_elements=["provider", "delivery_id"])
+            .returning(InboundWebhook)
+        )
+        result = await session.execute(statement)
+        inbound_webhook = result.scalar_one_or_none()
+        if inbound_webhook is not None:
+            return inbound_webhook
+
+        inbound_webhook = await self.get_by(
+            session, provider=provider, delivery_id=delivery_id
+        )
+        assert inbound_webhook is not None
+        if inbound_webhook.processed_at is not None:
+            log.info(
+                "inbound_webhook.replay_ignored",
+                provider=provider,
+                delivery_id=delivery_id,
+                event_type=event_type,
+            )
+            return None
+
+        return inbound_webhook
+
+    async def get_payload(
+        self, session: AsyncSession, reference: InboundWebhookReference
+    ) -> Any:
+        """
+        Load and decode the payload of a stored webhook, in the shape expected
+        by the provider tasks: a `dict` for GitHub, a `stripe.Event` for Stripe.
+        """
+        statement = select(InboundWebhook.provider, InboundWebhook.body).where(
+            InboundWebhook.id == reference.id
+        )
+        result = await session.execute(statement)
+        provider, body = result.one()
+
+        payload = json.loads(zlib.decompress(body))
+        if provider == InboundWebhookProvider.stripe:
+            return stripe_lib.Event.construct_from(payload, stripe_lib.api_key)
+        return payload
+
+    async def mark_processed(
+        self, session: AsyncSession, reference: InboundWebhookReference
+    ) -> None:
+        statement = (
+            update(InboundWebhook)
+            .where(InboundWebhook.id == reference.id)
+            .values(processed_at=utc_now())
+        )
+        await session.execute(statement)
+
+    async def delete_before(self, session: AsyncSession, before: datetime) -> int:
+        statement = delete(InboundWebhook).where(InboundWebhook.created_at < before)
+        result = await session.execute(statement)
+        return result.rowcount
+
+
+inbound_webhook = InboundWebhookService(InboundWebhook)
@@ -0,0 +1,67 @@
+import functools
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any, ParamSpec, TypeVar, cast
+
+import structlog
+
+from polar.kit.utils import utc_now
+from polar.logging import Logger
+from polar.worker import AsyncSessionMaker, CronTrigger, JobContext, task
+
+from .service import InboundWebhookReference
+from .service import inbound_webhook as inbound_webhook_service
+
+log: Logger = structlog.get_logger()
+
+# Deliveries older than this are forgotten: replays after that are processed again
+RETENTION = timedelta(days=30)
+
+Params = ParamSpec("Params")
+ReturnValue = TypeVar("ReturnValue")
+
+
+def inbound_webhook_payload(
+    func: Callable[Params, Awaitable[ReturnValue]],
+) -> Callable[Params, Awaitable[ReturnValue]]:
+    """
+    Resolve `InboundWebhookReference` arguments of a webhook task
+    into the stored payload, and mark the webhook as processed on success.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> ReturnValue:
+        ctx = cast(JobContext, args[0])
+        references: list[InboundWebhookReference] = []
+
+        async def _resolve(value: Any) -> Any:
+            if isinstance(value, InboundWebhookReference):
+                references.append(value)
+                return await inbound_webhook_service.get_payload(session, value)
+            return value
+
+        async with AsyncSessionMaker(ctx) as session:
+            args = cast(Params.args, (ctx, *[await _resolve(a) for a in args[1:]]))
+            kwargs = cast(
+                Params.kwargs, {k: await _resolve(v) for k, v in kwargs.items()}
+            )
+
+        r = await func(*args, **kwargs)
+
+        if references:
+            async with AsyncSessionMaker(ctx) as session:
+                for reference in references:
+                    await inbound_webhook_service.mark_processed(session, reference)
+
+        return r
+
+    return wrapper
+
+
+@task("inbound_webhook.cleanup", cron_trigger=CronTrigger(hour=3, minute=0))
+async def inbound_webhook_cleanup(ctx: JobContext) -> None:
+    async with AsyncSessionMaker(ctx) as session:
+        deleted = await inbound_webhook_service.delete_before(
+            session, utc_now() - RETENTION
+        )
+        log.info("inbound_webhook.cleanup", deleted=deleted)
@@ -2,8 +2,9 @@ import base64
 import hashlib
 from datetime import datetime
 from typing import Any, Self
+from uuid import UUID
 
-from pydantic import UUID4, computed_field
+from pydantic import computed_field
 
 from polar.kit.schemas import IDSchema, Schema
 from polar.kit.utils import human_readable_size
@@ -48,7 +49,7 @@ class S3FileCreate(Schema):
 
 
 class S3File(IDSchema, validate_assignment=True):
-    organization_id: UUID4
+    organization_id: UUID
 
     name: str
     path: str
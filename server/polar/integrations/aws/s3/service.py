@@ -163,6 +163,11 @@ class S3Service:
 
         return cast(dict[str, Any], head)
 
+    def upload(self, data: bytes, path: str, mime_type: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=path, Body=data, ContentType=mime_type
+        )
+
     def complete_multipart_upload(self, data: S3FileUploadCompleted) -> S3File:
         boto_arguments = data.get_boto3_arguments()
         response = self.client.complete_multipart_upload(
@@ -13,7 +13,15 @@ from githubkit import (
     utils,
     webhooks,
 )
-from githubkit.typing import Missing
+from githubkit.typing import (
+    ContentTypes,
+    CookieTypes,
+    HeaderTypes,
+    Missing,
+    QueryParamTypes,
+    RequestFiles,
+    URLTypes,
+)
 from githubkit.utils import UNSET, Unset
 from pydantic import BaseModel, Field
 
@@ -25,6 +33,7 @@ from polar.postgres import AsyncSession
 from polar.redis import Redis
 from polar.user.oauth_service import oauth_account_service
 
+from .rate_limit import GitHubRateBudget, RateLimitResource, is_rate_budget_enforced
 from .types import AppPermissionsType
 
 log = structlog.get_logger()
@@ -78,6 +87,56 @@ def ensure_expected_response(
 ###############################################################################
 
 
+class InstallationGitHub(GitHub[AppInstallationAuthStrategy]):
+    """
+    GitHub installation client keeping track of the installation rate budget.
+
+    Every response feeds the budget from its `X-RateLimit-*` headers.
+    On the `github_crawl` queue, the budget is also acquired before
+    dispatching each request.
+    """
+
+    def __init__(self, auth: AppInstallationAuthStrategy, *, redis: Redis) -> None:
+        super().__init__(auth)
+        self.rate_budget = GitHubRateBudget(redis)
+
+    async def _arequest(
+        self,
+        method: str,
+        url: URLTypes,
+        *,
+        params: QueryParamTypes | None = None,
+        content: ContentTypes | None = None,
+        data: dict[Any, Any] | None = None,
+        files: RequestFiles | None = None,
+        json: Any | None = None,
+        headers: HeaderTypes | None = None,
+        cookies: CookieTypes | None = None,
+    ) -> httpx.Response:
+        installation_id = self.auth.installation_id
+
+        if is_rate_budget_enforced():
+            await self.rate_budget.acquire(
+                installation_id, RateLimitResource.from_path(httpx.URL(url).path)
+            )
+
+        response = await super()._arequest(
+            method,
+            url,
+            params=params,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            headers=headers,
+            cookies=cookies,
+        )
+
+        await self.rate_budget.update(installation_id, response.headers)
+
+        return response
+
+
 class RefreshAccessToken(BaseModel):
     access_token: str = Field(default=...)
     # The number of seconds until access_token expires (will always be 28800)
@@ -249,7 +308,7 @@ def get_app_installation_client(
     # they can be reused across restarts of the python process and by multiple workers.
 
     if app == GitHubApp.polar:
-        return GitHub(
+        return InstallationGitHub(
             AppInstallationAuthStrategy(
                 app_id=settings.GITHUB_APP_IDENTIFIER,
                 private_key=settings.GITHUB_APP_PRIVATE_KEY,
@@ -258,10 +317,11 @@ def get_app_installation_client(
                 installation_id=installation_id,
                 permissions=permissions,
                 cache=RedisCache(app, redis),
-            )
+            ),
+            redis=redis,
         )
     elif app == GitHubApp.repository_benefit:
-        return GitHub(
+        return InstallationGitHub(
             AppInstallationAuthStrategy(
                 app_id=settings.GITHUB_REPOSITORY_BENEFITS_APP_IDENTIFIER,
                 private_key=settings.GITHUB_REPOSITORY_BENEFITS_APP_PRIVATE_KEY,
@@ -270,7 +330,8 @@ def get_app_installation_client(
                 installation_id=installation_id,
                 permissions=permissions,
                 cache=RedisCache(app, redis),
-            )
+            ),
+            redis=redis,
         )
 
 
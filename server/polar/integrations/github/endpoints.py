@@ -1,3 +1,4 @@
+import json
 from typing import Any
 from uuid import UUID
 
@@ -9,6 +10,7 @@ from httpx_oauth.clients.github import GitHubOAuth2
 from httpx_oauth.integrations.fastapi import OAuth2AuthorizeCallback
 from httpx_oauth.oauth2 import OAuth2Token
 from pydantic import BaseModel, ValidationError
+from starlette.datastructures import Headers
 
 from polar.auth.dependencies import WebUser, WebUserOrAnonymous
 from polar.auth.models import is_user
@@ -26,6 +28,8 @@ from polar.external_organization.schemas import (
     ExternalOrganization as ExternalOrganizationSchema,
 )
 from polar.external_organization.schemas import ExternalOrganizationID
+from polar.inbound_webhook.service import InboundWebhookReference
+from polar.inbound_webhook.service import inbound_webhook as inbound_webhook_service
 from polar.integrations.github import client as github
 from polar.integrations.loops.service import loops as loops_service
 from polar.kit import jwt
@@ -33,6 +37,7 @@ from polar.kit.http import ReturnTo
 from polar.locker import Locker, get_locker
 from polar.models import ExternalOrganization
 from polar.models.benefit import BenefitType
+from polar.models.inbound_webhook import InboundWebhookProvider
 from polar.openapi import APITag
 from polar.pledge.service import pledge as pledge_service
 from polar.postgres import AsyncSession, get_db_session
@@ -442,31 +447,53 @@ def not_implemented() -> WebhookResponse:
     return WebhookResponse(success=False, message="Not implemented")
 
 
-async def enqueue(request: Request) -> WebhookResponse:
-    json_body = await request.json()
-    event_scope = request.headers["X-GitHub-Event"]
+async def enqueue(
+    session: AsyncSession, headers: Headers, body: bytes
+) -> WebhookResponse:
+    json_body = json.loads(body)
+    event_scope = headers["X-GitHub-Event"]
     event_action = json_body["action"] if "action" in json_body else None
     event_name = f"{event_scope}.{event_action}" if event_action else event_scope
 
     if event_name not in IMPLEMENTED_WEBHOOKS:
         return not_implemented()
 
+    inbound_webhook = await inbound_webhook_service.receive(
+        session,
+        provider=InboundWebhookProvider.github,
+        delivery_id=headers["X-GitHub-Delivery"],
+        event_type=event_name,
+        body=body,
+    )
+    if inbound_webhook is None:
+        return WebhookResponse(success=True, message="Already processed")
+
     task_name = f"github.webhook.{event_name}"
-    enqueue_job(task_name, event_scope, event_action, json_body)
+    enqueue_job(
+        task_name,
+        event_scope,
+        event_action,
+        InboundWebhookReference(inbound_webhook.id),
+        # Redeliveries of a pending webhook are deduplicated by arq
+        _job_id=f"{task_name}:{inbound_webhook.id}",
+    )
 
     log.info("github.webhook.queued", task_name=task_name)
     return WebhookResponse(success=True)
 
 
 @router.post("/webhook", response_model=WebhookResponse)
-async def webhook(request: Request) -> WebhookResponse:
+async def webhook(
+    request: Request, session: AsyncSession = Depends(get_db_session)
+) -> WebhookResponse:
+    body = await request.body()
     valid_signature = github.webhooks.verify(
         settings.GITHUB_APP_WEBHOOK_SECRET,
-        await request.body(),
+        body,
         request.headers["X-Hub-Signature-256"],
     )
     if valid_signature:
-        return await enqueue(request)
+        return await enqueue(session, request.headers, body)
 
     # Should be 403 Forbidden, but...
     # Throwing unsophisticated hackers/scrapers/bots off the scent
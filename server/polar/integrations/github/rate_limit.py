@@ -0,0 +1,184 @@
+import time
+from collections.abc import Mapping
+from datetime import timedelta
+from enum import StrEnum
+
+import structlog
+
+from polar.config import settings
+from polar.logging import Logger
+from polar.redis import Redis
+from polar.worker import QueueName, get_current_queue_name
+
+log: Logger = structlog.get_logger()
+
+
+class RateLimitResource(StrEnum):
+    core = "core"
+    graphql = "graphql"
+    search = "search"
+
+    @classmethod
+    def from_path(cls, path: str) -> "RateLimitResource":
+        if path.startswith("/graphql"):
+            return cls.graphql
+        if path.startswith("/search/"):
+            return cls.search
+        return cls.core
+
+
+class RateBudgetExhausted(Exception):
+    def __init__(
+        self,
+        installation_id: int,
+        resource: RateLimitResource,
+        retry_after: timedelta,
+    ) -> None:
+        self.installation_id = installation_id
+        self.resource = resource
+        self.retry_after = retry_after
+        super().__init__(
+            f"GitHub rate budget exhausted for installation {installation_id} "
+            f"({resource}), retry after {retry_after}."
+        )
+
+
+# Take the budget from the bucket, unless it would go below the reserve.
+# Returns 0 if the budget was acquired, -1 if the budget is unknown or stale,
+# or the number of seconds until the reset otherwise.
+_ACQUIRE_SCRIPT = """
+local remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+local reset = tonumber(redis.call('HGET', KEYS[1], 'reset'))
+if remaining == nil or reset == nil then
+    return -1
+end
+local cost = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+if reset <= now then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+if remaining - cost < reserve then
+    return reset - now
+end
+redis.call('HINCRBY', KEYS[1], 'remaining', -cost)
+return 0
+"""
+
+# Refill the bucket from the rate limit headers. Within the same window, only lower
+# the remaining budget: concurrent requests may have consumed more than what the
+# headers of a slower response tell.
+_UPDATE_SCRIPT = """
+local reset = tonumber(redis.call('HGET', KEYS[1], 'reset'))
+local remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+local new_remaining = tonumber(ARGV[1])
+local new_reset = tonumber(ARGV[2])
+if reset ~= nil and remaining ~= nil and reset == new_reset then
+    new_remaining = math.min(remaining, new_remaining)
+elseif reset ~= nil and reset > new_reset then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'remaining', new_remaining, 'limit', ARGV[3], 'reset', new_reset)
+redis.call('EXPIREAT', KEYS[1], new_reset)
+return 1
+"""
+
+
+class GitHubRateBudget:
+    """
+    Per-installation token bucket of GitHub API calls, stored in Redis.
+
+    The bucket is fed from the `X-RateLimit-*` headers of every response
+    and consumed before dispatching each request from the `github_crawl` queue,
+    so the crawler uses the available budget without exhausting it. A reserve
+    is kept for webhooks and user-facing calls sharing the same installation.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    async def acquire(
+        self,
+        installation_id: int,
+        resource: RateLimitResource = RateLimitResource.core,
+        cost: int = 1,
+    ) -> None:
+        """
+        Take `cost` calls from the installation budget.
+
+        If the budget is unknown, the call is allowed:
+        the response headers will fill the bucket.
+
+        Raises:
+            RateBudgetExhausted: The budget left is below the reserve.
+        """
+        result = int(
+            await self.redis.eval(
+                _ACQUIRE_SCRIPT,
+                1,
+                self._get_key(installation_id, resource),
+                cost,
+                int(time.time()),
+                settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE,
+            )
+        )
+        if result > 0:
+            log.info(
+                "github.rate_budget.exhausted",
+                installation_id=installation_id,
+                resource=resource,
+                retry_after=result,
+            )
+            raise RateBudgetExhausted(
+                installation_id, resource, timedelta(seconds=result)
+            )
+
+    async def update(self, installation_id: int, headers: Mapping[str, str]) -> None:
+        """Refill the installation budget from GitHub's rate limit headers."""
+        try:
+            remaining = int(headers["x-ratelimit-remaining"])
+            limit = int(headers["x-ratelimit-limit"])
+            reset = int(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return
+
+        resource = RateLimitResource.core
+        if header_resource := headers.get("x-ratelimit-resource"):
+            try:
+                resource = RateLimitResource(header_resource)
+            except ValueError:
+                return
+
+        await self.redis.eval(
+            _UPDATE_SCRIPT,
+            1,
+            self._get_key(installation_id, resource),
+            remaining,
+            reset,
+            limit,
+        )
+
+    async def get_available(
+        self,
+        installation_id: int,
+        resource: RateLimitResource = RateLimitResource.core,
+    ) -> int | None:
+        """
+        Return the number of calls the crawler can still make in the current window,
+        or `None` if the budget is unknown.
+        """
+        remaining, reset = await self.redis.hmget(
+            self._get_key(installation_id, resource), ["remaining", "reset"]
+        )
+        if remaining is None or reset is None or int(reset) <= time.time():
+            return None
+        return max(int(remaining) - settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE, 0)
+
+    def _get_key(self, installation_id: int, resource: RateLimitResource) -> str:
+        return f"github:rate_budget:{installation_id}:{resource}"
+
+
+def is_rate_budget_enforced() -> bool:
+    """Only the crawler waits for budget, other calls only feed the bucket."""
+    return get_current_queue_name() == QueueName.github_crawl
@@ -1,7 +1,8 @@
 import time
 from typing import Any
+from uuid import UUID
 
-from pydantic import UUID4, model_validator
+from pydantic import model_validator
 
 from polar.kit.schemas import Schema
 from polar.organization.schemas import OrganizationID
@@ -49,7 +50,7 @@ class OrganizationCheckPermissionsInput(Schema):
 
 
 class OrganizationBillingPlan(Schema):
-    organization_id: UUID4
+    organization_id: UUID
     is_free: bool
     plan_name: str
 
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Literal
 
 from githubkit import GitHub
 
@@ -13,13 +13,19 @@ class RateLimit(Schema):
 
 
 class GitHubApi:
-    async def get_rate_limit(self, client: GitHub[Any]) -> RateLimit:
+    async def get_rate_limit(
+        self, client: GitHub[Any], resource: Literal["core", "graphql"] = "core"
+    ) -> RateLimit:
         r = await client.rest.rate_limit.async_get()
+        resources = r.parsed_data.resources
+        rate_limit = resources.core
+        if resource == "graphql" and resources.graphql:
+            rate_limit = resources.graphql
         return RateLimit(
-            limit=r.parsed_data.resources.core.limit,
-            remaining=r.parsed_data.resources.core.remaining,
-            used=r.parsed_data.resources.core.used,
-            reset=r.parsed_data.resources.core.reset,
+            limit=rate_limit.limit,
+            remaining=rate_limit.remaining,
+            used=rate_limit.used,
+            reset=rate_limit.reset,
         )
 
 
@@ -8,7 +8,7 @@ from uuid import UUID
 
 import structlog
 from githubkit import GitHub, Paginator
-from githubkit.exception import RequestFailed
+from githubkit.exception import GraphQLFailed, RequestFailed
 from sqlalchemy import asc, or_
 from sqlalchemy.orm import contains_eager
 
@@ -44,6 +44,60 @@ from .repository import github_repository
 
 log: Logger = structlog.get_logger()
 
+# Maximum number of issues fetched in a single GraphQL query,
+# GitHub limits the number of nodes a query can return.
+BULK_SYNC_BATCH_SIZE = 100
+
+_BULK_SYNC_ISSUE_FRAGMENT = """
+fragment IssueFields on Issue {
+    databaseId
+    number
+    title
+    body
+    state
+    stateReason
+    closedAt
+    updatedAt
+    repository { databaseId }
+    comments { totalCount }
+    reactionGroups { content reactors { totalCount } }
+    labels(first: 50) { nodes { id name color description isDefault } }
+}
+"""
+
+# Fields refreshed by the bulk sync. The other ones are only set by webhooks
+# and the REST sync, which receive the full issue payload.
+_BULK_SYNC_MUTABLE_KEYS = {
+    "title",
+    "body",
+    "comments",
+    "labels",
+    "reactions",
+    "state",
+    "state_reason",
+    "issue_closed_at",
+    "issue_modified_at",
+    "has_pledge_badge_label",
+    "pledge_badge_embedded_at",
+    "positive_reactions_count",
+    "total_engagement_count",
+}
+
+
+def _get_bulk_sync_query(numbers: Sequence[int]) -> str:
+    aliases = "\n".join(
+        f"issue_{number}: issue(number: {number}) {{ ...IssueFields }}"
+        for number in numbers
+    )
+    return f"""
+    query($owner: String!, $name: String!) {{
+        repository(owner: $owner, name: $name) {{
+            {aliases}
+        }}
+    }}
+    {_BULK_SYNC_ISSUE_FRAGMENT}
+    """
+
 
 class GithubIssueService(IssueService):
     async def get_by_external_id(
@@ -441,10 +495,141 @@ class GithubIssueService(IssueService):
             issue.github_issue_etag = res.headers.get("etag", None)
             session.add(issue)
 
+    async def sync_issues_bulk(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        org: ExternalOrganization,
+        repo: Repository,
+        issues: Sequence[Issue],
+        crawl_with_installation_id: int
+        | None = None,  # Override which installation to use when crawling
+    ) -> Sequence[Issue]:
+        """
+        Refresh issues of a repository with a single GraphQL query,
+        and upsert them in a single statement.
+
+        Issue hooks are only called for issues modified since their last sync.
+        Issues that are not found anymore, or were transferred to another
+        repository, are soft-deleted.
+
+        Returns:
+            The modified issues.
+        """
+        if len(issues) > BULK_SYNC_BATCH_SIZE:
+            raise ValueError(
+                f"Can't sync more than {BULK_SYNC_BATCH_SIZE} issues at once"
+            )
+        if not issues:
+            return []
+
+        installation_id = (
+            crawl_with_installation_id
+            if crawl_with_installation_id
+            else org.safe_installation_id
+        )
+
+        client = github.get_app_installation_client(installation_id, redis=redis)
+
+        log.info("github.sync_issues_bulk", repository_id=repo.id, count=len(issues))
+
+        try:
+            data = await client.async_graphql(
+                _get_bulk_sync_query([issue.number for issue in issues]),
+                {"owner": org.name, "name": repo.name},
+            )
+        except GraphQLFailed as e:
+            # Deleted issues are reported as errors, but the others are still there
+            if e.response.data is None or any(
+                error.type != "NOT_FOUND" for error in e.response.errors or []
+            ):
+                raise
+            data = e.response.data
+
+        previous_versions = {
+            issue.id: (issue.issue_modified_at, issue.state) for issue in issues
+        }
+
+        github_repository_data: dict[str, Any] | None = data.get("repository")
+        if github_repository_data is None:
+            # Missing or inaccessible repository: don't delete its issues
+            log.info(
+                "github.sync_issues_bulk.repository_not_found",
+                repository_id=repo.id,
+            )
+            await session.execute(
+                sql.update(Issue)
+                .where(Issue.id.in_(previous_versions.keys()))
+                .values(github_issue_fetched_at=utc_now())
+            )
+            await session.commit()
+            return []
+
+        schemas: list[IssueCreate] = []
+        removed_ids: list[UUID] = []
+        for issue in issues:
+            github_issue_data = github_repository_data.get(f"issue_{issue.number}")
+            # Not found: deleted or turned into a discussion
+            if github_issue_data is None:
+                log.info("github.sync_issues_bulk.not_found", issue_id=issue.id)
+                removed_ids.append(issue.id)
+                continue
+            # Transferred to another repository, see `sync_issue`
+            if (
+                github_issue_data["databaseId"] != issue.external_id
+                or github_issue_data["repository"]["databaseId"] != repo.external_id
+            ):
+                log.info("github.sync_issues_bulk.transferred", issue_id=issue.id)
+                removed_ids.append(issue.id)
+                continue
+            schemas.append(
+                IssueCreate.from_github_graphql(github_issue_data, issue, repo)
+            )
+
+        if removed_ids:
+            await session.execute(
+                sql.update(Issue)
+                .where(Issue.id.in_(removed_ids), Issue.deleted_at.is_(None))
+                .values(deleted_at=utc_now())
+            )
+
+        records: Sequence[Issue] = []
+        if schemas:
+            records = await self.upsert_many(
+                session,
+                schemas,
+                constraints=[Issue.external_id],
+                mutable_keys=_BULK_SYNC_MUTABLE_KEYS,
+                autocommit=False,
+            )
+
+        await session.execute(
+            sql.update(Issue)
+            .where(
+                Issue.id.in_(previous_versions.keys()),
+                Issue.id.not_in(removed_ids),
+            )
+            .values(github_issue_fetched_at=utc_now())
+        )
+        await session.commit()
+
+        modified_records = [
+            record
+            for record in records
+            if previous_versions.get(record.id)
+            != (record.issue_modified_at, record.state)
+        ]
+        for record in modified_records:
+            await issue_upserted.call(IssueHook(session, redis, record))
+
+        return modified_records
+
     async def list_issues_to_crawl_issue(
         self,
         session: AsyncSession,
         organization: ExternalOrganization,
+        *,
+        limit: int = 100,
     ) -> Sequence[Issue]:
         current_time = utc_now()
         cutoff_time = current_time - datetime.timedelta(hours=12)
@@ -465,7 +650,7 @@ class GithubIssueService(IssueService):
                 ExternalOrganization.id == organization.id,
             )
             .order_by(asc(Issue.github_issue_fetched_at))
-            .limit(100)
+            .limit(limit)
         )
 
         res = await session.execute(stmt)
@@ -745,17 +930,12 @@ class GithubIssueService(IssueService):
         locker: Locker,
         sessionmaker: AsyncSessionMaker,
         user: User,
-    ) -> list[Issue]:
+    ) -> Sequence[Issue]:
         # use cached result if we have one
         cache_key = "recommendations:" + str(user.id)
         val = await redis.lrange(cache_key, 0, -1)
         if val:
-            res_issues: list[Issue] = []
-            for id in val:
-                issue = await github_issue.get(session, UUID(id))
-                if issue:
-                    res_issues.append(issue)
-            return res_issues
+            return await self.get_loaded_many(session, [UUID(id) for id in val])
 
         client = await github.get_user_client(session, locker, user)
 
@@ -796,7 +976,8 @@ class GithubIssueService(IssueService):
             pipe.expire(cache_key, datetime.timedelta(hours=24))
             await pipe.execute()
 
-        return res
+        # issues were upserted in their own sessions, load them in ours
+        return await self.get_loaded_many(session, [i.id for i in res])
 
     async def create_or_update_from_github(
         self,
@@ -3,7 +3,9 @@ from uuid import UUID
 
 import structlog
 
+from polar.config import settings
 from polar.integrations.github.client import get_app_installation_client
+from polar.integrations.github.rate_limit import GitHubRateBudget, RateLimitResource
 from polar.worker import (
     AsyncSessionMaker,
     CronTrigger,
@@ -16,12 +18,15 @@ from polar.worker import (
 )
 
 from ..service.api import github_api
-from ..service.issue import github_issue
+from ..service.issue import BULK_SYNC_BATCH_SIZE, github_issue
 from ..service.organization import github_organization as github_organization_service
 from .utils import get_external_organization_and_repo, github_rate_limit_retry
 
 log = structlog.get_logger()
 
+# Maximum number of issues to refresh per organization on each cron run
+CRON_REFRESH_ISSUES_LIMIT = 5000
+
 
 @task("github.issue.sync")
 @github_rate_limit_retry
@@ -57,6 +62,37 @@ async def issue_sync(
             )
 
 
+@task("github.issue.sync_bulk")
+@github_rate_limit_retry
+async def issue_sync_bulk(
+    ctx: JobContext,
+    organization_id: UUID,
+    repository_id: UUID,
+    issue_ids: list[UUID],
+    polar_context: PolarWorkerContext,
+    crawl_with_installation_id: int
+    | None = None,  # Override which installation to use when crawling
+) -> None:
+    with polar_context.to_execution_context():
+        async with AsyncSessionMaker(ctx) as session:
+            organization, repository = await get_external_organization_and_repo(
+                session, organization_id, repository_id
+            )
+
+            issues = await github_issue.list_by_repository_and_ids(
+                session, repository.id, issue_ids
+            )
+
+            await github_issue.sync_issues_bulk(
+                session,
+                get_worker_redis(ctx),
+                org=organization,
+                repo=repository,
+                issues=issues,
+                crawl_with_installation_id=crawl_with_installation_id,
+            )
+
+
 @task(
     "github.issue.sync.cron_refresh_issues",
     cron_trigger=CronTrigger(hour=1, minute=0),
@@ -67,7 +103,9 @@ async def cron_refresh_issues(ctx: JobContext) -> None:
     async with AsyncSessionMaker(ctx) as session:
         orgs = await github_organization_service.list_installed(session)
         for org in orgs:
-            issues = await github_issue.list_issues_to_crawl_issue(session, org)
+            issues = await github_issue.list_issues_to_crawl_issue(
+                session, org, limit=CRON_REFRESH_ISSUES_LIMIT
+            )
             if len(issues) == 0:
                 log.info(
                     "github.issue.sync.cron_refresh_issues",
@@ -76,24 +114,47 @@ async def cron_refresh_issues(ctx: JobContext) -> None:
                 )
                 continue
 
-            client = get_app_installation_client(
-                org.safe_installation_id, redis=get_worker_redis(ctx)
+            installation_id = org.safe_installation_id
+            redis = get_worker_redis(ctx)
+            available = await GitHubRateBudget(redis).get_available(
+                installation_id, RateLimitResource.graphql
             )
-            try:
-                rate_limit = await github_api.get_rate_limit(client)
-            except Exception as e:
-                log.info(
-                    "failed to get rate limit, treating it as no remaining",
-                    org_name=org.name,
-                    err=e,
+            if available is None:
+                # Unknown budget: ask GitHub, its response headers fill the bucket
+                client = get_app_installation_client(installation_id, redis=redis)
+                try:
+                    rate_limit = await github_api.get_rate_limit(client, "graphql")
+                except Exception as e:
+                    log.info(
+                        "failed to get rate limit, treating it as no remaining",
+                        org_name=org.name,
+                        err=e,
+                    )
+                    continue
+                available = max(
+                    rate_limit.remaining - settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE, 0
                 )
-                continue
 
-            if rate_limit.remaining < 1000:
+            # Issues are synced by batches of the same repository,
+            # each batch being a single GraphQL query.
+            issues_by_repository: dict[UUID, list[UUID]] = {}
+            for issue in issues:
+                issues_by_repository.setdefault(issue.repository_id, []).append(
+                    issue.id
+                )
+            batches = [
+                (repository_id, repository_issue_ids[i : i + BULK_SYNC_BATCH_SIZE])
+                for repository_id, repository_issue_ids in issues_by_repository.items()
+                for i in range(0, len(repository_issue_ids), BULK_SYNC_BATCH_SIZE)
+            ]
+
+            # Crawl as many batches as the budget allows, the oldest fetched first.
+            # The others will be picked by the next run.
+            batches = batches[:available]
+            if len(batches) == 0:
                 log.info(
-                    "github.issue.sync.cron_refresh_issues.rate_limit_almost_exhausted",
+                    "github.issue.sync.cron_refresh_issues.rate_budget_exhausted",
                     org_name=org.name,
-                    rate_limit_remaining=rate_limit.remaining,
                 )
                 continue
 
@@ -101,14 +162,17 @@ async def cron_refresh_issues(ctx: JobContext) -> None:
                 "github.issue.sync.cron_refresh_issues",
                 org_name=org.name,
                 found_count=len(issues),
-                rate_limit_remaining=rate_limit.remaining,
+                batches_count=len(batches),
+                rate_budget_available=available,
             )
 
-            for issue in issues:
+            for repository_id, issue_ids in batches:
                 enqueue_job(
-                    "github.issue.sync",
-                    issue.id,
-                    _job_id=f"github.issue.sync:{issue.id}",
+                    "github.issue.sync_bulk",
+                    org.id,
+                    repository_id,
+                    issue_ids,
+                    _job_id=f"github.issue.sync_bulk:{issue_ids[0]}",
                     _defer_by=random.randint(0, 60 * 5),
                     queue_name=QueueName.github_crawl,
                 )
@@ -8,6 +8,7 @@ from arq import Retry
 from githubkit.exception import RateLimitExceeded
 
 from polar.integrations.github import service
+from polar.integrations.github.rate_limit import RateBudgetExhausted
 from polar.models import ExternalOrganization, Repository
 from polar.postgres import AsyncSession
 
@@ -50,7 +51,7 @@ def github_rate_limit_retry(
     async def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> ReturnValue:
         try:
             return await func(*args, **kwargs)
-        except RateLimitExceeded as e:
+        except (RateLimitExceeded, RateBudgetExhausted) as e:
             raise Retry(e.retry_after)
 
     return wrapper
@@ -7,6 +7,7 @@ import structlog
 from polar.context import ExecutionContext
 from polar.eventstream.service import publish_members
 from polar.exceptions import PolarTaskError
+from polar.inbound_webhook.tasks import inbound_webhook_payload
 from polar.integrations.github import client as github
 from polar.kit.extensions.sqlalchemy import sql
 from polar.kit.utils import utc_now
@@ -107,6 +108,7 @@ async def organization_updated(
 
 
 @task(name="github.webhook.organization.renamed")
+@inbound_webhook_payload
 async def organizations_renamed(
     ctx: JobContext,
     scope: Literal["organization"],
@@ -196,6 +198,7 @@ async def remove_repositories(
 
 
 @task("github.webhook.installation_repositories.added")
+@inbound_webhook_payload
 async def repositories_added(
     ctx: JobContext,
     scope: Literal["installation_repositories"],
@@ -213,6 +216,7 @@ async def repositories_added(
 
 
 @task(name="github.webhook.installation_repositories.removed")
+@inbound_webhook_payload
 async def repositories_removed(
     ctx: JobContext,
     scope: Literal["installation_repositories"],
@@ -230,6 +234,7 @@ async def repositories_removed(
 
 
 @task(name="github.webhook.public")
+@inbound_webhook_payload
 async def repositories_public(
     ctx: JobContext,
     scope: Literal["public"],
@@ -247,6 +252,7 @@ async def repositories_public(
 
 
 @task(name="github.webhook.repository.renamed")
+@inbound_webhook_payload
 async def repositories_renamed(
     ctx: JobContext,
     scope: Literal["repository"],
@@ -264,6 +270,7 @@ async def repositories_renamed(
 
 
 @task(name="github.webhook.repository.edited")
+@inbound_webhook_payload
 async def repositories_redited(
     ctx: JobContext,
     scope: Literal["repository"],
@@ -281,6 +288,7 @@ async def repositories_redited(
 
 
 @task(name="github.webhook.repository.deleted")
+@inbound_webhook_payload
 async def repositories_deleted(
     ctx: JobContext,
     scope: Literal["repository"],
@@ -298,6 +306,7 @@ async def repositories_deleted(
 
 
 @task(name="github.webhook.repository.archived")
+@inbound_webhook_payload
 async def repositories_archived(
     ctx: JobContext,
     scope: Literal["repository"],
@@ -315,6 +324,7 @@ async def repositories_archived(
 
 
 @task(name="github.webhook.repository.transferred")
+@inbound_webhook_payload
 async def repositories_transferred(
     ctx: JobContext,
     scope: Literal["repository"],
@@ -509,6 +519,7 @@ async def handle_issue_transferred(
 
 
 @task("github.webhook.issues.opened")
+@inbound_webhook_payload
 async def issue_opened(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -535,6 +546,7 @@ async def issue_opened(
 
 
 @task("github.webhook.issues.reopened")
+@inbound_webhook_payload
 async def issue_reopened(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -561,6 +573,7 @@ async def issue_reopened(
 
 
 @task("github.webhook.issues.edited")
+@inbound_webhook_payload
 async def issue_edited(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -587,6 +600,7 @@ async def issue_edited(
 
 
 @task("github.webhook.issues.closed")
+@inbound_webhook_payload
 async def issue_closed(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -605,6 +619,7 @@ async def issue_closed(
 
 
 @task("github.webhook.issues.deleted")
+@inbound_webhook_payload
 async def issue_deleted(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -633,6 +648,7 @@ async def issue_deleted(
 
 
 @task("github.webhook.issues.transferred")
+@inbound_webhook_payload
 async def issue_transferred(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -651,6 +667,7 @@ async def issue_transferred(
 
 
 @task("github.webhook.issues.labeled")
+@inbound_webhook_payload
 async def issue_labeled(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -671,6 +688,7 @@ async def issue_labeled(
 
 
 @task("github.webhook.issues.unlabeled")
+@inbound_webhook_payload
 async def issue_unlabeled(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -787,6 +805,7 @@ async def issue_labeled_async(
 
 
 @task("github.webhook.issues.assigned")
+@inbound_webhook_payload
 async def issue_assigned(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -805,6 +824,7 @@ async def issue_assigned(
 
 
 @task("github.webhook.issues.unassigned")
+@inbound_webhook_payload
 async def issue_unassigned(
     ctx: JobContext,
     scope: Literal["issues"],
@@ -861,6 +881,7 @@ async def issue_assigned_async(
 
 
 @task("github.webhook.installation.created")
+@inbound_webhook_payload
 async def installation_created(
     ctx: JobContext,
     scope: Literal["installation"],
@@ -880,6 +901,7 @@ async def installation_created(
 
 
 @task("github.webhook.installation.new_permissions_accepted")
+@inbound_webhook_payload
 async def installation_new_permissions_accepted(
     ctx: JobContext,
     scope: Literal["installation"],
@@ -916,6 +938,7 @@ async def installation_new_permissions_accepted(
 
 
 @task("github.webhook.installation.deleted")
+@inbound_webhook_payload
 async def installation_delete(
     ctx: JobContext,
     scope: Literal["installation"],
@@ -943,6 +966,7 @@ async def installation_delete(
 
 
 @task("github.webhook.installation.suspend")
+@inbound_webhook_payload
 async def installation_suspend(
     ctx: JobContext,
     scope: Literal["installation"],
@@ -968,6 +992,7 @@ async def installation_suspend(
 
 
 @task("github.webhook.installation.unsuspend")
+@inbound_webhook_payload
 async def installation_unsuspend(
     ctx: JobContext,
     scope: Literal["installation"],
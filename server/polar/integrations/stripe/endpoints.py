@@ -4,6 +4,10 @@ from fastapi import Depends, HTTPException, Query, Request
 from starlette.responses import RedirectResponse
 
 from polar.config import settings
+from polar.inbound_webhook.service import InboundWebhookReference
+from polar.inbound_webhook.service import inbound_webhook as inbound_webhook_service
+from polar.models.inbound_webhook import InboundWebhookProvider
+from polar.postgres import AsyncSession, get_db_session
 from polar.routing import APIRouter
 from polar.worker import enqueue_job
 
@@ -31,10 +35,25 @@ DIRECT_IMPLEMENTED_WEBHOOKS = {
 CONNECT_IMPLEMENTED_WEBHOOKS = {"account.updated", "payout.paid"}
 
 
-async def enqueue(event: stripe.Event) -> None:
+async def enqueue(session: AsyncSession, event: stripe.Event, body: bytes) -> None:
     event_type: str = event["type"]
+    inbound_webhook = await inbound_webhook_service.receive(
+        session,
+        provider=InboundWebhookProvider.stripe,
+        delivery_id=event["id"],
+        event_type=event_type,
+        body=body,
+    )
+    if inbound_webhook is None:
+        return
+
     task_name = f"stripe.webhook.{event_type}"
-    enqueue_job(task_name, event)
+    enqueue_job(
+        task_name,
+        InboundWebhookReference(inbound_webhook.id),
+        # Redeliveries of a pending webhook are deduplicated by arq
+        _job_id=f"{task_name}:{inbound_webhook.id}",
+    )
     log.info("stripe.webhook.queued", task_name=task_name)
 
 
@@ -65,19 +84,23 @@ class WebhookEventGetter:
 
 @router.post("/webhook", status_code=202, name="integrations.stripe.webhook")
 async def webhook(
+    request: Request,
     event: stripe.Event = Depends(WebhookEventGetter(settings.STRIPE_WEBHOOK_SECRET)),
+    session: AsyncSession = Depends(get_db_session),
 ) -> None:
     if event["type"] in DIRECT_IMPLEMENTED_WEBHOOKS:
-        await enqueue(event)
+        await enqueue(session, event, await request.body())
 
 
 @router.post(
     "/webhook-connect", status_code=202, name="integrations.stripe.webhook_connect"
 )
 async def webhook_connect(
+    request: Request,
     event: stripe.Event = Depends(
         WebhookEventGetter(settings.STRIPE_CONNECT_WEBHOOK_SECRET)
     ),
+    session: AsyncSession = Depends(get_db_session),
 ) -> None:
     if event["type"] in CONNECT_IMPLEMENTED_WEBHOOKS:
-        return await enqueue(event)
+        return await enqueue(session, event, await request.body())
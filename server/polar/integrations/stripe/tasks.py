@@ -11,6 +11,7 @@ from arq import Retry
 from polar.account.service import account as account_service
 from polar.checkout.service import checkout as checkout_service
 from polar.exceptions import PolarTaskError
+from polar.inbound_webhook.tasks import inbound_webhook_payload
 from polar.integrations.stripe.schemas import PaymentIntentSuccessWebhook, ProductType
 from polar.logging import Logger
 from polar.order.service import NotAnOrderInvoice
@@ -90,6 +91,7 @@ class UnsetAccountOnPayoutEvent(StripeTaskError):
 
 
 @task("stripe.webhook.account.updated")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def account_updated(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -103,6 +105,7 @@ async def account_updated(
 
 
 @task("stripe.webhook.payment_intent.succeeded")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def payment_intent_succeeded(
     ctx: JobContext,
@@ -166,6 +169,7 @@ async def payment_intent_succeeded(
 
 
 @task("stripe.webhook.payment_intent.payment_failed")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def payment_intent_payment_failed(
     ctx: JobContext,
@@ -188,6 +192,7 @@ async def payment_intent_payment_failed(
 
 
 @task("stripe.webhook.charge.succeeded")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def charge_succeeded(
     ctx: JobContext,
@@ -211,6 +216,7 @@ async def charge_succeeded(
 
 
 @task("stripe.webhook.charge.refunded")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def charge_refunded(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -231,6 +237,7 @@ async def charge_refunded(
 
 
 @task("stripe.webhook.charge.dispute.created")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def charge_dispute_created(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -262,6 +269,7 @@ async def charge_dispute_created(
 
 
 @task("stripe.webhook.charge.dispute.funds_reinstated")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def charge_dispute_funds_reinstated(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -276,6 +284,7 @@ async def charge_dispute_funds_reinstated(
 
 
 @task("stripe.webhook.customer.subscription.created")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def customer_subscription_created(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -291,6 +300,7 @@ async def customer_subscription_created(
 
 
 @task("stripe.webhook.customer.subscription.updated")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def customer_subscription_updated(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -314,6 +324,7 @@ async def customer_subscription_updated(
 
 
 @task("stripe.webhook.customer.subscription.deleted")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def customer_subscription_deleted(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -337,6 +348,7 @@ async def customer_subscription_deleted(
 
 
 @task("stripe.webhook.invoice.paid")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def invoice_paid(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
@@ -363,6 +375,7 @@ async def invoice_paid(
 
 
 @task("stripe.webhook.payout.paid")
+@inbound_webhook_payload
 @stripe_api_connection_error_retry
 async def payout_paid(
     ctx: JobContext, event: stripe.Event, polar_context: PolarWorkerContext
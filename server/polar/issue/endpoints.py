@@ -1,4 +1,5 @@
 import builtins
+from datetime import timedelta
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Query
@@ -45,6 +46,10 @@ from .service import issue as issue_service
 
 router = APIRouter(tags=["issues", APITag.private])
 
+# Issues state and reactions change over time,
+# so keep the serialized recommendations shorter than the recommended IDs.
+FOR_YOU_CACHE_TTL = timedelta(hours=1)
+
 
 @router.get(
     "/issues/",
@@ -197,14 +202,14 @@ async def for_you(
     sessionmaker: AsyncSessionMaker = Depends(get_db_sessionmaker),
     locker: Locker = Depends(get_locker),
 ) -> ListResource[IssueSchema]:
+    # use the serialized recommendations if we have them
+    cache_key = f"for_you:{auth_subject.subject.id}"
+    if cached := await redis.get(cache_key):
+        return ListResource[IssueSchema].model_validate_json(cached)
+
     issues = await github_issue_service.list_issues_from_starred(
         session, redis, locker, sessionmaker, auth_subject.subject
     )
-
-    # get loaded
-    issues = [
-        i for i in [await issue_service.get_loaded(session, i.id) for i in issues] if i
-    ]
     items = [IssueSchema.model_validate(i) for i in issues]
 
     # sort
@@ -244,10 +249,15 @@ async def for_you(
 
     items = spread(items)
 
-    return ListResource(
+    result = ListResource(
         items=items, pagination=Pagination(total_count=len(items), max_page=1)
     )
 
+    if items:
+        await redis.set(cache_key, result.model_dump_json(), ex=FOR_YOU_CACHE_TTL)
+
+    return result
+
 
 @router.get(
     "/issues/{id}",
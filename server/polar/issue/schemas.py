@@ -335,6 +335,99 @@ class IssueCreate(IssueAndPullRequestBase):
 
         return ret
 
+    @classmethod
+    def from_github_graphql(
+        cls,
+        data: dict[str, Any],
+        issue: IssueModel,
+        repository: RepositoryModel,
+    ) -> Self:
+        """
+        Build the schema from an issue fetched with the GraphQL API.
+
+        The GraphQL selection only covers the fields we refresh when crawling:
+        the other ones, like the author or the assignees,
+        are taken from the existing record.
+        """
+        reaction_counts = {
+            group["content"]: group["reactors"]["totalCount"]
+            for group in data["reactionGroups"] or []
+        }
+        reactions = Reactions(
+            total_count=sum(reaction_counts.values()),
+            plus_one=reaction_counts.get("THUMBS_UP", 0),
+            minus_one=reaction_counts.get("THUMBS_DOWN", 0),
+            laugh=reaction_counts.get("LAUGH", 0),
+            hooray=reaction_counts.get("HOORAY", 0),
+            confused=reaction_counts.get("CONFUSED", 0),
+            heart=reaction_counts.get("HEART", 0),
+            rocket=reaction_counts.get("ROCKET", 0),
+            eyes=reaction_counts.get("EYES", 0),
+        )
+
+        # Same shape as the REST API labels, at least for the fields we read
+        labels = [
+            {
+                "node_id": label["id"],
+                "name": label["name"],
+                "color": label["color"],
+                "description": label["description"],
+                "default": label["isDefault"],
+            }
+            for label in data["labels"]["nodes"]
+        ]
+
+        body: str = data["body"] or ""
+        comments: int = data["comments"]["totalCount"]
+        issue_modified_at = datetime.fromisoformat(data["updatedAt"])
+
+        pledge_badge_embedded_at: datetime | None = None
+        if GithubBadge.badge_is_embedded(body):
+            pledge_badge_embedded_at = (
+                issue.pledge_badge_embedded_at or issue_modified_at
+            )
+
+        return cls(
+            platform=issue.platform,
+            external_id=issue.external_id,
+            organization_id=issue.organization_id,
+            repository_id=issue.repository_id,
+            number=issue.number,
+            title=data["title"],
+            body=body,
+            comments=comments,
+            author=issue.author,
+            author_association=issue.author_association,
+            labels=labels,
+            assignee=issue.assignee,
+            assignees=issue.assignees,
+            milestone=issue.milestone,
+            closed_by=issue.closed_by,
+            reactions=reactions.model_dump(mode="json"),
+            state=IssueModel.State(data["state"].lower()),
+            state_reason=data["stateReason"].lower() if data["stateReason"] else None,
+            issue_closed_at=datetime.fromisoformat(data["closedAt"])
+            if data["closedAt"]
+            else None,
+            issue_modified_at=issue_modified_at,
+            issue_created_at=issue.issue_created_at,
+            external_lookup_key=issue.external_lookup_key,
+            has_pledge_badge_label=IssueModel.contains_pledge_badge_label(
+                labels, repository.pledge_badge_label
+            ),
+            pledge_badge_embedded_at=pledge_badge_embedded_at,
+            # excluding: confused, minus_one
+            positive_reactions_count=(
+                reactions.plus_one
+                + reactions.laugh
+                + reactions.heart
+                + reactions.hooray
+                + reactions.eyes
+                + reactions.rocket
+            ),
+            total_engagement_count=reactions.total_count + comments,
+        )
+
 
 class IssueUpdate(IssueCreate): ...
 
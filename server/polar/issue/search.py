@@ -1,3 +1,16 @@
+import hashlib
+import json
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, literal, or_
+
+from polar.models import Issue
+from polar.redis import Redis
+
+
 def search_query(text: str) -> str:
     # cleanup search query
     text = (
@@ -33,3 +46,71 @@ def search_query(text: str) -> str:
 
     # OR all words
     return " | ".join(words)
+
+
+# Below this length, words are too short to produce meaningful trigrams:
+# only the prefix-matching of the full-text search is used.
+TRIGRAM_MIN_LENGTH = 3
+
+# Search results are cached as a list of issue IDs, the issues themselves are
+# always loaded fresh, so we can afford a short staleness on the ranking.
+SEARCH_CACHE_TTL = timedelta(minutes=1)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def get_search_clause(text: str) -> ColumnElement[bool]:
+    """
+    Match issues against a user query.
+
+    The search document (title, labels and body) is matched using the full-text
+    index. Queries long enough are also matched on the title by trigram word
+    similarity, so partial words and typos still return results.
+    """
+    normalized = normalize_query(text)
+    clause: ColumnElement[bool] = Issue.search_tsv.bool_op("@@")(
+        func.to_tsquery("simple", search_query(text))
+    )
+    if len(normalized) >= TRIGRAM_MIN_LENGTH:
+        clause = or_(clause, literal(normalized).bool_op("<%")(Issue.title))
+    return clause
+
+
+def get_search_rank(text: str) -> ColumnElement[float]:
+    normalized = normalize_query(text)
+    return func.ts_rank_cd(
+        Issue.search_tsv, func.to_tsquery("simple", search_query(text))
+    ) + func.word_similarity(normalized, Issue.title)
+
+
+def get_search_cache_key(namespace: str, query: str, **filters: Any) -> str:
+    """
+    Build a cache key for a search, stable across equivalent queries.
+
+    Filters values must be JSON-serializable, or convertible with `str`.
+    """
+    payload = json.dumps(
+        {"query": normalize_query(query), **filters}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"issue_search:{namespace}:{digest}"
+
+
+async def get_cached_search(redis: Redis, key: str) -> tuple[list[UUID], int] | None:
+    cached = await redis.get(key)
+    if cached is None:
+        return None
+    data = json.loads(cached)
+    return [UUID(id) for id in data["ids"]], data["count"]
+
+
+async def set_cached_search(
+    redis: Redis, key: str, ids: Sequence[UUID], count: int
+) -> None:
+    await redis.set(
+        key,
+        json.dumps({"ids": [str(id) for id in ids], "count": count}),
+        ex=SEARCH_CACHE_TTL,
+    )
@@ -14,7 +14,6 @@ from sqlalchemy import (
     and_,
     asc,
     desc,
-    func,
     nullslast,
     or_,
     select,
@@ -24,7 +23,7 @@ from sqlalchemy.orm import aliased, contains_eager, joinedload
 from polar.auth.models import Anonymous, AuthSubject, is_organization, is_user
 from polar.dashboard.schemas import IssueSortBy
 from polar.enums import Platforms
-from polar.issue.search import search_query
+from polar.issue.search import get_search_clause, get_search_rank
 from polar.kit.pagination import PaginationParams, paginate
 from polar.kit.services import ResourceService
 from polar.kit.sorting import Sorting
@@ -165,20 +164,29 @@ class IssueService(ResourceService[Issue, IssueCreate, IssueUpdate]):
         session: AsyncSession,
         id: UUID,
     ) -> Issue | None:
-        statement = (
-            sql.select(Issue)
-            .where(Issue.id == id)
-            .where(Issue.deleted_at.is_(None))
-            .options(
-                joinedload(Issue.repository),
-                joinedload(Issue.repository)
-                .joinedload(Repository.organization)
-                .joinedload(ExternalOrganization.organization),
-            )
-        )
+        statement = self._get_loaded_statement().where(Issue.id == id)
         res = await session.execute(statement)
         return res.scalars().unique().one_or_none()
 
+    async def get_loaded_many(
+        self,
+        session: AsyncSession,
+        ids: Sequence[UUID],
+    ) -> Sequence[Issue]:
+        """
+        Get loaded issues by IDs in a single query.
+
+        The input order is preserved. IDs that don't exist or are deleted
+        are skipped.
+        """
+        if not ids:
+            return []
+
+        statement = self._get_loaded_statement().where(Issue.id.in_(ids))
+        res = await session.execute(statement)
+        issues = {issue.id: issue for issue in res.scalars().unique().all()}
+        return [issues[id] for id in ids if id in issues]
+
     async def get_by_platform(
         self, session: AsyncSession, platform: Platforms, external_id: int
     ) -> Issue | None:
@@ -227,6 +235,19 @@ class IssueService(ResourceService[Issue, IssueCreate, IssueUpdate]):
         issues = res.scalars().unique().all()
         return issues
 
+    async def list_by_repository_and_ids(
+        self, session: AsyncSession, repository_id: UUID, ids: Sequence[UUID]
+    ) -> Sequence[Issue]:
+        statement = (
+            sql.select(Issue)
+            .where(Issue.repository_id == repository_id)
+            .where(Issue.id.in_(ids))
+            .where(Issue.deleted_at.is_(None))
+        )
+        res = await session.execute(statement)
+        issues = res.scalars().unique().all()
+        return issues
+
     async def list_by_repository_type_and_status(
         self,
         session: AsyncSession,
@@ -328,17 +349,11 @@ class IssueService(ResourceService[Issue, IssueCreate, IssueUpdate]):
 
         # free text search
         if text:
-            search = search_query(text)
-
-            statement = statement.where(
-                Issue.title_tsv.bool_op("@@")(func.to_tsquery(search))
-            )
+            statement = statement.where(get_search_clause(text))
 
             # Sort results based on matching
             if sort_by == IssueSortBy.relevance:
-                statement = statement.order_by(
-                    desc(func.ts_rank_cd(Issue.title_tsv, func.to_tsquery(search)))
-                )
+                statement = statement.order_by(desc(get_search_rank(text)))
 
         if sort_by == IssueSortBy.issues_default:
             statement = statement.order_by(
@@ -607,5 +622,17 @@ class IssueService(ResourceService[Issue, IssueCreate, IssueUpdate]):
 
         return statement
 
+    def _get_loaded_statement(self) -> sql.Select[tuple[Issue]]:
+        return (
+            sql.select(Issue)
+            .where(Issue.deleted_at.is_(None))
+            .options(
+                joinedload(Issue.repository),
+                joinedload(Issue.repository)
+                .joinedload(Repository.organization)
+                .joinedload(ExternalOrganization.organization),
+            )
+        )
+
 
 issue = IssueService(Issue)
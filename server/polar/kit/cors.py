@@ -1,9 +1,11 @@
 import dataclasses
-from collections.abc import Sequence
+import functools
+from collections.abc import Iterable, Sequence
 from typing import Protocol
 
 from starlette.datastructures import Headers
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 
@@ -11,6 +13,16 @@ class CORSMatcher(Protocol):
     def __call__(self, origin: str, scope: Scope) -> bool: ...
 
 
+def origins_matcher(origins: Iterable[str]) -> CORSMatcher:
+    """Match a fixed list of origins, compiled into a set."""
+    allowed_origins = frozenset(origins)
+
+    def _matcher(origin: str, scope: Scope) -> bool:
+        return origin in allowed_origins
+
+    return _matcher
+
+
 @dataclasses.dataclass
 class CORSConfig:
     matcher: CORSMatcher
@@ -36,43 +48,83 @@ class CORSConfig:
 
 
 class CORSMatcherMiddleware:
-    def __init__(self, app: ASGIApp, *, configs: Sequence[CORSConfig]) -> None:
+    """
+    Apply the CORS configuration of the first config matching the request origin.
+
+    Preflight responses only depend on the config and on the origin, method and
+    headers requested, so they are built once and kept in a bounded LRU cache.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        configs: Sequence[CORSConfig],
+        preflight_cache_size: int = 1024,
+    ) -> None:
         self.app = app
         self.config_middlewares = tuple(
             (config, config.get_middleware(app)) for config in configs
         )
+        self._get_preflight_response = functools.lru_cache(
+            maxsize=preflight_cache_size
+        )(self._build_preflight_response)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":  # pragma: no cover
             await self.app(scope, receive, send)
             return
 
-        method = scope["method"]
-        headers = Headers(scope=scope)
-        origin = headers.get("origin")
+        origin: str | None = None
+        requested_method: str | None = None
+        requested_headers: str | None = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value.decode("latin-1")
+            elif key == b"access-control-request-method":
+                requested_method = value.decode("latin-1")
+            elif key == b"access-control-request-headers":
+                requested_headers = value.decode("latin-1")
 
         if origin is None:
             await self.app(scope, receive, send)
             return
 
-        middleware = self._get_config_middleware(origin, scope)
-        if middleware is None:
+        middleware_index = self._get_config_middleware_index(origin, scope)
+        if middleware_index is None:
             await self.app(scope, receive, send)
             return
 
-        if method == "OPTIONS" and "access-control-request-method" in headers:
-            response = middleware.preflight_response(request_headers=headers)
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            response = self._get_preflight_response(
+                middleware_index, origin, requested_method, requested_headers
+            )
             await response(scope, receive, send)
             return
-        await middleware.simple_response(scope, receive, send, request_headers=headers)
 
-    def _get_config_middleware(
-        self, origin: str, scope: Scope
-    ) -> CORSMiddleware | None:
-        for config, middleware in self.config_middlewares:
+        _, middleware = self.config_middlewares[middleware_index]
+        await middleware.simple_response(
+            scope, receive, send, request_headers=Headers(scope=scope)
+        )
+
+    def _get_config_middleware_index(self, origin: str, scope: Scope) -> int | None:
+        for index, (config, _) in enumerate(self.config_middlewares):
             if config.matcher(origin, scope):
-                return middleware
+                return index
         return None
 
-
-__all__ = ["CORSConfig", "CORSMatcherMiddleware", "Scope"]
+    def _build_preflight_response(
+        self,
+        middleware_index: int,
+        origin: str,
+        requested_method: str,
+        requested_headers: str | None,
+    ) -> Response:
+        _, middleware = self.config_middlewares[middleware_index]
+        headers = {"origin": origin, "access-control-request-method": requested_method}
+        if requested_headers is not None:
+            headers["access-control-request-headers"] = requested_headers
+        return middleware.preflight_response(request_headers=Headers(headers=headers))
+
+
+__all__ = ["CORSConfig", "CORSMatcherMiddleware", "Scope", "origins_matcher"]
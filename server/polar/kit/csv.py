@@ -82,6 +82,12 @@ class IterableCSVWriter:
         self.writer.writerow(row)
         return self.read()
 
+    def getrows(self, rows: Iterable[Iterable[Any]]) -> str:
+        self.writer.writerows(rows)
+        lines = "".join(self._lines)
+        self._lines.clear()
+        return lines
+
     def write(self, line: str) -> None:
         self._lines.append(line)
 
@@ -0,0 +1,142 @@
+"""
+Cache the entities loaded by ID within a session, i.e. a request or a job.
+
+Service getters decorated with `identity_cached` run their query once per
+session and arguments: later calls return the same instance, and concurrent
+calls wait for the load in flight instead of issuing their own.
+
+The cache is conservative. It's cleared when the transaction ends or on bulk
+UPDATE/DELETE statements, and an entry is dropped when its instance is
+modified, deleted or detached from the session.
+"""
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Concatenate, ParamSpec, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+_CACHE_KEY = "polar_identity_cache"
+
+S = TypeVar("S")
+T = TypeVar("T")
+P = ParamSpec("P")
+
+IdentityCache = dict[Hashable, "asyncio.Future[Any]"]
+
+
+def _get_cache(session: Session) -> IdentityCache:
+    return session.info.setdefault(_CACHE_KEY, {})
+
+
+def clear(session: Session) -> None:
+    session.info.pop(_CACHE_KEY, None)
+
+
+async def get_or_load(
+    session: AsyncSession, key: Hashable, loader: Callable[[], Awaitable[T | None]]
+) -> T | None:
+    cache = _get_cache(session.sync_session)
+
+    future = cache.get(key)
+    if future is not None:
+        # Shielded, so a cancelled waiter doesn't cancel the load for the others
+        value = await asyncio.shield(future)
+        if value is None or (value in session and not inspect(value).modified):
+            return value
+        # Expunged or modified meanwhile: load it again
+        if cache.get(key) is future:
+            del cache[key]
+        return await get_or_load(session, key, loader)
+
+    future = asyncio.get_running_loop().create_future()
+    cache[key] = future
+    try:
+        value = await loader()
+    except Exception as e:
+        if cache.get(key) is future:
+            del cache[key]
+        future.set_exception(e)
+        # Retrieve it, so the event loop doesn't warn about it without waiters
+        future.exception()
+        raise
+    except BaseException:
+        if cache.get(key) is future:
+            del cache[key]
+        future.cancel()
+        raise
+
+    future.set_result(value)
+    # Don't remember misses: the entity may be created later in the session
+    if value is None and cache.get(key) is future:
+        del cache[key]
+    return value
+
+
+def identity_cached(
+    f: Callable[Concatenate[S, AsyncSession, P], Awaitable[T | None]],
+) -> Callable[Concatenate[S, AsyncSession, P], Awaitable[T | None]]:
+    """
+    Cache a service getter in the session, by service, method and arguments.
+
+    Calls with loader `options` are not cached, since they load the entity
+    differently.
+    """
+
+    @functools.wraps(f)
+    async def wrapper(
+        self: S, session: AsyncSession, *args: P.args, **kwargs: P.kwargs
+    ) -> T | None:
+        if kwargs.get("options") is not None:
+            return await f(self, session, *args, **kwargs)
+
+        key = (type(self), f.__qualname__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return await f(self, session, *args, **kwargs)
+
+        return await get_or_load(
+            session, key, lambda: f(self, session, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_on_transaction_end(session: Session) -> None:
+    clear(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_on_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    clear(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _clear_on_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        clear(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_flushed(session: Session, flush_context: UOWTransaction) -> None:
+    cache: IdentityCache | None = session.info.get(_CACHE_KEY)
+    if not cache:
+        return
+    # `dirty` and `deleted` still reflect the state before the flush here
+    changed = {id(instance) for instance in (*session.dirty, *session.deleted)}
+    if not changed:
+        return
+    for key, future in list(cache.items()):
+        if (
+            future.done()
+            and not future.cancelled()
+            and future.exception() is None
+            and id(future.result()) in changed
+        ):
+            del cache[key]
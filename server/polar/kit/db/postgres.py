@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..extensions.sqlalchemy import sql
+from .query_stats import instrument_engine
 
 
 def create_async_engine(
@@ -23,7 +24,7 @@ def create_async_engine(
     pool_recycle: int | None = None,
     debug: bool = False,
 ) -> AsyncEngine:
-    return _create_async_engine(
+    engine = _create_async_engine(
         dsn,
         echo=debug,
         connect_args={"server_settings": {"application_name": application_name}}
@@ -32,6 +33,8 @@ def create_async_engine(
         pool_size=pool_size,
         pool_recycle=pool_recycle,
     )
+    instrument_engine(engine.sync_engine)
+    return engine
 
 
 def create_sync_engine(
@@ -42,13 +45,15 @@ def create_sync_engine(
     pool_recycle: int | None = None,
     debug: bool = False,
 ) -> Engine:
-    return _create_engine(
+    engine = _create_engine(
         dsn,
         echo=debug,
         connect_args={"application_name": application_name} if application_name else {},
         pool_size=pool_size,
         pool_recycle=pool_recycle,
     )
+    instrument_engine(engine)
+    return engine
 
 
 AsyncSessionMaker: TypeAlias = async_sessionmaker[AsyncSession]
@@ -0,0 +1,109 @@
+"""
+Count the SQL statements executed within a unit of work, like a request or a job.
+
+Engines are instrumented once with `instrument_engine`. Statements are then
+recorded on the `QueryStats` of every enclosing `track_queries` block, so a
+budget set around a request also covers the request's own tracking.
+
+Identical statements, i.e. same SQL with possibly different parameters,
+repeated many times within a block are usually the sign of an N+1 pattern.
+"""
+
+import contextlib
+import contextvars
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    duration: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def get_repeated(self, threshold: int) -> dict[str, int]:
+        """Return the statements executed at least `threshold` times."""
+        return {
+            statement: count
+            for statement, count in self.shapes.most_common()
+            if count >= threshold
+        }
+
+    def to_attributes(self) -> dict[str, int | float]:
+        return {
+            "db.statements": self.statements,
+            "db.duration_ms": round(self.duration * 1000, 3),
+            "db.max_repeats": self.max_repeats,
+        }
+
+
+_current_query_stats = contextvars.ContextVar[tuple[QueryStats, ...]](
+    "polar_current_query_stats", default=()
+)
+
+
+def get_current_query_stats() -> QueryStats | None:
+    stack = _current_query_stats.get()
+    return stack[-1] if stack else None
+
+
+@contextlib.contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_query_stats.set((*_current_query_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if not _current_query_stats.get() or context is None:
+        return
+    # Kept on the execution context, so a failing statement doesn't leave it
+    # behind on the pooled connection
+    context._polar_query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stack = _current_query_stats.get()
+    if not stack:
+        return
+    start_time: float | None = getattr(context, "_polar_query_start_time", None)
+    if start_time is None:
+        return
+    duration = time.perf_counter() - start_time
+    for stats in stack:
+        stats.statements += 1
+        stats.duration += duration
+        stats.shapes[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
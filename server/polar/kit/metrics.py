@@ -0,0 +1,225 @@
+"""
+Minimal in-process metrics, exposed in the Prometheus text format.
+
+Metrics are registered on a `Registry`, which renders them all for a scrape.
+Values are kept in memory per process: run one `MetricsServer` per process.
+"""
+
+import asyncio
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from typing import ClassVar, TypeVar
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    labels = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    )
+    return f"{{{labels}}}"
+
+
+class Metric(ABC):
+    type: ClassVar[str]
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _get_label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]:
+        pass
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self._render_samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, /, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._get_label_values(labels), 0)
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, /, **labels: str) -> None:
+        self._values[self._get_label_values(labels)] = value
+
+    def dec(self, amount: float = 1, /, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, /, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._sums[key] = self._sums.get(key, 0) + value
+
+    def get_count(self, **labels: str) -> int:
+        counts = self._counts.get(self._get_label_values(labels))
+        return counts[-1] if counts is not None else 0
+
+    def _render_samples(self) -> list[str]:
+        samples: list[str] = []
+        bucket_labelnames = (*self.labelnames, "le")
+        for key, counts in self._counts.items():
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(bucket_labelnames, (*key, _format_value(bound)))
+                samples.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            samples.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            samples.append(f"{self.name}_count{labels} {counts[-1]}")
+        return samples
+
+
+Collector = Callable[[], Awaitable[None]]
+
+M = TypeVar("M", bound=Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """
+        Add a coroutine run before each scrape, to refresh gauges whose value
+        is read from an external source.
+        """
+        self._collectors.append(collector)
+
+    async def render(self) -> str:
+        for collector in self._collectors:
+            await collector()
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+class MetricsServer:
+    """
+    Bare HTTP server answering `GET /metrics` with the registry metrics.
+
+    It runs on the process event loop, so it doesn't need any locking.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, registry: Registry, *, host: str, port: int) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            # Drain the headers, we don't need them
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass
+
+            method, path, *_ = request_line.decode("latin-1").split(" ")
+            if method == "GET" and path.split("?")[0] == "/metrics":
+                status = "200 OK"
+                body = (await self.registry.render()).encode()
+            else:
+                status = "404 Not Found"
+                body = b""
+
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: {self.content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode()
+                + body
+            )
+            await writer.drain()
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
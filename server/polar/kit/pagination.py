@@ -1,15 +1,45 @@
+import base64
+import binascii
+import enum
+import hashlib
+import json
 import math
 from collections.abc import Sequence
-from typing import Annotated, Any, Generic, NamedTuple, Self, TypeVar, overload
+from datetime import date, datetime
+from decimal import Decimal
+from typing import (
+    Annotated,
+    Any,
+    Generic,
+    NamedTuple,
+    Self,
+    TypeVar,
+    cast,
+    overload,
+)
+from uuid import UUID
 
 from fastapi import Depends, Query
-from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic import BaseModel, Field, GetCoreSchemaHandler
 from pydantic._internal._repr import display_as_type
 from pydantic_core import CoreSchema
-from sqlalchemy import Select, func, over
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    UnaryExpression,
+    and_,
+    false,
+    func,
+    or_,
+    over,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import operators
 from sqlalchemy.sql._typing import _ColumnsClauseArgument
 
 from polar.config import settings
+from polar.exceptions import PolarRequestValidationError
 from polar.kit.db.models import RecordModel
 from polar.kit.db.models.base import Model
 from polar.kit.db.postgres import AsyncSession
@@ -25,6 +55,12 @@ class PaginationParams(NamedTuple):
     limit: int
 
 
+class CursorPaginationParams(NamedTuple):
+    cursor: str | None
+    limit: int
+    include_total: bool = True
+
+
 @overload
 async def paginate(
     session: AsyncSession,
@@ -86,6 +122,257 @@ async def paginate(
     return results, count
 
 
+class InvalidCursor(PolarRequestValidationError):
+    def __init__(self, cursor: str) -> None:
+        super().__init__(
+            [
+                {
+                    "loc": ("query", "cursor"),
+                    "msg": "Invalid cursor.",
+                    "type": "value_error",
+                    "input": cursor,
+                }
+            ]
+        )
+
+
+class _SortKey(NamedTuple):
+    expression: ColumnElement[Any]
+    desc: bool
+    nulls_last: bool
+
+
+def _get_sort_keys(
+    order_by: Sequence[ColumnElement[Any]], tiebreaker: ColumnElement[Any]
+) -> list[_SortKey]:
+    sort_keys: list[_SortKey] = []
+    for clause in [*order_by, tiebreaker]:
+        nulls_last: bool | None = None
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.nulls_first_op,
+            operators.nulls_last_op,
+        ):
+            nulls_last = clause.modifier is operators.nulls_last_op
+            clause = cast(ColumnElement[Any], clause.element)
+        desc = False
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.asc_op,
+            operators.desc_op,
+        ):
+            desc = clause.modifier is operators.desc_op
+            clause = cast(ColumnElement[Any], clause.element)
+        # PostgreSQL puts NULL values last in ascending order, first in descending
+        sort_keys.append(
+            _SortKey(clause, desc, nulls_last if nulls_last is not None else not desc)
+        )
+    return sort_keys
+
+
+def _get_sort_signature(sort_keys: Sequence[_SortKey]) -> str:
+    """Short hash of the sorting, so a cursor can't be used with another one."""
+    sorting = ",".join(
+        f"{sort_key.expression}:{sort_key.desc}:{sort_key.nulls_last}"
+        for sort_key in sort_keys
+    )
+    return hashlib.sha256(sorting.encode()).hexdigest()[:8]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        ((tag, v),) = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(v)
+        if tag == "d":
+            return date.fromisoformat(v)
+        if tag == "u":
+            return UUID(v)
+        if tag == "n":
+            return Decimal(v)
+        raise ValueError(tag)
+    return value
+
+
+def encode_cursor(sort_keys: Sequence[_SortKey], values: Sequence[Any]) -> str:
+    payload = {
+        "s": _get_sort_signature(sort_keys),
+        "v": [_encode_value(value) for value in values],
+    }
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    ).decode()
+
+
+def decode_cursor(sort_keys: Sequence[_SortKey], cursor: str) -> list[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["s"] != _get_sort_signature(sort_keys):
+            raise InvalidCursor(cursor)
+        values = [_decode_value(value) for value in payload["v"]]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(cursor) from e
+    if len(values) != len(sort_keys):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def _get_keyset_clause(
+    sort_keys: Sequence[_SortKey], values: Sequence[Any]
+) -> ColumnElement[bool]:
+    """
+    Build the clause selecting rows strictly after the given sort key values.
+
+    It expands to `(a > x) OR (a = x AND b > y) OR ...`, so it supports mixed
+    sorting directions and NULL values, unlike a row value comparison.
+    """
+
+    def _equal(sort_key: _SortKey, value: Any) -> ColumnElement[bool]:
+        if value is None:
+            return sort_key.expression.is_(None)
+        return sort_key.expression == value
+
+    def _after(sort_key: _SortKey, value: Any) -> ColumnElement[bool]:
+        expression = sort_key.expression
+        if value is None:
+            return false() if sort_key.nulls_last else expression.is_not(None)
+        comparison = expression < value if sort_key.desc else expression > value
+        if sort_key.nulls_last:
+            return or_(comparison, expression.is_(None))
+        return comparison
+
+    return or_(
+        *(
+            and_(
+                *(_equal(sort_keys[j], values[j]) for j in range(i)),
+                _after(sort_keys[i], values[i]),
+            )
+            for i in range(len(sort_keys))
+        )
+    )
+
+
+async def get_estimated_count(session: AsyncSession, statement: Select[Any]) -> int:
+    """
+    Return the number of rows the query planner expects the statement to return.
+
+    It's way cheaper than an actual count on large tables,
+    but may be inaccurate, especially with restrictive filters.
+    """
+    compiled = statement.order_by(None).compile(
+        dialect=postgresql.asyncpg.dialect(),
+        # Expand `IN` parameters, the statement is sent as-is to `EXPLAIN`
+        compile_kwargs={"render_postcompile": True},
+    )
+    parameters = tuple(compiled.params[key] for key in compiled.positiontup or [])
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", parameters
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate_cursor(
+    session: AsyncSession,
+    statement: Select[Any],
+    *,
+    pagination: PaginationParams | CursorPaginationParams,
+    order_by: Sequence[ColumnElement[Any]],
+    tiebreaker: ColumnElement[Any] | None = None,
+    count_clause: _ColumnsClauseArgument[Any] | None = None,
+) -> tuple[Sequence[Any], int, str | None]:
+    """
+    Paginate a statement, returning an opaque cursor pointing to the next page.
+
+    With `CursorPaginationParams`, the page is selected by keyset on the sort keys,
+    instead of `OFFSET`: the cost doesn't grow with the page depth.
+    `PaginationParams` are still supported, so clients can start from a page
+    and continue with the returned cursor.
+
+    Args:
+        order_by: Sorting clauses. Don't apply them on the statement yourself.
+        tiebreaker: Unique column appended to the sorting, so the order is total.
+        Defaults to the `id` of the statement's first entity.
+
+    Returns:
+        The results, the total count and the next page cursor, if any.
+        If `include_total` is disabled, the total count is the planner estimate.
+    """
+    if tiebreaker is None:
+        tiebreaker = statement.column_descriptions[0]["entity"].id
+    sort_keys = _get_sort_keys(order_by, tiebreaker)
+    base_statement = statement
+
+    statement = statement.order_by(*order_by, tiebreaker)
+    statement = statement.add_columns(
+        *(
+            sort_key.expression.label(f"_cursor_{i}")
+            for i, sort_key in enumerate(sort_keys)
+        )
+    )
+
+    with_window_count = False
+    count: int | None = None
+    if isinstance(pagination, CursorPaginationParams):
+        if pagination.cursor is not None:
+            values = decode_cursor(sort_keys, pagination.cursor)
+            statement = statement.where(_get_keyset_clause(sort_keys, values))
+            if pagination.include_total:
+                count_statement = select(func.count()).select_from(
+                    base_statement.order_by(None).subquery()
+                )
+                count = (await session.execute(count_statement)).scalar_one()
+        elif pagination.include_total:
+            with_window_count = True
+        if not pagination.include_total:
+            count = await get_estimated_count(session, base_statement)
+    else:
+        statement = statement.offset(pagination.limit * (pagination.page - 1))
+        with_window_count = True
+
+    statement = statement.limit(pagination.limit)
+    if with_window_count:
+        statement = statement.add_columns(
+            count_clause if count_clause is not None else over(func.count())
+        )
+
+    result = await session.execute(statement)
+
+    results: list[Any] = []
+    last_values: list[Any] = []
+    for row in result.unique().all():
+        queried_data = list(row._tuple())
+        if with_window_count:
+            count = int(queried_data.pop())
+        last_values = queried_data[-len(sort_keys) :]
+        queried_data = queried_data[: -len(sort_keys)]
+        if len(queried_data) == 1:
+            results.append(queried_data[0])
+        else:
+            results.append(queried_data)
+
+    next_cursor: str | None = None
+    if len(results) == pagination.limit:
+        next_cursor = encode_cursor(sort_keys, last_values)
+
+    return results, count or 0, next_cursor
+
+
 async def get_pagination_params(
     page: int = Query(1, description="Page number, defaults to 1.", gt=0),
     limit: int = Query(
@@ -103,9 +390,58 @@ async def get_pagination_params(
 PaginationParamsQuery = Annotated[PaginationParams, Depends(get_pagination_params)]
 
 
+async def get_cursor_pagination_params(
+    page: int = Query(
+        1,
+        description="Page number, defaults to 1. Ignored if `cursor` is set.",
+        gt=0,
+    ),
+    limit: int = Query(
+        10,
+        description=(
+            f"Size of a page, defaults to 10. "
+            f"Maximum is {settings.API_PAGINATION_MAX_LIMIT}."
+        ),
+        gt=0,
+    ),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Cursor of the page to fetch, "
+            "as returned in `pagination.next_cursor` by the previous page. "
+            "Recommended over `page` to browse large lists."
+        ),
+    ),
+    include_total: bool = Query(
+        True,
+        description=(
+            "Whether to compute the exact total count. "
+            "If `false`, `pagination.total_count` is an estimate, "
+            "and `cursor` pagination is used, starting from the first page."
+        ),
+    ),
+) -> PaginationParams | CursorPaginationParams:
+    limit = min(settings.API_PAGINATION_MAX_LIMIT, limit)
+    if cursor is not None or not include_total:
+        return CursorPaginationParams(cursor, limit, include_total)
+    return PaginationParams(page, limit)
+
+
+CursorPaginationParamsQuery = Annotated[
+    PaginationParams | CursorPaginationParams, Depends(get_cursor_pagination_params)
+]
+
+
 class Pagination(Schema):
     total_count: int
     max_page: int
+    next_cursor: str | None = Field(
+        default=None,
+        description=(
+            "Cursor to pass to get the next page, if any. "
+            "Only set on endpoints supporting cursor pagination."
+        ),
+    )
 
 
 class ListResource(BaseModel, Generic[T]):
@@ -114,13 +450,18 @@ class ListResource(BaseModel, Generic[T]):
 
     @classmethod
     def from_paginated_results(
-        cls, items: Sequence[T], total_count: int, pagination_params: PaginationParams
+        cls,
+        items: Sequence[T],
+        total_count: int,
+        pagination_params: PaginationParams | CursorPaginationParams,
+        next_cursor: str | None = None,
     ) -> Self:
         return cls(
             items=list(items),
             pagination=Pagination(
                 total_count=total_count,
                 max_page=math.ceil(total_count / pagination_params.limit),
+                next_cursor=next_cursor,
             ),
         )
 
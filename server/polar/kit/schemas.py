@@ -3,9 +3,9 @@ import json
 from collections.abc import Sequence
 from datetime import datetime
 from typing import Annotated, Any, Literal, TypeVar, cast, get_args, overload
+from uuid import UUID
 
 from pydantic import (
-    UUID4,
     AfterValidator,
     BaseModel,
     ConfigDict,
@@ -20,6 +20,8 @@ from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import CoreSchema, PydanticCustomError, core_schema
 from slugify import slugify
 
+from polar.config import settings
+
 from .email import EmailNotValidError, validate_email
 
 
@@ -27,8 +29,20 @@ class Schema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+def get_type_adapter_config() -> ConfigDict | None:
+    """
+    Config for the module-level `TypeAdapter` of large unions.
+
+    In lazy startup mode, their validator and serializer are built
+    on first use instead of at import time.
+    """
+    if not settings.LAZY_STARTUP:
+        return None
+    return ConfigDict(defer_build=True, experimental_defer_build_mode=("type_adapter",))
+
+
 class IDSchema(Schema):
-    id: UUID4 = Field(..., description="The ID of the object.")
+    id: UUID = Field(..., description="The ID of the object.")
 
     model_config = ConfigDict(
         # IMPORTANT: this ensures FastAPI doesn't generate `-Input` for output schemas
@@ -83,7 +97,7 @@ def _validate_slug(value: str) -> str:
 
 SlugValidator = AfterValidator(_validate_slug)
 
-UUID4ToStr = Annotated[UUID4, PlainSerializer(lambda v: str(v), return_type=str)]
+UUIDToStr = Annotated[UUID, PlainSerializer(lambda v: str(v), return_type=str)]
 HttpUrlToStr = Annotated[HttpUrl, PlainSerializer(lambda v: str(v), return_type=str)]
 
 
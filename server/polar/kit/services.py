@@ -9,6 +9,7 @@ from sqlalchemy.sql.base import ExecutableOption
 
 from polar.kit.utils import utc_now
 
+from .db.identity_cache import identity_cached
 from .db.models import RecordModel
 from .db.postgres import AsyncSession, sql
 from .schemas import Schema
@@ -25,6 +26,7 @@ class ResourceServiceReader(
     def __init__(self, model: type[ModelType]) -> None:
         self.model = model
 
+    @identity_cached
     async def get(
         self,
         session: AsyncSession,
@@ -1,3 +1,6 @@
+import os
+import threading
+import time
 import uuid
 from datetime import UTC, datetime
 
@@ -6,8 +9,49 @@ def utc_now() -> datetime:
     return datetime.now(UTC)
 
 
+_uuid7_lock = threading.Lock()
+_uuid7_last_timestamp_ms = 0
+_uuid7_last_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits are the Unix timestamp in milliseconds. The next 12 bits
+    are a counter, randomly seeded each millisecond and incremented for each
+    UUID generated within it, so UUIDs of a process are strictly increasing.
+    The remaining 62 bits are random.
+    """
+    global _uuid7_last_timestamp_ms, _uuid7_last_counter
+
+    with _uuid7_lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _uuid7_last_timestamp_ms:
+            # Leave room in the counter for UUIDs of the same millisecond
+            counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        else:
+            # Same millisecond, or clock moved backwards
+            timestamp_ms = _uuid7_last_timestamp_ms
+            counter = _uuid7_last_counter + 1
+            if counter > 0xFFF:
+                timestamp_ms += 1
+                counter = 0
+        _uuid7_last_timestamp_ms = timestamp_ms
+        _uuid7_last_counter = counter
+
+    random = int.from_bytes(os.urandom(8)) & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(
+        int=(timestamp_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | random
+    )
+
+
 def generate_uuid() -> uuid.UUID:
-    return uuid.uuid4()
+    return uuid7()
 
 
 def human_readable_size(num: float, suffix: str = "B") -> str:
@@ -1,11 +1,12 @@
+from uuid import UUID
+
 from fastapi import Depends, Query
-from pydantic import UUID4
 
 from polar.authz.service import AccessType, Authz
 from polar.benefit.schemas import BenefitID
 from polar.exceptions import ResourceNotFound, Unauthorized
 from polar.kit.db.postgres import AsyncSession
-from polar.kit.pagination import ListResource, PaginationParamsQuery
+from polar.kit.pagination import CursorPaginationParamsQuery, ListResource
 from polar.kit.schemas import MultipleQueryFilter
 from polar.models import LicenseKey, LicenseKeyActivation
 from polar.openapi import APITag
@@ -44,7 +45,7 @@ router = APIRouter(
 )
 async def list(
     auth_subject: auth.LicenseKeysRead,
-    pagination: PaginationParamsQuery,
+    pagination: CursorPaginationParamsQuery,
     organization_id: MultipleQueryFilter[OrganizationID] | None = Query(
         None, title="OrganizationID Filter", description="Filter by organization ID."
     ),
@@ -54,7 +55,7 @@ async def list(
     session: AsyncSession = Depends(get_db_session),
 ) -> ListResource[LicenseKeyRead]:
     """Get license keys connected to the given organization & filters."""
-    results, count = await license_key_service.get_list(
+    results, count, next_cursor = await license_key_service.get_list(
         session,
         auth_subject,
         organization_ids=organization_id,
@@ -66,6 +67,7 @@ async def list(
         [LicenseKeyRead.model_validate(result) for result in results],
         count,
         pagination,
+        next_cursor,
     )
 
 
@@ -80,7 +82,7 @@ async def list(
 )
 async def get(
     auth_subject: auth.LicenseKeysRead,
-    id: UUID4,
+    id: UUID,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
 ) -> LicenseKey:
@@ -106,7 +108,7 @@ async def get(
 )
 async def update(
     auth_subject: auth.LicenseKeysWrite,
-    id: UUID4,
+    id: UUID,
     updates: LicenseKeyUpdate,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
@@ -139,8 +141,8 @@ async def update(
 )
 async def get_activation(
     auth_subject: auth.LicenseKeysRead,
-    id: UUID4,
-    activation_id: UUID4,
+    id: UUID,
+    activation_id: UUID,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
 ) -> LicenseKeyActivation:
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Any, Literal, Self
+from uuid import UUID
 
 from dateutil.relativedelta import relativedelta
-from pydantic import UUID4, Field
+from pydantic import Field
 
 from polar.benefit.schemas import BenefitID
 from polar.exceptions import ResourceNotFound, Unauthorized
@@ -36,17 +37,17 @@ UnauthorizedResponse = {
 
 class LicenseKeyValidate(Schema):
     key: str
-    organization_id: UUID4
-    activation_id: UUID4 | None = None
+    organization_id: UUID
+    activation_id: UUID | None = None
     benefit_id: BenefitID | None = None
-    user_id: UUID4 | None = None
+    user_id: UUID | None = None
     increment_usage: int | None = None
     conditions: dict[str, Any] = {}
 
 
 class LicenseKeyActivate(Schema):
     key: str
-    organization_id: UUID4
+    organization_id: UUID
     label: str
     conditions: dict[str, Any] = {}
     meta: dict[str, Any] = {}
@@ -54,21 +55,21 @@ class LicenseKeyActivate(Schema):
 
 class LicenseKeyDeactivate(Schema):
     key: str
-    organization_id: UUID4
-    activation_id: UUID4
+    organization_id: UUID
+    activation_id: UUID
 
 
 class LicenseKeyUser(Schema):
-    id: UUID4
+    id: UUID
     public_name: str
     email: str
     avatar_url: str | None
 
 
 class LicenseKeyRead(Schema):
-    id: UUID4
-    organization_id: UUID4
-    user_id: UUID4
+    id: UUID
+    organization_id: UUID
+    user_id: UUID
     user: LicenseKeyUser
     benefit_id: BenefitID
     key: str
@@ -83,8 +84,8 @@ class LicenseKeyRead(Schema):
 
 
 class LicenseKeyActivationBase(Schema):
-    id: UUID4
-    license_key_id: UUID4
+    id: UUID
+    license_key_id: UUID
     label: str
     meta: dict[str, Any]
     created_at: datetime
@@ -112,8 +113,8 @@ class LicenseKeyUpdate(Schema):
 
 
 class LicenseKeyCreate(LicenseKeyUpdate):
-    organization_id: UUID4
-    user_id: UUID4
+    organization_id: UUID
+    user_id: UUID
     benefit_id: BenefitID
     key: str
 
@@ -142,9 +143,9 @@ class LicenseKeyCreate(LicenseKeyUpdate):
     @classmethod
     def build(
         cls,
-        organization_id: UUID4,
-        user_id: UUID4,
-        benefit_id: UUID4,
+        organization_id: UUID,
+        user_id: UUID,
+        benefit_id: UUID,
         prefix: str | None = None,
         status: LicenseKeyStatus = LicenseKeyStatus.granted,
         limit_usage: int | None = None,
@@ -7,7 +7,12 @@ from sqlalchemy.orm import contains_eager, joinedload
 
 from polar.auth.models import AuthSubject, is_organization, is_user
 from polar.exceptions import BadRequest, NotPermitted, ResourceNotFound
-from polar.kit.pagination import PaginationParams, paginate
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    PaginationParams,
+    paginate,
+    paginate_cursor,
+)
 from polar.kit.services import ResourceService
 from polar.kit.utils import utc_now
 from polar.models import (
@@ -140,11 +145,11 @@ class LicenseKeyService(
         session: AsyncSession,
         auth_subject: AuthSubject[User | Organization],
         *,
-        pagination: PaginationParams,
+        pagination: PaginationParams | CursorPaginationParams,
         benefit_ids: Sequence[UUID] | None = None,
         organization_ids: Sequence[UUID] | None = None,
-    ) -> tuple[Sequence[LicenseKey], int]:
-        query = self._get_select_base().order_by(LicenseKey.created_at.asc())
+    ) -> tuple[Sequence[LicenseKey], int, str | None]:
+        query = self._get_select_base()
 
         if is_user(auth_subject):
             user = auth_subject.subject
@@ -163,7 +168,12 @@ class LicenseKeyService(
         if benefit_ids:
             query = query.where(LicenseKey.benefit_id.in_(benefit_ids))
 
-        return await paginate(session, query, pagination=pagination)
+        return await paginate_cursor(
+            session,
+            query,
+            pagination=pagination,
+            order_by=[LicenseKey.created_at.asc()],
+        )
 
     async def get_user_list(
         self,
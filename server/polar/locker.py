@@ -8,7 +8,7 @@ from redis.exceptions import LockError, LockNotOwnedError
 
 from polar.exceptions import PolarError
 from polar.logging import Logger
-from polar.redis import Redis, get_redis
+from polar.redis import Redis, get_redis_locks
 
 log: Logger = structlog.get_logger()
 
@@ -104,5 +104,5 @@ class Locker:
             log.debug("released lock", name=name)
 
 
-async def get_locker(redis: Redis = Depends(get_redis)) -> Locker:
+async def get_locker(redis: Redis = Depends(get_redis_locks)) -> Locker:
     return Locker(redis)
@@ -1,7 +1,8 @@
 import datetime
 from typing import Literal
+from uuid import UUID
 
-from pydantic import UUID4, EmailStr, field_validator
+from pydantic import EmailStr, field_validator
 
 from polar.kit.http import get_safe_return_url
 from polar.kit.schemas import EmailStrDNS, Schema
@@ -27,7 +28,7 @@ class MagicLinkCreate(Schema):
     token_hash: str
     user_email: EmailStr
     signup_attribution: UserSignupAttribution | None = None
-    user_id: UUID4 | None = None
+    user_id: UUID | None = None
     source: MagicLinkSource
     expires_at: datetime.datetime | None = None
 
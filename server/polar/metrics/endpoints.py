@@ -7,7 +7,7 @@ from polar.kit.schemas import MultipleQueryFilter
 from polar.models.product_price import ProductPriceType
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
-from polar.postgres import AsyncSession, get_db_session
+from polar.postgres import AsyncSession, get_db_read_session
 from polar.product.schemas import ProductID
 from polar.routing import APIRouter
 
@@ -46,7 +46,7 @@ async def get(
             "`one_time` will filter data corresponding to one-time purchases."
         ),
     ),
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_read_session),
 ) -> MetricsResponse:
     """Get metrics about your orders and subscriptions."""
 
@@ -2,11 +2,13 @@ import functools
 import re
 
 import structlog
+from opentelemetry import trace
 from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from polar.config import settings
 from polar.logging import Logger, generate_correlation_id
+from polar.postgres import report_query_stats, track_queries
 from polar.worker import flush_enqueued_jobs
 
 
@@ -29,6 +31,20 @@ class LogCorrelationIdMiddleware:
         structlog.contextvars.unbind_contextvars("correlation_id", "method", "path")
 
 
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track_queries() as stats:
+            await self.app(scope, receive, send)
+
+        report_query_stats(stats, trace.get_current_span().set_attributes)
+
+
 class FlushEnqueuedWorkerJobsMiddleware:
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
@@ -1,6 +1,7 @@
 from polar.kit.db.models import Model, TimestampedModel
 
 from .account import Account
+from .account_balance import AccountBalance
 from .advertisement_campaign import AdvertisementCampaign
 from .article import Article
 from .articles_subscription import ArticlesSubscription
@@ -16,6 +17,7 @@ from .downloadable import Downloadable
 from .external_organization import ExternalOrganization
 from .file import File
 from .held_balance import HeldBalance
+from .inbound_webhook import InboundWebhook
 from .invites import Invite
 from .issue import Issue
 from .issue_reward import IssueReward
@@ -56,6 +58,7 @@ __all__ = [
     "Model",
     "TimestampedModel",
     "Account",
+    "AccountBalance",
     "AdvertisementCampaign",
     "Article",
     "ArticlesSubscription",
@@ -71,6 +74,7 @@ __all__ = [
     "ExternalOrganization",
     "File",
     "HeldBalance",
+    "InboundWebhook",
     "Invite",
     "Issue",
     "IssueReward",
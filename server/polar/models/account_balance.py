@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from polar.kit.db.models import RecordModel
+
+
+class AccountBalance(RecordModel):
+    """
+    Running totals of the transactions of an account.
+
+    Maintained in the same database transaction as the ledger,
+    so we don't have to sum every transaction of an account to know its balance.
+    """
+
+    __tablename__ = "account_balances"
+
+    account_id: Mapped[UUID] = mapped_column(
+        Uuid, ForeignKey("accounts.id", ondelete="cascade"), nullable=False, unique=True
+    )
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    """Sum of all the transactions amounts, in Polar currency."""
+    account_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    """Sum of all the transactions amounts, in account currency."""
+    gross_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    """Sum of the balance transactions amounts, in Polar currency."""
+    payout_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    """Sum of the payout transactions amounts, in Polar currency."""
+    account_payout_amount: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    """Sum of the payout transactions amounts, in account currency."""
@@ -7,9 +7,11 @@ from sqlalchemy import (
     Boolean,
     ColumnElement,
     ForeignKey,
+    Index,
     UniqueConstraint,
     Uuid,
     and_,
+    text,
     type_coerce,
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -125,6 +127,13 @@ class BenefitGrant(RecordModel):
         UniqueConstraint(
             "subscription_id", "user_id", "benefit_id", name="benefit_grants_sbu_key"
         ),
+        # Keyset pagination over the active grants of a benefit
+        Index(
+            "ix_benefit_grants_benefit_id_id_granted",
+            "benefit_id",
+            "id",
+            postgresql_where=text("granted_at IS NOT NULL AND deleted_at IS NULL"),
+        ),
     )
 
     granted_at: Mapped[datetime | None] = mapped_column(
@@ -9,10 +9,12 @@ from sqlalchemy import (
     Boolean,
     Connection,
     ForeignKey,
+    Index,
     Integer,
     String,
     Uuid,
     event,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
@@ -51,6 +53,14 @@ class CheckoutStatus(StrEnum):
 
 class Checkout(CustomFieldDataMixin, MetadataMixin, RecordModel):
     __tablename__ = "checkouts"
+    __table_args__ = (
+        # Open checkouts to expire, see `CheckoutService.expire_open_checkouts`
+        Index(
+            "ix_checkouts_expires_at_open",
+            "expires_at",
+            postgresql_where=text("status = 'open' AND deleted_at IS NULL"),
+        ),
+    )
 
     payment_processor: Mapped[PaymentProcessor] = mapped_column(
         String, nullable=False, default=PaymentProcessor.stripe, index=True
@@ -0,0 +1,37 @@
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import TIMESTAMP, LargeBinary, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from polar.kit.db.models import RecordModel
+from polar.kit.extensions.sqlalchemy import StringEnum
+
+
+class InboundWebhookProvider(StrEnum):
+    github = "github"
+    stripe = "stripe"
+
+
+class InboundWebhook(RecordModel):
+    """
+    Webhook received from a third-party provider, stored before being processed.
+
+    The provider delivery ID is unique, so redeliveries of the same event
+    are detected and not processed twice.
+    """
+
+    __tablename__ = "inbound_webhooks"
+    __table_args__ = (UniqueConstraint("provider", "delivery_id"),)
+
+    provider: Mapped[InboundWebhookProvider] = mapped_column(
+        StringEnum(InboundWebhookProvider), nullable=False
+    )
+    delivery_id: Mapped[str] = mapped_column(String, nullable=False)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False, doc="zlib-compressed raw body."
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True, default=None
+    )
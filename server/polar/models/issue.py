@@ -104,9 +104,19 @@ class IssueFields:
         TIMESTAMP(timezone=True), nullable=True
     )
 
-    title_tsv: Mapped[TSVectorType] = mapped_column(
-        TSVectorType("title", regconfig="simple"),
-        sa.Computed("to_tsvector('simple', \"title\")", persisted=True),
+    # Full-text search document: title, then labels names, then body.
+    # Deferred, since it's only used in WHERE and ORDER BY clauses.
+    search_tsv: Mapped[TSVectorType] = mapped_column(
+        TSVectorType(regconfig="simple"),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(jsonb_to_tsvector('simple', "
+            "coalesce(jsonb_path_query_array(labels, '$[*].name'), '[]'::jsonb), "
+            "'[\"string\"]'), 'B') || "
+            "setweight(to_tsvector('simple', left(coalesce(body, ''), 100000)), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
     )
 
 
@@ -135,8 +145,14 @@ class Issue(IssueFields, RecordModel):
         UniqueConstraint("external_id"),
         UniqueConstraint("platform", "external_lookup_key"),
         UniqueConstraint("organization_id", "repository_id", "number"),
-        # Search index
-        Index("idx_issues_title_tsv", "title_tsv", postgresql_using="gin"),
+        # Search indexes
+        Index("idx_issues_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index(
+            "idx_issues_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
         Index(
             "idx_issues_id_closed_at",
             "id",
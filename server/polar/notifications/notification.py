@@ -4,7 +4,7 @@ from enum import StrEnum
 from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from pydantic import UUID4, BaseModel, Discriminator, Field
+from pydantic import BaseModel, Discriminator, Field
 
 from polar.email.renderer import get_email_renderer
 from polar.kit.money import get_cents_in_dollar_string
@@ -51,7 +51,7 @@ class NotificationPayloadBase(BaseModel):
 
 
 class NotificationBase(Schema):
-    id: UUID4
+    id: UUID
     created_at: datetime
     type: NotificationType
 
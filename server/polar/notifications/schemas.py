@@ -1,4 +1,4 @@
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.kit.schemas import Schema
 from polar.notifications.notification import Notification
@@ -6,8 +6,8 @@ from polar.notifications.notification import Notification
 
 class NotificationsList(Schema):
     notifications: list[Notification]
-    last_read_notification_id: UUID4 | None
+    last_read_notification_id: UUID | None
 
 
 class NotificationsMarkRead(Schema):
-    notification_id: UUID4
+    notification_id: UUID
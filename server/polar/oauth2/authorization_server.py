@@ -2,6 +2,7 @@ import json
 import secrets
 import time
 import typing
+from collections.abc import Callable
 
 import structlog
 from authlib.oauth2 import AuthorizationServer as _AuthorizationServer
@@ -26,6 +27,7 @@ from polar.kit.crypto import generate_token, get_token_hash
 from polar.logging import Logger
 from polar.models import OAuth2Client, OAuth2Token, User
 from polar.oauth2.sub_type import SubTypeValue
+from polar.postgres import AsyncSession
 
 from .constants import (
     ACCESS_TOKEN_PREFIX,
@@ -42,6 +44,9 @@ from .service.oauth2_grant import oauth2_grant as oauth2_grant_service
 
 logger: Logger = structlog.get_logger(__name__)
 
+P = typing.ParamSpec("P")
+R = typing.TypeVar("R")
+
 
 def _get_server_metadata(server: "AuthorizationServer") -> dict[str, typing.Any]:
     def _dummy_url_for(name: str) -> str:
@@ -249,13 +254,14 @@ class AuthorizationServer(_AuthorizationServer):
 
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
         *,
         scopes_supported: list[str] | None = None,
         error_uris: list[tuple[str, str]] | None = None,
     ) -> None:
         super().__init__(scopes_supported)
-        self.session = session
+        self.async_session = session
+        self.session: Session = session.sync_session
         self._error_uris = dict(error_uris) if error_uris is not None else None
 
         self.register_token_generator("default", self.create_bearer_token_generator())
@@ -263,7 +269,7 @@ class AuthorizationServer(_AuthorizationServer):
     @classmethod
     def build(
         cls,
-        session: Session,
+        session: AsyncSession,
         *,
         scopes_supported: list[str] | None = None,
         error_uris: list[tuple[str, str]] | None = None,
@@ -278,6 +284,17 @@ class AuthorizationServer(_AuthorizationServer):
         register_grants(authorization_server)
         return authorization_server
 
+    async def run(self, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Run a synchronous Authlib flow on the async database session.
+
+        Authlib is synchronous, so endpoints and grants query through `session`,
+        the synchronous facade of the async session. Running them through
+        SQLAlchemy's greenlet bridge awaits those queries on the asyncpg
+        connection, without blocking the event loop.
+        """
+        return await self.async_session.run_sync(lambda _: fn(*args, **kwargs))
+
     def query_client(self, client_id: str) -> OAuth2Client | None:
         statement = select(OAuth2Client).where(
             OAuth2Client.deleted_at.is_(None), OAuth2Client.client_id == client_id
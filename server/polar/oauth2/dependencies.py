@@ -1,12 +1,9 @@
-from collections.abc import Generator
-
-from fastapi import Depends, Request
+from fastapi import Depends
 from fastapi.security import OpenIdConnect
 from fastapi.security.utils import get_authorization_scheme_param
 
 from polar.auth.scope import SCOPES_SUPPORTED
 from polar.exceptions import Unauthorized
-from polar.kit.db.postgres import SyncSessionMaker
 from polar.models import OAuth2Token
 from polar.postgres import AsyncSession, get_db_session
 
@@ -45,17 +42,6 @@ async def get_token(
 
 
 def get_authorization_server(
-    request: Request,
-) -> Generator[AuthorizationServer, None, None]:
-    sync_sessionmaker: SyncSessionMaker = request.state.sync_sessionmaker
-    with sync_sessionmaker() as session:
-        authorization_server = AuthorizationServer.build(
-            session, scopes_supported=SCOPES_SUPPORTED
-        )
-        try:
-            yield authorization_server
-        except:
-            session.rollback()
-            raise
-        else:
-            session.commit()
+    session: AsyncSession = Depends(get_db_session),
+) -> AuthorizationServer:
+    return AuthorizationServer.build(session, scopes_supported=SCOPES_SUPPORTED)
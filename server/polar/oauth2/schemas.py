@@ -1,9 +1,9 @@
 import ipaddress
 import re
 from typing import Annotated, Literal
+from uuid import UUID
 
 from pydantic import (
-    UUID4,
     AfterValidator,
     BeforeValidator,
     Discriminator,
@@ -76,13 +76,13 @@ class OAuth2ClientPublic(TimestampedSchema):
 
 
 class AuthorizeUser(Schema):
-    id: UUID4
+    id: UUID
     email: EmailStr
     avatar_url: str | None
 
 
 class AuthorizeOrganization(Schema):
-    id: UUID4
+    id: UUID
     slug: str
     avatar_url: str | None
 
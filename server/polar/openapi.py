@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from enum import StrEnum
 from typing import Any, NotRequired, TypedDict
 
@@ -107,12 +108,24 @@ OPENAPI_PARAMETERS: OpenAPIParameters = {
 }
 
 
-def set_openapi_generator(app: FastAPI) -> None:
+def set_openapi_generator(
+    app: FastAPI, *, prepare: Callable[[FastAPI], None] | None = None
+) -> None:
+    """
+    Generate the OpenAPI schema on first request, and cache it.
+
+    `prepare` is called once before generating the schema. It allows to defer
+    the setup only needed by the schema, like the webhooks documentation.
+    """
+
     def _openapi_generator() -> dict[str, Any]:
         if app.openapi_schema:
             return app.openapi_schema
 
-        openapi_schema = get_openapi(
+        if prepare is not None:
+            prepare(app)
+
+        app.openapi_schema = get_openapi(
             title=app.title,
             version=app.version,
             openapi_version=app.openapi_version,
@@ -127,7 +140,7 @@ def set_openapi_generator(app: FastAPI) -> None:
             servers=app.servers,
             separate_input_output_schemas=app.separate_input_output_schemas,
         )
-        return openapi_schema
+        return app.openapi_schema
 
     app.openapi = _openapi_generator  # type: ignore[method-assign]
 
@@ -1,10 +1,10 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.exceptions import ResourceNotFound
-from polar.kit.pagination import ListResource, PaginationParamsQuery
+from polar.kit.pagination import CursorPaginationParamsQuery, ListResource
 from polar.kit.schemas import MultipleQueryFilter
 from polar.models import Order
 from polar.models.product_price import ProductPriceType
@@ -22,14 +22,14 @@ from .service import order as order_service
 router = APIRouter(prefix="/orders", tags=["orders", APITag.documented])
 
 
-OrderID = Annotated[UUID4, Path(description="The order ID.")]
+OrderID = Annotated[UUID, Path(description="The order ID.")]
 OrderNotFound = {"description": "Order not found.", "model": ResourceNotFound.schema()}
 
 
 @router.get("/", summary="List Orders", response_model=ListResource[OrderSchema])
 async def list(
     auth_subject: auth.OrdersRead,
-    pagination: PaginationParamsQuery,
+    pagination: CursorPaginationParamsQuery,
     sorting: sorting.ListSorting,
     organization_id: MultipleQueryFilter[OrganizationID] | None = Query(
         None, title="OrganizationID Filter", description="Filter by organization ID."
@@ -47,16 +47,16 @@ async def list(
             "`one_time` will return orders corresponding to one-time purchases."
         ),
     ),
-    discount_id: MultipleQueryFilter[UUID4] | None = Query(
+    discount_id: MultipleQueryFilter[UUID] | None = Query(
         None, title="DiscountID Filter", description="Filter by discount ID."
     ),
-    user_id: MultipleQueryFilter[UUID4] | None = Query(
+    user_id: MultipleQueryFilter[UUID] | None = Query(
         None, title="UserID Filter", description="Filter by customer's user ID."
     ),
     session: AsyncSession = Depends(get_db_session),
 ) -> ListResource[OrderSchema]:
     """List orders."""
-    results, count = await order_service.list(
+    results, count, next_cursor = await order_service.list(
         session,
         auth_subject,
         organization_id=organization_id,
@@ -72,6 +72,7 @@ async def list(
         [OrderSchema.model_validate(result) for result in results],
         count,
         pagination,
+        next_cursor,
     )
 
 
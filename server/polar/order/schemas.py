@@ -1,7 +1,8 @@
 from typing import Annotated
+from uuid import UUID
 
 from babel.numbers import format_currency
-from pydantic import UUID4, Field
+from pydantic import Field
 
 from polar.custom_field.data import CustomFieldDataOutputMixin
 from polar.discount.schemas import (
@@ -24,12 +25,12 @@ class OrderBase(
     billing_reason: OrderBillingReason
     billing_address: Address | None
 
-    user_id: UUID4
-    product_id: UUID4
-    product_price_id: UUID4
-    discount_id: UUID4 | None
-    subscription_id: UUID4 | None
-    checkout_id: UUID4 | None
+    user_id: UUID
+    product_id: UUID
+    product_price_id: UUID
+    discount_id: UUID | None
+    subscription_id: UUID | None
+    checkout_id: UUID | None
 
     def get_amount_display(self) -> str:
         return f"{format_currency(
@@ -40,7 +41,7 @@ class OrderBase(
 
 
 class OrderUser(Schema):
-    id: UUID4
+    id: UUID
     email: str
     public_name: str
     github_username: str | None
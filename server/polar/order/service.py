@@ -23,7 +23,11 @@ from polar.integrations.stripe.service import stripe as stripe_service
 from polar.integrations.stripe.utils import get_expandable_id
 from polar.kit.address import Address
 from polar.kit.db.postgres import AsyncSession
-from polar.kit.pagination import PaginationParams, paginate
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    PaginationParams,
+    paginate_cursor,
+)
 from polar.kit.services import ResourceServiceReader
 from polar.kit.sorting import Sorting
 from polar.logging import Logger
@@ -166,11 +170,11 @@ class OrderService(ResourceServiceReader[Order]):
         product_price_type: Sequence[ProductPriceType] | None = None,
         discount_id: Sequence[uuid.UUID] | None = None,
         user_id: Sequence[uuid.UUID] | None = None,
-        pagination: PaginationParams,
+        pagination: PaginationParams | CursorPaginationParams,
         sorting: list[Sorting[OrderSortProperty]] = [
             (OrderSortProperty.created_at, True)
         ],
-    ) -> tuple[Sequence[Order], int]:
+    ) -> tuple[Sequence[Order], int, str | None]:
         statement = self._get_readable_order_statement(auth_subject)
 
         statement = statement.join(Order.discount, isouter=True).options(
@@ -218,9 +222,10 @@ class OrderService(ResourceServiceReader[Order]):
                 order_by_clauses.append(clause_function(Discount.name))
             elif criterion == OrderSortProperty.subscription:
                 order_by_clauses.append(clause_function(Order.subscription_id))
-        statement = statement.order_by(*order_by_clauses)
 
-        return await paginate(session, statement, pagination=pagination)
+        return await paginate_cursor(
+            session, statement, pagination=pagination, order_by=order_by_clauses
+        )
 
     async def get_by_id(
         self,
@@ -1,6 +1,5 @@
 from typing import Protocol
-
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.auth.models import AuthSubject, Subject, is_organization
 from polar.exceptions import PolarRequestValidationError
@@ -9,7 +8,7 @@ from polar.postgres import AsyncSession
 
 
 class OrganizationIDModel(Protocol):
-    organization_id: UUID4 | None
+    organization_id: UUID | None
 
 
 async def get_payload_organization(
@@ -1,8 +1,8 @@
 from collections.abc import Sequence
 from typing import Annotated, Self
+from uuid import UUID
 
 from pydantic import (
-    UUID4,
     AfterValidator,
     Field,
     HttpUrl,
@@ -24,7 +24,7 @@ from polar.kit.schemas import (
 )
 
 OrganizationID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The organization ID."}),
     SelectorWidget("/v1/organizations", "Organization", "name"),
 ]
@@ -56,10 +56,10 @@ class OrganizationProfileSettings(Schema):
         Field(max_length=160, description="A description of the organization"),
         EmptyStrToNoneValidator,
     ] = None
-    featured_projects: list[UUID4] | None = Field(
+    featured_projects: list[UUID] | None = Field(
         None, description="A list of featured projects"
     )
-    featured_organizations: list[UUID4] | None = Field(
+    featured_organizations: list[UUID] | None = Field(
         None, description="A list of featured organizations"
     )
     links: list[HttpUrl] | None = Field(
@@ -173,7 +173,7 @@ class OrganizationUpdate(Schema):
 
 
 class OrganizationSetAccount(Schema):
-    account_id: UUID4
+    account_id: UUID
 
 
 class OrganizationStripePortalSession(Schema):
@@ -188,14 +188,14 @@ class CreditBalance(Schema):
 
 # Internal model
 class RepositoryBadgeSettingsUpdate(Schema):
-    id: UUID4
+    id: UUID
     badge_auto_embed: bool
     retroactive: bool
 
 
 # Internal model
 class RepositoryBadgeSettingsRead(Schema):
-    id: UUID4
+    id: UUID
     avatar_url: str | None
     name: str
     synced_issues: int
@@ -13,6 +13,7 @@ from polar.auth.models import AuthSubject, is_organization, is_user
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted, PolarError, PolarRequestValidationError
 from polar.integrations.loops.service import loops as loops_service
+from polar.kit.db.identity_cache import identity_cached
 from polar.kit.pagination import PaginationParams, paginate
 from polar.kit.services import ResourceServiceReader
 from polar.kit.sorting import Sorting
@@ -181,6 +182,7 @@ class OrganizationService(ResourceServiceReader[Organization]):
         return organization
 
     # Override get method to include `blocked_at` filter
+    @identity_cached
     async def get(
         self,
         session: AsyncSession,
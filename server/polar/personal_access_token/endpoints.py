@@ -1,5 +1,6 @@
+from uuid import UUID
+
 from fastapi import Depends
-from pydantic import UUID4
 
 from polar.auth.dependencies import WebUser
 from polar.exceptions import ResourceNotFound
@@ -57,7 +58,7 @@ async def create_personal_access_token(
 
 @router.delete("/{id}", status_code=204)
 async def delete_personal_access_token(
-    id: UUID4,
+    id: UUID,
     auth_subject: WebUser,
     session: AsyncSession = Depends(get_db_session),
 ) -> None:
@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 from enum import StrEnum
-
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.auth.scope import RESERVED_SCOPES, Scope
 from polar.kit.schemas import Schema, TimestampedSchema
@@ -18,7 +17,7 @@ class PersonalAccessTokenCreate(Schema):
 
 
 class PersonalAccessToken(TimestampedSchema):
-    id: UUID4
+    id: UUID
     scopes: list[Scope]
     expires_at: datetime | None
     comment: str
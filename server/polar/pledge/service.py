@@ -4,14 +4,16 @@ import datetime
 from collections.abc import Awaitable, Callable, Sequence
 from datetime import timedelta
 from json import JSONDecodeError
-from typing import Any
+from typing import Any, NamedTuple
 from uuid import UUID
 
 import stripe as stripe_lib
 import structlog
 from discord_webhook import AsyncDiscordWebhook, DiscordEmbed
-from sqlalchemy import func, or_, select
+from sqlalchemy import JSON, case, func, or_, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import (
+    aliased,
     joinedload,
 )
 
@@ -43,10 +45,11 @@ from polar.models.account import Account
 from polar.models.external_organization import ExternalOrganization
 from polar.models.issue import Issue
 from polar.models.issue_reward import IssueReward
+from polar.models.organization import Organization
 from polar.models.pledge import Pledge, PledgeState, PledgeType
 from polar.models.pledge_transaction import PledgeTransaction, PledgeTransactionType
 from polar.models.repository import Repository
-from polar.models.user import User
+from polar.models.user import OAuthAccount, OAuthPlatform, User
 from polar.models.user_organization import UserOrganization
 from polar.models.webhook_endpoint import WebhookEventType
 from polar.notifications.notification import (
@@ -83,13 +86,21 @@ from .hooks import (
 )
 from .schemas import (
     PledgePledgesSummary,
-    Pledger,
     SummaryPledge,
 )
 
 log = structlog.get_logger()
 
 
+class _IssuePledgesAggregate(NamedTuple):
+    total: int
+    type_totals: dict[PledgeType, int]
+    pledges: list[SummaryPledge]
+
+
+_EMPTY_ISSUE_PLEDGES_AGGREGATE = _IssuePledgesAggregate(0, {}, [])
+
+
 class PledgeService(ResourceServiceReader[Pledge]):
     async def get_with_loaded(
         self,
@@ -1253,66 +1264,46 @@ class PledgeService(ResourceServiceReader[Pledge]):
     async def issues_pledge_summary(
         self, session: AsyncSession, issues: Sequence[Issue]
     ) -> dict[UUID, PledgePledgesSummary]:
-        all_pledges = await self.list_by(
-            session,
-            issue_ids=[i.id for i in issues],
-            load_pledger=True,
+        pledges_aggregates = await self._get_issues_pledges_aggregates(
+            session, [i.id for i in issues]
         )
 
         res: dict[UUID, PledgePledgesSummary] = {}
-
-        pledges_by_issue: dict[UUID, list[Pledge]] = {}
-        for p in all_pledges:
-            exist = pledges_by_issue.get(p.issue_id, [])
-            exist.append(p)
-            pledges_by_issue[p.issue_id] = exist
-
         for i in issues:
-            pledges = pledges_by_issue.get(i.id, [])
-
-            sum_pledges = sum([p.amount for p in pledges])
+            aggregate = pledges_aggregates.get(i.id, _EMPTY_ISSUE_PLEDGES_AGGREGATE)
 
             funding = Funding(
                 funding_goal=CurrencyAmount(currency="USD", amount=i.funding_goal)
                 if i.funding_goal
                 else None,
-                pledges_sum=CurrencyAmount(currency="USD", amount=sum_pledges),
+                pledges_sum=CurrencyAmount(currency="USD", amount=aggregate.total),
             )
 
-            summary_pledges = [SummaryPledge.from_db(p) for p in pledges]
-
-            res[i.id] = PledgePledgesSummary(funding=funding, pledges=summary_pledges)
+            res[i.id] = PledgePledgesSummary(funding=funding, pledges=aggregate.pledges)
 
         return res
 
     async def issues_pledge_type_summary(
         self, session: AsyncSession, issues: Sequence[Issue]
     ) -> dict[UUID, PledgesTypeSummaries]:
-        all_pledges = await self.list_by(
-            session, issue_ids=[i.id for i in issues], load_pledger=True
+        pledges_aggregates = await self._get_issues_pledges_aggregates(
+            session, [i.id for i in issues]
         )
 
         res: dict[UUID, PledgesTypeSummaries] = {}
-
-        pledges_by_issue: dict[UUID, list[Pledge]] = {}
-        for p in all_pledges:
-            exist = pledges_by_issue.get(p.issue_id, [])
-            exist.append(p)
-            pledges_by_issue[p.issue_id] = exist
-
         for i in issues:
-            pledges = pledges_by_issue.get(i.id, [])
+            aggregate = pledges_aggregates.get(i.id, _EMPTY_ISSUE_PLEDGES_AGGREGATE)
 
             def summary(type: PledgeType) -> FundingPledgesSummary:
-                pledges_of_type = [p for p in pledges if p.type == type]
-                amount = sum([p.amount for p in pledges_of_type])
-                pledgers = [
-                    p for p in [Pledger.from_pledge(p) for p in pledges_of_type] if p
-                ]
-
                 return FundingPledgesSummary(
-                    total=CurrencyAmount(currency="USD", amount=amount),
-                    pledgers=pledgers,
+                    total=CurrencyAmount(
+                        currency="USD", amount=aggregate.type_totals.get(type, 0)
+                    ),
+                    pledgers=[
+                        p.pledger
+                        for p in aggregate.pledges
+                        if p.type == type and p.pledger is not None
+                    ],
                 )
 
             res[i.id] = PledgesTypeSummaries(
@@ -1323,6 +1314,124 @@ class PledgeService(ResourceServiceReader[Pledge]):
 
         return res
 
+    async def _get_issues_pledges_aggregates(
+        self, session: AsyncSession, issue_ids: Sequence[UUID]
+    ) -> dict[UUID, _IssuePledgesAggregate]:
+        """
+        Aggregate the active pledges of the given issues in a single query.
+
+        Totals are summed by the database, and pledgers are built as JSON,
+        so we don't load the pledges and their pledgers as ORM objects.
+        """
+        if not issue_ids:
+            return {}
+
+        OnBehalfOfOrganization = aliased(Organization)
+        ByOrganization = aliased(Organization)
+        github_account = (
+            select(OAuthAccount.account_username)
+            .where(
+                OAuthAccount.user_id == Pledge.by_user_id,
+                OAuthAccount.platform == OAuthPlatform.github,
+            )
+            .limit(1)
+            .lateral()
+        )
+
+        def _organization_name(organization: type[Organization]) -> Any:
+            return func.coalesce(func.nullif(organization.name, ""), organization.slug)
+
+        is_on_behalf_of_organization = OnBehalfOfOrganization.id.is_not(None)
+        is_user = User.id.is_not(None)
+        is_by_organization = ByOrganization.id.is_not(None)
+        pledger = case(
+            (
+                or_(is_on_behalf_of_organization, is_user, is_by_organization),
+                func.json_build_object(
+                    "name",
+                    case(
+                        (
+                            is_on_behalf_of_organization,
+                            _organization_name(OnBehalfOfOrganization),
+                        ),
+                        (
+                            is_user,
+                            func.coalesce(
+                                func.nullif(github_account.c.account_username, ""),
+                                func.left(User.email, 1),
+                            ),
+                        ),
+                        else_=_organization_name(ByOrganization),
+                    ),
+                    "github_username",
+                    case(
+                        (is_on_behalf_of_organization, OnBehalfOfOrganization.slug),
+                        (is_user, github_account.c.account_username),
+                        else_=ByOrganization.slug,
+                    ),
+                    "avatar_url",
+                    case(
+                        (
+                            is_on_behalf_of_organization,
+                            OnBehalfOfOrganization.avatar_url,
+                        ),
+                        (is_user, User.avatar_url),
+                        else_=ByOrganization.avatar_url,
+                    ),
+                ),
+            ),
+            else_=None,
+        )
+
+        statement = (
+            select(
+                Pledge.issue_id,
+                func.sum(Pledge.amount),
+                *(
+                    func.coalesce(
+                        func.sum(Pledge.amount).filter(Pledge.type == pledge_type), 0
+                    )
+                    for pledge_type in PledgeType
+                ),
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object("type", Pledge.type, "pledger", pledger),
+                        Pledge.created_at,
+                    ),
+                    type_=JSON,
+                ),
+            )
+            .join(
+                OnBehalfOfOrganization,
+                onclause=OnBehalfOfOrganization.id
+                == Pledge.on_behalf_of_organization_id,
+                isouter=True,
+            )
+            .join(User, onclause=User.id == Pledge.by_user_id, isouter=True)
+            .join(github_account, onclause=true(), isouter=True)
+            .join(
+                ByOrganization,
+                onclause=ByOrganization.id == Pledge.by_organization_id,
+                isouter=True,
+            )
+            .where(
+                Pledge.issue_id.in_(issue_ids),
+                Pledge.state.in_(PledgeState.active_states()),
+            )
+            .group_by(Pledge.issue_id)
+        )
+
+        result = await session.execute(statement)
+
+        aggregates: dict[UUID, _IssuePledgesAggregate] = {}
+        for issue_id, total, *type_totals, pledges in result.tuples().all():
+            aggregates[issue_id] = _IssuePledgesAggregate(
+                total=total,
+                type_totals=dict(zip(PledgeType, type_totals)),
+                pledges=[SummaryPledge.model_validate(p) for p in pledges],
+            )
+        return aggregates
+
     async def sum_pledges_period(
         self,
         session: AsyncSession,
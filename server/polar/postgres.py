@@ -1,22 +1,27 @@
-from collections.abc import AsyncGenerator
-from typing import Literal, TypeAlias
+import contextlib
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from typing import Any, Literal, TypeAlias
 
+import structlog
 from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
 from polar.config import settings
 from polar.kit.db.postgres import (
     AsyncEngine,
     AsyncSession,
     AsyncSessionMaker,
-    Engine,
     sql,
 )
 from polar.kit.db.postgres import (
     create_async_engine as _create_async_engine,
 )
-from polar.kit.db.postgres import (
-    create_sync_engine as _create_sync_engine,
-)
+from polar.kit.db.query_stats import QueryStats, track_queries
+from polar.logging import Logger
+
+log: Logger = structlog.get_logger()
 
 ProcessName: TypeAlias = Literal["app", "worker", "script", "backoffice"]
 
@@ -31,16 +36,90 @@ def create_async_engine(process_name: ProcessName) -> AsyncEngine:
     )
 
 
-def create_sync_engine(process_name: ProcessName) -> Engine:
-    return _create_sync_engine(
-        dsn=str(settings.get_postgres_dsn("psycopg2")),
-        application_name=f"{settings.ENV.value}.{process_name}",
+def create_async_read_engine(process_name: ProcessName) -> AsyncEngine | None:
+    dsn = settings.get_postgres_read_dsn("asyncpg")
+    if dsn is None:
+        return None
+    return _create_async_engine(
+        dsn=dsn,
+        application_name=f"{settings.ENV.value}.{process_name}.read",
         debug=settings.DEBUG,
-        pool_size=settings.DATABASE_SYNC_POOL_SIZE,
+        pool_size=settings.DATABASE_READ_POOL_SIZE,
         pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
     )
 
 
+class ReplicaLagCheck:
+    """
+    Tell if a replica is fresh enough to serve reads.
+
+    The replay lag is queried at most once per interval, and the last known value
+    is used in between. A replica whose WAL is entirely replayed has no lag,
+    even if the last replayed transaction is old, but only while it's streaming
+    from the primary: a disconnected replica has an unknown lag and isn't used.
+    """
+
+    statement = text(
+        """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN NOT EXISTS (
+                SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+            ) THEN NULL
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+        """
+    )
+
+    def __init__(self, *, max_lag: float, interval: float) -> None:
+        self.max_lag = max_lag
+        self.interval = interval
+        self._lag: float | None = None
+        self._checked_at: float | None = None
+
+    async def is_fresh(self, sessionmaker: AsyncSessionMaker) -> bool:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.interval:
+            # Set it first so concurrent requests don't query the lag too
+            self._checked_at = now
+            self._lag = await self._get_lag(sessionmaker)
+        return self._lag is not None and self._lag <= self.max_lag
+
+    async def _get_lag(self, sessionmaker: AsyncSessionMaker) -> float | None:
+        try:
+            async with sessionmaker() as session:
+                lag = await session.scalar(self.statement)
+        except (DBAPIError, OSError) as e:
+            log.warning("polar.db.replica_lag_check_failed", error=str(e))
+            return None
+        return float(lag) if lag is not None else None
+
+
+replica_lag_check = ReplicaLagCheck(
+    max_lag=settings.DATABASE_READ_MAX_LAG_SECONDS,
+    interval=settings.DATABASE_READ_LAG_CHECK_INTERVAL_SECONDS,
+)
+
+
+def report_query_stats(
+    stats: QueryStats, set_span_attributes: Callable[[dict[str, Any]], None]
+) -> None:
+    """
+    Attach the statements counters of a request or a job to its span, and warn
+    about the statements repeated enough to be a likely N+1 pattern.
+    """
+    attributes = stats.to_attributes()
+    set_span_attributes(attributes)
+    log.debug("polar.db.query_stats", **attributes)
+
+    repeated = stats.get_repeated(settings.DATABASE_REPEATED_STATEMENTS_THRESHOLD)
+    for statement, count in repeated.items():
+        log.warning(
+            "polar.db.repeated_statement", statement=statement[:500], count=count
+        )
+
+
 async def get_db_sessionmaker(
     request: Request,
 ) -> AsyncGenerator[AsyncSessionMaker, None]:
@@ -69,22 +148,76 @@ async def get_db_session(
     if session := getattr(request.state, "session", None):
         yield session
     else:
-        async with sessionmaker() as session:
+        async with _request_session(request, sessionmaker) as session:
+            yield session
+
+
+async def get_db_read_sessionmaker(
+    request: Request,
+) -> AsyncGenerator[AsyncSessionMaker | None, None]:
+    async_read_sessionmaker: AsyncSessionMaker | None = (
+        request.state.async_read_sessionmaker
+    )
+    yield async_read_sessionmaker
+
+
+async def get_db_read_session(
+    request: Request,
+    sessionmaker: AsyncSessionMaker = Depends(get_db_sessionmaker),
+    read_sessionmaker: AsyncSessionMaker | None = Depends(get_db_read_sessionmaker),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Generates a session for read-only endpoints.
+
+    It's bound to the read replica, unless there is none configured or
+    it's lagging too much behind the primary: in this case, we fall back to
+    the regular request session, so the read can't be staler than the last write.
+
+    The replica session is never committed: don't write with it.
+    """
+    if session := getattr(request.state, "read_session", None):
+        yield session
+    elif read_sessionmaker is None or not await replica_lag_check.is_fresh(
+        read_sessionmaker
+    ):
+        if session := getattr(request.state, "session", None):
+            yield session
+        else:
+            async with _request_session(request, sessionmaker) as session:
+                yield session
+    else:
+        async with read_sessionmaker() as session:
+            request.state.read_session = session
             try:
-                request.state.session = session
                 yield session
-            except:
+            finally:
                 await session.rollback()
-                raise
-            else:
-                await session.commit()
+
+
+@contextlib.asynccontextmanager
+async def _request_session(
+    request: Request, sessionmaker: AsyncSessionMaker
+) -> AsyncIterator[AsyncSession]:
+    async with sessionmaker() as session:
+        try:
+            request.state.session = session
+            yield session
+        except:
+            await session.rollback()
+            raise
+        else:
+            await session.commit()
 
 
 __all__ = [
     "AsyncSession",
     "sql",
     "create_async_engine",
-    "create_sync_engine",
+    "create_async_read_engine",
     "get_db_session",
+    "get_db_read_session",
+    "report_query_stats",
+    "track_queries",
     "get_db_sessionmaker",
+    "get_db_read_sessionmaker",
 ]
@@ -11,7 +11,7 @@ from polar.kit.sorting import Sorting, SortingGetter
 from polar.models import Product
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
-from polar.postgres import AsyncSession, get_db_session
+from polar.postgres import AsyncSession, get_db_read_session, get_db_session
 from polar.routing import APIRouter
 
 from . import auth
@@ -59,7 +59,7 @@ async def list(
         title="BenefitID Filter",
         description="Filter products granting specific benefit.",
     ),
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_read_session),
 ) -> ListResource[ProductSchema]:
     """List products."""
     results, count = await product_service.list(
@@ -1,8 +1,9 @@
 import builtins
 from typing import Annotated, Literal
+from uuid import UUID
 
 import stripe as stripe_lib
-from pydantic import UUID4, AfterValidator, Discriminator, Field
+from pydantic import AfterValidator, Discriminator, Field
 
 from polar.benefit.schemas import Benefit, BenefitID, BenefitPublic
 from polar.custom_field.attachment import (
@@ -40,7 +41,7 @@ PRODUCT_NAME_MIN_LENGTH = 3
 # Product
 
 ProductID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The product ID."}),
     SelectorWidget("/v1/products", "Product", "name"),
 ]
@@ -278,7 +279,7 @@ class ProductCreateBase(MetadataInputMixin, Schema):
     prices: ProductPriceRecurringCreateList | ProductPriceOneTimeCreateList = Field(
         ..., description="List of available prices for this product."
     )
-    medias: list[UUID4] | None = Field(
+    medias: list[UUID] | None = Field(
         default=None,
         description=(
             "List of file IDs. "
@@ -330,7 +331,7 @@ class ExistingProductPrice(Schema):
     Useful when updating a product if you want to keep an existing price.
     """
 
-    id: UUID4
+    id: UUID
 
 
 ProductPriceUpdate = Annotated[
@@ -363,7 +364,7 @@ class ProductUpdate(OptionalMetadataInputMixin, Schema):
             "as an `ExistingProductPrice` object."
         ),
     )
-    medias: list[UUID4] | None = Field(
+    medias: list[UUID] | None = Field(
         default=None,
         description=(
             "List of file IDs. "
@@ -388,14 +389,14 @@ class ProductBenefitsUpdate(Schema):
 
 
 class ProductPriceBase(TimestampedSchema):
-    id: UUID4 = Field(description="The ID of the price.")
+    id: UUID = Field(description="The ID of the price.")
     amount_type: ProductPriceAmountType = Field(
         description="The type of amount, either fixed or custom."
     )
     is_archived: bool = Field(
         description="Whether the price is archived and no longer available."
     )
-    product_id: UUID4 = Field(description="The ID of the product owning the price.")
+    product_id: UUID = Field(description="The ID of the product owning the price.")
 
 
 class ProductPriceFixedBase(ProductPriceBase):
@@ -515,7 +516,7 @@ ProductPrice = Annotated[
 
 
 class ProductBase(IDSchema, TimestampedSchema):
-    id: UUID4 = Field(description="The ID of the product.")
+    id: UUID = Field(description="The ID of the product.")
     name: str = Field(description="The name of the product.")
     description: str | None = Field(description="The description of the product.")
     is_recurring: bool = Field(
@@ -524,7 +525,7 @@ class ProductBase(IDSchema, TimestampedSchema):
     is_archived: bool = Field(
         description="Whether the product is archived and no longer available."
     )
-    organization_id: UUID4 = Field(
+    organization_id: UUID = Field(
         description="The ID of the organization owning the product."
     )
 
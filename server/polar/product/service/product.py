@@ -14,6 +14,7 @@ from polar.exceptions import NotPermitted, PolarError, PolarRequestValidationErr
 from polar.file.service import file as file_service
 from polar.integrations.loops.service import loops as loops_service
 from polar.integrations.stripe.service import stripe as stripe_service
+from polar.kit.db.identity_cache import identity_cached
 from polar.kit.db.postgres import AsyncSession
 from polar.kit.pagination import PaginationParams, paginate
 from polar.kit.services import ResourceServiceReader
@@ -214,6 +215,7 @@ class ProductService(ResourceServiceReader[Product]):
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
+    @identity_cached
     async def get_loaded(
         self, session: AsyncSession, id: uuid.UUID, allow_deleted: bool = False
     ) -> Product | None:
@@ -1,10 +1,14 @@
 import contextlib
 from collections.abc import AsyncGenerator
-from typing import TYPE_CHECKING, cast
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, cast
 
 import redis.asyncio as _async_redis
 from fastapi import Request
 from redis import ConnectionError, RedisError, TimeoutError
+from redis.asyncio.connection import BlockingConnectionPool as _BlockingConnectionPool
+from redis.asyncio.connection import ConnectionPool as _ConnectionPool
 from redis.asyncio.retry import Retry
 from redis.backoff import default_backoff
 
@@ -13,38 +17,156 @@ from polar.config import settings
 # https://github.com/python/typeshed/issues/7597#issuecomment-1117551641
 # Redis is generic at type checking, but not at runtime...
 if TYPE_CHECKING:
+    from redis.asyncio.connection import Connection
+
     Redis = _async_redis.Redis[str]
+    BlockingConnectionPool = _BlockingConnectionPool[Connection]
+    ConnectionPool = _ConnectionPool[Connection]
 else:
     Redis = _async_redis.Redis
+    BlockingConnectionPool = _BlockingConnectionPool
+    ConnectionPool = _ConnectionPool
 
 
 REDIS_RETRY_ON_ERRROR: list[type[RedisError]] = [ConnectionError, TimeoutError]
 REDIS_RETRY = Retry(default_backoff(), retries=50)
 
 
+class RedisRole(StrEnum):
+    cache = "cache"
+    locks = "locks"
+    pubsub = "pubsub"
+    queue = "queue"
+
+
+def get_max_connections(role: RedisRole) -> int | None:
+    return {
+        RedisRole.cache: settings.REDIS_MAX_CONNECTIONS_CACHE,
+        RedisRole.locks: settings.REDIS_MAX_CONNECTIONS_LOCKS,
+        # Each SSE stream holds a connection for its whole lifetime:
+        # capping them would cap the number of concurrent streams.
+        RedisRole.pubsub: None,
+        RedisRole.queue: settings.REDIS_MAX_CONNECTIONS_QUEUE,
+    }[role]
+
+
+def get_connection_kwargs() -> dict[str, Any]:
+    return {
+        "retry_on_error": REDIS_RETRY_ON_ERRROR,
+        "retry": REDIS_RETRY,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        "socket_keepalive": settings.REDIS_SOCKET_KEEPALIVE,
+    }
+
+
+@dataclass(frozen=True)
+class RedisPoolStats:
+    max_connections: int | None
+    in_use: int
+    idle: int
+
+
+class RedisConnectionManager:
+    """
+    Hold one connection pool per role, shared by all the clients of the process.
+
+    Pools are created on first use. When a capped one is exhausted, callers wait
+    up to `REDIS_POOL_TIMEOUT_SECONDS` for a connection to be released. The pubsub
+    pool isn't capped.
+    """
+
+    def __init__(self, url: str = settings.redis_url) -> None:
+        self.url = url
+        self._pools: dict[RedisRole, ConnectionPool] = {}
+        self._clients: dict[RedisRole, Redis] = {}
+
+    def get_pool(self, role: RedisRole) -> ConnectionPool:
+        if role not in self._pools:
+            # arq handles bytes itself
+            decode_responses = role != RedisRole.queue
+            max_connections = get_max_connections(role)
+            if max_connections is None:
+                self._pools[role] = ConnectionPool.from_url(
+                    self.url,
+                    decode_responses=decode_responses,
+                    **get_connection_kwargs(),
+                )
+            else:
+                self._pools[role] = BlockingConnectionPool.from_url(
+                    self.url,
+                    max_connections=max_connections,
+                    timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+                    decode_responses=decode_responses,
+                    **get_connection_kwargs(),
+                )
+        return self._pools[role]
+
+    def get_client(self, role: RedisRole) -> Redis:
+        if role not in self._clients:
+            self._clients[role] = cast(
+                Redis, _async_redis.Redis(connection_pool=self.get_pool(role))
+            )
+        return self._clients[role]
+
+    def get_stats(self) -> dict[RedisRole, RedisPoolStats]:
+        # The pools don't expose their usage publicly: read their internal state
+        return {
+            role: RedisPoolStats(
+                max_connections=get_max_connections(role),
+                in_use=len(pool._in_use_connections),  # type: ignore[attr-defined]
+                idle=len(pool._available_connections),  # type: ignore[attr-defined]
+            )
+            for role, pool in self._pools.items()
+        }
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            await pool.disconnect()
+        self._pools = {}
+        self._clients = {}
+
+
+@contextlib.asynccontextmanager
+async def create_redis_connections() -> AsyncGenerator[RedisConnectionManager, None]:
+    connections = RedisConnectionManager()
+    try:
+        yield connections
+    finally:
+        await connections.close()
+
+
 @contextlib.asynccontextmanager
-async def create_redis() -> AsyncGenerator[Redis, None]:
-    redis = cast(
-        Redis,
-        _async_redis.Redis.from_url(
-            settings.redis_url,
-            decode_responses=True,
-            retry_on_error=REDIS_RETRY_ON_ERRROR,
-            retry=REDIS_RETRY,
-        ),
-    )
-    yield redis
-    await redis.close()
+async def create_redis(
+    role: RedisRole = RedisRole.cache,
+) -> AsyncGenerator[Redis, None]:
+    async with create_redis_connections() as connections:
+        yield connections.get_client(role)
 
 
 async def get_redis(request: Request) -> Redis:
     return request.state.redis
 
 
+async def get_redis_pubsub(request: Request) -> Redis:
+    redis_connections: RedisConnectionManager = request.state.redis_connections
+    return redis_connections.get_client(RedisRole.pubsub)
+
+
+async def get_redis_locks(request: Request) -> Redis:
+    redis_connections: RedisConnectionManager = request.state.redis_connections
+    return redis_connections.get_client(RedisRole.locks)
+
+
 __all__ = [
     "Redis",
     "REDIS_RETRY_ON_ERRROR",
     "REDIS_RETRY",
+    "RedisRole",
+    "RedisConnectionManager",
+    "RedisPoolStats",
     "create_redis",
+    "create_redis_connections",
     "get_redis",
+    "get_redis_pubsub",
+    "get_redis_locks",
 ]
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Annotated, Self
 from uuid import UUID
 
-from pydantic import UUID4, Field, HttpUrl
+from pydantic import Field, HttpUrl
 
 from polar.enums import Platforms
 from polar.external_organization.schemas import (
@@ -16,7 +16,7 @@ from polar.visibility import Visibility
 REPOSITORY_PROFILE_DESCRIPTION_MAX_LENGTH = 240
 
 RepositoryID = Annotated[
-    UUID4,
+    UUID,
     MergeJSONSchema({"description": "The repository ID."}),
     SelectorWidget("/v1/repositories", "Repository", "name"),
 ]
@@ -29,10 +29,10 @@ class RepositoryProfileSettings(Schema):
         max_length=REPOSITORY_PROFILE_DESCRIPTION_MAX_LENGTH,
     )
     cover_image_url: str | None = Field(None, description="A URL to a cover image")
-    featured_organizations: list[UUID4] | None = Field(
+    featured_organizations: list[UUID] | None = Field(
         None, description="A list of featured organizations"
     )
-    highlighted_subscription_tiers: list[UUID4] | None = Field(
+    highlighted_subscription_tiers: list[UUID] | None = Field(
         None, description="A list of highlighted subscription tiers"
     )
     links: list[HttpUrl] | None = Field(
@@ -68,8 +68,8 @@ class RepositoryProfileSettingsUpdate(Schema):
     set_cover_image_url: bool | None = None
     cover_image_url: str | None = None
 
-    featured_organizations: list[UUID4] | None = None
-    highlighted_subscription_tiers: list[UUID4] | None = Field(None, max_length=3)
+    featured_organizations: list[UUID] | None = None
+    highlighted_subscription_tiers: list[UUID] | None = Field(None, max_length=3)
     links: list[HttpUrl] | None = None
 
 
@@ -8,7 +8,11 @@ from fastapi.responses import StreamingResponse
 from polar.kit.csv import (
     IterableCSVWriter,
 )
-from polar.kit.pagination import ListResource, PaginationParams, PaginationParamsQuery
+from polar.kit.pagination import (
+    CursorPaginationParamsQuery,
+    ListResource,
+    PaginationParams,
+)
 from polar.kit.schemas import MultipleQueryFilter
 from polar.kit.sorting import Sorting, SortingGetter
 from polar.openapi import APITag
@@ -38,7 +42,7 @@ SearchSorting = Annotated[
 )
 async def list(
     auth_subject: auth.SubscriptionsRead,
-    pagination: PaginationParamsQuery,
+    pagination: CursorPaginationParamsQuery,
     sorting: SearchSorting,
     organization_id: MultipleQueryFilter[OrganizationID] | None = Query(
         None, title="OrganizationID Filter", description="Filter by organization ID."
@@ -55,7 +59,7 @@ async def list(
     session: AsyncSession = Depends(get_db_session),
 ) -> ListResource[SubscriptionSchema]:
     """List subscriptions."""
-    results, count = await subscription_service.list(
+    results, count, next_cursor = await subscription_service.list(
         session,
         auth_subject,
         organization_id=organization_id,
@@ -70,6 +74,7 @@ async def list(
         [SubscriptionSchema.model_validate(result) for result in results],
         count,
         pagination,
+        next_cursor,
     )
 
 
@@ -98,7 +103,7 @@ async def export(
             )
         )
 
-        (subscribers, _) = await subscription_service.list(
+        (subscribers, _, _) = await subscription_service.list(
             session,
             auth_subject,
             organization_id=organization_id,
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Annotated
+from uuid import UUID
 
 from babel.numbers import format_currency
-from pydantic import UUID4, Field
+from pydantic import Field
 
 from polar.custom_field.data import CustomFieldDataOutputMixin
 from polar.discount.schemas import DiscountMinimal
@@ -37,11 +38,11 @@ class SubscriptionBase(IDSchema, TimestampedSchema):
     started_at: datetime | None
     ended_at: datetime | None
 
-    user_id: UUID4
-    product_id: UUID4
-    price_id: UUID4
-    discount_id: UUID4 | None
-    checkout_id: UUID4 | None
+    user_id: UUID
+    product_id: UUID
+    price_id: UUID
+    discount_id: UUID | None
+    checkout_id: UUID | None
 
     def get_amount_display(self) -> str:
         if self.amount is None or self.currency is None:
@@ -69,6 +70,6 @@ class SubscriptionCreateEmail(Schema):
     """Request schema for creating a subscription by email."""
 
     email: EmailStrDNS = Field(description="The email address of the user.")
-    product_id: UUID4 = Field(
+    product_id: UUID = Field(
         description="The ID of the product. **Must be the free subscription tier**."
     )
@@ -24,8 +24,13 @@ from polar.enums import SubscriptionRecurringInterval
 from polar.exceptions import PolarError
 from polar.integrations.stripe.service import stripe as stripe_service
 from polar.integrations.stripe.utils import get_expandable_id
+from polar.kit.db.identity_cache import identity_cached
 from polar.kit.db.postgres import AsyncSession
-from polar.kit.pagination import PaginationParams, paginate
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    PaginationParams,
+    paginate_cursor,
+)
 from polar.kit.services import ResourceServiceReader
 from polar.kit.sorting import Sorting
 from polar.kit.utils import utc_now
@@ -152,6 +157,7 @@ class SubscriptionSortProperty(StrEnum):
 
 
 class SubscriptionService(ResourceServiceReader[Subscription]):
+    @identity_cached
     async def get(
         self,
         session: AsyncSession,
@@ -190,11 +196,11 @@ class SubscriptionService(ResourceServiceReader[Subscription]):
         product_id: Sequence[uuid.UUID] | None = None,
         discount_id: Sequence[uuid.UUID] | None = None,
         active: bool | None = None,
-        pagination: PaginationParams,
+        pagination: PaginationParams | CursorPaginationParams,
         sorting: list[Sorting[SubscriptionSortProperty]] = [
             (SubscriptionSortProperty.started_at, True)
         ],
-    ) -> tuple[Sequence[Subscription], int]:
+    ) -> tuple[Sequence[Subscription], int, str | None]:
         statement = self._get_readable_subscriptions_statement(auth_subject).where(
             Subscription.started_at.is_not(None)
         )
@@ -276,7 +282,6 @@ class SubscriptionService(ResourceServiceReader[Subscription]):
                 order_by_clauses.append(clause_function(Product.name))
             if criterion == SubscriptionSortProperty.discount:
                 order_by_clauses.append(clause_function(Discount.name))
-        statement = statement.order_by(*order_by_clauses)
 
         statement = statement.options(
             contains_eager(Subscription.product).options(
@@ -288,9 +293,9 @@ class SubscriptionService(ResourceServiceReader[Subscription]):
             contains_eager(Subscription.user),
         )
 
-        results, count = await paginate(session, statement, pagination=pagination)
-
-        return results, count
+        return await paginate_cursor(
+            session, statement, pagination=pagination, order_by=order_by_clauses
+        )
 
     async def get_by_stripe_subscription_id(
         self, session: AsyncSession, stripe_subscription_id: str
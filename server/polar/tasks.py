@@ -2,7 +2,9 @@ from polar.account import tasks as account
 from polar.article import tasks as article
 from polar.benefit import tasks as benefit
 from polar.checkout import tasks as checkout
+from polar.counter import tasks as counter
 from polar.eventstream import tasks as eventstream
+from polar.inbound_webhook import tasks as inbound_webhook
 from polar.integrations.github import tasks as github
 from polar.integrations.loops import tasks as loops
 from polar.integrations.stripe import tasks as stripe
@@ -21,8 +23,10 @@ __all__ = [
     "article",
     "benefit",
     "checkout",
+    "counter",
     "eventstream",
     "github",
+    "inbound_webhook",
     "loops",
     "stripe",
     "magic_link",
@@ -1,20 +1,25 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Query
-from fastapi.responses import StreamingResponse
-from pydantic import UUID4
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 
 from polar.account.service import account as account_service
 from polar.auth.dependencies import WebUser
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted, ResourceNotFound
 from polar.kit.db.postgres import AsyncSessionMaker
-from polar.kit.pagination import ListResource, PaginationParamsQuery
+from polar.kit.pagination import CursorPaginationParamsQuery, ListResource
 from polar.kit.sorting import Sorting, SortingGetter
 from polar.models import Transaction as TransactionModel
 from polar.models.transaction import TransactionType
 from polar.openapi import APITag
-from polar.postgres import AsyncSession, get_db_session, get_db_sessionmaker
+from polar.postgres import (
+    AsyncSession,
+    get_db_read_session,
+    get_db_session,
+    get_db_sessionmaker,
+)
 from polar.routing import APIRouter
 
 from .schemas import (
@@ -24,6 +29,7 @@ from .schemas import (
     TransactionDetails,
     TransactionsSummary,
 )
+from .service.payout import get_payout_csv_filename
 from .service.payout import payout_transaction as payout_transaction_service
 from .service.transaction import TransactionSortProperty
 from .service.transaction import transaction as transaction_service
@@ -39,17 +45,17 @@ SearchSorting = Annotated[
 
 @router.get("/search", response_model=ListResource[Transaction])
 async def search_transactions(
-    pagination: PaginationParamsQuery,
+    pagination: CursorPaginationParamsQuery,
     sorting: SearchSorting,
     auth_subject: WebUser,
     type: TransactionType | None = Query(None),
-    account_id: UUID4 | None = Query(None),
-    payment_user_id: UUID4 | None = Query(None),
-    payment_organization_id: UUID4 | None = Query(None),
+    account_id: UUID | None = Query(None),
+    payment_user_id: UUID | None = Query(None),
+    payment_organization_id: UUID | None = Query(None),
     exclude_platform_fees: bool = Query(False),
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_read_session),
 ) -> ListResource[Transaction]:
-    results, count = await transaction_service.search(
+    results, count, next_cursor = await transaction_service.search(
         session,
         auth_subject.subject,
         type=type,
@@ -65,12 +71,13 @@ async def search_transactions(
         [Transaction.model_validate(result) for result in results],
         count,
         pagination,
+        next_cursor,
     )
 
 
 @router.get("/lookup", response_model=TransactionDetails)
 async def lookup_transaction(
-    transaction_id: UUID4,
+    transaction_id: UUID,
     auth_subject: WebUser,
     session: AsyncSession = Depends(get_db_session),
 ) -> TransactionDetails:
@@ -82,7 +89,7 @@ async def lookup_transaction(
 @router.get("/summary", response_model=TransactionsSummary)
 async def get_summary(
     auth_subject: WebUser,
-    account_id: UUID4,
+    account_id: UUID,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
 ) -> TransactionsSummary:
@@ -98,7 +105,7 @@ async def get_summary(
 @router.get("/payouts", response_model=PayoutEstimate)
 async def get_payout_estimate(
     auth_subject: WebUser,
-    account_id: UUID4,
+    account_id: UUID,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
 ) -> PayoutEstimate:
@@ -134,12 +141,12 @@ async def create_payout(
 
 @router.get("/payouts/{id}/csv")
 async def get_payout_csv(
-    id: UUID4,
+    id: UUID,
     auth_subject: WebUser,
     session: AsyncSession = Depends(get_db_session),
     sessionmaker: AsyncSessionMaker = Depends(get_db_sessionmaker),
     authz: Authz = Depends(Authz.authz),
-) -> StreamingResponse:
+) -> Response:
     payout = await payout_transaction_service.get(session, id)
 
     if payout is None:
@@ -152,10 +159,16 @@ async def get_payout_csv(
     if not await authz.can(auth_subject.subject, AccessType.write, account):
         raise NotPermitted()
 
+    url = await payout_transaction_service.get_payout_csv_url(
+        account=account, payout=payout
+    )
+    if url is not None:
+        return RedirectResponse(url, 302)
+
     content = payout_transaction_service.get_payout_csv(
         sessionmaker, account=account, payout=payout
     )
-    filename = f"polar-payout-{payout.created_at.isoformat()}.csv"
+    filename = get_payout_csv_filename(payout)
 
     return StreamingResponse(
         content,
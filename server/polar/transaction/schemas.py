@@ -1,4 +1,4 @@
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.enums import Platforms
 from polar.kit.schemas import IDSchema, Schema, TimestampedSchema
@@ -16,7 +16,7 @@ class TransactionExternalOrganization(IDSchema, TimestampedSchema):
 
 class TransactionRepository(IDSchema, TimestampedSchema):
     platform: Platforms
-    organization_id: UUID4
+    organization_id: UUID
     name: str
 
 
@@ -27,8 +27,8 @@ class TransactionUser(IDSchema, Schema):
 
 class TransactionIssue(IDSchema, TimestampedSchema):
     platform: Platforms
-    organization_id: UUID4
-    repository_id: UUID4
+    organization_id: UUID
+    repository_id: UUID
     number: int
     title: str
 
@@ -48,13 +48,13 @@ class TransactionOrganization(IDSchema, TimestampedSchema):
 
 
 class TransactionIssueReward(IDSchema, TimestampedSchema):
-    issue_id: UUID4
+    issue_id: UUID
     share_thousands: int
 
 
 class TransactionProduct(IDSchema, TimestampedSchema):
     name: str
-    organization_id: UUID4 | None
+    organization_id: UUID | None
     organization: TransactionOrganization | None
 
 
@@ -64,7 +64,7 @@ TransactionProductPrice = ProductPrice
 class TransactionOrder(IDSchema, TimestampedSchema):
     product: TransactionProduct
     product_price: TransactionProductPrice
-    subscription_id: UUID4 | None
+    subscription_id: UUID | None
 
 
 class TransactionEmbedded(IDSchema, TimestampedSchema):
@@ -78,12 +78,12 @@ class TransactionEmbedded(IDSchema, TimestampedSchema):
 
     platform_fee_type: PlatformFeeType | None
 
-    pledge_id: UUID4 | None
-    issue_reward_id: UUID4 | None
-    order_id: UUID4 | None
+    pledge_id: UUID | None
+    issue_reward_id: UUID | None
+    order_id: UUID | None
 
-    payout_transaction_id: UUID4 | None
-    incurred_by_transaction_id: UUID4 | None
+    payout_transaction_id: UUID | None
+    incurred_by_transaction_id: UUID | None
 
 
 class Transaction(TransactionEmbedded):
@@ -115,11 +115,11 @@ class TransactionsSummary(Schema):
 
 
 class PayoutCreate(Schema):
-    account_id: UUID4
+    account_id: UUID
 
 
 class PayoutEstimate(Schema):
-    account_id: UUID4
+    account_id: UUID
     gross_amount: int
     fees_amount: int
     net_amount: int
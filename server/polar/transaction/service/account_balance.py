@@ -0,0 +1,251 @@
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+import structlog
+from sqlalchemy import ColumnElement, Select, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from polar.kit.utils import generate_uuid, utc_now
+from polar.logging import Logger
+from polar.models import AccountBalance, Transaction
+from polar.models.transaction import TransactionType
+from polar.postgres import AsyncSession
+
+log: Logger = structlog.get_logger()
+
+_TOTALS_COLUMNS = (
+    "amount",
+    "account_amount",
+    "gross_amount",
+    "payout_amount",
+    "account_payout_amount",
+)
+
+
+def _get_ledger_totals_columns() -> list[ColumnElement[int]]:
+    return [
+        func.coalesce(func.sum(Transaction.amount), 0).label("amount"),
+        func.coalesce(func.sum(Transaction.account_amount), 0).label("account_amount"),
+        func.coalesce(
+            func.sum(Transaction.amount).filter(
+                Transaction.type == TransactionType.balance
+            ),
+            0,
+        ).label("gross_amount"),
+        func.coalesce(
+            func.sum(Transaction.amount).filter(
+                Transaction.type == TransactionType.payout
+            ),
+            0,
+        ).label("payout_amount"),
+        func.coalesce(
+            func.sum(Transaction.account_amount).filter(
+                Transaction.type == TransactionType.payout
+            ),
+            0,
+        ).label("account_payout_amount"),
+    ]
+
+
+def _get_delta(transaction: Transaction) -> dict[str, int]:
+    return {
+        "amount": transaction.amount,
+        "account_amount": transaction.account_amount,
+        "gross_amount": transaction.amount
+        if transaction.type == TransactionType.balance
+        else 0,
+        "payout_amount": transaction.amount
+        if transaction.type == TransactionType.payout
+        else 0,
+        "account_payout_amount": transaction.account_amount
+        if transaction.type == TransactionType.payout
+        else 0,
+    }
+
+
+class AccountBalanceService:
+    """
+    Maintain the running totals of the accounts transactions.
+
+    Services writing transactions bound to an account call `apply` right after
+    flushing them, so the totals are updated in the same database transaction
+    as the ledger. Accounts without totals yet are initialized from the ledger.
+    """
+
+    async def get(self, session: AsyncSession, account_id: uuid.UUID) -> AccountBalance:
+        statement = (
+            select(AccountBalance)
+            .where(AccountBalance.account_id == account_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(statement)
+        account_balance = result.scalar_one_or_none()
+        if account_balance is not None:
+            return account_balance
+
+        await self._initialize(session, account_id)
+        result = await session.execute(statement)
+        return result.scalar_one()
+
+    async def apply(
+        self, session: AsyncSession, transactions: Iterable[Transaction]
+    ) -> None:
+        """
+        Add flushed transactions to the totals of their account.
+
+        Transactions without account, i.e. on Polar's side, are ignored.
+        """
+        deltas: dict[uuid.UUID, dict[str, int]] = {}
+        for transaction in transactions:
+            if transaction.account_id is None:
+                continue
+            account_delta = deltas.setdefault(
+                transaction.account_id, dict.fromkeys(_TOTALS_COLUMNS, 0)
+            )
+            for key, value in _get_delta(transaction).items():
+                account_delta[key] += value
+
+        for account_id, delta in deltas.items():
+            if await self._increment(session, account_id, delta):
+                continue
+            # The ledger already contains the flushed transactions
+            if await self._initialize(session, account_id):
+                continue
+            # Initialized concurrently in the meantime
+            await self._increment(session, account_id, delta)
+
+    async def apply_account_amount_change(
+        self, session: AsyncSession, transaction: Transaction, delta: int
+    ) -> None:
+        """
+        Add the change of `account_amount` of an already applied transaction.
+
+        Typically, the amount of a cross-currency payout is only known once
+        Stripe converted it.
+        """
+        if transaction.account_id is None or delta == 0:
+            return
+        account_delta = dict.fromkeys(_TOTALS_COLUMNS, 0)
+        account_delta["account_amount"] = delta
+        if transaction.type == TransactionType.payout:
+            account_delta["account_payout_amount"] = delta
+        if not await self._increment(session, transaction.account_id, account_delta):
+            # Not initialized yet: the ledger already contains the new amount
+            await self._initialize(session, transaction.account_id)
+
+    async def reconcile(self, session: AsyncSession) -> int:
+        """
+        Verify the totals against the ledger, and fix the ones drifting from it.
+
+        Returns:
+            The number of fixed accounts.
+        """
+        ledger = self._get_ledger_totals_statement().subquery()
+        statement = (
+            select(AccountBalance.account_id)
+            .join(
+                ledger,
+                onclause=ledger.c.account_id == AccountBalance.account_id,
+                isouter=True,
+            )
+            .where(
+                tuple_(
+                    *(getattr(AccountBalance, c) for c in _TOTALS_COLUMNS)
+                ).is_distinct_from(
+                    tuple_(*(func.coalesce(ledger.c[c], 0) for c in _TOTALS_COLUMNS))
+                )
+            )
+        )
+        result = await session.execute(statement)
+        drifting_account_ids = result.scalars().all()
+
+        for account_id in drifting_account_ids:
+            await self._reset(session, account_id)
+            await session.commit()
+
+        return len(drifting_account_ids)
+
+    async def _increment(
+        self, session: AsyncSession, account_id: uuid.UUID, delta: dict[str, int]
+    ) -> bool:
+        statement = (
+            update(AccountBalance)
+            .where(AccountBalance.account_id == account_id)
+            .values(
+                {
+                    **{
+                        column: getattr(AccountBalance, column) + value
+                        for column, value in delta.items()
+                    },
+                    "modified_at": utc_now(),
+                }
+            )
+            .returning(AccountBalance.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def _initialize(self, session: AsyncSession, account_id: uuid.UUID) -> bool:
+        totals = self._get_ledger_totals_statement(account_id).subquery()
+        statement = (
+            insert(AccountBalance)
+            .from_select(
+                ["id", "created_at", "account_id", *_TOTALS_COLUMNS],
+                select(
+                    literal(generate_uuid()),
+                    literal(utc_now()),
+                    literal(account_id),
+                    *(totals.c[c] for c in _TOTALS_COLUMNS),
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=[AccountBalance.account_id])
+            .returning(AccountBalance.id)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def _reset(self, session: AsyncSession, account_id: uuid.UUID) -> None:
+        # Lock the totals before reading the ledger, so concurrent writers
+        # apply their increment on top of the value we set.
+        account_balance = await session.scalar(
+            select(AccountBalance)
+            .where(AccountBalance.account_id == account_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        if account_balance is None:
+            return
+
+        result = await session.execute(self._get_ledger_totals_statement(account_id))
+        totals = result.one()._asdict()
+
+        log.warning(
+            "account_balance.drift",
+            account_id=str(account_id),
+            **{
+                column: totals[column] - getattr(account_balance, column)
+                for column in _TOTALS_COLUMNS
+            },
+        )
+
+        for column in _TOTALS_COLUMNS:
+            setattr(account_balance, column, totals[column])
+        session.add(account_balance)
+
+    def _get_ledger_totals_statement(
+        self, account_id: uuid.UUID | None = None
+    ) -> Select[Any]:
+        if account_id is not None:
+            return select(*_get_ledger_totals_columns()).where(
+                Transaction.account_id == account_id
+            )
+        return (
+            select(Transaction.account_id, *_get_ledger_totals_columns())
+            .where(Transaction.account_id.is_not(None))
+            .group_by(Transaction.account_id)
+        )
+
+
+account_balance = AccountBalanceService()
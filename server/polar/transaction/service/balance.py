@@ -11,6 +11,7 @@ from polar.models import Account, IssueReward, Order, Pledge, Transaction
 from polar.models.transaction import PlatformFeeType, TransactionType
 from polar.postgres import AsyncSession
 
+from .account_balance import account_balance as account_balance_service
 from .base import BaseTransactionService, BaseTransactionServiceError
 
 log: Logger = structlog.get_logger()
@@ -80,6 +81,9 @@ class BalanceTransactionService(BaseTransactionService):
         session.add(outgoing_transaction)
         session.add(incoming_transaction)
         await session.flush()
+        await account_balance_service.apply(
+            session, (outgoing_transaction, incoming_transaction)
+        )
 
         if destination_account is not None:
             await account_service.check_review_threshold(session, destination_account)
@@ -200,6 +204,9 @@ class BalanceTransactionService(BaseTransactionService):
         session.add(outgoing_reversal)
         session.add(incoming_reversal)
         await session.flush()
+        await account_balance_service.apply(
+            session, (outgoing_reversal, incoming_reversal)
+        )
 
         return (outgoing_reversal, incoming_reversal)
 
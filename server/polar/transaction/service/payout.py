@@ -1,27 +1,40 @@
-from collections.abc import AsyncIterable, Sequence
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from datetime import timedelta
-from typing import cast
+from typing import Any, cast
 
 import stripe as stripe_lib
 import structlog
-from sqlalchemy import select
+from sqlalchemy import Row, inspect, literal, select, tuple_
 from sqlalchemy.orm import joinedload, selectinload
+from starlette.concurrency import run_in_threadpool
 
 from polar.account.service import account as account_service
 from polar.config import settings
 from polar.enums import AccountType
+from polar.integrations.aws.s3 import S3FileError, S3Service
 from polar.integrations.stripe.service import stripe as stripe_service
 from polar.integrations.stripe.utils import get_expandable_id
 from polar.kit.csv import IterableCSVWriter
 from polar.kit.db.postgres import AsyncSessionMaker
 from polar.kit.utils import generate_uuid, utc_now
 from polar.logging import Logger
-from polar.models import Account, Issue, Order, Pledge, Transaction
+from polar.models import (
+    Account,
+    ExternalOrganization,
+    Issue,
+    Order,
+    Pledge,
+    Product,
+    Repository,
+    Transaction,
+)
 from polar.models.transaction import PaymentProcessor, TransactionType
 from polar.postgres import AsyncSession
 from polar.transaction.schemas import PayoutEstimate
 from polar.worker import enqueue_job
 
+from .account_balance import account_balance as account_balance_service
 from .base import BaseTransactionService, BaseTransactionServiceError
 from .platform_fee import PayoutAmountTooLow
 from .platform_fee import platform_fee_transaction as platform_fee_transaction_service
@@ -29,6 +42,12 @@ from .transaction import transaction as transaction_service
 
 log: Logger = structlog.get_logger()
 
+# Payout exports are kept apart from the customer files, in a private bucket
+s3_service = S3Service(
+    bucket=settings.S3_PAYOUTS_BUCKET_NAME,
+    presign_ttl=settings.S3_FILES_PRESIGN_TTL,
+)
+
 
 class PayoutTransactionError(BaseTransactionServiceError): ...
 
@@ -91,6 +110,24 @@ class UnknownAccount(PayoutTransactionError):
         super().__init__(message)
 
 
+PAYOUT_CSV_CHUNK_SIZE = 1000
+PAYOUT_CSV_HEADER = (
+    "Date",
+    "Payout ID",
+    "Transaction ID",
+    "Description",
+    "Currency",
+    "Amount",
+    "Payout Total",
+    "Account Currency",
+    "Account Payout Total",
+)
+
+
+def get_payout_csv_filename(payout: Transaction) -> str:
+    return f"polar-payout-{payout.created_at.isoformat()}.csv"
+
+
 class PayoutTransactionService(BaseTransactionService):
     async def get_payout_estimate(
         self, session: AsyncSession, *, account: Account
@@ -185,8 +222,13 @@ class PayoutTransactionService(BaseTransactionService):
 
         session.add(transaction)
         await session.flush()
+        await account_balance_service.apply(session, (transaction,))
 
         enqueue_job("payout.created", payout_id=transaction.id)
+        # The transfers are done at this point, so `account_amount` is final.
+        # Should it change later, `_set_account_amount` regenerates the CSV.
+        if settings.ACCOUNT_PAYOUT_CSV_PRECOMPUTE:
+            enqueue_job("payout.precompute_csv", payout_id=transaction.id)
 
         return transaction
 
@@ -312,90 +354,180 @@ class PayoutTransactionService(BaseTransactionService):
 
         session.add(transaction)
         await session.flush()
+        await account_balance_service.apply(session, (transaction,))
 
         return transaction
 
     async def get_payout_csv(
         self, sessionmaker: AsyncSessionMaker, *, account: Account, payout: Transaction
     ) -> AsyncIterable[str]:
+        csv_writer = IterableCSVWriter(dialect="excel")
+        yield csv_writer.getrow(PAYOUT_CSV_HEADER)
+
+        async for chunk in self._get_payout_csv_chunks(
+            sessionmaker, account=account, payout=payout
+        ):
+            yield csv_writer.getrows(
+                self._get_payout_csv_row(row, account=account, payout=payout)
+                for row in chunk
+            )
+
+    async def get_payout_csv_url(
+        self, *, account: Account, payout: Transaction
+    ) -> str | None:
+        """
+        Return a download URL of the precomputed payout CSV,
+        or `None` if it's not available.
+        """
+        if not settings.ACCOUNT_PAYOUT_CSV_PRECOMPUTE:
+            return None
+
+        path = self._get_payout_csv_path(account=account, payout=payout)
+        try:
+            await run_in_threadpool(s3_service.get_head_or_raise, path)
+        except S3FileError:
+            return None
+
+        url, _ = await run_in_threadpool(
+            s3_service.generate_presigned_download_url,
+            path=path,
+            filename=get_payout_csv_filename(payout),
+            mime_type="text/csv",
+        )
+        return url
+
+    async def precompute_payout_csv(
+        self, sessionmaker: AsyncSessionMaker, *, account: Account, payout: Transaction
+    ) -> None:
+        """Render the payout CSV and store it, so downloads don't hit the database."""
+        content = "".join(
+            [
+                chunk
+                async for chunk in self.get_payout_csv(
+                    sessionmaker, account=account, payout=payout
+                )
+            ]
+        )
+        await run_in_threadpool(
+            s3_service.upload,
+            content.encode("utf-8"),
+            self._get_payout_csv_path(account=account, payout=payout),
+            "text/csv",
+        )
+
+    async def _get_payout_csv_chunks(
+        self, sessionmaker: AsyncSessionMaker, *, account: Account, payout: Transaction
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Iterate over the payout transactions in chunks, walking the
+        `(created_at, id)` keyset.
+
+        Each chunk is fetched in its own short-lived session: we don't hold a
+        connection for the whole download. The next chunk is fetched while
+        the current one is being rendered and sent.
+        """
         statement = (
-            select(Transaction)
+            select(
+                Transaction.id,
+                Transaction.created_at,
+                Transaction.currency,
+                Transaction.amount,
+                Transaction.platform_fee_type,
+                Transaction.incurred_by_transaction_id,
+                Transaction.pledge_id,
+                Transaction.order_id,
+                ExternalOrganization.name.label("issue_organization_name"),
+                Repository.name.label("issue_repository_name"),
+                Issue.number.label("issue_number"),
+                Order.subscription_id.label("order_subscription_id"),
+                Product.name.label("order_product_name"),
+            )
+            .join(Pledge, onclause=Pledge.id == Transaction.pledge_id, isouter=True)
+            .join(Issue, onclause=Issue.id == Pledge.issue_id, isouter=True)
+            .join(
+                ExternalOrganization,
+                onclause=ExternalOrganization.id == Issue.organization_id,
+                isouter=True,
+            )
+            .join(
+                Repository, onclause=Repository.id == Issue.repository_id, isouter=True
+            )
+            .join(Order, onclause=Order.id == Transaction.order_id, isouter=True)
+            .join(Product, onclause=Product.id == Order.product_id, isouter=True)
             .where(
                 Transaction.payout_transaction_id == payout.id,
                 Transaction.account_id == account.id,
             )
-            .order_by(Transaction.created_at)
-            .options(
-                # Order
-                selectinload(Transaction.order).joinedload(Order.product),
-                # Pledge
-                selectinload(Transaction.pledge)
-                .joinedload(Pledge.issue)
-                .options(
-                    joinedload(Issue.organization),
-                    joinedload(Issue.repository),
-                ),
-            )
+            .order_by(Transaction.created_at, Transaction.id)
+            .limit(PAYOUT_CSV_CHUNK_SIZE)
         )
 
-        csv_writer = IterableCSVWriter(dialect="excel")
-        yield csv_writer.getrow(
-            (
-                "Date",
-                "Payout ID",
-                "Transaction ID",
-                "Description",
-                "Currency",
-                "Amount",
-                "Payout Total",
-                "Account Currency",
-                "Account Payout Total",
+        async def _get_chunk(after: Row[Any] | None) -> Sequence[Row[Any]]:
+            chunk_statement = statement
+            if after is not None:
+                chunk_statement = chunk_statement.where(
+                    tuple_(Transaction.created_at, Transaction.id)
+                    > tuple_(literal(after.created_at), literal(after.id))
+                )
+            async with sessionmaker() as session:
+                result = await session.execute(chunk_statement)
+                return result.all()
+
+        next_chunk = asyncio.create_task(_get_chunk(None))
+        try:
+            while True:
+                chunk = await next_chunk
+                is_last = len(chunk) < PAYOUT_CSV_CHUNK_SIZE
+                if not is_last:
+                    next_chunk = asyncio.create_task(_get_chunk(chunk[-1]))
+                if chunk:
+                    yield chunk
+                if is_last:
+                    return
+        finally:
+            next_chunk.cancel()
+
+    def _get_payout_csv_row(
+        self, row: Row[Any], *, account: Account, payout: Transaction
+    ) -> tuple[Any, ...]:
+        description = ""
+        if row.platform_fee_type is not None:
+            if row.platform_fee_type == "platform":
+                description = "Polar fee"
+            else:
+                description = f"Payment processor fee ({row.platform_fee_type})"
+        elif row.pledge_id is not None:
+            description = (
+                "Pledge to "
+                f"{row.issue_organization_name}/{row.issue_repository_name}"
+                f"#{row.issue_number}"
             )
+        elif row.order_id is not None:
+            if row.order_subscription_id is not None:
+                description = f"Subscription to {row.order_product_name}"
+            else:
+                description = f"Order of {row.order_product_name}"
+
+        transaction_id = (
+            str(row.id)
+            if row.incurred_by_transaction_id is None
+            else str(row.incurred_by_transaction_id)
         )
 
-        # StreamingResponse is running its own async task to exhaust the iterator
-        # Thus, rely on the main session generated by the FastAPI dependency leads to
-        # garbage collection problems.
-        # We create a new session to avoid this.
-        async with sessionmaker() as session:
-            transactions = await session.stream_scalars(statement)
-            async for transaction in transactions:
-                description = ""
-                if transaction.platform_fee_type is not None:
-                    if transaction.platform_fee_type == "platform":
-                        description = "Polar fee"
-                    else:
-                        description = (
-                            f"Payment processor fee ({transaction.platform_fee_type})"
-                        )
-                elif transaction.pledge is not None:
-                    description = f"Pledge to {transaction.pledge.issue.reference_key}"
-                elif transaction.order is not None:
-                    product = transaction.order.product
-                    if transaction.order.subscription_id is not None:
-                        description = f"Subscription to {product.name}"
-                    else:
-                        description = f"Order of {product.name}"
-
-                transaction_id = (
-                    str(transaction.id)
-                    if transaction.incurred_by_transaction_id is None
-                    else str(transaction.incurred_by_transaction_id)
-                )
+        return (
+            row.created_at.isoformat(),
+            str(payout.id),
+            transaction_id,
+            description,
+            row.currency,
+            row.amount / 100,
+            abs(payout.amount / 100),
+            account.currency,
+            abs(payout.account_amount / 100),
+        )
 
-                yield csv_writer.getrow(
-                    (
-                        transaction.created_at.isoformat(),
-                        str(payout.id),
-                        transaction_id,
-                        description,
-                        transaction.currency,
-                        transaction.amount / 100,
-                        abs(payout.amount / 100),
-                        account.currency,
-                        abs(payout.account_amount / 100),
-                    )
-                )
+    def _get_payout_csv_path(self, *, account: Account, payout: Transaction) -> str:
+        return f"payouts/{account.id}/{payout.id}.csv"
 
     async def _prepare_stripe_payout(
         self,
@@ -470,7 +602,7 @@ class PayoutTransactionService(BaseTransactionService):
         # If the account currency is different from the transaction currency,
         # Set the account amount to 0 and get the converted amount when making transfers
         if transaction.currency != transaction.account_currency:
-            transaction.account_amount = 0
+            await self._set_account_amount(session, transaction, 0)
 
         # Make individual transfers with the payment transaction as source
         assert account.stripe_id is not None
@@ -513,8 +645,11 @@ class PayoutTransactionService(BaseTransactionService):
                     stripe_lib.BalanceTransaction,
                     stripe_destination_charge.balance_transaction,
                 )
-                transaction.account_amount -= (
-                    stripe_destination_balance_transaction.amount
+                await self._set_account_amount(
+                    session,
+                    transaction,
+                    transaction.account_amount
+                    - stripe_destination_balance_transaction.amount,
                 )
                 log.info(
                     (
@@ -531,6 +666,25 @@ class PayoutTransactionService(BaseTransactionService):
 
         return transaction
 
+    async def _set_account_amount(
+        self, session: AsyncSession, transaction: Transaction, account_amount: int
+    ) -> None:
+        """
+        Update the account amount of a payout, keeping its account balance right.
+
+        Once the payout is flushed, its balance has been applied with the
+        previous amount: the difference is applied as well, and its precomputed
+        CSV is regenerated with the new total.
+        """
+        delta = account_amount - transaction.account_amount
+        transaction.account_amount = account_amount
+        if inspect(transaction).persistent:
+            await account_balance_service.apply_account_amount_change(
+                session, transaction, delta
+            )
+            if settings.ACCOUNT_PAYOUT_CSV_PRECOMPUTE:
+                enqueue_job("payout.precompute_csv", payout_id=transaction.id)
+
     async def _get_unpaid_balance_transactions(
         self, session: AsyncSession, account: Account
     ) -> Sequence[Transaction]:
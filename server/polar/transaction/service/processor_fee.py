@@ -1,14 +1,26 @@
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Literal
 
+import stripe as stripe_lib
+import structlog
+from sqlalchemy import func, select
+
 from polar.integrations.stripe.service import stripe as stripe_service
 from polar.integrations.stripe.utils import get_expandable_id
+from polar.logging import Logger
 from polar.models import Transaction
 from polar.models.transaction import PaymentProcessor, ProcessorFeeType, TransactionType
 from polar.postgres import AsyncSession
+from polar.redis import Redis
 
 from .base import BaseTransactionService, BaseTransactionServiceError
 
+log: Logger = structlog.get_logger()
+
+STRIPE_FEES_SYNC_CHECKPOINT_KEY = "processor_fee:stripe_fees:checkpoint"
+STRIPE_FEES_SYNC_PAGE_SIZE = 100
+
 
 class ProcessorFeeTransactionError(BaseTransactionServiceError): ...
 
@@ -162,20 +174,59 @@ class ProcessorFeeTransactionService(BaseTransactionService):
 
         return fee_transactions
 
-    async def sync_stripe_fees(self, session: AsyncSession) -> list[Transaction]:
-        transactions: list[Transaction] = []
-
+    async def sync_stripe_fees(
+        self, session: AsyncSession, redis: Redis
+    ) -> list[Transaction]:
+        """
+        Create the transactions for the Stripe fees created since the last sync.
+
+        Stripe lists the fees newest first, so the checkpoint is only moved forward
+        once every page has been synced. Each page is committed on its own:
+        if the sync is interrupted, the next one starts again from the same
+        checkpoint and skips the fees already synced.
+        """
+        checkpoint = await self._get_stripe_fees_checkpoint(session, redis)
         balance_transactions = await stripe_service.list_balance_transactions(
-            type="stripe_fee"
+            type="stripe_fee", created_gte=checkpoint
         )
+
+        transactions: list[Transaction] = []
+        newest_created: int | None = None
+        page: list[stripe_lib.BalanceTransaction] = []
         async for balance_transaction in balance_transactions:
-            transaction = await self.get_by(
-                session, fee_balance_transaction_id=balance_transaction.id
-            )
+            if newest_created is None:
+                newest_created = balance_transaction.created
+            page.append(balance_transaction)
+            if len(page) == STRIPE_FEES_SYNC_PAGE_SIZE:
+                transactions += await self._sync_stripe_fees_page(session, page)
+                page = []
+        if page:
+            transactions += await self._sync_stripe_fees_page(session, page)
+
+        if newest_created is not None:
+            await redis.set(STRIPE_FEES_SYNC_CHECKPOINT_KEY, newest_created)
+
+        log.info(
+            "processor_fee.stripe_fees_synced",
+            checkpoint=checkpoint,
+            new_checkpoint=newest_created,
+            count=len(transactions),
+        )
+        return transactions
 
-            # We reached the point where we have already synced all the fees
-            if transaction is not None:
-                break
+    async def _sync_stripe_fees_page(
+        self, session: AsyncSession, page: Sequence[stripe_lib.BalanceTransaction]
+    ) -> list[Transaction]:
+        statement = select(Transaction.fee_balance_transaction_id).where(
+            Transaction.fee_balance_transaction_id.in_([bt.id for bt in page])
+        )
+        result = await session.execute(statement)
+        synced_ids = set(result.scalars().all())
+
+        transactions: list[Transaction] = []
+        for balance_transaction in page:
+            if balance_transaction.id in synced_ids:
+                continue
 
             if balance_transaction.description is None:
                 continue
@@ -198,9 +249,27 @@ class ProcessorFeeTransactionService(BaseTransactionService):
             session.add(transaction)
             transactions.append(transaction)
 
-        await session.flush()
+        await session.commit()
 
         return transactions
 
+    async def _get_stripe_fees_checkpoint(
+        self, session: AsyncSession, redis: Redis
+    ) -> int | None:
+        checkpoint = await redis.get(STRIPE_FEES_SYNC_CHECKPOINT_KEY)
+        if checkpoint is not None:
+            return int(checkpoint)
+
+        # No checkpoint stored, start from the latest synced fee
+        statement = select(func.max(Transaction.created_at)).where(
+            Transaction.type == TransactionType.processor_fee,
+            Transaction.fee_balance_transaction_id.is_not(None),
+        )
+        result = await session.execute(statement)
+        latest_created_at = result.scalar_one_or_none()
+        if latest_created_at is None:
+            return None
+        return int(latest_created_at.timestamp())
+
 
 processor_fee_transaction = ProcessorFeeTransactionService(Transaction)
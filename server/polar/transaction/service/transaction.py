@@ -1,15 +1,18 @@
 import uuid
 from collections.abc import Sequence
 from enum import StrEnum
-from typing import Any, cast
+from typing import Any
 
 from sqlalchemy import Select, UnaryExpression, asc, desc, func, or_, select
-from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import aliased, joinedload, subqueryload
 
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted, ResourceNotFound
-from polar.kit.pagination import PaginationParams, paginate
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    PaginationParams,
+    paginate_cursor,
+)
 from polar.kit.sorting import Sorting
 from polar.models import (
     Account,
@@ -29,6 +32,7 @@ from ..schemas import (
     TransactionsBalance,
     TransactionsSummary,
 )
+from .account_balance import account_balance as account_balance_service
 from .base import BaseTransactionService
 
 
@@ -48,11 +52,11 @@ class TransactionService(BaseTransactionService):
         payment_user_id: uuid.UUID | None = None,
         payment_organization_id: uuid.UUID | None = None,
         exclude_platform_fees: bool = False,
-        pagination: PaginationParams,
+        pagination: PaginationParams | CursorPaginationParams,
         sorting: list[Sorting[TransactionSortProperty]] = [
             (TransactionSortProperty.created_at, True)
         ],
-    ) -> tuple[Sequence[Transaction], int]:
+    ) -> tuple[Sequence[Transaction], int, str | None]:
         statement = self._get_readable_transactions_statement(user)
 
         statement = statement.options(
@@ -95,11 +99,10 @@ class TransactionService(BaseTransactionService):
                 order_by_clauses.append(clause_function(Transaction.created_at))
             elif criterion == TransactionSortProperty.amount:
                 order_by_clauses.append(clause_function(Transaction.amount))
-        statement = statement.order_by(*order_by_clauses)
-
-        results, count = await paginate(session, statement, pagination=pagination)
 
-        return results, count
+        return await paginate_cursor(
+            session, statement, pagination=pagination, order_by=order_by_clauses
+        )
 
     async def lookup(
         self, session: AsyncSession, id: uuid.UUID, user: User
@@ -164,60 +167,24 @@ class TransactionService(BaseTransactionService):
         if not await authz.can(user, AccessType.read, account):
             raise NotPermitted()
 
-        statement = select(
-            cast(type[int], func.coalesce(func.sum(Transaction.amount), 0)),
-            cast(type[int], func.coalesce(func.sum(Transaction.account_amount), 0)),
-            cast(
-                type[int],
-                func.coalesce(
-                    func.sum(Transaction.amount).filter(
-                        Transaction.type == TransactionType.payout
-                    ),
-                    0,
-                ),
-            ),
-            cast(
-                type[int],
-                func.coalesce(
-                    func.sum(Transaction.account_amount).filter(
-                        Transaction.type == TransactionType.payout
-                    ),
-                    0,
-                ),
-            ),
-        ).where(Transaction.account_id == account.id)
-
-        result = await session.execute(statement)
+        account_balance = await account_balance_service.get(session, account.id)
 
         currency = "usd"  # FIXME: Main Polar currency
         account_currency = account.currency
         assert account_currency is not None
 
-        try:
-            (
-                amount,
-                account_amount,
-                payout_amount,
-                account_payout_amount,
-            ) = result.one()._tuple()
-        except NoResultFound:
-            amount = 0
-            account_amount = 0
-            payout_amount = 0
-            account_payout_amount = 0
-
         return TransactionsSummary(
             balance=TransactionsBalance(
                 currency=currency,
-                amount=amount,
+                amount=account_balance.amount,
                 account_currency=account_currency,
-                account_amount=account_amount,
+                account_amount=account_balance.account_amount,
             ),
             payout=TransactionsBalance(
                 currency=currency,
-                amount=payout_amount,
+                amount=account_balance.payout_amount,
                 account_currency=account_currency,
-                account_amount=account_payout_amount,
+                account_amount=account_balance.account_payout_amount,
             ),
         )
 
@@ -228,6 +195,18 @@ class TransactionService(BaseTransactionService):
         *,
         type: TransactionType | None = None,
     ) -> int:
+        if account_id is not None and type in {
+            None,
+            TransactionType.balance,
+            TransactionType.payout,
+        }:
+            account_balance = await account_balance_service.get(session, account_id)
+            if type == TransactionType.balance:
+                return account_balance.gross_amount
+            if type == TransactionType.payout:
+                return account_balance.payout_amount
+            return account_balance.amount
+
         statement = select(func.coalesce(func.sum(Transaction.amount), 0)).where(
             Transaction.account_id == account_id
         )
@@ -11,9 +11,11 @@ from polar.worker import (
     CronTrigger,
     JobContext,
     PolarWorkerContext,
+    get_worker_redis,
     task,
 )
 
+from .service.account_balance import account_balance as account_balance_service
 from .service.payout import payout_transaction as payout_transaction_service
 from .service.processor_fee import (
     processor_fee_transaction as processor_fee_transaction_service,
@@ -33,7 +35,15 @@ class PayoutDoesNotExist(TransactionTaskError):
 @task("processor_fee.sync_stripe_fees", cron_trigger=CronTrigger(hour=0, minute=0))
 async def sync_stripe_fees(ctx: JobContext) -> None:
     async with AsyncSessionMaker(ctx) as session:
-        await processor_fee_transaction_service.sync_stripe_fees(session)
+        await processor_fee_transaction_service.sync_stripe_fees(
+            session, get_worker_redis(ctx)
+        )
+
+
+@task("account_balance.reconcile", cron_trigger=CronTrigger(hour=1, minute=0))
+async def account_balance_reconcile(ctx: JobContext) -> None:
+    async with AsyncSessionMaker(ctx) as session:
+        await account_balance_service.reconcile(session)
 
 
 @task("payout.created")
@@ -77,6 +87,24 @@ async def payout_created(
         await webhook.execute()
 
 
+@task("payout.precompute_csv")
+async def payout_precompute_csv(
+    ctx: JobContext, payout_id: uuid.UUID, polar_context: PolarWorkerContext
+) -> None:
+    async with AsyncSessionMaker(ctx) as session:
+        payout = await payout_transaction_service.get(session, payout_id)
+        if payout is None:
+            raise PayoutDoesNotExist(payout_id)
+
+        await session.refresh(payout, {"account"})
+        account = payout.account
+        assert account is not None
+
+    await payout_transaction_service.precompute_payout_csv(
+        ctx["async_sessionmaker"], account=account, payout=payout
+    )
+
+
 @task("payout.trigger_stripe_payouts", cron_trigger=CronTrigger(minute=15))
 async def trigger_stripe_payouts(ctx: JobContext) -> None:
     async with AsyncSessionMaker(ctx) as session:
@@ -1,8 +1,9 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path
-from pydantic import UUID4
 
+from polar.advertisement.service import advertisement_campaign_views
 from polar.exceptions import ResourceNotFound
 from polar.kit.db.postgres import AsyncSession
 from polar.kit.pagination import ListResource, PaginationParamsQuery
@@ -10,6 +11,7 @@ from polar.kit.sorting import Sorting, SortingGetter
 from polar.models import AdvertisementCampaign
 from polar.openapi import APITag
 from polar.postgres import get_db_session
+from polar.redis import Redis, get_redis
 from polar.routing import APIRouter
 
 from .. import auth
@@ -25,7 +27,7 @@ from ..service.advertisement import user_advertisement as user_advertisement_ser
 router = APIRouter(prefix="/advertisements", tags=["advertisements", APITag.documented])
 
 AdvertisementCampaignID = Annotated[
-    UUID4, Path(description="The advertisement campaign ID.")
+    UUID, Path(description="The advertisement campaign ID.")
 ]
 AdvertisementCampaignNotFound = {
     "description": "Advertisement campaign not found.",
@@ -48,6 +50,7 @@ async def list(
     pagination: PaginationParamsQuery,
     sorting: ListSorting,
     session: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> ListResource[UserAdvertisementCampaign]:
     """List advertisement campaigns."""
     results, count = await user_advertisement_service.list(
@@ -56,6 +59,7 @@ async def list(
         pagination=pagination,
         sorting=sorting,
     )
+    await advertisement_campaign_views.merge_pending(redis, results)
 
     return ListResource.from_paginated_results(
         [UserAdvertisementCampaign.model_validate(result) for result in results],
@@ -74,6 +78,7 @@ async def get(
     id: AdvertisementCampaignID,
     auth_subject: auth.UserAdvertisementCampaignsRead,
     session: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> AdvertisementCampaign:
     """Get an advertisement campaign by ID."""
     advertisement_campaign = await user_advertisement_service.get_by_id(
@@ -83,6 +88,8 @@ async def get(
     if advertisement_campaign is None:
         raise ResourceNotFound()
 
+    await advertisement_campaign_views.merge_pending(redis, [advertisement_campaign])
+
     return advertisement_campaign
 
 
@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.exceptions import ResourceNotFound
 from polar.kit.db.postgres import AsyncSession
@@ -24,7 +24,7 @@ router = APIRouter(
     prefix="/benefits", tags=["benefits", APITag.documented, APITag.featured]
 )
 
-BenefitID = Annotated[UUID4, Path(description="The benefit ID.")]
+BenefitID = Annotated[UUID, Path(description="The benefit ID.")]
 BenefitNotFound = {
     "description": "Benefit not found or not granted.",
     "model": ResourceNotFound.schema(),
@@ -47,10 +47,10 @@ async def list(
     organization_id: MultipleQueryFilter[OrganizationID] | None = Query(
         None, title="OrganizationID Filter", description="Filter by organization ID."
     ),
-    order_id: MultipleQueryFilter[UUID4] | None = Query(
+    order_id: MultipleQueryFilter[UUID] | None = Query(
         None, title="OrderID Filter", description="Filter by order ID."
     ),
-    subscription_id: MultipleQueryFilter[UUID4] | None = Query(
+    subscription_id: MultipleQueryFilter[UUID] | None = Query(
         None, title="SubscriptionID Filter", description="Filter by subscription ID."
     ),
     session: AsyncSession = Depends(get_db_session),
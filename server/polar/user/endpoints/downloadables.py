@@ -7,11 +7,13 @@ from polar.kit.schemas import MultipleQueryFilter
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
 from polar.postgres import AsyncSession, get_db_session
+from polar.redis import Redis, get_redis
 from polar.routing import APIRouter
 
 from .. import auth
 from ..schemas.downloadables import DownloadableRead
 from ..service.downloadables import downloadable as downloadable_service
+from ..service.downloadables import downloadable_downloads
 
 router = APIRouter(
     prefix="/downloadables", tags=["downloadables", APITag.documented, APITag.featured]
@@ -35,6 +37,7 @@ async def list(
         description=("Filter by given benefit ID. "),
     ),
     session: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> ListResource[DownloadableRead]:
     subject = auth_subject.subject
 
@@ -45,6 +48,7 @@ async def list(
         organization_id=organization_id,
         benefit_id=benefit_id,
     )
+    await downloadable_downloads.merge_pending(redis, results)
 
     return ListResource.from_paginated_results(
         downloadable_service.generate_downloadable_schemas(results),
@@ -67,11 +71,12 @@ async def get(
     token: str,
     auth_subject: auth.UserDownloadablesRead,
     session: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> RedirectResponse:
     subject = auth_subject.subject
 
     downloadable = await downloadable_service.get_from_token_or_raise(
-        session, user=subject, token=token
+        session, redis, user=subject, token=token
     )
     signed = downloadable_service.generate_download_schema(downloadable)
     return RedirectResponse(signed.file.download.url, 302)
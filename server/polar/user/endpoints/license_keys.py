@@ -1,5 +1,6 @@
+from uuid import UUID
+
 from fastapi import Depends, Query
-from pydantic import UUID4
 
 from polar.benefit.schemas import BenefitID
 from polar.exceptions import NotPermitted, ResourceNotFound, Unauthorized
@@ -84,7 +85,7 @@ async def list(
 )
 async def get(
     auth_subject: auth.UserLicenseKeysRead,
-    id: UUID4,
+    id: UUID,
     session: AsyncSession = Depends(get_db_session),
 ) -> LicenseKeyWithActivations:
     """Get a license key."""
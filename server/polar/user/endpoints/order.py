@@ -1,7 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.exceptions import ResourceNotFound
 from polar.kit.db.postgres import AsyncSession
@@ -12,7 +12,7 @@ from polar.models import Order
 from polar.models.product_price import ProductPriceType
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
-from polar.postgres import get_db_session
+from polar.postgres import get_db_read_session, get_db_session
 from polar.product.schemas import ProductID
 from polar.routing import APIRouter
 
@@ -25,7 +25,7 @@ router = APIRouter(
     prefix="/orders", tags=["orders", APITag.documented, APITag.featured]
 )
 
-OrderID = Annotated[UUID4, Path(description="The order ID.")]
+OrderID = Annotated[UUID, Path(description="The order ID.")]
 OrderNotFound = {"description": "Order not found.", "model": ResourceNotFound.schema()}
 
 ListSorting = Annotated[
@@ -55,13 +55,13 @@ async def list(
             "`one_time` will return orders corresponding to one-time purchases."
         ),
     ),
-    subscription_id: MultipleQueryFilter[UUID4] | None = Query(
+    subscription_id: MultipleQueryFilter[UUID] | None = Query(
         None, title="SubscriptionID Filter", description="Filter by subscription ID."
     ),
     query: str | None = Query(
         None, description="Search by product or organization name."
     ),
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_db_read_session),
 ) -> ListResource[UserOrder]:
     """List my orders."""
     results, count = await user_order_service.list(
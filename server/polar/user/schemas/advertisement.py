@@ -1,12 +1,14 @@
-from pydantic import UUID4, HttpUrl
+from uuid import UUID
+
+from pydantic import HttpUrl
 
 from polar.benefit.schemas import BenefitID
 from polar.kit.schemas import HttpUrlToStr, Schema, TimestampedSchema
 
 
 class UserAdvertisementCampaign(TimestampedSchema):
-    id: UUID4
-    user_id: UUID4
+    id: UUID
+    user_id: UUID
     views: int
     clicks: int
     image_url: HttpUrl
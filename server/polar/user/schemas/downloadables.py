@@ -1,6 +1,5 @@
 from datetime import datetime
-
-from pydantic import UUID4
+from uuid import UUID
 
 from polar.benefit.schemas import BenefitID
 from polar.file.schemas import FileDownload
@@ -14,21 +13,21 @@ class DownloadableURL(Schema):
 
 
 class DownloadableRead(Schema):
-    id: UUID4
-    benefit_id: UUID4
+    id: UUID
+    benefit_id: UUID
 
     file: FileDownload
 
 
 class DownloadableCreate(Schema):
-    file_id: UUID4
-    user_id: UUID4
+    file_id: UUID
+    user_id: UUID
     benefit_id: BenefitID
     status: DownloadableStatus
 
 
 class DownloadableUpdate(Schema):
-    file_id: UUID4
-    user_id: UUID4
+    file_id: UUID
+    user_id: UUID
     benefit_id: BenefitID
     status: DownloadableStatus
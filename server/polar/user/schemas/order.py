@@ -1,4 +1,6 @@
-from pydantic import UUID4, Field
+from uuid import UUID
+
+from pydantic import Field
 
 from polar.kit.schemas import Schema, TimestampedSchema
 from polar.organization.schemas import Organization
@@ -13,15 +15,15 @@ from polar.subscription.schemas import SubscriptionBase
 
 
 class UserOrderBase(TimestampedSchema):
-    id: UUID4
+    id: UUID
     amount: int
     tax_amount: int
     currency: str
 
-    user_id: UUID4
-    product_id: UUID4
-    product_price_id: UUID4
-    subscription_id: UUID4 | None
+    user_id: UUID
+    product_id: UUID
+    product_price_id: UUID
+    subscription_id: UUID | None
 
 
 class UserOrderProduct(ProductBase):
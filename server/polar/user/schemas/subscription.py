@@ -1,6 +1,7 @@
 from datetime import datetime
+from uuid import UUID
 
-from pydantic import UUID4, Field
+from pydantic import Field
 
 from polar.kit.schemas import EmailStrDNS, Schema
 from polar.models.subscription import SubscriptionStatus
@@ -23,9 +24,9 @@ class UserSubscriptionBase(SubscriptionBase):
     started_at: datetime | None
     ended_at: datetime | None
 
-    user_id: UUID4
-    product_id: UUID4
-    price_id: UUID4
+    user_id: UUID
+    product_id: UUID
+    price_id: UUID
 
 
 class UserSubscriptionProduct(ProductBase):
@@ -41,7 +42,7 @@ class UserSubscription(UserSubscriptionBase):
 
 
 class UserFreeSubscriptionCreate(Schema):
-    product_id: UUID4 = Field(
+    product_id: UUID = Field(
         ...,
         description="ID of the free tier to subscribe to.",
     )
@@ -55,4 +56,4 @@ class UserFreeSubscriptionCreate(Schema):
 
 
 class UserSubscriptionUpdate(Schema):
-    product_price_id: UUID4
+    product_price_id: UUID
@@ -1,11 +1,12 @@
 import uuid
 from typing import Annotated, Literal
+from uuid import UUID
 
 from fastapi import Depends
-from pydantic import UUID4, EmailStr
+from pydantic import EmailStr
 
 from polar.auth.scope import Scope
-from polar.kit.schemas import Schema, TimestampedSchema, UUID4ToStr
+from polar.kit.schemas import Schema, TimestampedSchema, UUIDToStr
 from polar.models.user import OAuthPlatform
 
 
@@ -19,7 +20,7 @@ class User(Schema):
 class UserBase(Schema):
     email: EmailStr
     avatar_url: str | None
-    account_id: UUID4 | None
+    account_id: UUID | None
 
 
 class OAuthAccountRead(TimestampedSchema):
@@ -44,7 +45,7 @@ class UserUpdate(UserBase): ...
 
 
 class UserSetAccount(Schema):
-    account_id: UUID4
+    account_id: UUID
 
 
 class UserStripePortalSession(Schema):
@@ -73,10 +74,10 @@ class UserSignupAttribution(Schema):
     ) = None
 
     # Flywheel sources
-    order: UUID4ToStr | None = None
-    subscription: UUID4ToStr | None = None
-    pledge: UUID4ToStr | None = None
-    from_storefront: UUID4ToStr | None = None
+    order: UUIDToStr | None = None
+    subscription: UUIDToStr | None = None
+    pledge: UUIDToStr | None = None
+    from_storefront: UUIDToStr | None = None
 
     # Website source
     path: str | None = None
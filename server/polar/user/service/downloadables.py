@@ -7,6 +7,7 @@ from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from sqlalchemy.orm import contains_eager
 
 from polar.config import settings
+from polar.counter.service import BufferedCounter
 from polar.exceptions import (
     BadRequest,
     ResourceNotFound,
@@ -21,6 +22,7 @@ from polar.models import Benefit, User
 from polar.models.downloadable import Downloadable, DownloadableStatus
 from polar.models.file import File
 from polar.postgres import AsyncSession, sql
+from polar.redis import Redis
 
 from ..schemas.downloadables import (
     DownloadableCreate,
@@ -35,6 +37,13 @@ token_serializer = URLSafeTimedSerializer(
     settings.S3_FILES_DOWNLOAD_SECRET, settings.S3_FILES_DOWNLOAD_SALT
 )
 
+downloadable_downloads = BufferedCounter(
+    "downloadable_downloads",
+    Downloadable,
+    "downloaded",
+    timestamp_column="last_downloaded_at",
+)
+
 
 class DownloadableService(
     ResourceService[Downloadable, DownloadableCreate, DownloadableUpdate]
@@ -137,13 +146,10 @@ class DownloadableService(
 
     async def increment_download_count(
         self,
-        session: AsyncSession,
+        redis: Redis,
         downloadable: Downloadable,
     ) -> Downloadable:
-        downloadable.downloaded += 1
-        downloadable.last_downloaded_at = utc_now()
-        session.add(downloadable)
-        await session.flush()
+        await downloadable_downloads.increment(redis, downloadable)
         return downloadable
 
     def generate_downloadable_schemas(
@@ -189,7 +195,7 @@ class DownloadableService(
         return DownloadableURL(url=redirect_to, expires_at=expires_at)
 
     async def get_from_token_or_raise(
-        self, session: AsyncSession, user: User, token: str
+        self, session: AsyncSession, redis: Redis, user: User, token: str
     ) -> Downloadable:
         try:
             unpacked = token_serializer.loads(
@@ -209,7 +215,7 @@ class DownloadableService(
         if not downloadable:
             raise ResourceNotFound()
 
-        await self.increment_download_count(session, downloadable)
+        await self.increment_download_count(redis, downloadable)
         return downloadable
 
     def generate_download_schema(self, downloadable: Downloadable) -> DownloadableRead:
@@ -1,11 +1,15 @@
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, Path, Query
-from pydantic import UUID4
 
 from polar.authz.service import AccessType, Authz
 from polar.exceptions import NotPermitted, ResourceNotFound, Unauthorized
-from polar.kit.pagination import ListResource, PaginationParamsQuery
+from polar.kit.pagination import (
+    CursorPaginationParamsQuery,
+    ListResource,
+    PaginationParamsQuery,
+)
 from polar.models import WebhookEndpoint
 from polar.openapi import APITag
 from polar.organization.schemas import OrganizationID
@@ -20,7 +24,7 @@ from .service import webhook as webhook_service
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks", APITag.private])
 
-WebhookEndpointID = Annotated[UUID4, Path(description="The webhook endpoint ID.")]
+WebhookEndpointID = Annotated[UUID, Path(description="The webhook endpoint ID.")]
 WebhookEndpointNotFound = {
     "description": "Webhook endpoint not found.",
     "model": ResourceNotFound.schema(),
@@ -34,7 +38,7 @@ async def list_webhook_endpoints(
     organization_id: OrganizationID | None = Query(
         None, description="Filter by organization ID."
     ),
-    user_id: UUID4 | None = Query(None, description="Filter by user ID."),
+    user_id: UUID | None = Query(None, description="Filter by user ID."),
     session: AsyncSession = Depends(get_db_session),
 ) -> ListResource[WebhookEndpointSchema]:
     """List webhook endpoints."""
@@ -158,9 +162,9 @@ async def delete_webhook_endpoint(
     response_model=ListResource[WebhookDeliverySchema],
 )
 async def list_webhook_deliveries(
-    pagination: PaginationParamsQuery,
+    pagination: CursorPaginationParamsQuery,
     auth_subject: WebhooksRead,
-    endpoint_id: UUID4 | None = Query(
+    endpoint_id: UUID | None = Query(
         None, description="Filter by webhook endpoint ID."
     ),
     session: AsyncSession = Depends(get_db_session),
@@ -170,7 +174,7 @@ async def list_webhook_deliveries(
 
     Deliveries are all the attempts to deliver a webhook event to an endpoint.
     """
-    results, count = await webhook_service.list_deliveries(
+    results, count, next_cursor = await webhook_service.list_deliveries(
         session, auth_subject, endpoint_id=endpoint_id, pagination=pagination
     )
 
@@ -178,6 +182,7 @@ async def list_webhook_deliveries(
         [WebhookDeliverySchema.model_validate(result) for result in results],
         count,
         pagination,
+        next_cursor,
     )
 
 
@@ -193,7 +198,7 @@ async def list_webhook_deliveries(
     },
 )
 async def redeliver_webhook_event(
-    id: Annotated[UUID4, Path(..., description="The webhook event ID.")],
+    id: Annotated[UUID, Path(..., description="The webhook event ID.")],
     auth_subject: WebhooksWrite,
     session: AsyncSession = Depends(get_db_session),
     authz: Authz = Depends(Authz.authz),
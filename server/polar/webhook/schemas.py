@@ -1,6 +1,7 @@
 from typing import Annotated
+from uuid import UUID
 
-from pydantic import UUID4, AnyUrl, Field, PlainSerializer, UrlConstraints
+from pydantic import AnyUrl, Field, PlainSerializer, UrlConstraints
 
 from polar.kit.schemas import Schema, TimestampedSchema
 from polar.models.webhook_endpoint import WebhookEventType, WebhookFormat
@@ -45,13 +46,13 @@ class WebhookEndpoint(TimestampedSchema):
     A webhook endpoint.
     """
 
-    id: UUID4 = Field(description="The webhook endpoint ID.")
+    id: UUID = Field(description="The webhook endpoint ID.")
     url: EndpointURL
     format: EndpointFormat
-    user_id: UUID4 | None = Field(
+    user_id: UUID | None = Field(
         None, description=("The user ID associated with the webhook endpoint.")
     )
-    organization_id: UUID4 | None = Field(
+    organization_id: UUID | None = Field(
         None, description="The organization ID associated with the webhook endpoint."
     )
     events: EndpointEvents
@@ -97,7 +98,7 @@ class WebhookEvent(TimestampedSchema):
     each one creating a new delivery.
     """
 
-    id: UUID4 = Field(description="The webhook event ID.")
+    id: UUID = Field(description="The webhook event ID.")
     last_http_code: int | None = Field(
         None,
         description="Last HTTP code returned by the URL. "
@@ -118,7 +119,7 @@ class WebhookDelivery(TimestampedSchema):
     A webhook delivery for a webhook event.
     """
 
-    id: UUID4 = Field(description="The webhook delivery ID.")
+    id: UUID = Field(description="The webhook delivery ID.")
     http_code: int | None = Field(
         None,
         description="The HTTP code returned by the URL."
@@ -15,7 +15,12 @@ from polar.exceptions import (
     ResourceNotFound,
 )
 from polar.kit.db.postgres import AsyncSession
-from polar.kit.pagination import PaginationParams, paginate
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    PaginationParams,
+    paginate,
+    paginate_cursor,
+)
 from polar.kit.utils import utc_now
 from polar.logging import Logger
 from polar.models.organization import Organization
@@ -177,8 +182,8 @@ class WebhookService:
         auth_subject: AuthSubject[User | Organization],
         *,
         endpoint_id: UUID | None = None,
-        pagination: PaginationParams,
-    ) -> tuple[Sequence[WebhookDelivery], int]:
+        pagination: PaginationParams | CursorPaginationParams,
+    ) -> tuple[Sequence[WebhookDelivery], int, str | None]:
         readable_endpoints_statement = self._get_readable_endpoints_statement(
             auth_subject
         )
@@ -192,7 +197,6 @@ class WebhookService:
                 ),
             )
             .options(joinedload(WebhookDelivery.webhook_event))
-            .order_by(desc(WebhookDelivery.created_at))
         )
 
         if endpoint_id is not None:
@@ -200,7 +204,12 @@ class WebhookService:
                 WebhookDelivery.webhook_endpoint_id == endpoint_id
             )
 
-        return await paginate(session, statement, pagination=pagination)
+        return await paginate_cursor(
+            session,
+            statement,
+            pagination=pagination,
+            order_by=[desc(WebhookDelivery.created_at)],
+        )
 
     async def redeliver_event(
         self,
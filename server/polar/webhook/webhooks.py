@@ -14,7 +14,7 @@ from polar.benefit.schemas import Benefit as BenefitSchema
 from polar.benefit.schemas import BenefitGrantWebhook
 from polar.checkout.schemas import Checkout as CheckoutSchema
 from polar.exceptions import PolarError
-from polar.kit.schemas import IDSchema, Schema
+from polar.kit.schemas import IDSchema, Schema, get_type_adapter_config
 from polar.models import (
     Benefit,
     BenefitGrant,
@@ -768,7 +768,9 @@ WebhookPayload = Annotated[
     | WebhookBenefitGrantRevokedPayload,
     Discriminator(discriminator="type"),
 ]
-WebhookPayloadTypeAdapter: TypeAdapter[WebhookPayload] = TypeAdapter(WebhookPayload)
+WebhookPayloadTypeAdapter: TypeAdapter[WebhookPayload] = TypeAdapter(
+    WebhookPayload, config=get_type_adapter_config()
+)
 
 
 class WebhookAPIRoute(APIRoute):
@@ -3,23 +3,25 @@ import contextlib
 import contextvars
 import functools
 import random
+import time
 import uuid
 from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime
 from enum import Enum
-from typing import Any, ParamSpec, TypeAlias, TypedDict, TypeVar, cast
+from typing import Any, NotRequired, ParamSpec, TypeAlias, TypedDict, TypeVar, cast
 
 import logfire
 import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from arq import func
+from arq import Retry, func
 from arq.connections import ArqRedis, RedisSettings
 from arq.connections import create_pool as arq_create_pool
 from arq.cron import CronJob
 from arq.typing import SecondsTimedelta
 from arq.worker import Function
 from pydantic import BaseModel
+from redis import RedisError
 
 from polar.config import settings
 from polar.context import ExecutionContext
@@ -31,10 +33,18 @@ from polar.kit.db.postgres import (
 from polar.kit.db.postgres import (
     AsyncSessionMaker as AsyncSessionMakerType,
 )
+from polar.kit.metrics import Counter, Gauge, Histogram, MetricsServer, Registry
 from polar.logfire import instrument_httpx, instrument_sqlalchemy
 from polar.logging import generate_correlation_id
-from polar.postgres import create_async_engine
-from polar.redis import REDIS_RETRY, REDIS_RETRY_ON_ERRROR, Redis, create_redis
+from polar.postgres import create_async_engine, report_query_stats, track_queries
+from polar.redis import (
+    REDIS_RETRY,
+    REDIS_RETRY_ON_ERRROR,
+    Redis,
+    RedisConnectionManager,
+    RedisRole,
+    create_redis_connections,
+)
 
 log = structlog.get_logger()
 
@@ -50,6 +60,7 @@ class WorkerContext(TypedDict):
     async_engine: AsyncEngine
     async_sessionmaker: AsyncSessionMakerType
     exit_stack: contextlib.AsyncExitStack
+    metrics_port: NotRequired[int]
 
 
 class JobContext(WorkerContext):
@@ -77,6 +88,90 @@ class QueueName(Enum):
     github_crawl = "arq:queue:github_crawl"
 
 
+_current_queue_name = contextvars.ContextVar[QueueName | None](
+    "polar_worker_queue_name", default=None
+)
+
+
+def get_current_queue_name() -> QueueName | None:
+    """Return the queue processed by the current worker, if any."""
+    return _current_queue_name.get()
+
+
+metrics_registry = Registry()
+job_queue_lag = metrics_registry.register(
+    Histogram(
+        "polar_worker_job_queue_lag_seconds",
+        "Time between the moment a job is due and its start.",
+        ("task", "queue"),
+        buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600),
+    )
+)
+job_duration = metrics_registry.register(
+    Histogram(
+        "polar_worker_job_duration_seconds",
+        "Duration of job runs, by outcome.",
+        ("task", "queue", "status"),
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+    )
+)
+job_retries = metrics_registry.register(
+    Counter(
+        "polar_worker_job_retries_total",
+        "Job runs beyond their first try.",
+        ("task", "queue"),
+    )
+)
+job_deferrals = metrics_registry.register(
+    Counter(
+        "polar_worker_job_deferrals_total",
+        "Job runs deferred by raising `Retry`.",
+        ("task", "queue"),
+    )
+)
+jobs_in_progress = metrics_registry.register(
+    Gauge(
+        "polar_worker_jobs_in_progress",
+        "Jobs currently running in the worker process.",
+        ("queue",),
+    )
+)
+worker_max_jobs = metrics_registry.register(
+    Gauge(
+        "polar_worker_max_jobs",
+        "Maximum number of jobs running concurrently in the worker process.",
+        ("queue",),
+    )
+)
+queue_depth = metrics_registry.register(
+    Gauge(
+        "polar_worker_queue_depth",
+        "Jobs waiting in the queue, ready to run or deferred to later.",
+        ("queue", "state"),
+    )
+)
+
+
+redis_pool_connections = metrics_registry.register(
+    Gauge(
+        "polar_redis_pool_connections",
+        "Connections of the Redis pools, by role, in use or idle.",
+        ("role", "state"),
+    )
+)
+redis_pool_max_connections = metrics_registry.register(
+    Gauge(
+        "polar_redis_pool_max_connections",
+        "Maximum number of connections of the Redis pools, by role.",
+        ("role",),
+    )
+)
+
+
+def _get_queue_label() -> str:
+    return (get_current_queue_name() or QueueName.default).name
+
+
 def get_redis_settings() -> RedisSettings:
     redis_settings = RedisSettings.from_dsn(settings.redis_url)
     redis_settings.retry_on_error = REDIS_RETRY_ON_ERRROR  # type: ignore  # https://github.com/python-arq/arq/pull/446
@@ -88,6 +183,7 @@ class WorkerSettings:
     functions: list[Function] = []
     cron_jobs: list[CronJob] = []
     queue_name: str = QueueName.default.value
+    max_jobs = 10
     health_check_interval = settings.WORKER_HEALTH_CHECK_INTERVAL
     redis_settings = get_redis_settings()
 
@@ -103,7 +199,10 @@ class WorkerSettings:
         exit_stack = contextlib.AsyncExitStack()
         # Create a dedicated Redis instance instead of sharing the ARQ one,
         # because we need to have decode_responses=True.
-        redis = await exit_stack.enter_async_context(create_redis())
+        redis_connections = await exit_stack.enter_async_context(
+            create_redis_connections()
+        )
+        redis = redis_connections.get_client(RedisRole.cache)
 
         ctx.update(
             {
@@ -114,6 +213,40 @@ class WorkerSettings:
             }
         )
 
+        metrics_port = ctx.get("metrics_port")
+        if metrics_port is not None:
+            worker_max_jobs.set(WorkerSettings.max_jobs, queue=_get_queue_label())
+
+            async def _collect_queue_depth() -> None:
+                now_ms = int(time.time() * 1000)
+                for queue_name in QueueName:
+                    try:
+                        total = await redis.zcard(queue_name.value)
+                        ready = await redis.zcount(queue_name.value, "-inf", now_ms)
+                    except RedisError as e:
+                        log.warning("polar.worker.metrics_queue_depth", error=str(e))
+                        continue
+                    queue_depth.set(ready, queue=queue_name.name, state="ready")
+                    queue_depth.set(
+                        total - ready, queue=queue_name.name, state="deferred"
+                    )
+
+            async def _collect_redis_pools() -> None:
+                for role, stats in redis_connections.get_stats().items():
+                    if stats.max_connections is not None:
+                        redis_pool_max_connections.set(stats.max_connections, role=role)
+                    redis_pool_connections.set(stats.in_use, role=role, state="in_use")
+                    redis_pool_connections.set(stats.idle, role=role, state="idle")
+
+            metrics_registry.add_collector(_collect_queue_depth)
+            metrics_registry.add_collector(_collect_redis_pools)
+            metrics_server = MetricsServer(
+                metrics_registry, host=settings.WORKER_METRICS_HOST, port=metrics_port
+            )
+            await metrics_server.start()
+            exit_stack.push_async_callback(metrics_server.close)
+            log.info("polar.worker.metrics_server_started", port=metrics_port)
+
     @staticmethod
     async def on_shutdown(ctx: WorkerContext) -> None:
         engine = ctx["async_engine"]
@@ -166,6 +299,8 @@ class WorkerSettingsGitHubCrawl(WorkerSettings):
 
     @staticmethod
     async def on_startup(ctx: WorkerContext) -> None:
+        # Jobs tasks are spawned from the worker main task, so they inherit this
+        _current_queue_name.set(QueueName.github_crawl)
         return await WorkerSettings.on_startup(ctx)
 
     @staticmethod
@@ -225,7 +360,19 @@ class CronTasksScheduler:
 
 
 @contextlib.asynccontextmanager
-async def lifespan() -> AsyncIterator[ArqRedis]:
+async def lifespan(
+    redis_connections: RedisConnectionManager | None = None,
+) -> AsyncIterator[ArqRedis]:
+    """
+    Yield an ARQ pool to enqueue jobs.
+
+    With `redis_connections`, it's bound to their `queue` pool, which they own;
+    otherwise, a dedicated pool is created and closed on exit.
+    """
+    if redis_connections is not None:
+        yield ArqRedis(redis_connections.get_pool(RedisRole.queue))
+        return
+
     arq_pool = await arq_create_pool(WorkerSettings.redis_settings)
     try:
         yield arq_pool
@@ -280,7 +427,7 @@ ReturnValue = TypeVar("ReturnValue")
 
 
 def task_hooks(
-    f: Callable[Params, Awaitable[ReturnValue]],
+    f: Callable[Params, Awaitable[ReturnValue]], name: str
 ) -> Callable[Params, Awaitable[ReturnValue]]:
     @functools.wraps(f)
     async def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> ReturnValue:
@@ -300,8 +447,40 @@ def task_hooks(
         structlog.contextvars.bind_contextvars(**log_context)
         job_context["logfire_span"].set_attributes(log_context)
 
+        queue = _get_queue_label()
+        metrics_labels = {"task": name, "queue": queue}
+        # The score is the timestamp in milliseconds when the job was due
+        job_queue_lag.observe(
+            max(0.0, time.time() - job_context["score"] / 1000), **metrics_labels
+        )
+        if job_context["job_try"] > 1:
+            job_retries.inc(**metrics_labels)
+
         log.info("polar.worker.job_started")
-        r = await f(*args, **kwargs)
+        jobs_in_progress.inc(queue=queue)
+        status = "failure"
+        start = time.perf_counter()
+        # Set the job own list of jobs to enqueue, so jobs enqueued
+        # from tasks spawned by the job are shared with it and flushed too.
+        _jobs_to_enqueue.set([])
+        try:
+            with track_queries() as query_stats:
+                r = await f(*args, **kwargs)
+            status = "success"
+        except Retry:
+            status = "deferred"
+            job_deferrals.inc(**metrics_labels)
+            raise
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            jobs_in_progress.dec(queue=queue)
+            job_duration.observe(
+                time.perf_counter() - start, status=status, **metrics_labels
+            )
+
+        report_query_stats(query_stats, job_context["logfire_span"].set_attributes)
 
         arq_pool = job_context["redis"]
         await flush_enqueued_jobs(arq_pool)
@@ -336,7 +515,7 @@ def task(
     def decorator(
         f: Callable[Params, Awaitable[ReturnValue]],
     ) -> Callable[Params, Awaitable[ReturnValue]]:
-        wrapped = task_hooks(f)
+        wrapped = task_hooks(f, name)
 
         new_task = func(
             wrapped,  # type: ignore
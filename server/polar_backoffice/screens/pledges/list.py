@@ -10,7 +10,7 @@ from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import DataTable, Footer
 
-from polar.issue.search import search_query
+from polar.issue.search import get_search_clause
 from polar.models import (
     ExternalOrganization,
     Issue,
@@ -164,9 +164,8 @@ class PledgesListScreen(Screen[None]):
                     else:
                         fuzzy_clauses.append(clause)
                 if len(fuzzy_clauses):
-                    fuzzy_query = search_query(" ".join(fuzzy_clauses))
                     statement = statement.where(
-                        Issue.title_tsv.bool_op("@@")(func.to_tsquery(fuzzy_query))
+                        get_search_clause(" ".join(fuzzy_clauses))
                     )
 
             stream = await session.stream(statement)
@@ -10,6 +10,7 @@ import structlog
 from arq import check_health
 from arq import run_worker as arq_run_worker
 
+from polar.config import settings
 from polar.logfire import configure_logfire
 from polar.logging import Logger
 from polar.logging import configure as configure_logging
@@ -34,14 +35,15 @@ def _run_scheduler() -> None:
         pass
 
 
-def _run_worker(settings_cls: type[WorkerSettings]) -> None:
+def _run_worker(settings_cls: type[WorkerSettings], metrics_port: int | None) -> None:
     from polar import tasks, receivers  # noqa
 
     pid = multiprocessing.current_process().pid
     queue = settings_cls.queue_name
     structlog.contextvars.bind_contextvars(pid=pid, queue=queue)
 
-    arq_run_worker(settings_cls)  # type: ignore
+    ctx = {"metrics_port": metrics_port} if metrics_port is not None else {}
+    arq_run_worker(settings_cls, ctx=ctx)  # type: ignore
 
 
 def _worker_health_check(settings_cls: type[WorkerSettings]) -> None:
@@ -108,9 +110,14 @@ def _main(queue: str, worker_num: int = 1, scheduler: bool = False) -> int:
         processes.append(scheduler_process)
         logger.debug("Triggered scheduler process")
 
-    for _ in range(worker_num):
+    for i in range(worker_num):
+        metrics_port = (
+            settings.WORKER_METRICS_PORT + i
+            if settings.WORKER_METRICS_PORT is not None
+            else None
+        )
         default_worker_process = multiprocessing.Process(
-            target=_run_worker, args=(_worker_settings_class[queue],)
+            target=_run_worker, args=(_worker_settings_class[queue], metrics_port)
         )
         default_worker_process.start()
         processes.append(default_worker_process)
@@ -0,0 +1,84 @@
+"""
+Observe and control the bulk updates of a benefit grants.
+
+    python -m scripts.benefit_grant_updates status <benefit_id>
+    python -m scripts.benefit_grant_updates pause <benefit_id>
+    python -m scripts.benefit_grant_updates resume <benefit_id>
+"""
+
+import asyncio
+import uuid
+from functools import wraps
+
+import typer
+
+from polar.benefit.service.benefit_grant import benefit_grant as benefit_grant_service
+from polar.benefit.service.benefit_grant_updates import (
+    BenefitGrantUpdatesProgress,
+    get_progress,
+)
+from polar.redis import create_redis
+from polar.worker import flush_enqueued_jobs
+from polar.worker import lifespan as worker_lifespan
+
+cli = typer.Typer()
+
+
+def typer_async(f):  # type: ignore
+    # From https://github.com/tiangolo/typer/issues/85
+    @wraps(f)
+    def wrapper(*args, **kwargs):  # type: ignore
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+def _echo_progress(
+    benefit_id: uuid.UUID, progress: BenefitGrantUpdatesProgress | None
+) -> None:
+    if progress is None:
+        typer.echo(f"No grants update for benefit {benefit_id}")
+        return
+
+    percent = progress.processed / progress.total * 100 if progress.total else 100.0
+    typer.echo(
+        f"Run {progress.run_id}: {progress.status}, "
+        f"{progress.processed}/{progress.total} grants ({percent:.1f}%), "
+        f"{progress.retried} retried individually"
+    )
+    typer.echo(
+        f"  started at {progress.started_at.isoformat()}, "
+        f"updated at {progress.updated_at.isoformat()}"
+    )
+
+
+@cli.command()
+@typer_async
+async def status(benefit_id: uuid.UUID) -> None:
+    async with create_redis() as redis:
+        _echo_progress(benefit_id, await get_progress(redis, benefit_id))
+
+
+@cli.command()
+@typer_async
+async def pause(benefit_id: uuid.UUID) -> None:
+    async with create_redis() as redis:
+        progress = await benefit_grant_service.pause_benefit_grant_updates(
+            redis, benefit_id
+        )
+        _echo_progress(benefit_id, progress)
+
+
+@cli.command()
+@typer_async
+async def resume(benefit_id: uuid.UUID) -> None:
+    async with create_redis() as redis, worker_lifespan() as arq_pool:
+        progress = await benefit_grant_service.resume_benefit_grant_updates(
+            redis, benefit_id
+        )
+        await flush_enqueued_jobs(arq_pool)
+        _echo_progress(benefit_id, progress)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,101 @@
+"""
+Measure the per-request overhead of `CORSMatcherMiddleware`.
+
+The middleware wraps a no-op ASGI app and is called directly, without server,
+so the timings only include the CORS handling.
+
+    python -m scripts.cors_benchmark --iterations 100000
+"""
+
+import asyncio
+import time
+
+import typer
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from polar.kit.cors import CORSConfig, CORSMatcherMiddleware, origins_matcher
+
+cli = typer.Typer()
+
+
+async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+def _get_scope(method: str, headers: dict[str, str]) -> Scope:
+    return {
+        "type": "http",
+        "method": method,
+        "path": "/v1/products/",
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+    }
+
+
+SCENARIOS: dict[str, Scope] = {
+    "no origin": _get_scope("GET", {"authorization": "Bearer polar_at_xxx"}),
+    "simple request": _get_scope(
+        "GET", {"origin": "https://polar.sh", "authorization": "Bearer polar_at_xxx"}
+    ),
+    "preflight": _get_scope(
+        "OPTIONS",
+        {
+            "origin": "https://example.com",
+            "access-control-request-method": "POST",
+            "access-control-request-headers": "authorization",
+        },
+    ),
+}
+
+
+async def _benchmark(app: ASGIApp, scope: Scope, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(scope, _receive, _send)
+    return (time.perf_counter() - start) / iterations
+
+
+@cli.command()
+def main(iterations: int = typer.Option(100_000)) -> None:
+    middleware = CORSMatcherMiddleware(
+        _app,
+        configs=[
+            CORSConfig(
+                origins_matcher(["https://polar.sh"]),
+                allow_origins=["https://polar.sh"],
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            ),
+            CORSConfig(
+                lambda origin, scope: True,
+                allow_origins=["*"],
+                allow_methods=["*"],
+                allow_headers=["Authorization"],
+            ),
+        ],
+    )
+
+    async def _run() -> None:
+        baseline = await _benchmark(_app, SCENARIOS["no origin"], iterations)
+        typer.echo(f"{'baseline':<16} {baseline * 1e6:>8.2f} µs/request")
+        for name, scope in SCENARIOS.items():
+            duration = await _benchmark(middleware, scope, iterations)
+            typer.echo(
+                f"{name:<16} {duration * 1e6:>8.2f} µs/request "
+                f"(+{(duration - baseline) * 1e6:.2f} µs)"
+            )
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,119 @@
+"""
+Compare pipelined and unpipelined Redis access patterns used in the codebase.
+
+Each scenario runs the same commands one by one, awaiting each round-trip,
+then batched in a single non-transactional pipeline. Keys are written under
+a dedicated prefix, deleted afterwards.
+
+    python -m scripts.redis_benchmark --iterations 1000 --batch-size 3
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from functools import wraps
+
+import typer
+
+from polar.redis import Redis, RedisRole, create_redis_connections
+
+cli = typer.Typer()
+
+PREFIX = "redis_benchmark"
+
+
+def typer_async(f):  # type: ignore
+    # From https://github.com/tiangolo/typer/issues/85
+    @wraps(f)
+    def wrapper(*args, **kwargs):  # type: ignore
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+async def _publish(redis: Redis, batch_size: int) -> None:
+    # eventstream.send_event, before it was pipelined
+    for i in range(batch_size):
+        await redis.publish(f"{PREFIX}:channel:{i}", "{}")
+
+
+async def _publish_pipelined(redis: Redis, batch_size: int) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for i in range(batch_size):
+            pipe.publish(f"{PREFIX}:channel:{i}", "{}")
+        await pipe.execute()
+
+
+async def _cache_set(redis: Redis, batch_size: int) -> None:
+    # Cache writes with a TTL, like issue bodies or search results
+    for i in range(batch_size):
+        await redis.set(f"{PREFIX}:key:{i}", "value", ex=60)
+
+
+async def _cache_set_pipelined(redis: Redis, batch_size: int) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for i in range(batch_size):
+            pipe.set(f"{PREFIX}:key:{i}", "value", ex=60)
+        await pipe.execute()
+
+
+async def _cache_get(redis: Redis, batch_size: int) -> None:
+    for i in range(batch_size):
+        await redis.get(f"{PREFIX}:key:{i}")
+
+
+async def _cache_get_pipelined(redis: Redis, batch_size: int) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for i in range(batch_size):
+            pipe.get(f"{PREFIX}:key:{i}")
+        await pipe.execute()
+
+
+Scenario = Callable[[Redis, int], Awaitable[None]]
+
+SCENARIOS: dict[str, tuple[Scenario, Scenario]] = {
+    "publish": (_publish, _publish_pipelined),
+    "cache set": (_cache_set, _cache_set_pipelined),
+    "cache get": (_cache_get, _cache_get_pipelined),
+}
+
+
+async def _benchmark(
+    redis: Redis, scenario: Scenario, iterations: int, batch_size: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await scenario(redis, batch_size)
+    return (time.perf_counter() - start) / iterations
+
+
+@cli.command()
+@typer_async
+async def main(
+    iterations: int = typer.Option(1_000, help="Number of runs per scenario."),
+    batch_size: int = typer.Option(3, help="Number of commands per run."),
+) -> None:
+    async with create_redis_connections() as redis_connections:
+        redis = redis_connections.get_client(RedisRole.cache)
+        try:
+            for name, (sequential, pipelined) in SCENARIOS.items():
+                sequential_duration = await _benchmark(
+                    redis, sequential, iterations, batch_size
+                )
+                pipelined_duration = await _benchmark(
+                    redis, pipelined, iterations, batch_size
+                )
+                typer.echo(
+                    f"{name:<10} "
+                    f"sequential {sequential_duration * 1e6:>9.1f} µs/run, "
+                    f"pipelined {pipelined_duration * 1e6:>9.1f} µs/run "
+                    f"(x{sequential_duration / pipelined_duration:.1f})"
+                )
+        finally:
+            keys = [key async for key in redis.scan_iter(f"{PREFIX}:*")]
+            if keys:
+                await redis.delete(*keys)
+
+
+if __name__ == "__main__":
+    cli()
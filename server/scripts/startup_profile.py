@@ -0,0 +1,196 @@
+"""
+Profile the cold start of the API and worker processes.
+
+Each measure runs in a fresh interpreter, so modules already imported by this
+script don't skew the results.
+
+    python -m scripts.startup_profile imports polar.app
+    python -m scripts.startup_profile schemas polar.app
+    python -m scripts.startup_profile app --lazy --max-seconds 10
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import typer
+
+cli = typer.Typer()
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _run(
+    args: list[str], *, env: dict[str, str] | None = None
+) -> subprocess.CompletedProcess[str]:
+    result = subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+    if result.returncode != 0:
+        typer.echo(result.stderr, err=True)
+        raise typer.Exit(result.returncode)
+    return result
+
+
+def _parse_import_times(output: str) -> list[ImportTime]:
+    import_times: list[ImportTime] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        import_times.append(
+            ImportTime(module.strip(), int(self_us), int(cumulative_us))
+        )
+    return import_times
+
+
+def _echo_table(title: str, rows: list[tuple[str, float]]) -> None:
+    typer.echo(f"\n{title}")
+    for name, ms in rows:
+        typer.echo(f"{ms:>10.1f} ms  {name}")
+
+
+@cli.command()
+def imports(
+    module: str = typer.Argument("polar.app"),
+    limit: int = typer.Option(30, help="Number of modules to show."),
+    prefix: str = typer.Option(
+        "", help="Only show modules starting with this prefix, e.g. `polar.`"
+    ),
+) -> None:
+    """Report the import cost of each module, from `python -X importtime`."""
+    result = _run(["-X", "importtime", "-c", f"import {module}"])
+    import_times = [
+        i for i in _parse_import_times(result.stderr) if i.module.startswith(prefix)
+    ]
+
+    by_self = sorted(import_times, key=lambda i: i.self_us, reverse=True)
+    _echo_table(
+        "Self time (module body only)",
+        [(i.module, i.self_us / 1000) for i in by_self[:limit]],
+    )
+    by_cumulative = sorted(import_times, key=lambda i: i.cumulative_us, reverse=True)
+    _echo_table(
+        "Cumulative time (including imported modules)",
+        [(i.module, i.cumulative_us / 1000) for i in by_cumulative[:limit]],
+    )
+
+
+_SCHEMAS_SNIPPET = """
+import importlib
+import json
+import sys
+import time
+
+from pydantic import TypeAdapter
+from pydantic._internal._model_construction import ModelMetaclass
+
+timings = []
+
+original_model_new = ModelMetaclass.__new__
+
+
+def _timed_model_new(mcs, cls_name, bases, namespace, *args, **kwargs):
+    start = time.perf_counter()
+    cls = original_model_new(mcs, cls_name, bases, namespace, *args, **kwargs)
+    name = f"{namespace.get('__module__')}.{namespace.get('__qualname__', cls_name)}"
+    timings.append((name, time.perf_counter() - start))
+    return cls
+
+
+ModelMetaclass.__new__ = staticmethod(_timed_model_new)
+
+original_type_adapter_init = TypeAdapter.__init__
+
+
+def _timed_type_adapter_init(self, type, *args, **kwargs):
+    start = time.perf_counter()
+    original_type_adapter_init(self, type, *args, **kwargs)
+    timings.append((f"TypeAdapter({type!r})", time.perf_counter() - start))
+
+
+TypeAdapter.__init__ = _timed_type_adapter_init
+
+importlib.import_module(sys.argv[1])
+json.dump(timings, sys.stdout)
+"""
+
+
+@cli.command()
+def schemas(
+    module: str = typer.Argument("polar.app"),
+    limit: int = typer.Option(30, help="Number of schemas to show."),
+) -> None:
+    """Report the build time of Pydantic models and type adapters."""
+    result = _run(["-c", _SCHEMAS_SNIPPET, module])
+    timings: list[tuple[str, float]] = json.loads(result.stdout)
+    total = sum(seconds for _, seconds in timings)
+
+    timings.sort(key=lambda t: t[1], reverse=True)
+    _echo_table(
+        f"Schema build time, inclusive ({len(timings)} schemas, {total * 1000:.1f} ms)",
+        [(name, seconds * 1000) for name, seconds in timings[:limit]],
+    )
+
+
+_APP_SNIPPET = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from polar.app import app
+imported = time.perf_counter()
+app.openapi()
+openapi = time.perf_counter()
+
+json.dump({"import": imported - start, "openapi": openapi - imported}, sys.stdout)
+"""
+
+
+@cli.command()
+def app(
+    lazy: bool = typer.Option(False, help="Enable the lazy startup mode."),
+    runs: int = typer.Option(3, help="Number of cold starts to measure."),
+    max_seconds: float | None = typer.Option(
+        None, help="Fail if the median cold start exceeds this budget."
+    ),
+) -> None:
+    """Measure the cold start of the API application."""
+    env = {"POLAR_LAZY_STARTUP": "1" if lazy else "0"}
+    measures: list[dict[str, float]] = []
+    for _ in range(runs):
+        result = _run(["-c", _APP_SNIPPET], env=env)
+        measures.append(json.loads(result.stdout))
+
+    import_median = statistics.median(m["import"] for m in measures)
+    openapi_median = statistics.median(m["openapi"] for m in measures)
+    _echo_table(
+        f"API cold start, median of {runs} runs (lazy={lazy})",
+        [
+            ("import polar.app", import_median * 1000),
+            ("first OpenAPI schema", openapi_median * 1000),
+        ],
+    )
+
+    if max_seconds is not None and import_median > max_seconds:
+        typer.echo(
+            f"\n❌ Cold start {import_median:.2f}s exceeds budget {max_seconds:.2f}s",
+            err=True,
+        )
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,156 @@
+"""
+Compare random (v4) and time-ordered (v7) UUID primary keys on Postgres.
+
+A synthetic `webhook_deliveries`-like table is filled in batches for each
+generator, in a dedicated schema dropped afterwards. We report the insert
+throughput and the size of the primary key index; with the `pgstattuple`
+extension available, the average density of its leaf pages as well.
+
+    python -m scripts.uuid_benchmark --rows 1000000 --batch-size 1000
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import wraps
+from typing import Any
+
+import typer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from polar.kit.utils import human_readable_size, uuid7
+from polar.postgres import create_async_engine
+
+cli = typer.Typer()
+
+SCHEMA = "uuid_benchmark"
+
+GENERATORS: dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def typer_async(f):  # type: ignore
+    # From https://github.com/tiangolo/typer/issues/85
+    @wraps(f)
+    def wrapper(*args, **kwargs):  # type: ignore
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+async def _create_table(connection: AsyncConnection, name: str) -> None:
+    await connection.execute(
+        text(
+            f"""
+            CREATE TABLE {SCHEMA}.{name} (
+                id uuid PRIMARY KEY,
+                created_at timestamptz NOT NULL,
+                webhook_endpoint_id uuid NOT NULL,
+                webhook_event_id uuid NOT NULL,
+                http_code integer,
+                succeeded boolean NOT NULL
+            )
+            """
+        )
+    )
+
+
+async def _insert(
+    connection: AsyncConnection,
+    name: str,
+    generator: Callable[[], uuid.UUID],
+    rows: int,
+    batch_size: int,
+) -> float:
+    endpoint_id = uuid.uuid4()
+    statement = text(
+        f"""
+        INSERT INTO {SCHEMA}.{name}
+        (id, created_at, webhook_endpoint_id, webhook_event_id, http_code, succeeded)
+        VALUES (:id, :created_at, :webhook_endpoint_id, :webhook_event_id, 200, true)
+        """
+    )
+
+    duration = 0.0
+    for offset in range(0, rows, batch_size):
+        batch: list[dict[str, Any]] = [
+            {
+                "id": generator(),
+                "created_at": datetime.now(UTC),
+                "webhook_endpoint_id": endpoint_id,
+                "webhook_event_id": uuid.uuid4(),
+            }
+            for _ in range(min(batch_size, rows - offset))
+        ]
+        start = time.perf_counter()
+        await connection.execute(statement, batch)
+        await connection.commit()
+        duration += time.perf_counter() - start
+    return duration
+
+
+async def _get_index_stats(connection: AsyncConnection, name: str) -> dict[str, Any]:
+    index = f"{SCHEMA}.{name}_pkey"
+    stats: dict[str, Any] = {
+        "size": await connection.scalar(
+            text("SELECT pg_relation_size(CAST(:index AS regclass))"), {"index": index}
+        )
+    }
+    has_pgstattuple = await connection.scalar(
+        text("SELECT count(*) FROM pg_extension WHERE extname = 'pgstattuple'")
+    )
+    if has_pgstattuple:
+        result = await connection.execute(
+            text(
+                "SELECT avg_leaf_density, leaf_fragmentation "
+                "FROM pgstatindex(CAST(:index AS regclass))"
+            ),
+            {"index": index},
+        )
+        stats.update(result.mappings().one())
+    return stats
+
+
+@cli.command()
+@typer_async
+async def main(
+    rows: int = typer.Option(1_000_000, help="Number of rows to insert per table."),
+    batch_size: int = typer.Option(1_000, help="Number of rows per INSERT."),
+) -> None:
+    engine = create_async_engine("script")
+    async with engine.connect() as connection:
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await connection.commit()
+
+        try:
+            for name, generator in GENERATORS.items():
+                await _create_table(connection, name)
+                await connection.commit()
+
+                duration = await _insert(connection, name, generator, rows, batch_size)
+                stats = await _get_index_stats(connection, name)
+
+                typer.echo(
+                    f"{name}: {rows / duration:,.0f} rows/s, "
+                    f"primary key index {human_readable_size(stats['size'])}"
+                )
+                if "avg_leaf_density" in stats:
+                    typer.echo(
+                        f"  leaf density {stats['avg_leaf_density']:.1f}%, "
+                        f"leaf fragmentation {stats['leaf_fragmentation']:.1f}%"
+                    )
+        finally:
+            await connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await connection.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    cli()
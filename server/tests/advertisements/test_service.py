@@ -9,6 +9,7 @@ from polar.kit.db.postgres import AsyncSession
 from polar.kit.pagination import PaginationParams
 from polar.models import Benefit, Organization, User, UserOrganization
 from polar.models.benefit import BenefitType
+from polar.redis import Redis
 from tests.fixtures.database import SaveFixture
 from tests.fixtures.random_objects import (
     create_advertisement_campaign,
@@ -97,12 +98,12 @@ class TestList:
 @pytest.mark.skip_db_asserts
 class TestTrackView:
     async def test_valid(
-        self, save_fixture: SaveFixture, session: AsyncSession, user: User
+        self, save_fixture: SaveFixture, redis: Redis, user: User
     ) -> None:
         campaign = await create_advertisement_campaign(save_fixture, user=user)
         assert campaign.views == 0
 
         updated_campaign = await advertisement_campaign_service.track_view(
-            session, campaign
+            redis, campaign
         )
         assert updated_campaign.views == 1
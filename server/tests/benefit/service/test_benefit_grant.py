@@ -1,16 +1,29 @@
-from typing import Literal
-from unittest.mock import MagicMock, call
+import contextlib
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+from unittest.mock import MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
 
-from polar.benefit.benefits import BenefitPreconditionError, BenefitServiceProtocol
-from polar.benefit.service.benefit_grant import (
-    benefit_grant as benefit_grant_service,
+from polar.benefit.benefits import (
+    BenefitPreconditionError,
+    BenefitRetriableError,
+    BenefitServiceProtocol,
 )
+from polar.benefit.service import benefit_grant_updates
 from polar.benefit.service.benefit_grant import (  # type: ignore[attr-defined]
+    SessionFactory,
     notification_service,
 )
+from polar.benefit.service.benefit_grant import (
+    benefit_grant as benefit_grant_service,
+)
+from polar.benefit.service.benefit_grant_updates import (
+    BenefitGrantUpdatesStatus,
+    get_limits,
+)
 from polar.models import Benefit, BenefitGrant, Product, Subscription, User
 from polar.notifications.notification import (
     BenefitPreconditionErrorNotificationContextualPayload,
@@ -24,6 +37,7 @@ from tests.fixtures.random_objects import (
     create_benefit_grant,
     create_order,
     create_subscription,
+    create_user,
     set_product_benefits,
 )
 
@@ -329,57 +343,69 @@ class TestRevokeBenefit:
         benefit_service_mock.revoke.assert_called_once()
 
 
+def get_sessionmaker(session: AsyncSession) -> SessionFactory:
+    @contextlib.asynccontextmanager
+    async def sessionmaker() -> AsyncIterator[AsyncSession]:
+        yield session
+
+    return sessionmaker
+
+
 @pytest.mark.asyncio
 @pytest.mark.skip_db_asserts
-class TestEnqueueBenefitsGrants:
+class TestProcessBenefitsGrants:
     @pytest.mark.parametrize("task", ["grant", "revoke"])
     async def test_subscription_scope(
         self,
         task: Literal["grant", "revoke"],
         mocker: MockerFixture,
         session: AsyncSession,
+        redis: Redis,
         save_fixture: SaveFixture,
         product: Product,
         benefits: list[Benefit],
         user: User,
         subscription: Subscription,
     ) -> None:
-        enqueue_job_mock = mocker.patch(
-            "polar.benefit.service.benefit_grant.enqueue_job"
+        process_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "_process_benefit_grant"
         )
 
         product = await set_product_benefits(
             save_fixture, product=product, benefits=benefits
         )
 
-        await benefit_grant_service.enqueue_benefits_grants(
-            session, task, user, product, subscription=subscription
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            get_sessionmaker(session),
+            redis,
+            task,
+            user,
+            product,
+            max_concurrency=1,
+            subscription=subscription,
         )
 
-        enqueue_job_mock.assert_has_calls(
-            [
-                call(
-                    f"benefit.{task}",
-                    user_id=subscription.user_id,
-                    benefit_id=benefit.id,
-                    subscription_id=subscription.id,
-                )
-                for benefit in benefits
-            ]
-        )
+        assert process_benefit_grant_mock.call_count == len(benefits)
+        processed = {
+            mock_call.args[4].id: (mock_call.args[2], mock_call.args[5])
+            for mock_call in process_benefit_grant_mock.call_args_list
+        }
+        assert processed == {benefit.id: (task, None) for benefit in benefits}
 
     async def test_outdated_grants(
         self,
         mocker: MockerFixture,
         session: AsyncSession,
+        redis: Redis,
         save_fixture: SaveFixture,
         product: Product,
         benefits: list[Benefit],
         subscription: Subscription,
         user: User,
     ) -> None:
-        enqueue_job_mock = mocker.patch(
-            "polar.benefit.service.benefit_grant.enqueue_job"
+        process_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "_process_benefit_grant"
         )
 
         grant = BenefitGrant(
@@ -392,14 +418,177 @@ class TestEnqueueBenefitsGrants:
             save_fixture, product=product, benefits=benefits[1:]
         )
 
-        await benefit_grant_service.enqueue_benefits_grants(
-            session, "grant", user, product, subscription=subscription
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            get_sessionmaker(session),
+            redis,
+            "grant",
+            user,
+            product,
+            max_concurrency=1,
+            subscription=subscription,
         )
 
-        enqueue_job_mock.assert_any_call(
-            "benefit.revoke",
-            user_id=subscription.user_id,
+        processed = {
+            mock_call.args[4].id: (mock_call.args[2], mock_call.args[5])
+            for mock_call in process_benefit_grant_mock.call_args_list
+        }
+        assert processed == {
+            benefits[0].id: ("revoke", grant),
+            **{benefit.id: ("grant", None) for benefit in benefits[1:]},
+        }
+
+    async def test_grant(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        product: Product,
+        benefits: list[Benefit],
+        subscription: Subscription,
+        user: User,
+        benefit_service_mock: MagicMock,
+    ) -> None:
+        existing_grant = await create_benefit_grant(
+            save_fixture, user, benefits[0], granted=True, subscription=subscription
+        )
+        product = await set_product_benefits(
+            save_fixture, product=product, benefits=benefits
+        )
+
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            get_sessionmaker(session),
+            redis,
+            "grant",
+            user,
+            product,
+            max_concurrency=1,
+            subscription=subscription,
+        )
+
+        for benefit in benefits:
+            grant = await benefit_grant_service.get_by_benefit_and_scope(
+                session, user, benefit, subscription=subscription
+            )
+            assert grant is not None
+            assert grant.is_granted
+        # The already granted benefit is left as is
+        assert benefit_service_mock.grant.call_count == len(benefits) - 1
+        assert existing_grant.is_granted
+
+    async def test_grant_separate_sessions(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        product: Product,
+        benefits: list[Benefit],
+        subscription: Subscription,
+        user: User,
+        benefit_service_mock: MagicMock,
+    ) -> None:
+        product = await set_product_benefits(
+            save_fixture, product=product, benefits=benefits
+        )
+
+        # Each benefit gets its own session, in a savepoint of the test transaction
+        benefit_sessions: list[AsyncSession] = []
+
+        @contextlib.asynccontextmanager
+        async def sessionmaker() -> AsyncIterator[AsyncSession]:
+            # The orchestrator doesn't hold its transaction meanwhile
+            assert not session.in_transaction()
+            async with AsyncSession(
+                bind=session.bind,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            ) as benefit_session:
+                benefit_sessions.append(benefit_session)
+                yield benefit_session
+                await benefit_session.commit()
+
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            sessionmaker,
+            redis,
+            "grant",
+            user,
+            product,
+            max_concurrency=1,
+            subscription=subscription,
+        )
+
+        assert len(benefit_sessions) == len(benefits)
+        assert session not in benefit_sessions
+        # The orchestrator objects were merged, not moved to the benefit sessions
+        assert user in session
+        assert subscription in session
+
+        session.expunge_all()
+        for benefit in benefits:
+            grant = await benefit_grant_service.get_by_benefit_and_scope(
+                session, user, benefit, subscription=subscription
+            )
+            assert grant is not None
+            assert grant.is_granted
+        assert benefit_service_mock.grant.call_count == len(benefits)
+
+    async def test_retriable_error(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        product: Product,
+        benefits: list[Benefit],
+        subscription: Subscription,
+        user: User,
+    ) -> None:
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        async def _process_benefit_grant(
+            session: AsyncSession,
+            redis: Redis,
+            action: str,
+            user: User,
+            benefit: Benefit,
+            *args: Any,
+            **kwargs: Any,
+        ) -> None:
+            if benefit.id == benefits[0].id:
+                raise BenefitRetriableError(10)
+
+        process_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service,
+            "_process_benefit_grant",
+            side_effect=_process_benefit_grant,
+        )
+
+        product = await set_product_benefits(
+            save_fixture, product=product, benefits=benefits
+        )
+
+        await benefit_grant_service.process_benefits_grants(
+            session,
+            get_sessionmaker(session),
+            redis,
+            "grant",
+            user,
+            product,
+            max_concurrency=1,
+            subscription=subscription,
+        )
+
+        # Other benefits are processed, only the failing one is retried
+        assert process_benefit_grant_mock.call_count == len(benefits)
+        enqueue_job_mock.assert_called_once_with(
+            "benefit.grant",
+            user_id=user.id,
             benefit_id=benefits[0].id,
+            _defer_by=10,
             subscription_id=subscription.id,
         )
 
@@ -468,9 +657,19 @@ class TestEnqueueBenefitGrantUpdates:
             session, redis, benefit_organization, {}
         )
 
+        progress = await benefit_grant_updates.get_progress(
+            redis, benefit_organization.id
+        )
+        assert progress is not None
+        assert progress.status == BenefitGrantUpdatesStatus.running
+        assert progress.total == 1
+        assert progress.cursor is None
+
         enqueue_job_mock.assert_called_once_with(
-            "benefit.update",
-            benefit_grant_id=granted_grant.id,
+            "benefit.update_grants",
+            benefit_id=benefit_organization.id,
+            run_id=progress.run_id,
+            _job_id=f"benefit.update_grants:{progress.run_id}:start",
         )
 
     async def test_required_update_revoked(
@@ -512,6 +711,238 @@ class TestEnqueueBenefitGrantUpdates:
         enqueue_job_mock.assert_not_called()
 
 
+async def create_granted_grants(
+    save_fixture: SaveFixture, benefit: Benefit, count: int
+) -> list[BenefitGrant]:
+    grants: list[BenefitGrant] = []
+    for _ in range(count):
+        user = await create_user(save_fixture)
+        grant = BenefitGrant(user=user, benefit=benefit)
+        grant.set_granted()
+        await save_fixture(grant)
+        grants.append(grant)
+    return sorted(grants, key=lambda grant: grant.id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestUpdateBenefitGrantsChunk:
+    async def test_not_running(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        benefit_organization: Benefit,
+    ) -> None:
+        await create_granted_grants(save_fixture, benefit_organization, 2)
+        progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 2
+        )
+        await benefit_grant_service.pause_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+
+        update_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "update_benefit_grant"
+        )
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        await benefit_grant_service.update_benefit_grants_chunk(
+            session,
+            get_sessionmaker(session),
+            redis,
+            benefit_organization,
+            progress.run_id,
+        )
+
+        update_benefit_grant_mock.assert_not_called()
+        enqueue_job_mock.assert_not_called()
+
+    async def test_superseded_run(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        benefit_organization: Benefit,
+    ) -> None:
+        await create_granted_grants(save_fixture, benefit_organization, 2)
+        previous_progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 2
+        )
+        await benefit_grant_updates.start_progress(redis, benefit_organization.id, 2)
+
+        update_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "update_benefit_grant"
+        )
+
+        await benefit_grant_service.update_benefit_grants_chunk(
+            session,
+            get_sessionmaker(session),
+            redis,
+            benefit_organization,
+            previous_progress.run_id,
+        )
+
+        update_benefit_grant_mock.assert_not_called()
+
+    async def test_full_chunk(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        benefit_organization: Benefit,
+    ) -> None:
+        mocker.patch("polar.benefit.service.benefit_grant_updates.CHUNK_SIZE", 2)
+        grants = await create_granted_grants(save_fixture, benefit_organization, 3)
+        progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 3
+        )
+
+        update_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "update_benefit_grant"
+        )
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        await benefit_grant_service.update_benefit_grants_chunk(
+            session,
+            get_sessionmaker(session),
+            redis,
+            benefit_organization,
+            progress.run_id,
+            max_concurrency=1,
+        )
+
+        updated_ids = [
+            mock_call.args[2].id
+            for mock_call in update_benefit_grant_mock.call_args_list
+        ]
+        assert updated_ids == [grant.id for grant in grants[:2]]
+
+        updated_progress = await benefit_grant_updates.get_progress(
+            redis, benefit_organization.id
+        )
+        assert updated_progress is not None
+        assert updated_progress.status == BenefitGrantUpdatesStatus.running
+        assert updated_progress.processed == 2
+        assert updated_progress.cursor == grants[1].id
+
+        enqueue_job_mock.assert_called_once_with(
+            "benefit.update_grants",
+            benefit_id=benefit_organization.id,
+            run_id=progress.run_id,
+            _job_id=f"benefit.update_grants:{progress.run_id}:{grants[1].id}",
+            _defer_by=get_limits(benefit_organization.type).chunk_delay,
+        )
+
+    async def test_last_chunk(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        benefit_organization: Benefit,
+    ) -> None:
+        grants = await create_granted_grants(save_fixture, benefit_organization, 3)
+        progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 3
+        )
+        await benefit_grant_updates.record_chunk(
+            redis, benefit_organization.id, cursor=grants[0].id, processed=1, retried=0
+        )
+
+        update_benefit_grant_mock = mocker.patch.object(
+            benefit_grant_service, "update_benefit_grant"
+        )
+        update_benefit_grant_mock.side_effect = [
+            None,
+            BenefitRetriableError(10),
+        ]
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        await benefit_grant_service.update_benefit_grants_chunk(
+            session,
+            get_sessionmaker(session),
+            redis,
+            benefit_organization,
+            progress.run_id,
+            max_concurrency=1,
+        )
+
+        assert update_benefit_grant_mock.call_count == 2
+
+        updated_progress = await benefit_grant_updates.get_progress(
+            redis, benefit_organization.id
+        )
+        assert updated_progress is not None
+        assert updated_progress.status == BenefitGrantUpdatesStatus.completed
+        assert updated_progress.processed == 3
+        assert updated_progress.retried == 1
+        assert updated_progress.cursor == grants[2].id
+
+        enqueue_job_mock.assert_called_once_with(
+            "benefit.update", benefit_grant_id=grants[2].id, _defer_by=10
+        )
+
+
+@pytest.mark.asyncio
+class TestPauseResumeBenefitGrantUpdates:
+    async def test_pause_resume(
+        self, mocker: MockerFixture, redis: Redis, benefit_organization: Benefit
+    ) -> None:
+        progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 10
+        )
+        cursor = uuid.uuid4()
+        await benefit_grant_updates.record_chunk(
+            redis, benefit_organization.id, cursor=cursor, processed=2, retried=0
+        )
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        paused = await benefit_grant_service.pause_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+        assert paused is not None
+        assert paused.status == BenefitGrantUpdatesStatus.paused
+
+        resumed = await benefit_grant_service.resume_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+        assert resumed is not None
+        assert resumed.status == BenefitGrantUpdatesStatus.running
+        # Deduplicated with the chunk job the pause may have left pending
+        enqueue_job_mock.assert_called_once_with(
+            "benefit.update_grants",
+            benefit_id=benefit_organization.id,
+            run_id=progress.run_id,
+            _job_id=f"benefit.update_grants:{progress.run_id}:{cursor}",
+        )
+
+    async def test_resume_not_paused(
+        self, mocker: MockerFixture, redis: Redis, benefit_organization: Benefit
+    ) -> None:
+        await benefit_grant_updates.start_progress(redis, benefit_organization.id, 10)
+        enqueue_job_mock = mocker.patch(
+            "polar.benefit.service.benefit_grant.enqueue_job"
+        )
+
+        await benefit_grant_service.resume_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+
+        enqueue_job_mock.assert_not_called()
+
+
 @pytest.mark.asyncio
 class TestUpdateBenefitGrant:
     async def test_revoked_grant(
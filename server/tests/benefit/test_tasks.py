@@ -1,10 +1,14 @@
+import asyncio
 import uuid
 
 import pytest
 from arq import Retry
+from arq.jobs import Job, JobStatus
+from arq.worker import Worker
 from pytest_mock import MockerFixture
 
 from polar.benefit.benefits import BenefitRetriableError
+from polar.benefit.service import benefit_grant_updates
 from polar.benefit.service.benefit_grant import (
     BenefitGrantService,
 )
@@ -18,14 +22,77 @@ from polar.benefit.tasks import (  # type: ignore[attr-defined]
     benefit_precondition_fulfilled,
     benefit_revoke,
     benefit_update,
+    benefit_update_grants,
+    enqueue_benefits_grants,
 )
-from polar.models import Benefit, BenefitGrant, Subscription, User
+from polar.models import Benefit, BenefitGrant, Product, Subscription, User
 from polar.models.benefit import BenefitType
 from polar.postgres import AsyncSession
-from polar.worker import JobContext, PolarWorkerContext
+from polar.redis import Redis
+from polar.worker import (
+    JobContext,
+    PolarWorkerContext,
+    WorkerSettings,
+    flush_enqueued_jobs,
+)
 from tests.fixtures.database import SaveFixture
 
 
+@pytest.mark.asyncio
+class TestEnqueueBenefitsGrants:
+    async def test_not_existing_user(
+        self,
+        job_context: JobContext,
+        polar_worker_context: PolarWorkerContext,
+        subscription: Subscription,
+        product: Product,
+        session: AsyncSession,
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        with pytest.raises(UserDoesNotExist):
+            await enqueue_benefits_grants(
+                job_context,
+                "grant",
+                uuid.uuid4(),
+                product.id,
+                polar_worker_context,
+                subscription_id=subscription.id,
+            )
+
+    async def test_existing_product(
+        self,
+        mocker: MockerFixture,
+        job_context: JobContext,
+        polar_worker_context: PolarWorkerContext,
+        subscription: Subscription,
+        user: User,
+        product: Product,
+        session: AsyncSession,
+    ) -> None:
+        process_benefits_grants_mock = mocker.patch.object(
+            benefit_grant_service,
+            "process_benefits_grants",
+            spec=BenefitGrantService.process_benefits_grants,
+        )
+
+        # then
+        session.expunge_all()
+
+        await enqueue_benefits_grants(
+            job_context,
+            "grant",
+            user.id,
+            product.id,
+            polar_worker_context,
+            subscription_id=subscription.id,
+        )
+
+        process_benefits_grants_mock.assert_called_once()
+        assert process_benefits_grants_mock.call_args.kwargs["attempt"] == 1
+
+
 @pytest.mark.asyncio
 class TestBenefitGrant:
     async def test_not_existing_user(
@@ -228,6 +295,106 @@ class TestBenefitRevoke:
             )
 
 
+@pytest.mark.asyncio
+class TestBenefitUpdateGrants:
+    async def test_not_existing_benefit(
+        self,
+        job_context: JobContext,
+        polar_worker_context: PolarWorkerContext,
+        session: AsyncSession,
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        with pytest.raises(BenefitDoesNotExist):
+            await benefit_update_grants(
+                job_context, uuid.uuid4(), uuid.uuid4(), polar_worker_context
+            )
+
+    async def test_existing_benefit(
+        self,
+        session: AsyncSession,
+        mocker: MockerFixture,
+        job_context: JobContext,
+        polar_worker_context: PolarWorkerContext,
+        benefit_organization: Benefit,
+    ) -> None:
+        update_benefit_grants_chunk_mock = mocker.patch.object(
+            benefit_grant_service,
+            "update_benefit_grants_chunk",
+            spec=BenefitGrantService.update_benefit_grants_chunk,
+        )
+        run_id = uuid.uuid4()
+
+        # then
+        session.expunge_all()
+
+        await benefit_update_grants(
+            job_context, benefit_organization.id, run_id, polar_worker_context
+        )
+
+        update_benefit_grants_chunk_mock.assert_called_once()
+        assert update_benefit_grants_chunk_mock.call_args.args[3].id == (
+            benefit_organization.id
+        )
+        assert update_benefit_grants_chunk_mock.call_args.args[4] == run_id
+
+    async def test_resume_after_skipped_chunk(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        job_context: JobContext,
+        polar_worker_context: PolarWorkerContext,
+        benefit_organization: Benefit,
+    ) -> None:
+        arq_redis = job_context["redis"]
+        progress = await benefit_grant_updates.start_progress(
+            redis, benefit_organization.id, 10
+        )
+        cursor = uuid.uuid4()
+        await benefit_grant_updates.record_chunk(
+            redis, benefit_organization.id, cursor=cursor, processed=2, retried=0
+        )
+        job_id = f"benefit.update_grants:{progress.run_id}:{cursor}"
+        await arq_redis.enqueue_job(
+            "benefit.update_grants",
+            benefit_id=benefit_organization.id,
+            run_id=progress.run_id,
+            polar_context=polar_worker_context,
+            _job_id=job_id,
+        )
+
+        await benefit_grant_service.pause_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+
+        # then
+        session.expunge_all()
+
+        # The pending chunk job runs and is skipped, since the run is paused
+        worker = Worker(
+            functions=[
+                function
+                for function in WorkerSettings.functions
+                if function.name == "benefit.update_grants"
+            ],
+            redis_pool=arq_redis,
+            ctx=dict(job_context),
+            burst=True,
+            handle_signals=False,
+        )
+        await worker.start_jobs([job_id.encode()])
+        await asyncio.gather(*worker.tasks.values())
+
+        await benefit_grant_service.resume_benefit_grant_updates(
+            redis, benefit_organization.id
+        )
+        await flush_enqueued_jobs(arq_redis)
+
+        # Its ID is free again: the resumed job is enqueued, not dropped
+        assert await Job(job_id, arq_redis).status() == JobStatus.queued
+
+
 @pytest.mark.asyncio
 class TestBenefitUpdate:
     async def test_not_existing_grant(
@@ -56,6 +56,7 @@ from polar.models.product_price import (
     ProductPriceFree,
     ProductPriceType,
 )
+from polar.models.webhook_endpoint import WebhookEventType
 from polar.postgres import AsyncSession
 from tests.fixtures.auth import AuthSubjectFixture
 from tests.fixtures.database import SaveFixture
@@ -1599,6 +1600,33 @@ class TestUpdate:
 
         assert checkout.user_metadata == {"key": "value"}
 
+    async def test_debounced_webhook(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        checkout_one_time_free: Checkout,
+    ) -> None:
+        mocker.patch("polar.checkout.service.utc_now", return_value=utc_now())
+        enqueue_job_mock = mocker.patch("polar.checkout.service.enqueue_job")
+        publish_checkout_event_mock = mocker.patch(
+            "polar.checkout.service.publish_checkout_event"
+        )
+        webhook_send_mock = mocker.patch("polar.checkout.service.webhook_service.send")
+
+        for value in ("a", "b", "c"):
+            await checkout_service.update(
+                session, checkout_one_time_free, CheckoutUpdate(metadata={"key": value})
+            )
+
+        assert publish_checkout_event_mock.call_count == 3
+        webhook_send_mock.assert_not_called()
+
+        job_ids = {call.kwargs["_job_id"] for call in enqueue_job_mock.call_args_list}
+        assert len(job_ids) == 1
+        assert job_ids.pop().startswith(
+            f"checkout.send_updated_webhook:{checkout_one_time_free.id}:"
+        )
+
     @pytest.mark.parametrize(
         "custom_field_data",
         (
@@ -2210,6 +2238,36 @@ class TestHandleStripeFailure:
         assert checkout.status == CheckoutStatus.failed
 
 
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestSendUpdatedWebhook:
+    async def test_not_existing_checkout(
+        self, mocker: MockerFixture, session: AsyncSession
+    ) -> None:
+        webhook_send_mock = mocker.patch("polar.checkout.service.webhook_service.send")
+
+        await checkout_service.send_updated_webhook(session, uuid.uuid4())
+
+        webhook_send_mock.assert_not_called()
+
+    async def test_valid(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        checkout_one_time_free: Checkout,
+    ) -> None:
+        webhook_send_mock = mocker.patch(
+            "polar.checkout.service.webhook_service.send", return_value=[]
+        )
+
+        await checkout_service.send_updated_webhook(session, checkout_one_time_free.id)
+
+        webhook_send_mock.assert_called_once()
+        event_type, checkout = webhook_send_mock.call_args.args[2]
+        assert event_type == WebhookEventType.checkout_updated
+        assert checkout.id == checkout_one_time_free.id
+
+
 @pytest.mark.asyncio
 @pytest.mark.skip_db_asserts
 class TestHandleFreeSuccess:
@@ -2357,7 +2415,9 @@ class TestExpireOpenCheckouts:
             expires_at=utc_now() - timedelta(days=1),
         )
 
-        await checkout_service.expire_open_checkouts(session)
+        expired = await checkout_service.expire_open_checkouts(session)
+
+        assert expired == 1
 
         updated_open_checkout = await checkout_service.get(session, open_checkout.id)
         assert updated_open_checkout is not None
@@ -2374,3 +2434,40 @@ class TestExpireOpenCheckouts:
         )
         assert updated_successful_checkout is not None
         assert updated_successful_checkout.status == CheckoutStatus.succeeded
+
+    async def test_batch(
+        self,
+        mocker: MockerFixture,
+        save_fixture: SaveFixture,
+        session: AsyncSession,
+        product: Product,
+    ) -> None:
+        publish_checkouts_updated_event_mock = mocker.patch(
+            "polar.checkout.service.publish_checkouts_updated_event"
+        )
+        price = product.prices[0]
+        oldest_checkout = await create_checkout(
+            save_fixture,
+            price=price,
+            status=CheckoutStatus.open,
+            expires_at=utc_now() - timedelta(days=2),
+        )
+        newest_checkout = await create_checkout(
+            save_fixture,
+            price=price,
+            status=CheckoutStatus.open,
+            expires_at=utc_now() - timedelta(days=1),
+        )
+
+        expired = await checkout_service.expire_open_checkouts(session, batch_size=1)
+
+        assert expired == 1
+        publish_checkouts_updated_event_mock.assert_called_once_with(
+            [(oldest_checkout.client_secret, CheckoutStatus.expired)]
+        )
+
+        updated_newest_checkout = await checkout_service.get(
+            session, newest_checkout.id
+        )
+        assert updated_newest_checkout is not None
+        assert updated_newest_checkout.status == CheckoutStatus.open
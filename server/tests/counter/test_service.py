@@ -0,0 +1,91 @@
+import pytest
+
+from polar.counter.service import BufferedCounter
+from polar.kit.db.postgres import AsyncSession
+from polar.models import AdvertisementCampaign, User
+from polar.redis import Redis
+from tests.fixtures.database import SaveFixture
+from tests.fixtures.random_objects import create_advertisement_campaign
+
+counter = BufferedCounter("test_views", AdvertisementCampaign, "views")
+
+
+async def _get_persisted_views(
+    session: AsyncSession, campaign: AdvertisementCampaign
+) -> int:
+    session.expunge_all()
+    persisted = await session.get(AdvertisementCampaign, campaign.id)
+    assert persisted is not None
+    return persisted.views
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestIncrement:
+    async def test_read_your_writes(
+        self, save_fixture: SaveFixture, session: AsyncSession, redis: Redis, user: User
+    ) -> None:
+        campaign = await create_advertisement_campaign(save_fixture, user=user)
+
+        assert await counter.increment(redis, campaign) == 1
+        assert await counter.increment(redis, campaign, 2) == 3
+        assert campaign.views == 3
+
+        assert await _get_persisted_views(session, campaign) == 0
+
+    async def test_merge_pending(
+        self, save_fixture: SaveFixture, session: AsyncSession, redis: Redis, user: User
+    ) -> None:
+        campaign1 = await create_advertisement_campaign(save_fixture, user=user)
+        campaign2 = await create_advertisement_campaign(save_fixture, user=user)
+        await counter.increment(redis, campaign1, 5)
+
+        session.expunge_all()
+        loaded1 = await session.get(AdvertisementCampaign, campaign1.id)
+        loaded2 = await session.get(AdvertisementCampaign, campaign2.id)
+        assert loaded1 is not None
+        assert loaded2 is not None
+        await counter.merge_pending(redis, [loaded1, loaded2])
+
+        assert loaded1.views == 5
+        assert loaded2.views == 0
+        assert loaded1 not in session.dirty
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestFlush:
+    async def test_empty(self, session: AsyncSession, redis: Redis) -> None:
+        assert await counter.flush(session, redis) == 0
+
+    async def test_valid(
+        self, save_fixture: SaveFixture, session: AsyncSession, redis: Redis, user: User
+    ) -> None:
+        campaign1 = await create_advertisement_campaign(save_fixture, user=user)
+        campaign2 = await create_advertisement_campaign(save_fixture, user=user)
+        await counter.increment(redis, campaign1, 3)
+        await counter.increment(redis, campaign2)
+
+        assert await counter.flush(session, redis) == 2
+
+        assert await _get_persisted_views(session, campaign1) == 3
+        assert await _get_persisted_views(session, campaign2) == 1
+        assert await counter.get_pending(redis, campaign1.id) == 0
+        assert await counter.flush(session, redis) == 0
+
+    async def test_retry_crashed_flush(
+        self, save_fixture: SaveFixture, session: AsyncSession, redis: Redis, user: User
+    ) -> None:
+        campaign = await create_advertisement_campaign(save_fixture, user=user)
+        await counter.increment(redis, campaign, 2)
+        await redis.rename(counter.key, counter.flushing_key)
+        await counter.increment(redis, campaign)
+
+        assert await counter.get_pending(redis, campaign.id) == 3
+
+        await counter.flush(session, redis)
+        assert await _get_persisted_views(session, campaign) == 2
+        assert await counter.get_pending(redis, campaign.id) == 1
+
+        await counter.flush(session, redis)
+        assert await _get_persisted_views(session, campaign) == 3
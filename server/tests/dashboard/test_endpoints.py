@@ -11,8 +11,9 @@ from polar.models.repository import Repository
 from polar.models.user import User
 from polar.models.user_organization import UserOrganization
 from polar.postgres import AsyncSession
-from tests.fixtures.database import SaveFixture
+from tests.fixtures.database import QueryBudgetFixture, SaveFixture
 from tests.fixtures.random_objects import (
+    create_issue,
     create_pledge,
     create_user,
     create_user_github_oauth,
@@ -307,3 +308,55 @@ async def test_get_only_badged_is_badged(
     res = response.json()
 
     assert len(res["data"]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.auth
+@pytest.mark.parametrize("issues_count", [1, 10])
+async def test_get_query_count(
+    issues_count: int,
+    save_fixture: SaveFixture,
+    session: AsyncSession,
+    query_budget: QueryBudgetFixture,
+    user: User,
+    organization: Organization,
+    external_organization_linked: ExternalOrganization,
+    repository_linked: Repository,
+    user_organization: UserOrganization,  # makes User a member of Organization
+    pledging_organization: Organization,
+    client: AsyncClient,
+) -> None:
+    pledging_user = await create_user(save_fixture)
+    for _ in range(issues_count):
+        issue = await create_issue(
+            save_fixture, external_organization_linked, repository_linked
+        )
+        await create_pledge(
+            save_fixture,
+            external_organization_linked,
+            repository_linked,
+            issue,
+            pledging_organization=pledging_organization,
+        )
+        await create_pledge(
+            save_fixture,
+            external_organization_linked,
+            repository_linked,
+            issue,
+            pledging_user=pledging_user,
+        )
+    session.expunge_all()
+
+    # The number of queries must not depend on the number of issues and pledges
+    with query_budget(statements=12):
+        response = await client.get(f"/v1/dashboard/organization/{organization.id}")
+
+    assert response.status_code == 200
+    res = response.json()
+    assert len(res["data"]) == issues_count
+    assert all(len(entry["pledges"]) == 2 for entry in res["data"])
+    assert all(
+        pledge["authed_can_admin_received"]
+        for entry in res["data"]
+        for pledge in entry["pledges"]
+    )
@@ -1,7 +1,8 @@
+import contextlib
 import functools
 import inspect
 import warnings
-from collections.abc import AsyncIterator, Callable, Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
 from pathlib import Path
 from uuid import UUID
 
@@ -16,6 +17,7 @@ from sqlalchemy_utils import create_database, database_exists, drop_database
 
 from polar.config import settings
 from polar.kit.db.postgres import AsyncSession, create_async_engine
+from polar.kit.db.query_stats import QueryStats, track_queries
 from polar.kit.utils import generate_uuid
 from polar.models import Model
 
@@ -61,6 +63,7 @@ async def initialize_test_database(worker_id: str) -> AsyncIterator[None]:
 
     async with engine.begin() as conn:
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS citext"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Model.metadata.create_all)
     await engine.dispose()
 
@@ -162,3 +165,38 @@ def save_fixture_factory(session: AsyncSession) -> SaveFixture:
 @pytest_asyncio.fixture
 def save_fixture(session: AsyncSession) -> SaveFixture:
     return save_fixture_factory(session)
+
+
+QueryBudgetFixture = Callable[..., contextlib.AbstractContextManager[QueryStats]]
+
+
+@pytest.fixture
+def query_budget() -> QueryBudgetFixture:
+    """
+    Fail the test if the block executes more SQL statements than allowed.
+
+    `statements` bounds the total number of statements, `repeats` the number
+    of times an identical statement is executed, which catches N+1 patterns.
+
+        with query_budget(statements=3, repeats=1):
+            await service.list(session)
+    """
+
+    @contextlib.contextmanager
+    def _query_budget(
+        *, statements: int | None = None, repeats: int | None = None
+    ) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+
+        if statements is not None:
+            assert (
+                stats.statements <= statements
+            ), f"{stats.statements} statements executed, budget is {statements}"
+        if repeats is not None:
+            assert stats.max_repeats <= repeats, (
+                f"Statements repeated more than {repeats} times: "
+                f"{stats.get_repeated(repeats + 1)}"
+            )
+
+    return _query_budget
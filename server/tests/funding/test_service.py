@@ -1,7 +1,7 @@
 import uuid
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from polar.auth.models import Anonymous
 from polar.funding.schemas import FundingResultType, IssueFunding
@@ -21,7 +21,8 @@ from polar.models.pledge import PledgeState, PledgeType
 from polar.models.user import OAuthPlatform
 from polar.pledge.service import pledge as pledge_service
 from polar.postgres import AsyncSession
-from tests.fixtures.database import SaveFixture
+from polar.redis import Redis
+from tests.fixtures.database import QueryBudgetFixture, SaveFixture
 from tests.fixtures.random_objects import (
     create_issue,
     create_oauth_account,
@@ -40,14 +41,7 @@ async def issue_row_assertions(
     issue: Issue,
     pledges: list[Pledge],
 ) -> None:
-    (
-        issue_object,
-        total,
-        last_pledged_at,
-        pay_upfront_total,
-        pay_on_completion_total,
-        pay_directly_total,
-    ) = result
+    issue_object, pledges_summaries = result
     assert isinstance(issue, Issue)
     assert issue_object.id == issue.id
 
@@ -62,33 +56,23 @@ async def issue_row_assertions(
 
     assert len(issue.pledges) == len(active_pledges)
 
-    assert total == sum([pledge.amount for pledge in active_pledges])
-    assert last_pledged_at == (
-        max([pledge.created_at for pledge in active_pledges])
-        if len(active_pledges) > 0
-        else None
+    issue_funding = IssueFunding.from_list_by_result(result)
+    assert issue_funding.total.amount == sum(
+        [pledge.amount for pledge in active_pledges]
     )
-    assert pay_upfront_total == sum(
-        [
-            pledge.amount
-            for pledge in active_pledges
-            if pledge.type == PledgeType.pay_upfront
-        ]
-    )
-    assert pay_on_completion_total == sum(
-        [
-            pledge.amount
-            for pledge in active_pledges
-            if pledge.type == PledgeType.pay_on_completion
-        ]
-    )
-    assert pay_directly_total == sum(
-        [
-            pledge.amount
-            for pledge in active_pledges
-            if pledge.type == PledgeType.pay_directly
+
+    for pledge_type, pledges_summary in (
+        (PledgeType.pay_upfront, pledges_summaries.pay_upfront),
+        (PledgeType.pay_on_completion, pledges_summaries.pay_on_completion),
+        (PledgeType.pay_directly, pledges_summaries.pay_directly),
+    ):
+        pledges_of_type = [
+            pledge for pledge in active_pledges if pledge.type == pledge_type
         ]
-    )
+        assert pledges_summary.total.amount == sum(
+            [pledge.amount for pledge in pledges_of_type]
+        )
+        assert len(pledges_summary.pledgers) == len(pledges_of_type)
 
 
 async def run_calculate_sort_columns(session: AsyncSession) -> None:
@@ -341,6 +325,7 @@ class TestListBy:
         issues_pledges: IssuesPledgesFixture,
         session: AsyncSession,
         save_fixture: SaveFixture,
+        query_budget: QueryBudgetFixture,
     ) -> None:
         titles = [
             "Bug during request",
@@ -354,6 +339,36 @@ class TestListBy:
         # then
         session.expunge_all()
 
+        # IDs and count, issues, pledges summaries
+        with query_budget(statements=3, repeats=1):
+            results, count = await funding_service.list_by(
+                session,
+                Anonymous(),
+                pagination=PaginationParams(1, 10),
+                query="documentation",
+            )
+
+        assert count == 1
+        assert len(results) == 1
+        issue, _ = issues_pledges[2]
+        assert results[0][0].id == issue.id
+
+    async def test_query_labels_and_body(
+        self,
+        issues_pledges: IssuesPledgesFixture,
+        session: AsyncSession,
+        save_fixture: SaveFixture,
+    ) -> None:
+        issues_pledges[0][0].labels = [{"name": "documentation"}]
+        await save_fixture(issues_pledges[0][0])
+        issues_pledges[1][0].body = "The documentation is outdated."
+        await save_fixture(issues_pledges[1][0])
+        issues_pledges[2][0].title = "Documentation is wrong"
+        await save_fixture(issues_pledges[2][0])
+
+        # then
+        session.expunge_all()
+
         results, count = await funding_service.list_by(
             session,
             Anonymous(),
@@ -361,10 +376,79 @@ class TestListBy:
             query="documentation",
         )
 
+        assert count == 3
+        # Title matches rank first, then labels, then body
+        assert [result[0].id for result in results] == [
+            issues_pledges[2][0].id,
+            issues_pledges[0][0].id,
+            issues_pledges[1][0].id,
+        ]
+
+    async def test_query_typo(
+        self,
+        issues_pledges: IssuesPledgesFixture,
+        session: AsyncSession,
+        save_fixture: SaveFixture,
+    ) -> None:
+        issues_pledges[2][0].title = "Documentation is wrong"
+        await save_fixture(issues_pledges[2][0])
+
+        # then
+        session.expunge_all()
+
+        results, count = await funding_service.list_by(
+            session,
+            Anonymous(),
+            pagination=PaginationParams(1, 10),
+            query="documentaton",
+        )
+
+        assert count == 1
+        assert results[0][0].id == issues_pledges[2][0].id
+
+    async def test_query_cache(
+        self,
+        issues_pledges: IssuesPledgesFixture,
+        session: AsyncSession,
+        save_fixture: SaveFixture,
+        redis: Redis,
+        query_budget: QueryBudgetFixture,
+    ) -> None:
+        issue = issues_pledges[2][0]
+        issue.title = "Documentation is wrong"
+        await save_fixture(issue)
+
+        # then
+        session.expunge_all()
+
+        results, count = await funding_service.list_by(
+            session,
+            Anonymous(),
+            pagination=PaginationParams(1, 10),
+            query="Documentation",
+            redis=redis,
+        )
+        assert count == 1
+        assert results[0][0].id == issue.id
+
+        # Rename the issue: the cached IDs are still served
+        await session.execute(
+            update(Issue).where(Issue.id == issue.id).values(title="Renamed")
+        )
+        session.expunge_all()
+
+        # Issues and pledges summaries only
+        with query_budget(statements=2):
+            results, count = await funding_service.list_by(
+                session,
+                Anonymous(),
+                pagination=PaginationParams(1, 10),
+                query="  documentation ",
+                redis=redis,
+            )
         assert count == 1
-        assert len(results) == 1
-        issue, _ = issues_pledges[2]
         assert results[0][0].id == issue.id
+        assert results[0][0].title == "Renamed"
 
     async def test_sum_user_multiple_identities(
         self,
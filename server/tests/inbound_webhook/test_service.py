@@ -0,0 +1,126 @@
+import json
+
+import pytest
+import stripe as stripe_lib
+
+from polar.inbound_webhook.service import InboundWebhookReference
+from polar.inbound_webhook.service import inbound_webhook as inbound_webhook_service
+from polar.models.inbound_webhook import InboundWebhookProvider
+from polar.postgres import AsyncSession
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestReceive:
+    async def test_new(self, session: AsyncSession) -> None:
+        body = json.dumps({"action": "opened"}).encode()
+        inbound_webhook = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=body,
+        )
+
+        assert inbound_webhook is not None
+        assert inbound_webhook.body != body
+        assert inbound_webhook.processed_at is None
+
+    async def test_pending_redelivery(self, session: AsyncSession) -> None:
+        body = json.dumps({"action": "opened"}).encode()
+        inbound_webhook = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=body,
+        )
+        assert inbound_webhook is not None
+
+        redelivered = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=body,
+        )
+        assert redelivered is not None
+        assert redelivered.id == inbound_webhook.id
+
+    async def test_processed_replay(self, session: AsyncSession) -> None:
+        body = json.dumps({"action": "opened"}).encode()
+        inbound_webhook = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=body,
+        )
+        assert inbound_webhook is not None
+        await inbound_webhook_service.mark_processed(
+            session, InboundWebhookReference(inbound_webhook.id)
+        )
+
+        replayed = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=body,
+        )
+        assert replayed is None
+
+        # Same delivery ID from another provider
+        other = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.stripe,
+            delivery_id="DELIVERY_ID",
+            event_type="charge.succeeded",
+            body=body,
+        )
+        assert other is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestGetPayload:
+    async def test_github(self, session: AsyncSession) -> None:
+        payload = {"action": "opened", "issue": {"id": 1}}
+        inbound_webhook = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.github,
+            delivery_id="DELIVERY_ID",
+            event_type="issues.opened",
+            body=json.dumps(payload).encode(),
+        )
+        assert inbound_webhook is not None
+
+        assert (
+            await inbound_webhook_service.get_payload(
+                session, InboundWebhookReference(inbound_webhook.id)
+            )
+            == payload
+        )
+
+    async def test_stripe(self, session: AsyncSession) -> None:
+        payload = {
+            "id": "evt_123",
+            "object": "event",
+            "type": "charge.succeeded",
+            "data": {"object": {"id": "ch_123", "object": "charge"}},
+        }
+        inbound_webhook = await inbound_webhook_service.receive(
+            session,
+            provider=InboundWebhookProvider.stripe,
+            delivery_id="evt_123",
+            event_type="charge.succeeded",
+            body=json.dumps(payload).encode(),
+        )
+        assert inbound_webhook is not None
+
+        event = await inbound_webhook_service.get_payload(
+            session, InboundWebhookReference(inbound_webhook.id)
+        )
+        assert isinstance(event, stripe_lib.Event)
+        assert event["type"] == "charge.succeeded"
+        assert event["data"]["object"]["id"] == "ch_123"
@@ -1,8 +1,16 @@
+from typing import Any
+
 import pytest
+from pytest_mock import MockerFixture
 
 from polar.integrations.github.client import get_client
-from polar.integrations.github.service.issue import github_issue
+from polar.integrations.github.service.issue import BULK_SYNC_BATCH_SIZE, github_issue
+from polar.issue.hooks import issue_upserted
+from polar.models import ExternalOrganization, Issue, Repository
 from polar.postgres import AsyncSession
+from polar.redis import Redis
+from tests.fixtures.database import SaveFixture
+from tests.fixtures.random_objects import create_issue
 
 
 @pytest.mark.asyncio
@@ -35,3 +43,151 @@ async def test_sync_external_org_with_repo_and_issue(
     )
 
     assert issue is not None
+
+
+def _get_graphql_issue(issue: Issue, repository: Repository, **kwargs: Any) -> Any:
+    return {
+        "databaseId": issue.external_id,
+        "number": issue.number,
+        "title": "updated title",
+        "body": "updated body",
+        "state": "OPEN",
+        "stateReason": None,
+        "closedAt": None,
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "repository": {"databaseId": repository.external_id},
+        "comments": {"totalCount": 2},
+        "reactionGroups": [
+            {"content": "THUMBS_UP", "reactors": {"totalCount": 3}},
+            {"content": "CONFUSED", "reactors": {"totalCount": 1}},
+        ],
+        "labels": {
+            "nodes": [
+                {
+                    "id": "LA_1",
+                    "name": repository.pledge_badge_label,
+                    "color": "000000",
+                    "description": None,
+                    "isDefault": False,
+                }
+            ]
+        },
+        **kwargs,
+    }
+
+
+@pytest.mark.asyncio
+class TestSyncIssuesBulk:
+    async def test_sync(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        redis: Redis,
+        save_fixture: SaveFixture,
+        external_organization: ExternalOrganization,
+        repository: Repository,
+    ) -> None:
+        updated_issue = await create_issue(
+            save_fixture, external_organization, repository
+        )
+        closed_issue = await create_issue(
+            save_fixture, external_organization, repository
+        )
+        deleted_issue = await create_issue(
+            save_fixture, external_organization, repository
+        )
+        transferred_issue = await create_issue(
+            save_fixture, external_organization, repository
+        )
+
+        client = mocker.MagicMock()
+        client.async_graphql = mocker.AsyncMock(
+            return_value={
+                "repository": {
+                    f"issue_{updated_issue.number}": _get_graphql_issue(
+                        updated_issue, repository
+                    ),
+                    f"issue_{closed_issue.number}": _get_graphql_issue(
+                        closed_issue,
+                        repository,
+                        state="CLOSED",
+                        stateReason="COMPLETED",
+                        closedAt="2024-01-01T00:00:00Z",
+                        body="<!-- POLAR PLEDGE BADGE START -->",
+                    ),
+                    f"issue_{deleted_issue.number}": None,
+                    f"issue_{transferred_issue.number}": {
+                        **_get_graphql_issue(transferred_issue, repository),
+                        "repository": {"databaseId": repository.external_id + 1},
+                    },
+                }
+            }
+        )
+        mocker.patch(
+            "polar.integrations.github.client.get_app_installation_client",
+            return_value=client,
+        )
+        hook_mock = mocker.patch.object(issue_upserted, "call")
+
+        # then
+        session.expunge_all()
+
+        issues = await github_issue.list_by_repository(session, repository.id)
+        modified = await github_issue.sync_issues_bulk(
+            session,
+            redis,
+            org=external_organization,
+            repo=repository,
+            issues=issues,
+        )
+
+        client.async_graphql.assert_awaited_once()
+        assert {issue.id for issue in modified} == {updated_issue.id, closed_issue.id}
+        assert hook_mock.call_count == 2
+
+        session.expunge_all()
+
+        updated = await github_issue.get(session, updated_issue.id)
+        assert updated is not None
+        assert updated.title == "updated title"
+        assert updated.body == "updated body"
+        assert updated.comments == 2
+        assert updated.positive_reactions_count == 3
+        assert updated.total_engagement_count == 6
+        assert updated.has_pledge_badge_label is True
+        assert updated.pledge_badge_embedded_at is None
+        assert updated.github_issue_fetched_at is not None
+
+        closed = await github_issue.get(session, closed_issue.id)
+        assert closed is not None
+        assert closed.state == Issue.State.CLOSED
+        assert closed.state_reason == "completed"
+        assert closed.issue_closed_at is not None
+        assert closed.pledge_badge_embedded_at is not None
+
+        for removed_issue in (deleted_issue, transferred_issue):
+            assert await github_issue.get(session, removed_issue.id) is None
+            removed = await github_issue.get(
+                session, removed_issue.id, allow_deleted=True
+            )
+            assert removed is not None
+            assert removed.deleted_at is not None
+            assert removed.title == "issue title"
+            assert removed.github_issue_fetched_at is None
+
+    async def test_too_many_issues(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        external_organization: ExternalOrganization,
+        repository: Repository,
+        issue: Issue,
+    ) -> None:
+        with pytest.raises(ValueError):
+            await github_issue.sync_issues_bulk(
+                session,
+                redis,
+                org=external_organization,
+                repo=repository,
+                issues=[issue] * (BULK_SYNC_BATCH_SIZE + 1),
+            )
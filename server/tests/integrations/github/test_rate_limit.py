@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from polar.config import settings
+from polar.integrations.github.rate_limit import (
+    GitHubRateBudget,
+    RateBudgetExhausted,
+    RateLimitResource,
+)
+from polar.redis import Redis
+
+
+def _get_headers(remaining: int, reset: int, resource: str = "core") -> dict[str, str]:
+    return {
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-reset": str(reset),
+        "x-ratelimit-resource": resource,
+    }
+
+
+@pytest.mark.asyncio
+class TestGitHubRateBudget:
+    async def test_unknown_budget(self, redis: Redis) -> None:
+        rate_budget = GitHubRateBudget(redis)
+
+        assert await rate_budget.get_available(123) is None
+        await rate_budget.acquire(123)
+
+    async def test_acquire(self, redis: Redis) -> None:
+        rate_budget = GitHubRateBudget(redis)
+        reset = int(time.time()) + 600
+        reserve = settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE
+        await rate_budget.update(123, _get_headers(reserve + 2, reset))
+
+        assert await rate_budget.get_available(123) == 2
+        await rate_budget.acquire(123)
+        await rate_budget.acquire(123)
+        assert await rate_budget.get_available(123) == 0
+
+        with pytest.raises(RateBudgetExhausted) as e:
+            await rate_budget.acquire(123)
+        assert timedelta(0) < e.value.retry_after <= timedelta(seconds=600)
+
+        # Other installations and resources have their own bucket
+        await rate_budget.acquire(456)
+        await rate_budget.acquire(123, RateLimitResource.graphql)
+
+    async def test_update_same_window_keeps_lowest(self, redis: Redis) -> None:
+        rate_budget = GitHubRateBudget(redis)
+        reset = int(time.time()) + 600
+        reserve = settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE
+
+        await rate_budget.update(123, _get_headers(reserve + 10, reset))
+        await rate_budget.update(123, _get_headers(reserve + 20, reset))
+
+        assert await rate_budget.get_available(123) == 10
+
+    async def test_update_new_window(self, redis: Redis) -> None:
+        rate_budget = GitHubRateBudget(redis)
+        reset = int(time.time()) + 600
+        reserve = settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE
+
+        await rate_budget.update(123, _get_headers(reserve + 10, reset))
+        await rate_budget.update(123, _get_headers(reserve + 1000, reset + 3600))
+        assert await rate_budget.get_available(123) == 1000
+
+        # Late response from the previous window
+        await rate_budget.update(123, _get_headers(reserve + 5, reset))
+        assert await rate_budget.get_available(123) == 1000
+
+    async def test_update_other_resource(self, redis: Redis) -> None:
+        rate_budget = GitHubRateBudget(redis)
+        reset = int(time.time()) + 600
+        reserve = settings.GITHUB_CRAWL_RATE_LIMIT_RESERVE
+
+        await rate_budget.update(123, _get_headers(reserve + 10, reset, "graphql"))
+
+        assert await rate_budget.get_available(123) is None
+        assert await rate_budget.get_available(123, RateLimitResource.graphql) == 10
@@ -452,3 +452,34 @@ async def test_transfer(
         assert updated_pledge.organization_id == external_organization.id
         assert updated_pledge.repository_id == new_repository.id
         assert updated_pledge.issue_id == new_issue.id
+
+
+@pytest.mark.asyncio
+async def test_get_loaded_many(
+    session: AsyncSession,
+    save_fixture: SaveFixture,
+    repository: Repository,
+    external_organization: ExternalOrganization,
+) -> None:
+    issue_1 = await random_objects.create_issue(
+        save_fixture, external_organization, repository
+    )
+    issue_2 = await random_objects.create_issue(
+        save_fixture, external_organization, repository
+    )
+    deleted_issue = await random_objects.create_issue(
+        save_fixture, external_organization, repository
+    )
+    deleted_issue.deleted_at = utc_now()
+    await save_fixture(deleted_issue)
+
+    # then
+    session.expunge_all()
+
+    issues = await issue_service.get_loaded_many(
+        session, [issue_2.id, deleted_issue.id, uuid.uuid4(), issue_1.id]
+    )
+
+    assert [i.id for i in issues] == [issue_2.id, issue_1.id]
+    assert issues[0].repository.id == repository.id
+    assert issues[0].repository.organization.id == external_organization.id
@@ -0,0 +1,115 @@
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from polar.kit.cors import CORSConfig, CORSMatcherMiddleware, origins_matcher
+
+
+async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+    response = PlainTextResponse("Hello")
+    await response(scope, receive, send)
+
+
+@pytest.fixture
+def middleware() -> CORSMatcherMiddleware:
+    return CORSMatcherMiddleware(
+        _app,
+        configs=[
+            CORSConfig(
+                origins_matcher(["https://polar.sh"]),
+                allow_origins=["https://polar.sh"],
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            ),
+            CORSConfig(
+                lambda origin, scope: True,
+                allow_origins=["*"],
+                allow_methods=["*"],
+                allow_headers=["Authorization"],
+            ),
+        ],
+        preflight_cache_size=2,
+    )
+
+
+@pytest_asyncio.fixture
+async def cors_client(
+    middleware: CORSMatcherMiddleware,
+) -> AsyncIterator[AsyncClient]:
+    async with AsyncClient(app=middleware, base_url="http://test") as client:
+        yield client
+
+
+def test_origins_matcher() -> None:
+    matcher = origins_matcher(["https://polar.sh", "https://sandbox.polar.sh"])
+    assert matcher("https://polar.sh", {}) is True
+    assert matcher("https://example.com", {}) is False
+
+
+@pytest.mark.asyncio
+class TestCORSMatcherMiddleware:
+    async def test_no_origin(self, cors_client: AsyncClient) -> None:
+        response = await cors_client.get("/")
+
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    async def test_simple_request(self, cors_client: AsyncClient) -> None:
+        response = await cors_client.get("/", headers={"Origin": "https://polar.sh"})
+
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "https://polar.sh"
+        assert response.headers["access-control-allow-credentials"] == "true"
+
+    async def test_preflight(self, cors_client: AsyncClient) -> None:
+        response = await cors_client.options(
+            "/",
+            headers={
+                "Origin": "https://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Authorization",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+        assert "access-control-allow-credentials" not in response.headers
+
+    async def test_preflight_disallowed_headers(self, cors_client: AsyncClient) -> None:
+        response = await cors_client.options(
+            "/",
+            headers={
+                "Origin": "https://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Cookie",
+            },
+        )
+
+        assert response.status_code == 400
+
+    async def test_preflight_cache(
+        self, middleware: CORSMatcherMiddleware, cors_client: AsyncClient
+    ) -> None:
+        headers = {
+            "Origin": "https://polar.sh",
+            "Access-Control-Request-Method": "POST",
+        }
+        for _ in range(3):
+            response = await cors_client.options("/", headers=headers)
+            assert response.status_code == 200
+            assert response.headers["access-control-allow-origin"] == "https://polar.sh"
+
+        cache_info = middleware._get_preflight_response.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 2
+
+        for origin in ["https://a.example.com", "https://b.example.com"]:
+            await cors_client.options("/", headers={**headers, "Origin": origin})
+
+        cache_info = middleware._get_preflight_response.cache_info()
+        assert cache_info.currsize == 2
@@ -1,6 +1,6 @@
 import pytest
 
-from polar.kit.csv import get_emails_from_csv
+from polar.kit.csv import IterableCSVWriter, get_emails_from_csv
 
 
 @pytest.mark.asyncio
@@ -47,3 +47,11 @@ async def test_get_emails_from_csv() -> None:
             "baz,bazexample.com",
         ]
     ) == {"foo@example.com", "bar@example.com"}
+
+
+def test_iterable_csv_writer() -> None:
+    csv_writer = IterableCSVWriter(dialect="excel")
+
+    assert csv_writer.getrow(("a", "b")) == "a,b\r\n"
+    assert csv_writer.getrows([(1, "x,y"), (2, None)]) == '1,"x,y"\r\n2,\r\n'
+    assert csv_writer.getrows([]) == ""
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+from polar.kit.db.query_stats import track_queries
+from polar.kit.utils import utc_now
+from polar.models import Organization
+from polar.organization.service import organization as organization_service
+from polar.postgres import AsyncSession
+from tests.fixtures.database import QueryBudgetFixture
+
+
+@pytest.mark.asyncio
+class TestIdentityCached:
+    async def test_repeated(
+        self,
+        session: AsyncSession,
+        query_budget: QueryBudgetFixture,
+        organization: Organization,
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        with query_budget(statements=1):
+            first = await organization_service.get(session, organization.id)
+            second = await organization_service.get(session, organization.id)
+
+        assert first is not None
+        assert first is second
+
+    async def test_concurrent(
+        self,
+        session: AsyncSession,
+        query_budget: QueryBudgetFixture,
+        organization: Organization,
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        with query_budget(statements=1):
+            results = await asyncio.gather(
+                *(organization_service.get(session, organization.id) for _ in range(3))
+            )
+
+        assert results[0] is not None
+        assert all(result is results[0] for result in results)
+
+    async def test_options_not_cached(
+        self,
+        session: AsyncSession,
+        query_budget: QueryBudgetFixture,
+        organization: Organization,
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        with query_budget(statements=2):
+            await organization_service.get(session, organization.id, options=())
+            await organization_service.get(session, organization.id, options=())
+
+    async def test_modified(
+        self, session: AsyncSession, organization: Organization
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        loaded = await organization_service.get(session, organization.id)
+        assert loaded is not None
+
+        with track_queries() as stats:
+            loaded.name = "Updated"
+            session.add(loaded)
+            await session.flush()
+            reloaded = await organization_service.get(session, organization.id)
+
+        assert reloaded is loaded
+        assert stats.statements == 2
+
+    async def test_expunged(
+        self, session: AsyncSession, organization: Organization
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        loaded = await organization_service.get(session, organization.id)
+        assert loaded is not None
+
+        session.expunge_all()
+        reloaded = await organization_service.get(session, organization.id)
+
+        assert reloaded is not None
+        assert reloaded is not loaded
+        assert reloaded in session
+
+    async def test_bulk_update(
+        self, session: AsyncSession, organization: Organization
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        loaded = await organization_service.get(session, organization.id)
+        assert loaded is not None
+
+        await session.execute(
+            update(Organization)
+            .where(Organization.id == organization.id)
+            .values(deleted_at=utc_now())
+        )
+
+        assert await organization_service.get(session, organization.id) is None
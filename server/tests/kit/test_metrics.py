@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from polar.kit.metrics import Counter, Gauge, Histogram, MetricsServer, Registry
+
+
+@pytest.mark.asyncio
+async def test_registry_render() -> None:
+    registry = Registry()
+    counter = registry.register(Counter("jobs_total", "Jobs.", ("task",)))
+    gauge = registry.register(Gauge("jobs_in_progress", "Running jobs."))
+    histogram = registry.register(
+        Histogram("job_duration_seconds", "Duration.", ("task",), buckets=(1, 5))
+    )
+
+    counter.inc(task='say "hello"')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    histogram.observe(0.5, task="a")
+    histogram.observe(3, task="a")
+
+    assert await registry.render() == (
+        "# HELP jobs_total Jobs.\n"
+        "# TYPE jobs_total counter\n"
+        'jobs_total{task="say \\"hello\\""} 1\n'
+        "# HELP jobs_in_progress Running jobs.\n"
+        "# TYPE jobs_in_progress gauge\n"
+        "jobs_in_progress 1\n"
+        "# HELP job_duration_seconds Duration.\n"
+        "# TYPE job_duration_seconds histogram\n"
+        'job_duration_seconds_bucket{task="a",le="1"} 1\n'
+        'job_duration_seconds_bucket{task="a",le="5"} 2\n'
+        'job_duration_seconds_bucket{task="a",le="+Inf"} 2\n'
+        'job_duration_seconds_sum{task="a"} 3.5\n'
+        'job_duration_seconds_count{task="a"} 2\n'
+    )
+
+
+def test_invalid_labels() -> None:
+    counter = Counter("jobs_total", "Jobs.", ("task",))
+    with pytest.raises(ValueError):
+        counter.inc(queue="default")
+
+
+@pytest.mark.asyncio
+async def test_metrics_server() -> None:
+    registry = Registry()
+    gauge = registry.register(Gauge("queue_depth", "Depth."))
+
+    async def collect() -> None:
+        gauge.set(42)
+
+    registry.add_collector(collect)
+
+    server = MetricsServer(registry, host="127.0.0.1", port=0)
+    await server.start()
+    assert server._server is not None
+    port = server._server.sockets[0].getsockname()[1]
+
+    async def get(path: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    try:
+        response = await get("/metrics")
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert response.endswith(b"queue_depth 42\n")
+
+        response = await get("/")
+        assert response.startswith(b"HTTP/1.1 404 Not Found\r\n")
+    finally:
+        await server.close()
@@ -0,0 +1,143 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Uuid, desc, select
+from sqlalchemy.dialects import postgresql
+
+from polar.kit.pagination import (
+    CursorPaginationParams,
+    InvalidCursor,
+    _get_keyset_clause,
+    _get_sort_keys,
+    decode_cursor,
+    encode_cursor,
+    get_estimated_count,
+    paginate_cursor,
+)
+from polar.models import Organization
+from polar.postgres import AsyncSession
+from tests.fixtures.database import SaveFixture
+from tests.fixtures.random_objects import create_organization
+
+table = Table(
+    "items",
+    MetaData(),
+    Column("id", Uuid, primary_key=True),
+    Column("created_at", DateTime(timezone=True)),
+    Column("amount", Integer, nullable=True),
+)
+
+
+def test_cursor_round_trip() -> None:
+    sort_keys = _get_sort_keys([desc(table.c.created_at)], table.c.id)
+    values = [datetime(2024, 1, 1, tzinfo=UTC), uuid.uuid4()]
+
+    cursor = encode_cursor(sort_keys, values)
+
+    assert decode_cursor(sort_keys, cursor) == values
+
+
+def test_cursor_sorting_mismatch() -> None:
+    sort_keys = _get_sort_keys([desc(table.c.created_at)], table.c.id)
+    cursor = encode_cursor(sort_keys, [datetime(2024, 1, 1, tzinfo=UTC), uuid.uuid4()])
+
+    other_sort_keys = _get_sort_keys([table.c.created_at.asc()], table.c.id)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(other_sort_keys, cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJzIjoxfQ=="])
+def test_cursor_invalid(cursor: str) -> None:
+    sort_keys = _get_sort_keys([desc(table.c.created_at)], table.c.id)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(sort_keys, cursor)
+
+
+def test_keyset_clause() -> None:
+    sort_keys = _get_sort_keys(
+        [desc(table.c.created_at), table.c.amount.asc()], table.c.id
+    )
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    id = uuid.uuid4()
+
+    clause = _get_keyset_clause(sort_keys, [created_at, None, id])
+    compiled = str(
+        clause.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert compiled == (
+        f"items.created_at < '{created_at}' "
+        "OR false "
+        f"OR items.created_at = '{created_at}' AND items.amount IS NULL "
+        f"AND (items.id > '{id}' OR items.id IS NULL)"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestPaginateCursor:
+    async def test_pages(
+        self, session: AsyncSession, save_fixture: SaveFixture
+    ) -> None:
+        organizations = [await create_organization(save_fixture) for _ in range(3)]
+        statement = select(Organization).where(
+            Organization.id.in_([organization.id for organization in organizations])
+        )
+        order_by = [Organization.created_at.desc()]
+
+        first_page, count, cursor = await paginate_cursor(
+            session,
+            statement,
+            pagination=CursorPaginationParams(None, 2),
+            order_by=order_by,
+        )
+        assert len(first_page) == 2
+        assert count == 3
+        assert cursor is not None
+
+        second_page, count, cursor = await paginate_cursor(
+            session,
+            statement,
+            pagination=CursorPaginationParams(cursor, 2),
+            order_by=order_by,
+        )
+        assert len(second_page) == 1
+        assert count == 3
+        assert cursor is None
+
+        assert {organization.id for organization in [*first_page, *second_page]} == {
+            organization.id for organization in organizations
+        }
+
+    async def test_estimated_count(
+        self, session: AsyncSession, save_fixture: SaveFixture
+    ) -> None:
+        organizations = [await create_organization(save_fixture) for _ in range(3)]
+        statement = select(Organization).where(
+            Organization.id.in_([organization.id for organization in organizations])
+        )
+
+        results, count, cursor = await paginate_cursor(
+            session,
+            statement,
+            pagination=CursorPaginationParams(None, 10, include_total=False),
+            order_by=[Organization.created_at.desc()],
+        )
+
+        assert len(results) == 3
+        assert count >= 0
+        assert cursor is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+async def test_get_estimated_count_in_filter(session: AsyncSession) -> None:
+    statement = select(Organization).where(
+        Organization.id.in_([uuid.uuid4(), uuid.uuid4()]),
+        Organization.name == "polar",
+    )
+
+    assert await get_estimated_count(session, statement) >= 0
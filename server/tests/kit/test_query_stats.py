@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from polar.kit.db.query_stats import instrument_engine, track_queries
+
+
+def test_track_queries() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+        with track_queries() as stats:
+            for i in range(3):
+                connection.execute(text("SELECT :i"), {"i": i})
+            connection.execute(text("SELECT 2"))
+
+            with track_queries() as nested_stats:
+                connection.execute(text("SELECT 3"))
+
+    assert stats.statements == 5
+    assert stats.duration > 0
+    assert stats.max_repeats == 3
+    assert stats.get_repeated(2) == {"SELECT ?": 3}
+
+    assert nested_stats.statements == 1
+    assert nested_stats.get_repeated(1) == {"SELECT 3": 1}
+
+
+def test_track_queries_failed_statement() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        with track_queries() as stats:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            connection.execute(text("SELECT 1"))
+
+        assert "polar_query_start_time" not in connection.info
+
+    assert stats.statements == 1
+    assert stats.get_repeated(1) == {"SELECT 1": 1}
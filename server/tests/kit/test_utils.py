@@ -0,0 +1,27 @@
+import time
+
+from polar.kit.schemas import IDSchema
+from polar.kit.utils import generate_uuid, uuid7
+
+
+def test_uuid7() -> None:
+    before_ms = time.time_ns() // 1_000_000
+    value = uuid7()
+    after_ms = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before_ms <= value.int >> 80 <= after_ms
+
+
+def test_uuid7_monotonic() -> None:
+    values = [uuid7() for _ in range(10_000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_generate_uuid_id_schema() -> None:
+    value = generate_uuid()
+
+    assert IDSchema(id=value).model_dump(mode="json") == {"id": str(value)}
@@ -186,7 +186,7 @@ class TestLicenseKeyEndpoints:
                 prefix="testing",
             ),
         )
-        keys, count = await license_key_service.get_list(
+        keys, count, _ = await license_key_service.get_list(
             session,
             auth_subject,
             organization_ids=[organization.id],
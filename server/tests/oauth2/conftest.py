@@ -1,36 +1,20 @@
-"""
-🚨 The following fixtures are intended to test OAuth2 features.
-
-It's a bit tricky since we need to handle a synchronous database session.
-
-Bear in mind that there are lot of gotchas, especially if you try to rely on a DB
-state that's managed by the async database session.
-"""
-
 import os
-from collections.abc import Iterator
 from typing import Literal, cast
 
 import pytest
 from authlib.oauth2.rfc7636 import create_s256_code_challenge
 
-from polar.app import app
-from polar.auth.scope import SCOPES_SUPPORTED
 from polar.config import settings
 from polar.kit.crypto import get_token_hash
-from polar.kit.db.postgres import Engine, Session, create_sync_engine
 from polar.models import (
-    Model,
     OAuth2AuthorizationCode,
     OAuth2Client,
     OAuth2Token,
     Organization,
     User,
 )
-from polar.oauth2.authorization_server import AuthorizationServer
-from polar.oauth2.dependencies import get_authorization_server
 from polar.oauth2.sub_type import SubType
-from tests.fixtures.database import SaveFixture, get_database_url
+from tests.fixtures.database import SaveFixture
 
 
 @pytest.fixture(scope="package", autouse=True)
@@ -38,65 +22,6 @@ def authlib_insecure_transport() -> None:
     os.environ["AUTHLIB_INSECURE_TRANSPORT"] = "true"
 
 
-@pytest.fixture(scope="package")
-def sync_engine(worker_id: str) -> Iterator[Engine]:
-    engine = create_sync_engine(
-        dsn=get_database_url(worker_id, driver="psycopg2"),
-        application_name=f"test_sync_{worker_id}",
-        pool_size=settings.DATABASE_POOL_SIZE,
-        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
-    )
-    yield engine
-    engine.dispose()
-
-
-@pytest.fixture
-def sync_session(sync_engine: Engine) -> Iterator[Session]:
-    connection = sync_engine.connect()
-    transaction = connection.begin()
-
-    session = Session(bind=connection, expire_on_commit=False)
-
-    yield session
-
-    transaction.rollback()
-    connection.close()
-
-
-@pytest.fixture
-def save_fixture(sync_session: Session) -> SaveFixture:
-    """
-    Override locally save_fixture to use the synchronous session.
-
-    This is necessary because the OAuth2 features rely on the synchronous session.
-
-    🚨 As such, objects won't be present in the async session. Code that works with
-    the async session won't be able to see the objects saved by this fixture.
-
-    🧠 You might be tempted to save the object in the async session as well.
-    This **won't** work. Underneath, there are two different connections
-    and transactions to the database; so you'll end up with conflicts or locks.
-    😢 Time lost on this: 4 hours.
-    """
-
-    async def _save_fixture(model: Model) -> None:
-        sync_session.add(model)
-        sync_session.flush()
-        sync_session.expunge(model)
-
-    return _save_fixture
-
-
-@pytest.fixture(autouse=True)
-def override_get_authorization_server(sync_session: Session) -> Iterator[None]:
-    authorization_server = AuthorizationServer.build(
-        sync_session, scopes_supported=SCOPES_SUPPORTED
-    )
-    app.dependency_overrides[get_authorization_server] = lambda: authorization_server
-    yield
-    app.dependency_overrides.pop(get_authorization_server)
-
-
 async def create_oauth2_token(
     save_fixture: SaveFixture,
     *,
@@ -4,7 +4,6 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 
-from polar.kit.db.postgres import Session
 from polar.models import (
     OAuth2Client,
     OAuth2Grant,
@@ -14,6 +13,7 @@ from polar.models import (
 )
 from polar.oauth2.service.oauth2_grant import oauth2_grant as oauth2_grant_service
 from polar.oauth2.sub_type import SubType
+from polar.postgres import AsyncSession
 from tests.fixtures.auth import AuthSubjectFixture
 from tests.fixtures.database import SaveFixture
 
@@ -538,7 +538,7 @@ class TestOAuth2Consent:
         client: AsyncClient,
         user: User,
         oauth2_client: OAuth2Client,
-        sync_session: Session,
+        session: AsyncSession,
     ) -> None:
         params = {
             "client_id": oauth2_client.client_id,
@@ -555,11 +555,13 @@ class TestOAuth2Consent:
         assert location.startswith(params["redirect_uri"])
         assert "code=" in location
 
-        grant = oauth2_grant_service._get_by_sub_and_client_id(
-            sync_session,
-            sub_type=SubType.user,
-            sub_id=user.id,
-            client_id=cast(str, oauth2_client.client_id),
+        grant = await session.run_sync(
+            lambda sync_session: oauth2_grant_service._get_by_sub_and_client_id(
+                sync_session,
+                sub_type=SubType.user,
+                sub_id=user.id,
+                client_id=cast(str, oauth2_client.client_id),
+            )
         )
         assert grant is not None
         assert grant.scopes == ["openid", "profile", "email"]
@@ -571,7 +573,6 @@ class TestOAuth2Consent:
         user: User,
         organization: Organization,
         oauth2_client: OAuth2Client,
-        sync_session: Session,
     ) -> None:
         params = {
             "client_id": oauth2_client.client_id,
@@ -595,7 +596,6 @@ class TestOAuth2Consent:
         user: User,
         organization: Organization,
         oauth2_client: OAuth2Client,
-        sync_session: Session,
     ) -> None:
         params = {
             "client_id": oauth2_client.client_id,
@@ -620,7 +620,6 @@ class TestOAuth2Consent:
         organization: Organization,
         user_organization: UserOrganization,
         oauth2_client: OAuth2Client,
-        sync_session: Session,
     ) -> None:
         params = {
             "client_id": oauth2_client.client_id,
@@ -645,7 +644,7 @@ class TestOAuth2Consent:
         organization: Organization,
         user_organization: UserOrganization,
         oauth2_client: OAuth2Client,
-        sync_session: Session,
+        session: AsyncSession,
     ) -> None:
         params = {
             "client_id": oauth2_client.client_id,
@@ -664,11 +663,13 @@ class TestOAuth2Consent:
         assert location.startswith(params["redirect_uri"])
         assert "code=" in location
 
-        grant = oauth2_grant_service._get_by_sub_and_client_id(
-            sync_session,
-            sub_type=SubType.organization,
-            sub_id=organization.id,
-            client_id=cast(str, oauth2_client.client_id),
+        grant = await session.run_sync(
+            lambda sync_session: oauth2_grant_service._get_by_sub_and_client_id(
+                sync_session,
+                sub_type=SubType.organization,
+                sub_id=organization.id,
+                client_id=cast(str, oauth2_client.client_id),
+            )
         )
         assert grant is not None
         assert grant.scopes == ["openid", "profile", "email"]
@@ -16,11 +16,11 @@ from sqlalchemy import select
 
 from polar.config import settings
 from polar.kit.crypto import get_token_hash
-from polar.kit.db.postgres import Session
 from polar.models import ExternalOrganization, OAuth2Token, Organization
 from polar.oauth2.authorization_server import AuthorizationServer
 from polar.oauth2.grants.github_oidc_id_token import GitHubOIDCIDTokenGrant
 from polar.oauth2.sub_type import SubType
+from polar.postgres import AsyncSession
 from tests.fixtures.database import SaveFixture
 
 
@@ -68,8 +68,8 @@ MOCK_PYJWK_CLIENT = MockPyJWKClient(PUBLIC_JWK)
 
 
 @pytest.fixture
-def authorization_server(sync_session: Session) -> AuthorizationServer:
-    return AuthorizationServer(sync_session)
+def authorization_server(session: AsyncSession) -> AuthorizationServer:
+    return AuthorizationServer(session)
 
 
 GetGrant = Callable[[OAuth2Request], GitHubOIDCIDTokenGrant]
@@ -83,24 +83,31 @@ def get_grant(authorization_server: AuthorizationServer) -> GetGrant:
     return _get_grant
 
 
+@pytest.mark.asyncio
 class TestValidateTokenRequest:
-    def test_missing_id_token(self, get_grant: GetGrant) -> None:
+    async def test_missing_id_token(
+        self, authorization_server: AuthorizationServer, get_grant: GetGrant
+    ) -> None:
         request = _build_request(
             {"grant_type": "github_oidc_id_token", "scope": "openid"}
         )
         grant = get_grant(request)
         with pytest.raises(InvalidRequestError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_missing_scope(self, get_grant: GetGrant) -> None:
+    async def test_missing_scope(
+        self, authorization_server: AuthorizationServer, get_grant: GetGrant
+    ) -> None:
         request = _build_request(
             {"grant_type": "github_oidc_id_token", "id_token": "ID_TOKEN"}
         )
         grant = get_grant(request)
         with pytest.raises(InvalidRequestError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_invalid_scope(self, get_grant: GetGrant) -> None:
+    async def test_invalid_scope(
+        self, authorization_server: AuthorizationServer, get_grant: GetGrant
+    ) -> None:
         request = _build_request(
             {
                 "grant_type": "github_oidc_id_token",
@@ -110,9 +117,11 @@ class TestValidateTokenRequest:
         )
         grant = get_grant(request)
         with pytest.raises(InvalidScopeError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_invalid_id_token(self, get_grant: GetGrant) -> None:
+    async def test_invalid_id_token(
+        self, authorization_server: AuthorizationServer, get_grant: GetGrant
+    ) -> None:
         request = _build_request(
             {
                 "grant_type": "github_oidc_id_token",
@@ -122,9 +131,11 @@ class TestValidateTokenRequest:
         )
         grant = get_grant(request)
         with pytest.raises(InvalidGrantError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_not_existing_organization(self, get_grant: GetGrant) -> None:
+    async def test_not_existing_organization(
+        self, authorization_server: AuthorizationServer, get_grant: GetGrant
+    ) -> None:
         id_token = _generate_id_token(PRIVATE_JWK, {"repository_owner": "not_existing"})
         request = _build_request(
             {
@@ -135,10 +146,13 @@ class TestValidateTokenRequest:
         )
         grant = get_grant(request)
         with pytest.raises(InvalidGrantError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_not_linked_organization(
-        self, get_grant: GetGrant, external_organization: ExternalOrganization
+    async def test_not_linked_organization(
+        self,
+        authorization_server: AuthorizationServer,
+        get_grant: GetGrant,
+        external_organization: ExternalOrganization,
     ) -> None:
         id_token = _generate_id_token(
             PRIVATE_JWK,
@@ -157,10 +171,11 @@ class TestValidateTokenRequest:
         grant = get_grant(request)
 
         with pytest.raises(InvalidGrantError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
-    def test_valid(
+    async def test_valid(
         self,
+        authorization_server: AuthorizationServer,
         get_grant: GetGrant,
         organization: Organization,
         external_organization_linked: ExternalOrganization,
@@ -181,14 +196,14 @@ class TestValidateTokenRequest:
         )
         grant = get_grant(request)
 
-        grant.validate_token_request()
+        await authorization_server.run(grant.validate_token_request)
 
         assert request.user == (SubType.organization, organization)
         assert request.client is not None
 
-    @pytest.mark.asyncio
     async def test_nonce_exists(
         self,
+        authorization_server: AuthorizationServer,
         save_fixture: SaveFixture,
         get_grant: GetGrant,
         organization: Organization,
@@ -223,13 +238,15 @@ class TestValidateTokenRequest:
         grant = get_grant(request)
 
         with pytest.raises(InvalidGrantError):
-            grant.validate_token_request()
+            await authorization_server.run(grant.validate_token_request)
 
 
+@pytest.mark.asyncio
 class TestCreateTokenResponse:
-    def test_valid(
+    async def test_valid(
         self,
-        sync_session: Session,
+        session: AsyncSession,
+        authorization_server: AuthorizationServer,
         get_grant: GetGrant,
         external_organization_linked: ExternalOrganization,
     ) -> None:
@@ -253,8 +270,10 @@ class TestCreateTokenResponse:
         )
         grant = get_grant(request)
 
-        grant.validate_token_request()
-        status_code, body, _ = grant.create_token_response()
+        await authorization_server.run(grant.validate_token_request)
+        status_code, body, _ = await authorization_server.run(
+            grant.create_token_response
+        )
 
         assert status_code == 200
         assert "access_token" in body
@@ -262,7 +281,7 @@ class TestCreateTokenResponse:
 
         access_token = body["access_token"]
         access_token_hash = get_token_hash(access_token, secret=settings.SECRET)
-        result = sync_session.execute(
+        result = await session.execute(
             select(OAuth2Token).where(OAuth2Token.access_token == access_token_hash)
         )
         access_token_object = result.unique().scalar_one_or_none()
@@ -1,13 +1,7 @@
 import pytest_asyncio
 
-from polar.kit.db.postgres import AsyncSession
 from polar.models import OAuth2Client, User
-from tests.fixtures.database import SaveFixture, save_fixture_factory
-
-
-@pytest_asyncio.fixture
-def save_fixture(session: AsyncSession) -> SaveFixture:
-    return save_fixture_factory(session)
+from tests.fixtures.database import SaveFixture
 
 
 @pytest_asyncio.fixture
@@ -117,7 +117,7 @@ class TestList:
     ) -> None:
         await create_order(save_fixture, product=product, user=user_second)
 
-        orders, count = await order_service.list(
+        orders, count, _ = await order_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
@@ -148,7 +148,7 @@ class TestList:
             stripe_invoice_id="INVOICE_2",
         )
 
-        orders, count = await order_service.list(
+        orders, count, _ = await order_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
@@ -188,7 +188,7 @@ class TestList:
         )
 
         # No filter
-        orders, count = await order_service.list(
+        orders, count, _ = await order_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
         assert count == 2
@@ -197,7 +197,7 @@ class TestList:
         assert orders[1].id == order_organization.id
 
         # Filter by organization
-        orders, count = await order_service.list(
+        orders, count, _ = await order_service.list(
             session,
             auth_subject,
             pagination=PaginationParams(1, 10),
@@ -231,7 +231,7 @@ class TestList:
             stripe_invoice_id="INVOICE_2",
         )
 
-        orders, count = await order_service.list(
+        orders, count, _ = await order_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
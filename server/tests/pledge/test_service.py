@@ -40,6 +40,7 @@ from tests.fixtures.random_objects import (
     create_organization,
     create_repository,
     create_user,
+    create_user_pledge,
 )
 
 
@@ -1299,3 +1300,52 @@ async def test_pledge_states(
 
             if tc.pay_on_completion:
                 assert create_invoice.call_count == 2 if tc.other_pledged_first else 1
+
+
+@pytest.mark.asyncio
+async def test_issues_pledge_type_summary(
+    session: AsyncSession,
+    save_fixture: SaveFixture,
+    external_organization: ExternalOrganization,
+    repository: Repository,
+    issue: Issue,
+    pledge: Pledge,
+    pledging_organization: Organization,
+    user: User,
+    user_github_oauth: OAuthAccount,
+) -> None:
+    user_pledge = await create_user_pledge(
+        save_fixture,
+        external_organization,
+        repository,
+        issue,
+        pledging_user=user,
+        type=PledgeType.pay_on_completion,
+        amount=2000,
+    )
+    await create_user_pledge(
+        save_fixture,
+        external_organization,
+        repository,
+        issue,
+        pledging_user=user,
+        state=PledgeState.refunded,
+        amount=3000,
+    )
+
+    # then
+    session.expunge_all()
+
+    summaries = await pledge_service.issues_pledge_type_summary(session, issues=[issue])
+
+    summary = summaries[issue.id]
+    assert summary.pay_upfront.total.amount == pledge.amount
+    assert [p.github_username for p in summary.pay_upfront.pledgers] == [
+        pledging_organization.slug
+    ]
+    assert summary.pay_on_completion.total.amount == user_pledge.amount
+    assert [p.github_username for p in summary.pay_on_completion.pledgers] == [
+        user_github_oauth.account_username
+    ]
+    assert summary.pay_directly.total.amount == 0
+    assert summary.pay_directly.pledgers == []
@@ -839,7 +839,7 @@ class TestList:
         # then
         session.expunge_all()
 
-        results, count = await subscription_service.list(
+        results, count, _ = await subscription_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
@@ -867,7 +867,7 @@ class TestList:
         # then
         session.expunge_all()
 
-        results, count = await subscription_service.list(
+        results, count, _ = await subscription_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
@@ -895,7 +895,7 @@ class TestList:
         # then
         session.expunge_all()
 
-        results, count = await subscription_service.list(
+        results, count, _ = await subscription_service.list(
             session, auth_subject, pagination=PaginationParams(1, 10)
         )
 
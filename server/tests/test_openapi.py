@@ -1,6 +1,10 @@
 import pytest
+from fastapi import FastAPI
 from httpx import AsyncClient
 
+from polar.openapi import set_openapi_generator
+from polar.webhook.webhooks import document_webhooks
+
 
 @pytest.mark.asyncio
 @pytest.mark.skip_db_asserts
@@ -10,3 +14,14 @@ async def test_openapi(client: AsyncClient) -> None:
 
     schema = response.json()
     assert "Scope" in schema["components"]["schemas"]
+
+
+def test_openapi_generator_prepare() -> None:
+    app = FastAPI()
+    set_openapi_generator(app, prepare=document_webhooks)
+    assert app.webhooks.routes == []
+
+    schema = app.openapi()
+    assert "checkout.created" in schema["webhooks"]
+
+    assert app.openapi() is schema
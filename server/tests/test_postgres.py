@@ -0,0 +1,101 @@
+import contextlib
+from collections.abc import AsyncIterator
+from typing import cast
+
+import pytest
+from pytest_mock import MockerFixture
+from starlette.requests import Request
+
+from polar.kit.db.postgres import AsyncSession, AsyncSessionMaker
+from polar.postgres import ReplicaLagCheck, get_db_read_session
+
+
+def get_sessionmaker(session: AsyncSession) -> AsyncSessionMaker:
+    @contextlib.asynccontextmanager
+    async def sessionmaker() -> AsyncIterator[AsyncSession]:
+        yield session
+
+    return cast(AsyncSessionMaker, sessionmaker)
+
+
+def get_unreachable_sessionmaker() -> AsyncSessionMaker:
+    @contextlib.asynccontextmanager
+    async def sessionmaker() -> AsyncIterator[AsyncSession]:
+        raise ConnectionRefusedError()
+        yield
+
+    return cast(AsyncSessionMaker, sessionmaker)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestReplicaLagCheck:
+    async def test_not_in_recovery(self, session: AsyncSession) -> None:
+        check = ReplicaLagCheck(max_lag=5.0, interval=1.0)
+        assert await check.is_fresh(get_sessionmaker(session)) is True
+
+    async def test_lagging(self, session: AsyncSession, mocker: MockerFixture) -> None:
+        mocker.patch.object(ReplicaLagCheck, "_get_lag", return_value=10.0)
+        check = ReplicaLagCheck(max_lag=5.0, interval=1.0)
+        assert await check.is_fresh(get_sessionmaker(session)) is False
+
+    async def test_unknown_lag(
+        self, session: AsyncSession, mocker: MockerFixture
+    ) -> None:
+        # e.g. a replica whose WAL receiver is disconnected from the primary
+        mocker.patch.object(session, "scalar", return_value=None)
+        check = ReplicaLagCheck(max_lag=5.0, interval=1.0)
+        assert await check.is_fresh(get_sessionmaker(session)) is False
+
+    async def test_unreachable(self) -> None:
+        check = ReplicaLagCheck(max_lag=5.0, interval=1.0)
+        assert await check.is_fresh(get_unreachable_sessionmaker()) is False
+
+    async def test_interval(self, session: AsyncSession, mocker: MockerFixture) -> None:
+        get_lag_mock = mocker.patch.object(
+            ReplicaLagCheck, "_get_lag", return_value=0.0
+        )
+        check = ReplicaLagCheck(max_lag=5.0, interval=60.0)
+        sessionmaker = get_sessionmaker(session)
+
+        assert await check.is_fresh(sessionmaker) is True
+        assert await check.is_fresh(sessionmaker) is True
+        get_lag_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skip_db_asserts
+class TestGetDbReadSession:
+    async def test_no_replica(self, session: AsyncSession) -> None:
+        request = Request({"type": "http", "state": {"session": session}})
+
+        generator = get_db_read_session(request, get_sessionmaker(session), None)
+        assert await anext(generator) is session
+        await generator.aclose()
+
+    async def test_lagging_replica(
+        self, session: AsyncSession, mocker: MockerFixture
+    ) -> None:
+        mocker.patch("polar.postgres.replica_lag_check.is_fresh", return_value=False)
+        request = Request({"type": "http", "state": {"session": session}})
+        read_session = AsyncSession()
+
+        generator = get_db_read_session(
+            request, get_sessionmaker(session), get_sessionmaker(read_session)
+        )
+        assert await anext(generator) is session
+        await generator.aclose()
+
+    async def test_fresh_replica(
+        self, session: AsyncSession, mocker: MockerFixture
+    ) -> None:
+        mocker.patch("polar.postgres.replica_lag_check.is_fresh", return_value=True)
+        request = Request({"type": "http", "state": {"session": session}})
+        read_session = AsyncSession()
+
+        generator = get_db_read_session(
+            request, get_sessionmaker(session), get_sessionmaker(read_session)
+        )
+        assert await anext(generator) is read_session
+        assert request.state.read_session is read_session
+        await generator.aclose()
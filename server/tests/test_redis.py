@@ -0,0 +1,50 @@
+import pytest
+from redis.asyncio import BlockingConnectionPool
+
+from polar.config import settings
+from polar.redis import RedisConnectionManager, RedisPoolStats, RedisRole
+
+
+@pytest.mark.asyncio
+class TestRedisConnectionManager:
+    async def test_client_reuse(self) -> None:
+        connections = RedisConnectionManager()
+
+        cache = connections.get_client(RedisRole.cache)
+        assert connections.get_client(RedisRole.cache) is cache
+        assert connections.get_client(RedisRole.pubsub) is not cache
+        assert cache.connection_pool is connections.get_pool(RedisRole.cache)
+
+        await connections.close()
+
+    async def test_pool_sizing(self) -> None:
+        connections = RedisConnectionManager()
+
+        pool = connections.get_pool(RedisRole.pubsub)
+        assert not isinstance(pool, BlockingConnectionPool)
+        assert pool.connection_kwargs["decode_responses"] is True
+        assert (
+            pool.connection_kwargs["health_check_interval"]
+            == settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS
+        )
+
+        queue_pool = connections.get_pool(RedisRole.queue)
+        assert isinstance(queue_pool, BlockingConnectionPool)
+        assert queue_pool.max_connections == settings.REDIS_MAX_CONNECTIONS_QUEUE
+        assert queue_pool.connection_kwargs["decode_responses"] is False
+
+        await connections.close()
+
+    async def test_stats(self) -> None:
+        connections = RedisConnectionManager()
+        assert connections.get_stats() == {}
+
+        connections.get_client(RedisRole.locks)
+        assert connections.get_stats() == {
+            RedisRole.locks: RedisPoolStats(
+                max_connections=settings.REDIS_MAX_CONNECTIONS_LOCKS, in_use=0, idle=0
+            )
+        }
+
+        await connections.close()
+        assert connections.get_stats() == {}
@@ -0,0 +1,113 @@
+import pytest
+
+from polar.models import Account, Transaction
+from polar.models.transaction import TransactionType
+from polar.postgres import AsyncSession
+from polar.transaction.service.account_balance import (
+    account_balance as account_balance_service,
+)
+from tests.fixtures.database import SaveFixture
+
+
+async def create_transaction(
+    save_fixture: SaveFixture,
+    *,
+    account: Account,
+    type: TransactionType = TransactionType.balance,
+    amount: int = 1000,
+) -> Transaction:
+    transaction = Transaction(
+        type=type,
+        currency="usd",
+        amount=amount,
+        account_currency="eur",
+        account_amount=amount * 9 // 10,
+        tax_amount=0,
+        account=account,
+    )
+    await save_fixture(transaction)
+    return transaction
+
+
+@pytest.mark.asyncio
+class TestGet:
+    async def test_initialize_from_ledger(
+        self, session: AsyncSession, save_fixture: SaveFixture, account: Account
+    ) -> None:
+        await create_transaction(save_fixture, account=account, amount=1000)
+        await create_transaction(
+            save_fixture, account=account, type=TransactionType.payout, amount=-400
+        )
+
+        account_balance = await account_balance_service.get(session, account.id)
+
+        assert account_balance.amount == 600
+        assert account_balance.account_amount == 540
+        assert account_balance.gross_amount == 1000
+        assert account_balance.payout_amount == -400
+        assert account_balance.account_payout_amount == -360
+
+
+@pytest.mark.asyncio
+class TestApply:
+    async def test_increment(
+        self, session: AsyncSession, save_fixture: SaveFixture, account: Account
+    ) -> None:
+        await create_transaction(save_fixture, account=account, amount=1000)
+        await account_balance_service.get(session, account.id)
+
+        transactions = [
+            await create_transaction(save_fixture, account=account, amount=500),
+            await create_transaction(
+                save_fixture, account=account, type=TransactionType.payout, amount=-200
+            ),
+        ]
+        await account_balance_service.apply(session, transactions)
+
+        account_balance = await account_balance_service.get(session, account.id)
+        assert account_balance.amount == 1300
+        assert account_balance.account_amount == 1170
+        assert account_balance.gross_amount == 1500
+        assert account_balance.payout_amount == -200
+        assert account_balance.account_payout_amount == -180
+
+
+@pytest.mark.asyncio
+class TestApplyAccountAmountChange:
+    async def test_payout(
+        self, session: AsyncSession, save_fixture: SaveFixture, account: Account
+    ) -> None:
+        await create_transaction(save_fixture, account=account, amount=1000)
+        payout = await create_transaction(
+            save_fixture, account=account, type=TransactionType.payout, amount=-200
+        )
+        await account_balance_service.get(session, account.id)
+
+        await account_balance_service.apply_account_amount_change(session, payout, -20)
+
+        account_balance = await account_balance_service.get(session, account.id)
+        assert account_balance.amount == 800
+        assert account_balance.account_amount == 700
+        assert account_balance.payout_amount == -200
+        assert account_balance.account_payout_amount == -200
+
+
+@pytest.mark.asyncio
+class TestReconcile:
+    async def test_drift(
+        self, session: AsyncSession, save_fixture: SaveFixture, account: Account
+    ) -> None:
+        await create_transaction(save_fixture, account=account, amount=1000)
+        await account_balance_service.get(session, account.id)
+
+        # Not applied to the totals
+        await create_transaction(save_fixture, account=account, amount=500)
+
+        fixed = await account_balance_service.reconcile(session)
+        assert fixed == 1
+
+        account_balance = await account_balance_service.get(session, account.id)
+        assert account_balance.amount == 1500
+        assert account_balance.gross_amount == 1500
+
+        assert await account_balance_service.reconcile(session) == 0
@@ -1,18 +1,26 @@
+import contextlib
+import csv
 import datetime
+from collections.abc import AsyncIterator
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 import stripe as stripe_lib
 from pytest_mock import MockerFixture
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from polar.config import settings
 from polar.enums import AccountType
+from polar.integrations.aws.s3 import S3FileError
 from polar.integrations.stripe.service import StripeService
 from polar.kit.utils import utc_now
 from polar.models import Account, Organization, Transaction, User
 from polar.models.transaction import PaymentProcessor, TransactionType
 from polar.postgres import AsyncSession
+from polar.transaction.service.account_balance import (
+    account_balance as account_balance_service,
+)
 from polar.transaction.service.payout import (
     InsufficientBalance,
     NotReadyAccount,
@@ -262,11 +270,15 @@ class TestCreatePayout:
 
     async def test_stripe_different_currencies(
         self,
+        mocker: MockerFixture,
         session: AsyncSession,
         save_fixture: SaveFixture,
         user: User,
         stripe_service_mock: MagicMock,
     ) -> None:
+        mocker.patch.object(settings, "ACCOUNT_PAYOUT_CSV_PRECOMPUTE", new=True)
+        enqueue_job_mock = mocker.patch("polar.transaction.service.payout.enqueue_job")
+
         account = Account(
             status=Account.Status.ACTIVE,
             account_type=AccountType.stripe,
@@ -319,7 +331,21 @@ class TestCreatePayout:
         assert payout.currency == "usd"
         assert payout.amount < 0
         assert payout.account_currency == "eur"
-        assert payout.account_amount < 0
+        assert payout.account_amount == -1800
+
+        account_balance = await account_balance_service.get(session, account.id)
+        ledger_account_amount = await session.scalar(
+            select(func.sum(Transaction.account_amount)).where(
+                Transaction.account_id == account.id
+            )
+        )
+        assert account_balance.account_amount == ledger_account_amount
+        assert account_balance.account_payout_amount == payout.account_amount
+
+        # The CSV is precomputed once the converted amount is known
+        assert enqueue_job_mock.call_args_list[-1] == mocker.call(
+            "payout.precompute_csv", payout_id=payout.id
+        )
 
         assert len(payout.paid_transactions) == 2 + len(
             payout.account_incurred_transactions
@@ -581,6 +607,147 @@ class TestCreatePayout:
         assert len(payout.account_incurred_transactions) == 0
 
 
+@pytest.mark.asyncio
+class TestGetPayoutCSV:
+    async def test_chunks(
+        self,
+        mocker: MockerFixture,
+        session: AsyncSession,
+        save_fixture: SaveFixture,
+        organization: Organization,
+        user: User,
+    ) -> None:
+        mocker.patch("polar.transaction.service.payout.PAYOUT_CSV_CHUNK_SIZE", new=2)
+
+        account = await create_account(save_fixture, organization, user)
+        payout = Transaction(
+            type=TransactionType.payout,
+            processor=PaymentProcessor.stripe,
+            currency="usd",
+            amount=-3000,
+            account_currency="usd",
+            account_amount=-3000,
+            tax_amount=0,
+            account=account,
+        )
+        await save_fixture(payout)
+        balance_transactions = [
+            await create_balance_transaction(
+                save_fixture, account=account, payout_transaction=payout
+            )
+            for _ in range(3)
+        ]
+
+        @contextlib.asynccontextmanager
+        async def sessionmaker() -> AsyncIterator[AsyncSession]:
+            yield session
+
+        content = "".join(
+            [
+                chunk
+                async for chunk in payout_transaction_service.get_payout_csv(
+                    sessionmaker,  # type: ignore[arg-type]
+                    account=account,
+                    payout=payout,
+                )
+            ]
+        )
+
+        rows = list(csv.reader(content.splitlines()))
+        assert rows[0][0] == "Date"
+        assert [row[2] for row in rows[1:]] == [
+            str(t.id)
+            for t in sorted(balance_transactions, key=lambda t: (t.created_at, t.id))
+        ]
+        for row in rows[1:]:
+            assert row[1] == str(payout.id)
+            assert row[5] == "10.0"
+            assert row[6] == "30.0"
+
+
+async def create_payout_transaction(
+    save_fixture: SaveFixture, *, account: Account
+) -> Transaction:
+    payout = Transaction(
+        type=TransactionType.payout,
+        processor=PaymentProcessor.stripe,
+        currency="usd",
+        amount=-3000,
+        account_currency="usd",
+        account_amount=-3000,
+        tax_amount=0,
+        account=account,
+    )
+    await save_fixture(payout)
+    return payout
+
+
+@pytest.mark.asyncio
+class TestGetPayoutCSVUrl:
+    async def test_disabled(
+        self,
+        mocker: MockerFixture,
+        save_fixture: SaveFixture,
+        organization: Organization,
+        user: User,
+    ) -> None:
+        mocker.patch.object(settings, "ACCOUNT_PAYOUT_CSV_PRECOMPUTE", new=False)
+        s3_service_mock = mocker.patch("polar.transaction.service.payout.s3_service")
+        account = await create_account(save_fixture, organization, user)
+        payout = await create_payout_transaction(save_fixture, account=account)
+
+        url = await payout_transaction_service.get_payout_csv_url(
+            account=account, payout=payout
+        )
+
+        assert url is None
+        s3_service_mock.get_head_or_raise.assert_not_called()
+
+    async def test_not_precomputed(
+        self,
+        mocker: MockerFixture,
+        save_fixture: SaveFixture,
+        organization: Organization,
+        user: User,
+    ) -> None:
+        mocker.patch.object(settings, "ACCOUNT_PAYOUT_CSV_PRECOMPUTE", new=True)
+        s3_service_mock = mocker.patch("polar.transaction.service.payout.s3_service")
+        s3_service_mock.get_head_or_raise.side_effect = S3FileError("No object on S3")
+        account = await create_account(save_fixture, organization, user)
+        payout = await create_payout_transaction(save_fixture, account=account)
+
+        url = await payout_transaction_service.get_payout_csv_url(
+            account=account, payout=payout
+        )
+
+        assert url is None
+
+    async def test_precomputed(
+        self,
+        mocker: MockerFixture,
+        save_fixture: SaveFixture,
+        organization: Organization,
+        user: User,
+    ) -> None:
+        mocker.patch.object(settings, "ACCOUNT_PAYOUT_CSV_PRECOMPUTE", new=True)
+        s3_service_mock = mocker.patch("polar.transaction.service.payout.s3_service")
+        s3_service_mock.generate_presigned_download_url.return_value = (
+            "https://example.com/payout.csv",
+            utc_now(),
+        )
+        account = await create_account(save_fixture, organization, user)
+        payout = await create_payout_transaction(save_fixture, account=account)
+
+        url = await payout_transaction_service.get_payout_csv_url(
+            account=account, payout=payout
+        )
+
+        assert url == "https://example.com/payout.csv"
+        s3_service_mock.get_head_or_raise.assert_called_once_with(
+            f"payouts/{account.id}/{payout.id}.csv"
+        )
+
+
 def build_stripe_payout(
     *,
     status: str = "paid",
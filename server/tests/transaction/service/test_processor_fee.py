@@ -10,6 +10,10 @@ from polar.integrations.stripe.service import StripeService
 from polar.models import IssueReward, Order, Pledge, Transaction
 from polar.models.transaction import PaymentProcessor, ProcessorFeeType, TransactionType
 from polar.postgres import AsyncSession
+from polar.redis import Redis
+from polar.transaction.service.processor_fee import (
+    STRIPE_FEES_SYNC_CHECKPOINT_KEY,
+)
 from polar.transaction.service.processor_fee import (
     processor_fee_transaction as processor_fee_transaction_service,
 )
@@ -345,6 +349,7 @@ class TestSyncStripeFees:
     async def test_sync_stripe_fees(
         self,
         session: AsyncSession,
+        redis: Redis,
         save_fixture: SaveFixture,
         stripe_service_mock: MagicMock,
     ) -> None:
@@ -515,7 +520,7 @@ class TestSyncStripeFees:
         session.expunge_all()
 
         fee_transactions = await processor_fee_transaction_service.sync_stripe_fees(
-            session
+            session, redis
         )
 
         assert len(fee_transactions) == 11
@@ -580,3 +585,43 @@ class TestSyncStripeFees:
         assert fee_transaction_11.type == TransactionType.processor_fee
         assert fee_transaction_11.processor_fee_type == ProcessorFeeType.security
         assert fee_transaction_11.amount == -100
+
+        checkpoint = await redis.get(STRIPE_FEES_SYNC_CHECKPOINT_KEY)
+        assert checkpoint is not None
+        assert int(checkpoint) == now_timestamp
+
+    async def test_checkpoint(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        stripe_service_mock: MagicMock,
+    ) -> None:
+        await redis.set(STRIPE_FEES_SYNC_CHECKPOINT_KEY, 1700000000)
+        stripe_service_mock.list_balance_transactions.return_value = (
+            create_async_iterator(
+                [
+                    stripe_lib.BalanceTransaction.construct_from(
+                        {
+                            "created": 1700000100,
+                            "id": "STRIPE_BALANCE_TRANSACTION_ID_1",
+                            "net": -100,
+                            "currency": "usd",
+                            "description": "Billing - Usage Fee (2024-07-11)",
+                        },
+                        None,
+                    ),
+                ]
+            )
+        )
+
+        fee_transactions = await processor_fee_transaction_service.sync_stripe_fees(
+            session, redis
+        )
+
+        assert len(fee_transactions) == 1
+        stripe_service_mock.list_balance_transactions.assert_called_once_with(
+            type="stripe_fee", created_gte=1700000000
+        )
+        checkpoint = await redis.get(STRIPE_FEES_SYNC_CHECKPOINT_KEY)
+        assert checkpoint is not None
+        assert int(checkpoint) == 1700000100
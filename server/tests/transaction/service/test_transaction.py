@@ -4,7 +4,7 @@ import pytest
 
 from polar.authz.service import Authz
 from polar.exceptions import NotPermitted, ResourceNotFound
-from polar.kit.pagination import PaginationParams
+from polar.kit.pagination import CursorPaginationParams, PaginationParams
 from polar.models import Account, Organization, Transaction, User, UserOrganization
 from polar.models.transaction import TransactionType
 from polar.postgres import AsyncSession
@@ -27,7 +27,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session, user_second, pagination=PaginationParams(1, 10)
         )
 
@@ -45,7 +45,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session, user, pagination=PaginationParams(1, 10)
         )
 
@@ -65,6 +65,36 @@ class TestSearch:
             if result.order is not None:
                 result.order.product
 
+    async def test_cursor(
+        self,
+        session: AsyncSession,
+        user: User,
+        user_organization: UserOrganization,
+        readable_user_transactions: list[Transaction],
+        all_transactions: list[Transaction],
+    ) -> None:
+        # then
+        session.expunge_all()
+
+        first_page, count, next_cursor = await transaction_service.search(
+            session, user, pagination=CursorPaginationParams(None, 1)
+        )
+        assert count == len(readable_user_transactions)
+        assert len(first_page) == 1
+        assert next_cursor is not None
+
+        seen_ids = [t.id for t in first_page]
+        while next_cursor is not None:
+            page, _, next_cursor = await transaction_service.search(
+                session,
+                user,
+                pagination=CursorPaginationParams(next_cursor, 1, False),
+            )
+            seen_ids += [t.id for t in page]
+
+        assert len(seen_ids) == len(set(seen_ids))
+        assert set(seen_ids) == {t.id for t in readable_user_transactions}
+
     async def test_filter_type(
         self,
         session: AsyncSession,
@@ -77,7 +107,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session,
             user,
             type=TransactionType.payout,
@@ -106,7 +136,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session, user, account_id=account.id, pagination=PaginationParams(1, 10)
         )
 
@@ -129,7 +159,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session, user, payment_user_id=user.id, pagination=PaginationParams(1, 10)
         )
 
@@ -153,7 +183,7 @@ class TestSearch:
         # then
         session.expunge_all()
 
-        results, count = await transaction_service.search(
+        results, count, _ = await transaction_service.search(
             session,
             user,
             payment_organization_id=organization.id,
@@ -13,6 +13,7 @@ from polar.models import File, Organization, Product, User
 from polar.postgres import AsyncSession, sql
 from polar.redis import Redis
 from polar.user.schemas.downloadables import DownloadableRead
+from polar.user.service.downloadables import token_serializer
 from tests.fixtures.database import SaveFixture
 from tests.fixtures.downloadable import TestDownloadable
 
@@ -266,6 +267,44 @@ class TestDownloadablesEndpoints:
         assert pagination["total_count"] == 0
         assert len(downloadable_list) == 0
 
+    @pytest.mark.auth
+    async def test_list_pending_downloads(
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        client: AsyncClient,
+        save_fixture: SaveFixture,
+        user: User,
+        organization: Organization,
+        product: Product,
+        uploaded_logo_jpg: FileRead,
+    ) -> None:
+        await TestDownloadable.create_benefit_and_grant(
+            session,
+            redis,
+            save_fixture,
+            user=user,
+            organization=organization,
+            product=product,
+            properties=BenefitDownloadablesCreateProperties(
+                files=[uploaded_logo_jpg.id]
+            ),
+        )
+
+        response = await client.get("/v1/users/downloadables/")
+        assert response.status_code == 200
+        polar_download_url = response.json()["items"][0]["file"]["download"]["url"]
+
+        response = await client.get(polar_download_url, follow_redirects=False)
+        assert response.status_code == 302
+
+        # The download is still buffered, but already counted in the listing
+        response = await client.get("/v1/users/downloadables/")
+        assert response.status_code == 200
+        polar_download_url = response.json()["items"][0]["file"]["download"]["url"]
+        token = urlparse(polar_download_url).path.rsplit("/", 1)[-1]
+        assert token_serializer.loads(token)["downloaded"] == 1
+
     @pytest.mark.auth
     async def test_download(
         self,